@@ -4,28 +4,34 @@ API Dependencies
 وابستگی‌های مشترک API
 """
 
-from typing import Generator, Optional
+from typing import Generator, Optional, Type
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal
+from app.config import settings
+from app.db.session import SessionLocal, ReadSessionLocal, engine, read_engine
+from app.db.sharding import shard_router
 from app.models.user import User
 from app.core.security import verify_token
+from app.services.access_service import AccessService
 
 
 # HTTP Bearer برای دریافت توکن از هدر
 security = HTTPBearer(auto_error=False)
 
 
-def get_db() -> Generator[Session, None, None]:
+def get_main_db() -> Generator[Session, None, None]:
     """
-    Dependency برای دریافت session دیتابیس
+    Dependency برای دریافت session دیتابیس اصلی
     
     این تابع اطمینان می‌دهد که:
     - Session همیشه بسته می‌شود حتی در صورت خطا
     - Transaction ها به درستی commit یا rollback می‌شوند
     
+    با فعال بودن sharding، نوشتن روی کاربران و بانک‌های مشترک
+    (غذا، تمرین) باید از این dependency استفاده کند.
+    
     Note: این تابع duplicate است با backend/app/db/session.py
     برای سازگاری با کد موجود نگه داشته شده است.
     """
@@ -40,8 +46,78 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def get_main_read_db() -> Generator[Session, None, None]:
+    """
+    Dependency برای دریافت session خواندنی
+    
+    برای endpoint های GET (بانک‌ها، جستجو، خواندن برنامه‌ها) استفاده می‌شود.
+    با DATABASE_READ_ROUTING روی engine خواندنی (replica یا SQLite read-only) باز می‌شود.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+if read_engine is engine:
+    # وقتی مسیریابی غیرفعال است همان get_main_db استفاده می‌شود
+    # تا FastAPI در هر درخواست فقط یک session بسازد (کش dependency)
+    get_main_read_db = get_main_db  # noqa: F811
+
+
+def _token_coach_id(credentials: Optional[HTTPAuthorizationCredentials]) -> Optional[int]:
+    """
+    شناسه مربی از توکن، بدون مراجعه به دیتابیس
+    اعتبارسنجی کامل کاربر همچنان در get_current_user انجام می‌شود.
+    """
+    if not credentials:
+        return None
+    payload = verify_token(credentials.credentials, "access")
+    if not payload:
+        return None
+    try:
+        return int(payload.get("sub"))
+    except (ValueError, TypeError):
+        return None
+
+
+def get_shard_db(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+) -> Generator[Session, None, None]:
+    """
+    Dependency برای دریافت session روی shard مربی فعلی
+    
+    بدون توکن معتبر، session دیتابیس اصلی برگردانده می‌شود
+    (endpoint های عمومی مثل بانک غذا و تمرین).
+    """
+    coach_id = _token_coach_id(credentials)
+    if coach_id is None:
+        yield from get_main_db()
+        return
+
+    db = shard_router.session(coach_id)
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if settings.SHARDING_ENABLED:
+    # داده‌های شاگردان و برنامه‌ها روی shard مربی؛ خواندن و نوشتن از یک session
+    get_db = get_shard_db
+    get_read_db = get_shard_db
+else:
+    get_db = get_main_db
+    get_read_db = get_main_read_db
+
+
 def get_current_user(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
 ) -> User:
     """
@@ -93,7 +169,7 @@ def get_current_user(
 
 
 def get_current_user_optional(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
 ) -> Optional[User]:
     """
@@ -121,3 +197,32 @@ def get_current_superuser(
             detail="دسترسی فقط برای مدیران سیستم",
         )
     return current_user
+
+
+def check_athlete_access(db: Session, athlete_id: int, coach_id: int) -> None:
+    """
+    بررسی دسترسی مربی به شاگرد (بدون بارگذاری شاگرد)
+    
+    Raises:
+        HTTPException: 404 اگر شاگرد وجود نداشته باشد یا متعلق به مربی نباشد
+    """
+    if not AccessService(db).owns_athlete(athlete_id, coach_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="شاگرد یافت نشد",
+        )
+
+
+def check_plan_access(db: Session, plan_model: Type, plan_id: int, coach_id: int) -> None:
+    """
+    بررسی دسترسی مربی به برنامه (تمرینی، غذایی یا مکمل)
+    
+    Raises:
+        HTTPException: 404 اگر برنامه وجود نداشته باشد یا متعلق به مربی نباشد
+        (یکسان، تا شناسه برنامه‌های مربی‌های دیگر قابل شناسایی نباشد)
+    """
+    if not AccessService(db).owns_plan(plan_model, plan_id, coach_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="برنامه یافت نشد",
+        )
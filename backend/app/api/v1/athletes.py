@@ -4,16 +4,22 @@ Athlete Routes
 مسیرهای مدیریت شاگردان
 """
 
+from datetime import date
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_read_db, get_current_user, check_athlete_access
 from app.services.athlete_service import AthleteService
+from app.services.body_composition_service import BodyCompositionService
+from app.services.tdee_service import TDEEService
+from app.services.workspace_service import WorkspaceService
 from app.schemas.athlete import (
     AthleteCreate, AthleteUpdate, AthleteResponse, AthleteListResponse,
-    InjuryCreate, InjuryResponse, MeasurementCreate, MeasurementResponse
+    InjuryCreate, InjuryResponse, MeasurementCreate, MeasurementResponse,
+    MeasurementField, MeasurementTrends, BodyCompositionTimeline, AdaptiveTDEEResponse
 )
+from app.schemas.workspace import AthleteWorkspace
 from app.models.user import User
 
 router = APIRouter()
@@ -24,7 +30,7 @@ def get_athletes(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     active_only: bool = False,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -56,7 +62,7 @@ def create_athlete(
 def search_athletes(
     q: str = Query(..., min_length=1),
     limit: int = Query(20, ge=1, le=50),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -66,25 +72,76 @@ def search_athletes(
     return service.search(current_user.id, q, limit)
 
 
+def _tdee_response(service: TDEEService, row) -> AdaptiveTDEEResponse:
+    """تبدیل وضعیت TDEE به پاسخ"""
+    response = AdaptiveTDEEResponse.model_validate(row)
+    response.reliable = service.is_reliable(row)
+    return response
+
+
+@router.get("/tdee", response_model=List[AdaptiveTDEEResponse])
+def get_roster_tdee(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    TDEE تطبیقی همه شاگردان (از کش، یک کوئری)
+    """
+    service = TDEEService(db)
+    return [_tdee_response(service, row) for row in service.get_by_coach(current_user.id)]
+
+
 @router.get("/{athlete_id}", response_model=AthleteResponse)
 def get_athlete(
     athlete_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     دریافت اطلاعات یک شاگرد
     """
-    service = AthleteService(db)
-    athlete = service.get_by_id(athlete_id, current_user.id)
+    check_athlete_access(db, athlete_id, current_user.id)
+    return AthleteService(db).get_by_id(athlete_id)
+
+
+@router.get(
+    "/{athlete_id}/workspace",
+    response_model=AthleteWorkspace,
+    response_model_exclude_unset=True,
+)
+def get_athlete_workspace(
+    athlete_id: int,
+    fields: Optional[str] = Query(
+        None,
+        description="بخش‌ها با جداکننده کاما: athlete, measurements, training_plan, training_progression, diet_plan, supplement_plan, nutrition",
+    ),
+    measurements_limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    پنل شاگرد در یک درخواست
     
+    پروفایل، آخرین اندازه‌گیری‌ها، برنامه‌های فعال و محاسبه تغذیه؛
+    دسترسی یک بار بررسی می‌شود. بدون fields همه بخش‌ها برگردانده می‌شوند.
+    """
+    service = WorkspaceService(db)
+    try:
+        requested = service.parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    athlete = service.get_athlete(athlete_id, current_user.id)
     if not athlete:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="شاگرد یافت نشد"
         )
     
-    return athlete
+    return service.load(athlete, requested, measurements_limit)
 
 
 @router.put("/{athlete_id}", response_model=AthleteResponse)
@@ -153,7 +210,7 @@ def toggle_athlete_active(
 @router.get("/{athlete_id}/nutrition")
 def calculate_athlete_nutrition(
     athlete_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -162,12 +219,7 @@ def calculate_athlete_nutrition(
     service = AthleteService(db)
     
     # بررسی دسترسی
-    athlete = service.get_by_id(athlete_id, current_user.id)
-    if not athlete:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="شاگرد یافت نشد"
-        )
+    check_athlete_access(db, athlete_id, current_user.id)
     
     result = service.calculate_nutrition(athlete_id)
     
@@ -195,12 +247,7 @@ def add_injury(
     service = AthleteService(db)
     
     # بررسی دسترسی
-    athlete = service.get_by_id(athlete_id, current_user.id)
-    if not athlete:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="شاگرد یافت نشد"
-        )
+    check_athlete_access(db, athlete_id, current_user.id)
     
     injury = service.add_injury(athlete_id, injury_data)
     return injury
@@ -217,7 +264,7 @@ def remove_injury(
     """
     service = AthleteService(db)
     
-    if not service.remove_injury(injury_id):
+    if not service.remove_injury(injury_id, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="آسیب یافت نشد"
@@ -239,12 +286,7 @@ def add_measurement(
     service = AthleteService(db)
     
     # بررسی دسترسی
-    athlete = service.get_by_id(athlete_id, current_user.id)
-    if not athlete:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="شاگرد یافت نشد"
-        )
+    check_athlete_access(db, athlete_id, current_user.id)
     
     measurement = service.add_measurement(athlete_id, measurement_data)
     return measurement
@@ -254,7 +296,7 @@ def add_measurement(
 def get_measurements(
     athlete_id: int,
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -263,11 +305,91 @@ def get_measurements(
     service = AthleteService(db)
     
     # بررسی دسترسی
-    athlete = service.get_by_id(athlete_id, current_user.id)
-    if not athlete:
+    check_athlete_access(db, athlete_id, current_user.id)
+    
+    return service.get_measurements(athlete_id, limit)
+
+
+@router.get("/{athlete_id}/measurements/trends", response_model=MeasurementTrends)
+def get_measurement_trends(
+    athlete_id: int,
+    fields: List[MeasurementField] = Query(["weight", "body_fat", "waist"]),
+    window: int = Query(4, ge=2, le=52, description="تعداد اندازه‌گیری‌های میانگین متحرک"),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    limit: int = Query(200, ge=1, le=2000),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    تحلیل روند اندازه‌گیری‌ها
+    
+    برای هر فیلد: مقدار، تغییر نسبت به قبل، میانگین متحرک و نرخ تغییر هفتگی؛
+    به همراه درصد چربی فرمول نیروی دریایی (از اندازه‌های روز و میانگین متحرک)
+    """
+    service = AthleteService(db)
+    
+    # بررسی دسترسی
+    check_athlete_access(db, athlete_id, current_user.id)
+    
+    return service.get_measurement_trends(athlete_id, fields, window, start, end, limit)
+
+
+@router.get("/{athlete_id}/body-composition", response_model=BodyCompositionTimeline)
+def get_body_composition(
+    athlete_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    تایم‌لاین ترکیب بدنی (وزن، درصد چربی، توده بدون چربی، BMI)
+    
+    از جدول از پیش محاسبه‌شده خوانده می‌شود.
+    """
+    check_athlete_access(db, athlete_id, current_user.id)
+    return BodyCompositionService(db).get_timeline(athlete_id, start, end)
+
+
+@router.get("/{athlete_id}/tdee", response_model=AdaptiveTDEEResponse)
+def get_adaptive_tdee(
+    athlete_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    TDEE تطبیقی از روند وزن و کالری برنامه غذایی فعال
+    """
+    check_athlete_access(db, athlete_id, current_user.id)
+    
+    service = TDEEService(db)
+    row = service.get(athlete_id)
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="شاگرد یافت نشد"
+            detail="هنوز وزنی برای تخمین TDEE ثبت نشده"
         )
+    return _tdee_response(service, row)
+
+
+@router.post("/{athlete_id}/tdee/rebuild", response_model=AdaptiveTDEEResponse)
+def rebuild_adaptive_tdee(
+    athlete_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    بازسازی TDEE تطبیقی از کل تاریخچه وزن
+    (بعد از ثبت وزن‌های قدیمی‌تر از آخرین وزن)
+    """
+    check_athlete_access(db, athlete_id, current_user.id)
     
-    return service.get_measurements(athlete_id, limit)
+    service = TDEEService(db)
+    row = service.rebuild(athlete_id)
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="هنوز وزنی برای تخمین TDEE ثبت نشده"
+        )
+    return _tdee_response(service, row)
@@ -7,7 +7,7 @@ Authentication Routes
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_main_db, get_current_user
 from app.services.user_service import UserService
 from app.schemas.user import UserCreate, UserResponse, UserLogin, Token
 from app.core.security import create_access_token, create_refresh_token, verify_token
@@ -19,7 +19,7 @@ router = APIRouter()
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 def register(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_main_db)
 ):
     """
     ثبت‌نام کاربر جدید
@@ -43,7 +43,7 @@ def register(
 @router.post("/login", response_model=Token)
 def login(
     credentials: UserLogin,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_main_db)
 ):
     """
     ورود به سیستم
@@ -74,7 +74,7 @@ def login(
 @router.post("/refresh", response_model=Token)
 def refresh_token(
     refresh_token: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_main_db)
 ):
     """
     تمدید توکن با استفاده از رفرش توکن
@@ -123,7 +123,7 @@ def get_current_user_info(
 def change_password(
     old_password: str,
     new_password: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_main_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -5,12 +5,14 @@ Calculator Routes
 """
 
 from typing import Optional, List
+import numpy as np
 from fastapi import APIRouter, Query
 from pydantic import BaseModel, Field
 
 from app.core.calculator import NutritionCalculator, Gender, Goal, ActivityLevel
 from app.core.training_engine import TrainingEngine, ExperienceLevel
 from app.core.diet_engine import DietEngine, MealType
+from app.core.intensity import Formula, FORMULA_LABELS, MIN_RPE, MAX_RPE, rpe_chart, working_weights
 
 router = APIRouter()
 calculator = NutritionCalculator()
@@ -36,6 +38,21 @@ class MacrosRequest(BMRRequest):
 class OneRMRequest(BaseModel):
     weight: float = Field(..., gt=0, description="وزن استفاده شده")
     reps: int = Field(..., ge=1, le=30, description="تعداد تکرار")
+    rpe: float = Field(MAX_RPE, ge=MIN_RPE, le=MAX_RPE, description="RPE ست (۱۰ = تا واماندگی)")
+    formula: Formula = Formula.BRZYCKI
+
+
+class WorkingWeightRow(BaseModel):
+    one_rm: float = Field(..., gt=0, description="یک تکرار بیشینه")
+    reps: int = Field(..., ge=1, le=30, description="تکرار هدف")
+    rpe: float = Field(MAX_RPE, ge=MIN_RPE, le=MAX_RPE, description="RPE هدف")
+    formula: Optional[Formula] = None  # پیش‌فرض: فرمول درخواست
+
+
+class WorkingWeightBatchRequest(BaseModel):
+    formula: Formula = Formula.TABLE
+    rounding: Optional[float] = Field(None, gt=0, le=10, description="گام گرد کردن وزن (کیلوگرم)")
+    items: List[WorkingWeightRow] = Field(..., min_length=1, max_length=5000)
 
 
 class WaterIntakeRequest(BaseModel):
@@ -183,13 +200,14 @@ def calculate_one_rm(data: OneRMRequest):
     """
     تخمین 1RM (یک تکرار بیشینه)
     """
-    one_rm = training_engine.calculate_1rm(data.weight, data.reps)
+    one_rm = training_engine.calculate_1rm(data.weight, data.reps, data.formula, data.rpe)
     
     return {
         "estimated_1rm": round(one_rm, 1),
         "input_weight": data.weight,
         "input_reps": data.reps,
-        "method": "Brzycki Formula",
+        "input_rpe": data.rpe,
+        "method": FORMULA_LABELS[data.formula],
         "percentages": {
             "90%": round(one_rm * 0.9, 1),
             "85%": round(one_rm * 0.85, 1),
@@ -222,13 +240,53 @@ def get_rep_ranges():
 @router.post("/working-weight")
 def calculate_working_weight(
     one_rm: float = Query(..., gt=0),
-    target_reps: int = Query(..., ge=1, le=20),
-    goal: Goal = Query(Goal.BULK)
+    target_reps: int = Query(..., ge=1, le=30),
+    goal: Goal = Query(Goal.BULK),
+    rpe: float = Query(MAX_RPE, ge=MIN_RPE, le=MAX_RPE),
+    formula: Formula = Query(Formula.TABLE)
 ):
     """
     محاسبه وزن کاری بر اساس 1RM
     """
-    return training_engine.calculate_working_weight(one_rm, target_reps, goal)
+    return training_engine.calculate_working_weight(one_rm, target_reps, goal, rpe, formula)
+
+
+@router.post("/working-weights")
+def calculate_working_weights(data: WorkingWeightBatchRequest):
+    """
+    محاسبه دسته‌ای وزن کاری (مثلاً همه حرکات یک برنامه) در یک درخواست
+    
+    هر ردیف 1RM، تکرار و RPE هدف (و در صورت نیاز فرمول خودش) را دارد؛
+    همه ردیف‌ها با یک جست‌وجوی آرایه‌ای در جدول درصد 1RM محاسبه می‌شوند.
+    """
+    items = data.items
+    result = working_weights(
+        np.fromiter((item.one_rm for item in items), dtype=float, count=len(items)),
+        np.fromiter((item.reps for item in items), dtype=float, count=len(items)),
+        np.fromiter((item.rpe for item in items), dtype=float, count=len(items)),
+        [item.formula or data.formula for item in items],
+        data.rounding,
+    )
+    
+    return {
+        "formula": data.formula,
+        "rounding": data.rounding,
+        "results": [
+            {"percent_1rm": percent, "weight": weight}
+            for percent, weight in zip(result["percent"].tolist(), result["weight"].tolist())
+        ],
+    }
+
+
+@router.get("/rpe-table")
+def get_rpe_table(
+    formula: Formula = Query(Formula.RTS),
+    max_reps: int = Query(12, ge=1, le=30)
+):
+    """
+    جدول RPE × تکرار -> درصد 1RM
+    """
+    return rpe_chart(formula, max_reps)
 
 
 @router.post("/progression")
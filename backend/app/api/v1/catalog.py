@@ -0,0 +1,34 @@
+"""
+Catalog Routes
+==============
+مسیر snapshot کاتالوگ (بانک غذا + بانک تمرینات)
+"""
+
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.api.deps import get_read_db
+from app.core.snapshot import snapshot_response
+from app.services.catalog_service import CatalogService
+
+router = APIRouter()
+
+
+@router.get("")
+def get_catalog(
+    request: Request,
+    format: Optional[Literal["json", "msgpack"]] = Query(None),
+    db: Session = Depends(get_read_db),
+):
+    """
+    کل کاتالوگ در یک پاسخ: {version, food_categories, muscle_groups}
+    
+    - ETag قوی؛ با If-None-Match همان نسخه پاسخ 304 بدون بدنه
+    - فشرده‌سازی gzip/br بر اساس Accept-Encoding (از پیش محاسبه‌شده)
+    - MessagePack با format=msgpack یا Accept: application/msgpack
+      (در صورت نصب بودن msgpack؛ در غیر این صورت JSON)
+    """
+    document = CatalogService(db).get_document("catalog")
+    return snapshot_response(request, document, settings.CATALOG_CACHE_CONTROL, format)
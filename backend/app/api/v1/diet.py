@@ -4,17 +4,25 @@ Diet Routes
 مسیرهای برنامه غذایی
 """
 
+import json
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import (
+    get_db, get_read_db, get_current_user, check_athlete_access, check_plan_access
+)
+from app.db.sharding import session_target
 from app.services.diet_service import DietService
-from app.services.athlete_service import AthleteService
+from app.services.diet_generation_service import DietGenerationService
 from app.schemas.diet import (
-    DietPlanCreate, DietPlanUpdate, DietPlanResponse,
-    DietItemCreate, DietItemResponse, MacroSummary
+    DietPlanCreate, DietPlanUpdate, DietPlanResponse, DietPlanDocument,
+    DietItemCreate, DietItemResponse, MacroSummary,
+    DietGenerateRequest, DietGenerateResponse, RosterGenerateRequest
 )
+from app.models.athlete import Athlete, Goal
+from app.models.diet import DietPlan
 from app.models.user import User
 
 router = APIRouter()
@@ -26,16 +34,13 @@ router = APIRouter()
 def get_athlete_diet_plans(
     athlete_id: int,
     active_only: bool = False,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     دریافت برنامه‌های غذایی یک شاگرد
     """
-    athlete_service = AthleteService(db)
-    athlete = athlete_service.get_by_id(athlete_id, current_user.id)
-    if not athlete:
-        raise HTTPException(status_code=404, detail="شاگرد یافت نشد")
+    check_athlete_access(db, athlete_id, current_user.id)
     
     service = DietService(db)
     return service.get_plans_by_athlete(athlete_id, active_only)
@@ -44,16 +49,13 @@ def get_athlete_diet_plans(
 @router.get("/athlete/{athlete_id}/active", response_model=DietPlanResponse)
 def get_active_diet_plan(
     athlete_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     دریافت برنامه غذایی فعال شاگرد
     """
-    athlete_service = AthleteService(db)
-    athlete = athlete_service.get_by_id(athlete_id, current_user.id)
-    if not athlete:
-        raise HTTPException(status_code=404, detail="شاگرد یافت نشد")
+    check_athlete_access(db, athlete_id, current_user.id)
     
     service = DietService(db)
     plan = service.get_active_plan(athlete_id)
@@ -73,24 +75,105 @@ def create_diet_plan(
     """
     ایجاد برنامه غذایی جدید
     """
-    athlete_service = AthleteService(db)
-    athlete = athlete_service.get_by_id(plan_data.athlete_id, current_user.id)
-    if not athlete:
-        raise HTTPException(status_code=404, detail="شاگرد یافت نشد")
+    check_athlete_access(db, plan_data.athlete_id, current_user.id)
     
     service = DietService(db)
     return service.create_plan(plan_data)
 
 
+@router.post("/generate", response_model=DietGenerateResponse)
+def generate_diet_plan(
+    request: DietGenerateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    تولید خودکار برنامه غذایی از بانک غذاها
+
+    غذا و مقدار هر وعده طوری انتخاب می‌شود که به ماکروهای distribute_macros
+    برسد؛ حساسیت‌های غذایی شاگرد حذف می‌شوند. با save=false فقط پیش‌نمایش
+    برگردانده می‌شود. هر روز یک برنامه جدا ذخیره می‌شود و روز اول فعال است.
+    """
+    check_athlete_access(db, request.athlete_id, current_user.id)
+    athlete = db.get(Athlete, request.athlete_id)
+    
+    service = DietGenerationService(db)
+    try:
+        generated = service.generate(
+            athlete,
+            meal_plan_type=request.meal_plan_type,
+            days=request.days,
+            targets={
+                "calories": request.target_calories,
+                "protein": request.target_protein,
+                "carbs": request.target_carbs,
+                "fat": request.target_fat,
+            },
+            seed=request.seed,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    plans = service.create_plan(athlete.id, generated, request.name) if request.save else []
+    return DietGenerateResponse(
+        athlete_id=athlete.id,
+        plan=plans[0] if plans else None,
+        day_plan_ids=[plan.id for plan in plans],
+        **generated,
+    )
+
+
+@router.post("/generate/roster")
+def generate_roster_diet_plans(
+    request: RosterGenerateRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    تولید دسته‌ای برنامه غذایی برای شاگردان مربی
+
+    مثال: {"goal": "cut"} برای همه شاگردان فعال در فاز کات.
+    پاسخ به صورت NDJSON استریم می‌شود: یک رویداد started، یک رویداد progress
+    بعد از ذخیره هر دسته و در پایان completed.
+    """
+    coach_id = current_user.id
+    _, session_factory = session_target(coach_id)
+
+    def events():
+        # session مستقل: dependency ها قبل از شروع استریم بسته می‌شوند
+        db = session_factory()
+        try:
+            service = DietGenerationService(db)
+            athletes = service.select_roster(
+                coach_id,
+                goal=Goal(request.goal.value) if request.goal else None,
+                athlete_ids=request.athlete_ids,
+                active_only=request.active_only,
+            )
+            for event in service.generate_roster(
+                athletes,
+                meal_plan_type=request.meal_plan_type,
+                days=request.days,
+                name=request.name,
+                chunk_size=request.chunk_size,
+            ):
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @router.get("/{plan_id}", response_model=DietPlanResponse)
 def get_diet_plan(
     plan_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     دریافت جزئیات برنامه غذایی
     """
+    check_plan_access(db, DietPlan, plan_id, current_user.id)
+    
     service = DietService(db)
     plan = service.get_plan(plan_id)
     
@@ -110,6 +193,8 @@ def update_diet_plan(
     """
     ویرایش برنامه غذایی
     """
+    check_plan_access(db, DietPlan, plan_id, current_user.id)
+    
     service = DietService(db)
     plan = service.update_plan(plan_id, plan_data)
     
@@ -128,6 +213,8 @@ def delete_diet_plan(
     """
     حذف برنامه غذایی
     """
+    check_plan_access(db, DietPlan, plan_id, current_user.id)
+    
     service = DietService(db)
     
     if not service.delete_plan(plan_id):
@@ -143,6 +230,8 @@ def activate_diet_plan(
     """
     فعال کردن برنامه غذایی
     """
+    check_plan_access(db, DietPlan, plan_id, current_user.id)
+    
     service = DietService(db)
     plan = service.activate_plan(plan_id)
     
@@ -152,17 +241,46 @@ def activate_diet_plan(
     return plan
 
 
+@router.put("/{plan_id}/full", response_model=DietPlanResponse)
+def save_diet_plan_document(
+    plan_id: int,
+    document: DietPlanDocument,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    ذخیره کامل برنامه غذایی (همه آیتم‌ها) در یک درخواست
+    
+    آیتم‌های بدون id ایجاد، با id ویرایش و آیتم‌های غایب از سند حذف
+    می‌شوند؛ همه تغییرات در یک تراکنش.
+    """
+    check_plan_access(db, DietPlan, plan_id, current_user.id)
+    
+    service = DietService(db)
+    try:
+        plan = service.save_plan_document(plan_id, document, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if not plan:
+        raise HTTPException(status_code=404, detail="برنامه یافت نشد")
+    
+    return plan
+
+
 # ===== Macros Calculation =====
 
 @router.get("/{plan_id}/macros", response_model=MacroSummary)
 def get_plan_macros(
     plan_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     محاسبه مجموع ماکروهای برنامه
     """
+    check_plan_access(db, DietPlan, plan_id, current_user.id)
+    
     service = DietService(db)
     return service.calculate_plan_macros(plan_id)
 
@@ -170,12 +288,14 @@ def get_plan_macros(
 @router.get("/{plan_id}/meals-summary")
 def get_meals_summary(
     plan_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     خلاصه وعده‌ها
     """
+    check_plan_access(db, DietPlan, plan_id, current_user.id)
+    
     service = DietService(db)
     return service.get_meal_summary(plan_id)
 
@@ -192,6 +312,8 @@ def add_diet_item(
     """
     افزودن غذا به برنامه
     """
+    check_plan_access(db, DietPlan, plan_id, current_user.id)
+    
     service = DietService(db)
     item = service.add_item(plan_id, item_data)
     
@@ -212,7 +334,7 @@ def delete_diet_item(
     """
     service = DietService(db)
     
-    if not service.delete_item(item_id):
+    if not service.delete_item(item_id, current_user.id):
         raise HTTPException(status_code=404, detail="آیتم یافت نشد")
 
 
@@ -226,9 +348,11 @@ def reorder_diet_items(
     """
     مرتب‌سازی مجدد آیتم‌ها
     """
+    check_plan_access(db, DietPlan, plan_id, current_user.id)
+    
     service = DietService(db)
     
-    if not service.reorder_items(plan_id, item_ids):
+    if not service.reorder_items(plan_id, item_ids, current_user.id):
         raise HTTPException(status_code=404, detail="برنامه یافت نشد")
     
     return {"message": "ترتیب بروزرسانی شد"}
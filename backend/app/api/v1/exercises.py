@@ -5,15 +5,21 @@ Exercise Routes
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user_optional
+from app.config import settings
+from app.api.deps import get_main_db, get_db, get_read_db, get_current_user, get_current_user_optional
+from app.core.snapshot import snapshot_response
+from app.services.catalog_service import CatalogService
 from app.services.exercise_service import ExerciseService
+from app.services.restriction_service import InjuryRestrictionService
+from app.services.athlete_service import AthleteService
 from app.schemas.exercise import (
     MuscleGroupResponse, MuscleGroupWithExercises,
     ExerciseCreate, ExerciseResponse, ExerciseSearch,
-    ExerciseType, Equipment, Difficulty
+    ExerciseType, Equipment, Difficulty,
+    InjuryRestrictionCreate, InjuryRestrictionResponse
 )
 from app.models.user import User
 
@@ -22,7 +28,7 @@ router = APIRouter()
 
 @router.get("/muscle-groups", response_model=List[MuscleGroupResponse])
 def get_muscle_groups(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     دریافت لیست گروه‌های عضلانی
@@ -33,13 +39,16 @@ def get_muscle_groups(
 
 @router.get("/muscle-groups/with-exercises", response_model=List[MuscleGroupWithExercises])
 def get_muscle_groups_with_exercises(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
 ):
     """
     دریافت گروه‌های عضلانی به همراه تمرینات
+    
+    از snapshot کاتالوگ (ETag/304، gzip/br)؛ بدون کوئری تا تغییر بانک تمرینات
     """
-    service = ExerciseService(db)
-    return service.get_groups_with_exercises()
+    document = CatalogService(db).get_document("muscle_groups")
+    return snapshot_response(request, document, settings.CATALOG_CACHE_CONTROL)
 
 
 @router.get("/search", response_model=List[ExerciseResponse])
@@ -53,7 +62,7 @@ def search_exercises(
     exclude_risky: bool = False,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     جستجوی تمرینات
@@ -78,7 +87,7 @@ def search_exercises(
 @router.get("/compound", response_model=List[ExerciseResponse])
 def get_compound_exercises(
     limit: int = Query(30, ge=1, le=50),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     دریافت حرکات چندمفصلی
@@ -91,7 +100,7 @@ def get_compound_exercises(
 def get_exercises_by_type(
     exercise_type: ExerciseType,
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     دریافت تمرینات بر اساس نوع
@@ -100,10 +109,86 @@ def get_exercises_by_type(
     return service.get_by_type(exercise_type, limit)
 
 
+@router.get("/safe", response_model=List[ExerciseResponse])
+def get_safe_exercises(
+    athlete_id: int,
+    muscle_group_id: Optional[int] = None,
+    type: Optional[ExerciseType] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    تمرینات امن برای یک شاگرد
+    
+    حرکات پرخطر و حرکات ممنوعه آسیب‌های درمان‌نشده شاگرد (با قوانین
+    اختصاصی مربی) در یک کوئری حذف می‌شوند.
+    """
+    athlete_service = AthleteService(db)
+    athlete = athlete_service.get_by_id(athlete_id, current_user.id)
+    if not athlete:
+        raise HTTPException(status_code=404, detail="شاگرد یافت نشد")
+    
+    excluded = InjuryRestrictionService(db).athlete_excluded_ids(athlete)
+    service = ExerciseService(db)
+    return service.get_safe_exercises(
+        muscle_group_id=muscle_group_id,
+        excluded_ids=excluded,
+        exercise_type=type,
+    )
+
+
+# ===== Injury Restrictions =====
+
+@router.get("/restrictions", response_model=List[InjuryRestrictionResponse])
+def get_injury_restrictions(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    قوانین اختصاصی حرکات ممنوعه مربی
+    """
+    service = InjuryRestrictionService(db)
+    return service.list_rules(current_user.id)
+
+
+@router.post("/restrictions", response_model=InjuryRestrictionResponse, status_code=status.HTTP_201_CREATED)
+def create_injury_restriction(
+    rule_data: InjuryRestrictionCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    افزودن قانون حرکت ممنوعه
+    
+    مثال: {"body_part": "زانو", "pattern": "اسکات"} همه حرکات شامل «اسکات» را
+    برای شاگردان با آسیب زانو حذف می‌کند.
+    """
+    service = InjuryRestrictionService(db)
+    try:
+        return service.add_rule(current_user.id, rule_data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.delete("/restrictions/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_injury_restriction(
+    rule_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    حذف قانون حرکت ممنوعه
+    """
+    service = InjuryRestrictionService(db)
+    
+    if not service.delete_rule(current_user.id, rule_id):
+        raise HTTPException(status_code=404, detail="قانون یافت نشد")
+
+
 @router.get("/{exercise_id}", response_model=ExerciseResponse)
 def get_exercise(
     exercise_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     دریافت اطلاعات یک تمرین
@@ -123,7 +208,7 @@ def get_exercise(
 @router.post("", response_model=ExerciseResponse, status_code=status.HTTP_201_CREATED)
 def create_custom_exercise(
     exercise_data: ExerciseCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_main_db),
     current_user: User = Depends(get_current_user_optional)
 ):
     """
@@ -137,7 +222,7 @@ def create_custom_exercise(
 def get_exercises_by_muscle(
     muscle_group_id: int,
     type: Optional[ExerciseType] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     دریافت تمرینات یک گروه عضلانی
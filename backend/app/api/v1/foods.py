@@ -5,11 +5,14 @@ Food Routes
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user_optional
+from app.config import settings
+from app.api.deps import get_main_db, get_read_db, get_current_user_optional
+from app.core.snapshot import snapshot_response
 from app.services.food_service import FoodService
+from app.services.catalog_service import CatalogService
 from app.schemas.food import (
     FoodCategoryResponse, FoodCategoryWithFoods,
     FoodCreate, FoodResponse, FoodSearch, CalculatedMacros
@@ -21,7 +24,7 @@ router = APIRouter()
 
 @router.get("/categories", response_model=List[FoodCategoryResponse])
 def get_categories(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     دریافت لیست دسته‌بندی‌های غذا
@@ -32,13 +35,16 @@ def get_categories(
 
 @router.get("/categories/with-foods", response_model=List[FoodCategoryWithFoods])
 def get_categories_with_foods(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
 ):
     """
     دریافت دسته‌بندی‌ها به همراه غذاها
+    
+    از snapshot کاتالوگ (ETag/304، gzip/br)؛ بدون کوئری تا تغییر بانک غذا
     """
-    service = FoodService(db)
-    return service.get_categories_with_foods()
+    document = CatalogService(db).get_document("food_categories")
+    return snapshot_response(request, document, settings.CATALOG_CACHE_CONTROL)
 
 
 @router.get("/search", response_model=List[FoodResponse])
@@ -47,12 +53,15 @@ def search_foods(
     category_id: Optional[int] = None,
     min_protein: Optional[float] = None,
     max_calories: Optional[float] = None,
+    allergies: Optional[str] = None,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     جستجوی غذاها
+    
+    - allergies: حساسیت‌ها با جداکننده کاما (مثلاً "لبنیات، بادام زمینی")
     """
     service = FoodService(db)
     
@@ -61,6 +70,7 @@ def search_foods(
         category_id=category_id,
         min_protein=min_protein,
         max_calories=max_calories,
+        allergies=allergies,
         page=page,
         page_size=page_size
     )
@@ -72,7 +82,7 @@ def search_foods(
 def get_high_protein_foods(
     min_protein: float = Query(20, ge=0),
     limit: int = Query(20, ge=1, le=50),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     غذاهای با پروتئین بالا
@@ -85,7 +95,7 @@ def get_high_protein_foods(
 def get_low_calorie_foods(
     max_calories: float = Query(100, ge=0),
     limit: int = Query(20, ge=1, le=50),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     غذاهای کم‌کالری
@@ -97,7 +107,7 @@ def get_low_calorie_foods(
 @router.get("/{food_id}", response_model=FoodResponse)
 def get_food(
     food_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     دریافت اطلاعات یک غذا
@@ -118,7 +128,7 @@ def get_food(
 def calculate_food_macros(
     food_id: int,
     amount: float = Query(..., gt=0),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     محاسبه ماکروها برای مقدار مشخص
@@ -138,7 +148,7 @@ def calculate_food_macros(
 @router.post("", response_model=FoodResponse, status_code=status.HTTP_201_CREATED)
 def create_custom_food(
     food_data: FoodCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_main_db),
     current_user: User = Depends(get_current_user_optional)
 ):
     """
@@ -151,7 +161,7 @@ def create_custom_food(
 @router.get("/category/{category_id}", response_model=List[FoodResponse])
 def get_foods_by_category(
     category_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     دریافت غذاهای یک دسته‌بندی
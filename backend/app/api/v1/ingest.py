@@ -0,0 +1,95 @@
+"""
+Ingestion Routes
+================
+مسیر دریافت دسته‌ای اندازه‌گیری‌ها و رکوردهای پیشرفت
+"""
+
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_read_db, get_current_user
+from app.config import settings
+from app.db.sharding import session_target
+from app.models.athlete import Athlete
+from app.models.user import User
+from app.schemas.ingestion import IngestionRequest, IngestionResponse
+from app.services.ingestion_queue import ingestion_queue, IngestionQueueFull
+
+router = APIRouter()
+
+
+@router.post("", response_model=IngestionResponse, status_code=status.HTTP_201_CREATED)
+def ingest(
+    data: IngestionRequest,
+    response: Response,
+    wait: bool = Query(True, description="انتظار برای commit (تأیید ماندگاری)"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    ثبت دسته‌ای اندازه‌گیری‌ها و رکوردهای پیشرفت
+    
+    ردیف‌ها از طریق صف نوشتن دسته‌ای ثبت می‌شوند:
+    - wait=true: پاسخ 201 بعد از commit
+    - wait=false: پاسخ 202 بلافاصله بعد از قرار گرفتن در صف
+    """
+    measurements = [m.model_dump() for m in data.measurements]
+    progress_records = [p.model_dump() for p in data.progress_records]
+
+    # بررسی دسترسی همه شاگردان با یک کوئری
+    athlete_ids = {row["athlete_id"] for row in measurements + progress_records}
+    owned = set(db.scalars(
+        select(Athlete.id).where(
+            Athlete.id.in_(athlete_ids),
+            Athlete.coach_id == current_user.id
+        )
+    ))
+    if owned != athlete_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"شاگرد یافت نشد: {sorted(athlete_ids - owned)}"
+        )
+    # آزاد کردن اتصال قبل از انتظار برای flush؛ در غیر این صورت درخواست‌های
+    # منتظر کل pool را نگه می‌دارند و thread صف اتصالی برای نوشتن پیدا نمی‌کند
+    db.close()
+
+    key, session_factory = session_target(current_user.id)
+    try:
+        future = ingestion_queue.submit(key, session_factory, measurements, progress_records)
+    except IngestionQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="صف ثبت داده پر است، لطفاً کمی بعد دوباره تلاش کنید",
+            headers={"Retry-After": "1"},
+        )
+
+    accepted = IngestionResponse(
+        status="accepted",
+        measurements=len(measurements),
+        progress_records=len(progress_records),
+    )
+    if not wait:
+        response.status_code = status.HTTP_202_ACCEPTED
+        return accepted
+
+    try:
+        ack = future.result(timeout=settings.INGEST_ACK_TIMEOUT)
+    except FutureTimeoutError:
+        # داده در صف باقی است و نوشته خواهد شد
+        response.status_code = status.HTTP_202_ACCEPTED
+        return accepted
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="خطا در ثبت داده‌ها"
+        )
+
+    return IngestionResponse(
+        status="committed",
+        measurements=ack.measurements,
+        progress_records=ack.progress_records,
+        batch_id=ack.batch_id,
+        batch_rows=ack.batch_rows,
+    )
@@ -0,0 +1,84 @@
+"""
+Plan History Routes
+===================
+مسیرهای تاریخچه نسخه‌های برنامه
+"""
+
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_read_db, get_current_user
+from app.services.plan_history_service import PlanHistoryService
+from app.schemas.plan_history import PlanType, PlanVersionSummary, PlanVersionDocument, PlanVersionDiff
+from app.models.user import User
+
+router = APIRouter()
+
+
+@router.get("/{plan_type}/{plan_id}", response_model=List[PlanVersionSummary])
+def list_plan_versions(
+    plan_type: PlanType,
+    plan_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    لیست نسخه‌های یک برنامه (جدیدترین اول)
+    
+    تاریخچه بعد از حذف برنامه هم در دسترس است.
+    """
+    service = PlanHistoryService(db)
+    versions = service.list_versions(plan_type.value, plan_id, current_user.id)
+    
+    if not versions:
+        raise HTTPException(status_code=404, detail="تاریخچه‌ای یافت نشد")
+    
+    return versions
+
+
+@router.get("/{plan_type}/{plan_id}/diff", response_model=PlanVersionDiff)
+def diff_plan_versions(
+    plan_type: PlanType,
+    plan_id: int,
+    from_version: int = Query(..., ge=1),
+    to_version: int = Query(..., ge=1),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    تفاوت دو نسخه
+    
+    مثال: /plan-history/training/12/diff?from_version=3&to_version=7
+    """
+    service = PlanHistoryService(db)
+    changes = service.diff(plan_type.value, plan_id, from_version, to_version, current_user.id)
+    
+    if changes is None:
+        raise HTTPException(status_code=404, detail="نسخه یافت نشد")
+    
+    return {
+        "plan_type": plan_type,
+        "plan_id": plan_id,
+        "from_version": from_version,
+        "to_version": to_version,
+        "changes": changes,
+    }
+
+
+@router.get("/{plan_type}/{plan_id}/{version}", response_model=PlanVersionDocument)
+def get_plan_version(
+    plan_type: PlanType,
+    plan_id: int,
+    version: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """بازسازی سند کامل یک نسخه"""
+    service = PlanHistoryService(db)
+    document = service.get_version(plan_type.value, plan_id, version, current_user.id)
+    
+    if document is None:
+        raise HTTPException(status_code=404, detail="نسخه یافت نشد")
+    
+    return {"plan_type": plan_type, "plan_id": plan_id, "version": version, "document": document}
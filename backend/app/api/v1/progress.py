@@ -0,0 +1,120 @@
+"""
+Progress Routes
+===============
+مسیرهای ثبت و نمودار پیشرفت
+"""
+
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_read_db, get_current_user, check_athlete_access
+from app.services.progress_service import ProgressService
+from app.schemas.progress import (
+    ProgressRecordCreate, ProgressRecordResponse, ProgressSummary, ProgressSeries,
+    ProgressField, ProgressResolution
+)
+from app.models.user import User
+
+router = APIRouter()
+
+
+@router.post("", response_model=ProgressRecordResponse, status_code=status.HTTP_201_CREATED)
+def create_progress_record(
+    record_data: ProgressRecordCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    ثبت رکورد پیشرفت
+    """
+    check_athlete_access(db, record_data.athlete_id, current_user.id)
+
+    service = ProgressService(db)
+    return service.create_record(record_data)
+
+
+@router.get("/athlete/{athlete_id}", response_model=List[ProgressRecordResponse])
+def get_progress_records(
+    athlete_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    دریافت رکوردهای پیشرفت در یک بازه زمانی
+    """
+    check_athlete_access(db, athlete_id, current_user.id)
+
+    service = ProgressService(db)
+    return service.get_records(athlete_id, start, end, limit)
+
+
+@router.get("/athlete/{athlete_id}/summary", response_model=ProgressSummary)
+def get_progress_summary(
+    athlete_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    خلاصه پیشرفت (آخرین مقادیر، تغییرات، بهترین رکوردها و میانگین‌ها)
+    """
+    check_athlete_access(db, athlete_id, current_user.id)
+
+    service = ProgressService(db)
+    return service.get_summary(athlete_id)
+
+
+@router.get("/athlete/{athlete_id}/series", response_model=ProgressSeries)
+def get_progress_series(
+    athlete_id: int,
+    fields: List[ProgressField] = Query(["weight"]),
+    resolution: ProgressResolution = "lttb",
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    points: int = Query(500, ge=3, le=5000, description="حداکثر نقاط در حالت lttb و raw"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    سری زمانی ستونی برای نمودار
+
+    مثال: ?fields=weight&fields=bench_1rm&resolution=week
+
+    - lttb (پیش‌فرض): حداکثر points نقطه که شکل نمودار را حفظ می‌کنند
+    - raw: همه رکوردها تا سقف points (بیشتر از آن با lttb کاهش می‌یابد)
+    - day/week/month: تجمیع با min/avg/max
+    """
+    check_athlete_access(db, athlete_id, current_user.id)
+
+    service = ProgressService(db)
+    return service.get_series(
+        athlete_id,
+        list(dict.fromkeys(fields)),
+        resolution=resolution,
+        start=start,
+        end=end,
+        points=points,
+    )
+
+
+@router.delete("/{record_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_progress_record(
+    record_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    حذف رکورد پیشرفت
+    """
+    service = ProgressService(db)
+    record = service.get_record(record_id)
+
+    if not record:
+        raise HTTPException(status_code=404, detail="رکورد یافت نشد")
+
+    check_athlete_access(db, record.athlete_id, current_user.id)
+    service.delete_record(record_id)
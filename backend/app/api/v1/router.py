@@ -6,7 +6,7 @@ Main API Router
 
 from fastapi import APIRouter
 
-from app.api.v1 import auth, users, athletes, foods, exercises, training, diet, calculator, supplement_plan
+from app.api.v1 import auth, users, athletes, foods, exercises, training, diet, calculator, supplement_plan, templates, plan_history, ingest, progress, catalog
 
 # روتر اصلی
 api_router = APIRouter()
@@ -42,6 +42,12 @@ api_router.include_router(
     tags=["💪 بانک تمرینات"]
 )
 
+api_router.include_router(
+    catalog.router,
+    prefix="/catalog",
+    tags=["📦 کاتالوگ"]
+)
+
 api_router.include_router(
     training.router,
     prefix="/training",
@@ -54,6 +60,18 @@ api_router.include_router(
     tags=["🥗 برنامه غذایی"]
 )
 
+api_router.include_router(
+    templates.router,
+    prefix="/templates",
+    tags=["📑 قالب برنامه"]
+)
+
+api_router.include_router(
+    plan_history.router,
+    prefix="/plan-history",
+    tags=["🕓 تاریخچه برنامه"]
+)
+
 api_router.include_router(
     calculator.router,
     prefix="/calculator",
@@ -65,3 +83,15 @@ api_router.include_router(
     prefix="/supplement-plans",
     tags=["💊 برنامه مکمل"]
 )
+
+api_router.include_router(
+    progress.router,
+    prefix="/progress",
+    tags=["📈 پیشرفت"]
+)
+
+api_router.include_router(
+    ingest.router,
+    prefix="/ingest",
+    tags=["📡 دریافت داده"]
+)
@@ -8,13 +8,16 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import (
+    get_db, get_read_db, get_current_user, check_athlete_access, check_plan_access
+)
 from app.services.supplement_plan_service import SupplementPlanService
-from app.services.athlete_service import AthleteService
 from app.schemas.supplement_plan import (
     SupplementPlanCreate, SupplementPlanUpdate, SupplementPlanResponse,
-    SupplementPlanItemCreate, SupplementPlanItemResponse
+    SupplementPlanItemCreate, SupplementPlanItemResponse,
+    SupplementPlanBulkAssign, SupplementPlanBulkAssignResponse
 )
+from app.models.supplement_plan import SupplementPlan
 from app.models.user import User
 
 router = APIRouter()
@@ -24,14 +27,11 @@ router = APIRouter()
 def get_athlete_supplement_plans(
     athlete_id: int,
     active_only: bool = False,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """دریافت برنامه‌های مکمل یک شاگرد"""
-    athlete_service = AthleteService(db)
-    athlete = athlete_service.get_by_id(athlete_id, current_user.id)
-    if not athlete:
-        raise HTTPException(status_code=404, detail="شاگرد یافت نشد")
+    check_athlete_access(db, athlete_id, current_user.id)
     
     service = SupplementPlanService(db)
     return service.get_plans_by_athlete(athlete_id, active_only)
@@ -40,14 +40,11 @@ def get_athlete_supplement_plans(
 @router.get("/athlete/{athlete_id}/active", response_model=SupplementPlanResponse)
 def get_active_supplement_plan(
     athlete_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """دریافت برنامه فعال شاگرد"""
-    athlete_service = AthleteService(db)
-    athlete = athlete_service.get_by_id(athlete_id, current_user.id)
-    if not athlete:
-        raise HTTPException(status_code=404, detail="شاگرد یافت نشد")
+    check_athlete_access(db, athlete_id, current_user.id)
     
     service = SupplementPlanService(db)
     plan = service.get_active_plan(athlete_id)
@@ -65,15 +62,33 @@ def create_supplement_plan(
     current_user: User = Depends(get_current_user)
 ):
     """ایجاد برنامه مکمل جدید"""
-    athlete_service = AthleteService(db)
-    athlete = athlete_service.get_by_id(plan_data.athlete_id, current_user.id)
-    if not athlete:
-        raise HTTPException(status_code=404, detail="شاگرد یافت نشد")
+    check_athlete_access(db, plan_data.athlete_id, current_user.id)
     
     service = SupplementPlanService(db)
     return service.create_plan(plan_data)
 
 
+@router.post("/bulk-assign", response_model=SupplementPlanBulkAssignResponse, status_code=status.HTTP_201_CREATED)
+def bulk_assign_supplement_plan(
+    data: SupplementPlanBulkAssign,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    ساخت یک برنامه مکمل یکسان برای چند شاگرد
+    
+    مثال: {"athlete_ids": [1, 2, 3], "name": "مکمل کات", "items": [...]}
+    برنامه‌های فعال قبلی این شاگردان غیرفعال می‌شوند؛ همه در یک تراکنش.
+    """
+    service = SupplementPlanService(db)
+    try:
+        plans = service.bulk_assign(current_user.id, data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    return {"created": len(plans), "plans": plans}
+
+
 @router.put("/{plan_id}", response_model=SupplementPlanResponse)
 def update_supplement_plan(
     plan_id: int,
@@ -82,6 +97,8 @@ def update_supplement_plan(
     current_user: User = Depends(get_current_user)
 ):
     """ویرایش برنامه مکمل"""
+    check_plan_access(db, SupplementPlan, plan_id, current_user.id)
+    
     service = SupplementPlanService(db)
     plan = service.update_plan(plan_id, plan_data)
     
@@ -99,6 +116,8 @@ def add_supplement_item(
     current_user: User = Depends(get_current_user)
 ):
     """افزودن مکمل به برنامه"""
+    check_plan_access(db, SupplementPlan, plan_id, current_user.id)
+    
     service = SupplementPlanService(db)
     item = service.add_item(plan_id, item_data)
     
@@ -117,6 +136,6 @@ def delete_supplement_item(
     """حذف آیتم مکمل"""
     service = SupplementPlanService(db)
     
-    if not service.delete_item(item_id):
+    if not service.delete_item(item_id, current_user.id):
         raise HTTPException(status_code=404, detail="آیتم یافت نشد")
 
@@ -0,0 +1,208 @@
+"""
+Plan Template Routes
+====================
+مسیرهای قالب برنامه تمرینی و غذایی
+"""
+
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_read_db, get_current_user
+from app.services.plan_template_service import PlanTemplateService
+from app.schemas.plan_template import (
+    TrainingTemplateCreate, TrainingTemplateResponse,
+    DietTemplateCreate, DietTemplateResponse, PlanTemplateSummary,
+    TemplateFromPlanRequest, TemplateAssignRequest, TemplateAssignResponse
+)
+from app.models.user import User
+
+router = APIRouter()
+
+
+# ===== Training Templates =====
+
+@router.get("/training", response_model=List[PlanTemplateSummary])
+def list_training_templates(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """لیست قالب‌های تمرینی مربی"""
+    service = PlanTemplateService(db)
+    return service.list_training(current_user.id)
+
+
+@router.post("/training", response_model=TrainingTemplateResponse, status_code=status.HTTP_201_CREATED)
+def create_training_template(
+    data: TrainingTemplateCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """ایجاد قالب تمرینی"""
+    service = PlanTemplateService(db)
+    return service.create_training(current_user.id, data)
+
+
+@router.post("/training/from-plan", response_model=TrainingTemplateResponse, status_code=status.HTTP_201_CREATED)
+def create_training_template_from_plan(
+    request: TemplateFromPlanRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """ذخیره برنامه تمرینی یک شاگرد به‌عنوان قالب"""
+    service = PlanTemplateService(db)
+    template = service.training_from_plan(request.plan_id, current_user.id, request.name)
+    
+    if not template:
+        raise HTTPException(status_code=404, detail="برنامه یافت نشد")
+    
+    return template
+
+
+@router.get("/training/{template_id}", response_model=TrainingTemplateResponse)
+def get_training_template(
+    template_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """دریافت قالب تمرینی با روزها و حرکات"""
+    service = PlanTemplateService(db)
+    template = service.get_training(template_id, current_user.id)
+    
+    if not template:
+        raise HTTPException(status_code=404, detail="قالب یافت نشد")
+    
+    return template
+
+
+@router.delete("/training/{template_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_training_template(
+    template_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """حذف قالب تمرینی (برنامه‌های ساخته‌شده از آن حذف نمی‌شوند)"""
+    service = PlanTemplateService(db)
+    
+    if not service.delete_training(template_id, current_user.id):
+        raise HTTPException(status_code=404, detail="قالب یافت نشد")
+
+
+@router.post("/training/{template_id}/assign", response_model=TemplateAssignResponse, status_code=status.HTTP_201_CREATED)
+def assign_training_template(
+    template_id: int,
+    request: TemplateAssignRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    ساخت برنامه تمرینی از روی قالب برای چند شاگرد
+    
+    مثال: {"athlete_ids": [1, 2, 3]} برای هر شاگرد یک کپی مستقل از قالب
+    می‌سازد و (به‌طور پیش‌فرض) آن را برنامه فعال شاگرد می‌کند.
+    """
+    service = PlanTemplateService(db)
+    try:
+        plans = service.assign_training(
+            template_id, current_user.id, request.athlete_ids, request.name, request.activate
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if plans is None:
+        raise HTTPException(status_code=404, detail="قالب یافت نشد")
+    
+    return {"template_id": template_id, "created": len(plans), "plans": plans}
+
+
+# ===== Diet Templates =====
+
+@router.get("/diet", response_model=List[PlanTemplateSummary])
+def list_diet_templates(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """لیست قالب‌های غذایی مربی"""
+    service = PlanTemplateService(db)
+    return service.list_diet(current_user.id)
+
+
+@router.post("/diet", response_model=DietTemplateResponse, status_code=status.HTTP_201_CREATED)
+def create_diet_template(
+    data: DietTemplateCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """ایجاد قالب غذایی"""
+    service = PlanTemplateService(db)
+    try:
+        return service.create_diet(current_user.id, data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/diet/from-plan", response_model=DietTemplateResponse, status_code=status.HTTP_201_CREATED)
+def create_diet_template_from_plan(
+    request: TemplateFromPlanRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """ذخیره برنامه غذایی یک شاگرد به‌عنوان قالب"""
+    service = PlanTemplateService(db)
+    template = service.diet_from_plan(request.plan_id, current_user.id, request.name)
+    
+    if not template:
+        raise HTTPException(status_code=404, detail="برنامه یافت نشد")
+    
+    return template
+
+
+@router.get("/diet/{template_id}", response_model=DietTemplateResponse)
+def get_diet_template(
+    template_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """دریافت قالب غذایی با آیتم‌ها"""
+    service = PlanTemplateService(db)
+    template = service.get_diet(template_id, current_user.id)
+    
+    if not template:
+        raise HTTPException(status_code=404, detail="قالب یافت نشد")
+    
+    return template
+
+
+@router.delete("/diet/{template_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_diet_template(
+    template_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """حذف قالب غذایی (برنامه‌های ساخته‌شده از آن حذف نمی‌شوند)"""
+    service = PlanTemplateService(db)
+    
+    if not service.delete_diet(template_id, current_user.id):
+        raise HTTPException(status_code=404, detail="قالب یافت نشد")
+
+
+@router.post("/diet/{template_id}/assign", response_model=TemplateAssignResponse, status_code=status.HTTP_201_CREATED)
+def assign_diet_template(
+    template_id: int,
+    request: TemplateAssignRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """ساخت برنامه غذایی از روی قالب برای چند شاگرد"""
+    service = PlanTemplateService(db)
+    try:
+        plans = service.assign_diet(
+            template_id, current_user.id, request.athlete_ids, request.name, request.activate
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if plans is None:
+        raise HTTPException(status_code=404, detail="قالب یافت نشد")
+    
+    return {"template_id": template_id, "created": len(plans), "plans": plans}
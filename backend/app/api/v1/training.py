@@ -8,14 +8,21 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import (
+    get_db, get_read_db, get_current_user, check_athlete_access, check_plan_access
+)
 from app.services.training_service import TrainingService
-from app.services.athlete_service import AthleteService
+from app.services.training_generation_service import TrainingGenerationService
+from app.services.progression_service import ProgressionService
 from app.schemas.training import (
-    TrainingPlanCreate, TrainingPlanUpdate, TrainingPlanResponse,
+    TrainingPlanCreate, TrainingPlanUpdate, TrainingPlanResponse, TrainingPlanDocument,
     TrainingDayCreate, TrainingDayResponse,
-    WorkoutItemCreate, WorkoutItemResponse
+    WorkoutItemCreate, WorkoutItemResponse,
+    TrainingGenerateRequest, TrainingGenerateResponse,
+    TrainingProgressionRequest, TrainingProgressionResponse
 )
+from app.models.athlete import Athlete
+from app.models.training import TrainingPlan
 from app.models.user import User
 
 router = APIRouter()
@@ -27,17 +34,13 @@ router = APIRouter()
 def get_athlete_training_plans(
     athlete_id: int,
     active_only: bool = False,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     دریافت برنامه‌های تمرینی یک شاگرد
     """
-    # بررسی دسترسی
-    athlete_service = AthleteService(db)
-    athlete = athlete_service.get_by_id(athlete_id, current_user.id)
-    if not athlete:
-        raise HTTPException(status_code=404, detail="شاگرد یافت نشد")
+    check_athlete_access(db, athlete_id, current_user.id)
     
     service = TrainingService(db)
     return service.get_plans_by_athlete(athlete_id, active_only)
@@ -46,16 +49,13 @@ def get_athlete_training_plans(
 @router.get("/athlete/{athlete_id}/active", response_model=TrainingPlanResponse)
 def get_active_training_plan(
     athlete_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     دریافت برنامه فعال شاگرد
     """
-    athlete_service = AthleteService(db)
-    athlete = athlete_service.get_by_id(athlete_id, current_user.id)
-    if not athlete:
-        raise HTTPException(status_code=404, detail="شاگرد یافت نشد")
+    check_athlete_access(db, athlete_id, current_user.id)
     
     service = TrainingService(db)
     plan = service.get_active_plan(athlete_id)
@@ -75,36 +75,59 @@ def create_training_plan(
     """
     ایجاد برنامه تمرینی جدید
     """
-    athlete_service = AthleteService(db)
-    athlete = athlete_service.get_by_id(plan_data.athlete_id, current_user.id)
-    if not athlete:
-        raise HTTPException(status_code=404, detail="شاگرد یافت نشد")
+    check_athlete_access(db, plan_data.athlete_id, current_user.id)
     
     service = TrainingService(db)
     return service.create_plan(plan_data)
 
 
+@router.post("/generate", response_model=TrainingGenerateResponse)
+def generate_training_plan(
+    request: TrainingGenerateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    تولید خودکار برنامه تمرینی از بانک تمرینات
+
+    تقسیم‌بندی و حجم بر اساس سطح و هدف شاگرد؛ حرکات پرخطر و حرکات ممنوعه
+    آسیب‌های درمان‌نشده حذف می‌شوند. با save=false فقط پیش‌نمایش
+    برگردانده می‌شود.
+    """
+    check_athlete_access(db, request.athlete_id, current_user.id)
+    athlete = db.get(Athlete, request.athlete_id)
+    
+    service = TrainingGenerationService(db)
+    generated = service.generate(
+        athlete,
+        experience_level=request.experience_level.value if request.experience_level else None,
+        goal=request.goal.value if request.goal else None,
+        available_days=request.available_days,
+        split_type=request.split_type,
+        seed=request.seed,
+    )
+    
+    plan = service.create_plan(athlete.id, generated, request.name) if request.save else None
+    return TrainingGenerateResponse(athlete_id=athlete.id, plan=plan, **generated)
+
+
 @router.get("/{plan_id}", response_model=TrainingPlanResponse)
 def get_training_plan(
     plan_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     دریافت جزئیات برنامه تمرینی
     """
+    check_plan_access(db, TrainingPlan, plan_id, current_user.id)
+    
     service = TrainingService(db)
     plan = service.get_plan(plan_id)
     
     if not plan:
         raise HTTPException(status_code=404, detail="برنامه یافت نشد")
     
-    # بررسی دسترسی
-    athlete_service = AthleteService(db)
-    athlete = athlete_service.get_by_id(plan.athlete_id, current_user.id)
-    if not athlete:
-        raise HTTPException(status_code=403, detail="دسترسی ندارید")
-    
     return plan
 
 
@@ -118,6 +141,8 @@ def update_training_plan(
     """
     ویرایش برنامه تمرینی
     """
+    check_plan_access(db, TrainingPlan, plan_id, current_user.id)
+    
     service = TrainingService(db)
     plan = service.update_plan(plan_id, plan_data)
     
@@ -136,6 +161,8 @@ def delete_training_plan(
     """
     حذف برنامه تمرینی
     """
+    check_plan_access(db, TrainingPlan, plan_id, current_user.id)
+    
     service = TrainingService(db)
     
     if not service.delete_plan(plan_id):
@@ -151,6 +178,8 @@ def activate_training_plan(
     """
     فعال کردن برنامه تمرینی
     """
+    check_plan_access(db, TrainingPlan, plan_id, current_user.id)
+    
     service = TrainingService(db)
     plan = service.activate_plan(plan_id)
     
@@ -160,6 +189,99 @@ def activate_training_plan(
     return plan
 
 
+@router.put("/{plan_id}/full", response_model=TrainingPlanResponse)
+def save_training_plan_document(
+    plan_id: int,
+    document: TrainingPlanDocument,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    ذخیره کامل برنامه تمرینی (روزها و حرکات) در یک درخواست
+    
+    روزها و حرکات بدون id ایجاد، با id ویرایش و موارد غایب از سند حذف
+    می‌شوند؛ همه تغییرات در یک تراکنش.
+    """
+    check_plan_access(db, TrainingPlan, plan_id, current_user.id)
+    
+    service = TrainingService(db)
+    try:
+        plan = service.save_plan_document(plan_id, document, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if not plan:
+        raise HTTPException(status_code=404, detail="برنامه یافت نشد")
+    
+    return plan
+
+
+# ===== Progression =====
+
+@router.post("/{plan_id}/progression", response_model=TrainingProgressionResponse)
+def generate_training_progression(
+    plan_id: int,
+    request: TrainingProgressionRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    تولید جدول پیشرفت کل برنامه (هفته × حرکت)
+    
+    مثال: {"scheme": "dup", "weeks": 8, "exercise_one_rms": {"12": 100}}
+    جدول قبلی برنامه جایگزین می‌شود.
+    """
+    check_plan_access(db, TrainingPlan, plan_id, current_user.id)
+    
+    service = ProgressionService(db)
+    try:
+        progression = service.generate(plan_id, request)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if not progression:
+        raise HTTPException(status_code=404, detail="برنامه یافت نشد")
+    
+    return progression
+
+
+@router.get("/{plan_id}/progression", response_model=TrainingProgressionResponse)
+def get_training_progression(
+    plan_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    دریافت جدول پیشرفت ذخیره‌شده برنامه (برای نمایش و چاپ)
+    """
+    check_plan_access(db, TrainingPlan, plan_id, current_user.id)
+    
+    service = ProgressionService(db)
+    progression = service.get(plan_id)
+    
+    if not progression:
+        raise HTTPException(status_code=404, detail="جدول پیشرفت یافت نشد")
+    
+    return progression
+
+
+@router.delete("/{plan_id}/progression", status_code=status.HTTP_204_NO_CONTENT)
+def delete_training_progression(
+    plan_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    حذف جدول پیشرفت برنامه
+    """
+    check_plan_access(db, TrainingPlan, plan_id, current_user.id)
+    
+    service = ProgressionService(db)
+    
+    if not service.delete(plan_id):
+        raise HTTPException(status_code=404, detail="جدول پیشرفت یافت نشد")
+
+
 # ===== Training Days =====
 
 @router.post("/{plan_id}/days", response_model=TrainingDayResponse, status_code=status.HTTP_201_CREATED)
@@ -172,6 +294,8 @@ def add_training_day(
     """
     افزودن روز به برنامه
     """
+    check_plan_access(db, TrainingPlan, plan_id, current_user.id)
+    
     service = TrainingService(db)
     day = service.add_day(plan_id, day_data)
     
@@ -192,7 +316,7 @@ def delete_training_day(
     """
     service = TrainingService(db)
     
-    if not service.delete_day(day_id):
+    if not service.delete_day(day_id, current_user.id):
         raise HTTPException(status_code=404, detail="روز یافت نشد")
 
 
@@ -209,7 +333,7 @@ def add_workout_item(
     افزودن حرکت به روز تمرینی
     """
     service = TrainingService(db)
-    item = service.add_workout_item(day_id, item_data)
+    item = service.add_workout_item(day_id, item_data, current_user.id)
     
     if not item:
         raise HTTPException(status_code=404, detail="روز یافت نشد")
@@ -228,7 +352,7 @@ def delete_workout_item(
     """
     service = TrainingService(db)
     
-    if not service.delete_workout_item(item_id):
+    if not service.delete_workout_item(item_id, current_user.id):
         raise HTTPException(status_code=404, detail="حرکت یافت نشد")
 
 
@@ -244,7 +368,7 @@ def reorder_workout_items(
     """
     service = TrainingService(db)
     
-    if not service.reorder_items(day_id, item_ids):
+    if not service.reorder_items(day_id, item_ids, current_user.id):
         raise HTTPException(status_code=404, detail="روز یافت نشد")
     
     return {"message": "ترتیب بروزرسانی شد"}
@@ -7,7 +7,7 @@ User Routes
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_main_db, get_read_db, get_current_user
 from app.services.user_service import UserService
 from app.schemas.user import UserUpdate, UserResponse
 from app.models.user import User
@@ -28,7 +28,7 @@ def get_my_profile(
 @router.put("/me", response_model=UserResponse)
 def update_my_profile(
     user_data: UserUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_main_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -48,7 +48,7 @@ def update_my_profile(
 
 @router.get("/stats")
 def get_my_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -24,7 +24,55 @@ class Settings(BaseSettings):
     # تنظیمات دیتابیس
     DATABASE_URL: str = "sqlite:///./flexpro.db"
     DATABASE_ECHO: bool = False  # نمایش SQL queries در لاگ
-    
+
+    # مسیریابی خواندن/نوشتن
+    # با فعال بودن، endpoint های GET از engine خواندنی استفاده می‌کنند
+    DATABASE_READ_ROUTING: bool = False
+    # آدرس replica برای خواندن (اگر خالی باشد، برای SQLite اتصال read-only ساخته می‌شود)
+    DATABASE_READ_URL: Optional[str] = None
+
+    # تنظیمات connection pool (پروفایل PostgreSQL)
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_RECYCLE: int = 1800  # ثانیه - جلوگیری از اتصال‌های کهنه
+    DATABASE_POOL_TIMEOUT: int = 30  # ثانیه انتظار برای گرفتن اتصال از pool
+    # حداکثر زمان اجرای هر کوئری در سرور (میلی‌ثانیه، 0 = بدون محدودیت)
+    DATABASE_STATEMENT_TIMEOUT_MS: int = 30000
+    # prepared statement سمت سرور بعد از این تعداد اجرا (فقط psycopg 3، None = غیرفعال)
+    DATABASE_PREPARE_THRESHOLD: Optional[int] = 5
+
+    # Sharding (فقط SQLite): هر مربی یا bucket ای از مربی‌ها فایل جداگانه
+    SHARDING_ENABLED: bool = False
+    SHARD_DIR: str = "shards"
+    SHARD_BUCKETS: int = 0  # 0 = هر مربی یک فایل، N = تقسیم مربی‌ها بین N فایل
+
+    # صف نوشتن دسته‌ای (دریافت داده از ترازو/دستگاه‌های پوشیدنی)
+    INGEST_FLUSH_INTERVAL_MS: int = 250  # حداکثر زمان ماندن داده در صف قبل از commit
+    INGEST_MAX_BATCH_ROWS: int = 2000  # با رسیدن به این تعداد ردیف، فوراً flush می‌شود
+    INGEST_MAX_PENDING_ROWS: int = 20000  # سقف ردیف‌های در صف (backpressure)
+    INGEST_ENQUEUE_TIMEOUT: float = 2.0  # ثانیه انتظار برای جا باز شدن در صف
+    INGEST_ACK_TIMEOUT: float = 10.0  # ثانیه انتظار برای تأیید commit
+
+    # تولید دسته‌ای برنامه غذایی برای کل شاگردان
+    DIET_GENERATION_WORKERS: int = 0  # تعداد پردازه‌ها (0 = تعداد هسته‌ها)
+    DIET_GENERATION_CHUNK_SIZE: int = 25  # شاگردان هر دسته (یک تراکنش به ازای هر دسته)
+
+    # فشرده‌سازی پاسخ‌ها (br در صورت نصب بودن brotli، در غیر این صورت gzip)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # بایت؛ پاسخ‌های کوچک‌تر فشرده نمی‌شوند
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # ۰ تا ۱۱؛ مقادیر پایین برای پاسخ‌های پویا مناسب‌ترند
+
+    # snapshot کاتالوگ (بانک غذا و تمرین)؛ no-cache = همیشه اعتبارسنجی با ETag
+    CATALOG_CACHE_CONTROL: str = "public, no-cache"
+
+    # کش نگاشت شاگرد -> مربی برای بررسی دسترسی (تعداد ورودی، 0 = غیرفعال)
+    # فقط در استقرار تک‌پردازه‌ای یا وقتی جدول athletes با AUTOINCREMENT ساخته شده
+    ACCESS_CACHE_SIZE: int = 0
+
+    # تاریخچه برنامه‌ها: هر چند نسخه یک snapshot کامل (بقیه فقط تفاوت)
+    PLAN_SNAPSHOT_INTERVAL: int = 20
+
     # تنظیمات امنیتی - JWT
     SECRET_KEY: str = "flex-pro-super-secret-key-change-in-production-2024"
     ALGORITHM: str = "HS256"
@@ -14,6 +14,11 @@ from app.core.security import (
 from app.core.calculator import NutritionCalculator
 from app.core.training_engine import TrainingEngine
 from app.core.diet_engine import DietEngine
+from app.core.diet_generator import DietGenerator
+from app.core.training_generator import TrainingGenerator
+from app.core.injury_restrictions import InjuryRestrictionMatcher
+from app.core.allergens import AllergenTagger
+from app.core.adaptive_tdee import AdaptiveTDEEEngine
 
 __all__ = [
     # Security
@@ -27,4 +32,9 @@ __all__ = [
     "NutritionCalculator",
     "TrainingEngine",
     "DietEngine",
+    "DietGenerator",
+    "TrainingGenerator",
+    "InjuryRestrictionMatcher",
+    "AllergenTagger",
+    "AdaptiveTDEEEngine",
 ]
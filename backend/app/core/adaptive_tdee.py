@@ -0,0 +1,117 @@
+"""
+Adaptive TDEE Engine
+====================
+تخمین تطبیقی کالری مصرفی روزانه از روند وزن
+
+به جای ضرایب ثابت فعالیت، TDEE از تعادل انرژی برآورد می‌شود:
+    TDEE ≈ کالری دریافتی − (تغییر وزن روند × 7700) / روزها
+
+وزن روزانه نوسان آب و غذا دارد، پس از روند وزن (میانگین متحرک نمایی)
+استفاده می‌شود. هر اندازه‌گیری جدید وضعیت را به صورت افزایشی بروز می‌کند
+و نیازی به برازش دوباره کل تاریخچه نیست.
+"""
+
+from dataclasses import dataclass, replace
+from datetime import date
+from typing import Optional
+
+
+@dataclass
+class EnergyState:
+    """وضعیت تخمین‌گر یک شاگرد"""
+    last_date: date
+    weight_trend: float  # وزن روند (kg)
+    tdee: float  # تخمین فعلی TDEE (kcal)
+    observations: int = 0  # تعداد بروزرسانی‌های TDEE با کالری دریافتی معلوم
+    weekly_change: Optional[float] = None  # تغییر هفتگی وزن روند در آخرین بروزرسانی (kg)
+
+
+class AdaptiveTDEEEngine:
+    """
+    موتور TDEE تطبیقی
+    =================
+    بروزرسانی آنلاین وضعیت با هر وزن جدید
+    """
+    
+    # کالری معادل یک کیلوگرم تغییر وزن بدن
+    KCAL_PER_KG = 7700
+    
+    # ضریب هموارسازی روزانه وزن روند (مثل Hacker's Diet)
+    WEIGHT_ALPHA = 0.1
+    
+    # سرعت تطبیق روزانه TDEE با مشاهدات جدید
+    TDEE_ALPHA = 0.05
+    
+    # محدوده مجاز مشاهده TDEE (جلوگیری از پرش با نوسان آب)
+    MIN_TDEE = 1000
+    MAX_TDEE = 6000
+    
+    # فاصله بیشتر از این بین دو وزن: روند از نو شروع می‌شود
+    MAX_GAP_DAYS = 28
+    
+    # حداقل مشاهدات برای قابل اعتماد بودن تخمین
+    MIN_OBSERVATIONS = 3
+    
+    def start(self, day: date, weight: float, prior_tdee: float) -> EnergyState:
+        """
+        شروع وضعیت با اولین وزن
+        
+        Args:
+            day: تاریخ وزن
+            weight: وزن (kg)
+            prior_tdee: تخمین اولیه (فرمول با ضریب فعالیت)
+        """
+        return EnergyState(last_date=day, weight_trend=weight, tdee=float(prior_tdee))
+    
+    def update(
+        self,
+        state: EnergyState,
+        day: date,
+        weight: float,
+        intake: Optional[float]
+    ) -> EnergyState:
+        """
+        بروزرسانی وضعیت با یک وزن جدید
+        
+        Args:
+            state: وضعیت فعلی
+            day: تاریخ وزن (وزن‌های قدیمی‌تر از last_date نادیده گرفته می‌شوند)
+            weight: وزن (kg)
+            intake: میانگین کالری دریافتی روزانه در این فاصله (None = نامعلوم)
+            
+        Returns:
+            وضعیت جدید
+        """
+        days = (day - state.last_date).days
+        if days <= 0:
+            return state
+        
+        if days > self.MAX_GAP_DAYS:
+            # فاصله طولانی: روند معتبر نیست
+            return replace(state, last_date=day, weight_trend=weight, weekly_change=None)
+        
+        # ضریب هموارسازی متناسب با فاصله زمانی
+        weight_alpha = 1 - (1 - self.WEIGHT_ALPHA) ** days
+        trend = state.weight_trend + weight_alpha * (weight - state.weight_trend)
+        weekly_change = round((trend - state.weight_trend) / days * 7, 3)
+        
+        if intake is None:
+            return replace(state, last_date=day, weight_trend=trend, weekly_change=weekly_change)
+        
+        observed = intake - (trend - state.weight_trend) * self.KCAL_PER_KG / days
+        observed = min(max(observed, self.MIN_TDEE), self.MAX_TDEE)
+        
+        tdee_alpha = 1 - (1 - self.TDEE_ALPHA) ** days
+        tdee = state.tdee + tdee_alpha * (observed - state.tdee)
+        
+        return EnergyState(
+            last_date=day,
+            weight_trend=trend,
+            tdee=tdee,
+            observations=state.observations + 1,
+            weekly_change=weekly_change,
+        )
+
+
+# نمونه سینگلتون
+adaptive_tdee_engine = AdaptiveTDEEEngine()
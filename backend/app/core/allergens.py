@@ -0,0 +1,192 @@
+"""
+Allergens
+=========
+برچسب‌گذاری حساسیت‌زاهای غذا به صورت bitmask
+
+هر غذا یک بار (هنگام نوشتن) بر اساس نام فارسی، نام انگلیسی و دسته‌اش
+برچسب می‌خورد و ماسک در ستون foods.allergen_mask ذخیره می‌شود. متن آزاد
+حساسیت شاگرد هم به یک ماسک تبدیل می‌شود؛ فیلتر یک AND بیتی است:
+
+    allowed = (food.allergen_mask & athlete_mask) == 0
+
+عبارت‌هایی از متن حساسیت که به هیچ حساسیت‌زای شناخته‌شده‌ای نگاشت نشوند
+(مثلاً «قارچ») همچنان با نام غذا تطبیق داده می‌شوند.
+"""
+
+import re
+from enum import IntFlag
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from app.core.text import normalize_text, tokenize
+
+
+class Allergen(IntFlag):
+    """حساسیت‌زاهای اصلی (هر کدام یک بیت)"""
+    DAIRY = 1 << 0        # لبنیات
+    EGG = 1 << 1          # تخم مرغ
+    GLUTEN = 1 << 2       # گندم و غلات گلوتن‌دار
+    PEANUT = 1 << 3       # بادام زمینی
+    TREE_NUT = 1 << 4     # مغزها
+    SOY = 1 << 5          # سویا
+    FISH = 1 << 6         # ماهی
+    SHELLFISH = 1 << 7    # سخت‌پوستان و نرم‌تنان
+    SESAME = 1 << 8       # کنجد
+
+
+# عبارت‌هایی که در نام غذا وجود حساسیت‌زا را نشان می‌دهند؛ تطبیق توکنی است
+# (همه توکن‌های عبارت باید در نام باشند)، پس «شیر» با «شیرین» و «شیره» یکی نیست
+FOOD_KEYWORDS: Dict[Allergen, List[str]] = {
+    Allergen.DAIRY: [
+        "شیر", "شیری", "ماست", "پنیر", "دوغ", "کشک", "خامه", "خامه‌ای", "کفیر",
+        "بستنی", "لاته", "کاپوچینو", "وی", "کازئین", "کره", "چیزبرگر", "پیتزا",
+        "نوتلا", "milk", "yogurt", "cheese", "whey", "casein", "cream", "butter",
+        "kefir", "latte", "cappuccino",
+    ],
+    Allergen.EGG: [
+        "تخم مرغ", "تخم بلدرچین", "سفیده", "زرده", "مایونز", "دونات", "کیک",
+        "egg", "mayonnaise",
+    ],
+    Allergen.GLUTEN: [
+        "گندم", "نان", "ماکارونی", "بلغور", "جو", "کراکر", "مافین", "کورن فلکس",
+        "پیتزا", "همبرگر", "چیزبرگر", "هات داگ", "ساندویچ", "دونات", "کروسان",
+        "کیک", "شاورما", "سوخاری", "ناگت", "سس سویا",
+        "wheat", "bread", "pasta", "barley", "oat", "oats", "bulgur", "flour",
+    ],
+    Allergen.PEANUT: ["بادام زمینی", "peanut"],
+    Allergen.TREE_NUT: [
+        "بادام", "گردو", "پسته", "فندق", "بادام هندی", "آجیل", "نوتلا",
+        "almond", "walnut", "pistachio", "hazelnut", "cashew", "pecan",
+    ],
+    Allergen.SOY: ["سویا", "توفو", "soy", "tofu", "edamame"],
+    Allergen.FISH: [
+        "ماهی", "سالمون", "تن", "ساردین", "قزل آلا", "کاد", "تیلاپیا", "هالیبوت",
+        "fish", "salmon", "tuna", "sardine", "cod", "trout", "tilapia", "halibut",
+    ],
+    Allergen.SHELLFISH: [
+        "میگو", "خرچنگ", "صدف", "اسکویید", "لابستر", "ماهی مرکب",
+        "shrimp", "crab", "lobster", "squid", "oyster", "mussel", "clam",
+    ],
+    Allergen.SESAME: ["کنجد", "ارده", "تاهینی", "حمص", "sesame", "tahini", "hummus"],
+}
+
+# عبارت‌هایی که برچسب را لغو می‌کنند (شیرهای گیاهی، کره بادام زمینی)
+FOOD_EXCLUSIONS: Dict[Allergen, List[str]] = {
+    Allergen.DAIRY: [
+        "شیر بادام", "شیر سویا", "شیر نارگیل", "شیر جو", "کره بادام", "کره گیاهی",
+        "almond milk", "soy milk", "coconut milk", "oat milk", "peanut butter",
+    ],
+    Allergen.TREE_NUT: ["بادام زمینی", "peanut"],
+}
+
+# دسته‌هایی که همه غذاهایشان (به جز استثناها) حساسیت‌زا هستند
+CATEGORY_ALLERGENS: Dict[str, Allergen] = {
+    "لبنیات": Allergen.DAIRY,
+    "dairy": Allergen.DAIRY,
+}
+
+# عبارت‌های متن حساسیت شاگرد -> حساسیت‌زا (مقایسه بعد از حذف فاصله)
+ALLERGY_TERMS: Dict[str, Allergen] = {
+    **{term: Allergen.DAIRY for term in [
+        "لبنیات", "لاکتوز", "شیر", "پنیر", "ماست", "کازئین", "پروتئین شیر",
+        "dairy", "lactose", "milk", "casein", "whey",
+    ]},
+    **{term: Allergen.EGG for term in ["تخم مرغ", "تخم‌مرغ", "egg", "eggs"]},
+    **{term: Allergen.GLUTEN for term in [
+        "گلوتن", "گندم", "سلیاک", "gluten", "wheat", "celiac", "coeliac",
+    ]},
+    **{term: Allergen.PEANUT for term in ["بادام زمینی", "peanut", "peanuts"]},
+    **{term: Allergen.TREE_NUT for term in [
+        "آجیل", "مغزها", "بادام", "گردو", "پسته", "فندق", "بادام هندی",
+        "nuts", "tree nut", "tree nuts", "almond", "walnut", "hazelnut", "cashew", "pistachio",
+    ]},
+    **{term: Allergen.SOY for term in ["سویا", "soy", "soya"]},
+    **{term: Allergen.FISH for term in ["ماهی", "fish"]},
+    **{term: Allergen.SHELLFISH for term in [
+        "میگو", "خرچنگ", "صدف", "سخت پوستان", "سخت‌پوستان", "غذای دریایی",
+        "shellfish", "shrimp", "crab", "seafood",
+    ]},
+    **{term: Allergen.SESAME for term in ["کنجد", "ارده", "sesame", "tahini"]},
+}
+
+
+def parse_allergies(allergies: Optional[str]) -> List[str]:
+    """تبدیل متن حساسیت‌های شاگرد به لیست کلیدواژه"""
+    if not allergies:
+        return []
+    tokens = re.split(r"[,،;؛\n]+", allergies.lower())
+    return [token.strip() for token in tokens if token.strip()]
+
+
+def _compact(text: Optional[str]) -> str:
+    return normalize_text(text).replace(" ", "")
+
+
+class AllergenTagger:
+    """
+    برچسب‌گذار حساسیت‌زا
+    ====================
+    عبارت‌ها یک بار به مجموعه توکن کامپایل می‌شوند
+    """
+
+    def __init__(self):
+        self._keywords = self._compile(FOOD_KEYWORDS)
+        self._exclusions = self._compile(FOOD_EXCLUSIONS)
+        self._categories = {_compact(name): allergen for name, allergen in CATEGORY_ALLERGENS.items()}
+        self._terms = {_compact(term): allergen for term, allergen in ALLERGY_TERMS.items()}
+
+    @staticmethod
+    def _compile(rules: Dict[Allergen, List[str]]) -> List[Tuple[Allergen, List[FrozenSet[str]]]]:
+        return [(allergen, [tokenize(phrase) for phrase in phrases]) for allergen, phrases in rules.items()]
+
+    def tag(
+        self,
+        name: Optional[str],
+        name_en: Optional[str] = None,
+        category: Optional[str] = None,
+        category_en: Optional[str] = None,
+    ) -> int:
+        """ماسک حساسیت‌زای یک غذا"""
+        tokens = tokenize(name) | tokenize(name_en)
+        mask = 0
+        for allergen, phrases in self._keywords:
+            if any(phrase <= tokens for phrase in phrases):
+                mask |= allergen
+        for label in (category, category_en):
+            mask |= self._categories.get(_compact(label), 0)
+        for allergen, phrases in self._exclusions:
+            if mask & allergen and any(phrase <= tokens for phrase in phrases):
+                mask &= ~allergen
+        return int(mask)
+
+    def resolve(self, allergies: Iterable[str]) -> Tuple[int, List[str]]:
+        """
+        تبدیل عبارت‌های حساسیت شاگرد به ماسک
+
+        Returns:
+            (ماسک، عبارت‌های ناشناخته برای تطبیق با نام غذا)
+        """
+        mask = 0
+        unknown = []
+        for term in allergies:
+            allergen = self._terms.get(_compact(term))
+            if allergen:
+                mask |= allergen
+            elif normalize_text(term):
+                unknown.append(normalize_text(term))
+        return int(mask), unknown
+
+    def labels(self, mask: Optional[int]) -> List[str]:
+        """کد حساسیت‌زاهای یک ماسک (مثلاً ["dairy", "gluten"])"""
+        if not mask:
+            return []
+        return [allergen.name.lower() for allergen in Allergen if mask & allergen]
+
+    @lru_cache(maxsize=1024)
+    def tag_name(self, name: str) -> int:
+        """ماسک یک نام تنها (پیشنهادهای ثابت موتور تغذیه)"""
+        return self.tag(name)
+
+
+# نمونه سینگلتون
+allergen_tagger = AllergenTagger()
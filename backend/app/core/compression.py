@@ -0,0 +1,202 @@
+"""
+Compression
+===========
+فشرده‌سازی پاسخ‌های HTTP (middleware سطح ASGI)
+
+- br (در صورت نصب بودن brotli) یا gzip بر اساس Accept-Encoding
+- پاسخ‌های کوچک‌تر از minimum_size بدون تغییر ارسال می‌شوند
+- پاسخ‌هایی که خودشان Content-Encoding دارند (مثل snapshot کاتالوگ) یا نوعشان
+  از قبل فشرده است (تصویر، PDF) دست نمی‌خورند
+- پاسخ‌های streaming (مثل NDJSON پیشرفت تولید برنامه) تکه به تکه فشرده و
+  flush می‌شوند تا رویدادها بدون تأخیر برسند
+"""
+
+import gzip
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # اختیاری
+    brotli = None
+
+
+HAS_BROTLI = brotli is not None
+
+# نوع‌هایی که فشرده‌سازی دوباره سودی ندارد
+INCOMPRESSIBLE_MEDIA_TYPES = (
+    "image/", "video/", "audio/", "application/pdf", "application/zip",
+    "application/gzip", "text/event-stream",
+)
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> Dict[str, float]:
+    """فشرده‌سازی‌های پذیرفته‌شده در Accept-Encoding با وزن q"""
+    accepted: Dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    return accepted
+
+
+def choose_encoding(accept_encoding: Optional[str], available: Tuple[str, ...]) -> Optional[str]:
+    """اولین فشرده‌سازی در available (به ترتیب اولویت) که کلاینت پذیرفته است"""
+    accepted = accepted_encodings(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    for encoding in available:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    """فشرده‌سازی یکجای یک بدنه"""
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class _StreamCompressor:
+    """فشرده‌ساز تکه‌ای (هر تکه flush می‌شود)"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """
+    middleware فشرده‌سازی پاسخ
+    ==========================
+    Args:
+        minimum_size: حداقل اندازه بدنه (بایت) برای فشرده‌سازی
+        gzip_level: سطح gzip (۱ تا ۹)
+        brotli_quality: کیفیت brotli (۰ تا ۱۱)؛ مقادیر پایین برای پاسخ‌های پویا
+        encodings: فشرده‌سازی‌های مجاز به ترتیب اولویت
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        encodings: Tuple[str, ...] = ("br", "gzip"),
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.encodings = tuple(e for e in encodings if e != "br" or HAS_BROTLI)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder)
+
+
+class _CompressionResponder:
+    """نگه داشتن شروع پاسخ تا تصمیم‌گیری بر اساس اولین تکه بدنه"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start: Optional[Message] = None
+        self.mode: Optional[str] = None  # "passthrough" | "stream"
+        self.compressor: Optional[_StreamCompressor] = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.mode == "passthrough":
+            await self.send(message)
+            return
+        if self.mode == "stream":
+            data = self.compressor.chunk(body) if body else b""
+            if not more_body:
+                data += self.compressor.finish()
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        headers = MutableHeaders(raw=self.start["headers"])
+        if not self._compressible(headers) or (not more_body and len(body) < self.middleware.minimum_size):
+            self.mode = "passthrough"
+            await self.send(self.start)
+            await self.send(message)
+            return
+
+        self._mark_encoded(headers)
+        if not more_body:
+            data = compress(
+                body, self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+            )
+            headers["Content-Length"] = str(len(data))
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": data})
+            return
+
+        self.mode = "stream"
+        self.compressor = _StreamCompressor(
+            self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+        )
+        del headers["Content-Length"]
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": self.compressor.chunk(body), "more_body": True})
+
+    @staticmethod
+    def _compressible(headers: MutableHeaders) -> bool:
+        if "content-encoding" in headers:
+            return False
+        media_type = headers.get("content-type", "")
+        return not media_type.startswith(INCOMPRESSIBLE_MEDIA_TYPES)
+
+    def _mark_encoded(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        # ETag قوی برای بایت‌های فشرده‌نشده بوده است
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
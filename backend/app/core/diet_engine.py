@@ -7,6 +7,8 @@ Diet Engine
 from typing import List, Dict, Optional
 from enum import Enum
 
+from app.core.allergens import allergen_tagger
+
 
 class MealType(str, Enum):
     BREAKFAST = "صبحانه"
@@ -187,26 +189,24 @@ class DietEngine:
         Returns:
             پیشنهادات غذایی
         """
-        suggestions = self.FOOD_TIMING_SUGGESTIONS.get(
+        suggestions = dict(self.FOOD_TIMING_SUGGESTIONS.get(
             meal_type,
             {
                 "protein_sources": ["سینه مرغ", "ماهی", "تخم مرغ"],
                 "carb_sources": ["برنج", "نان", "سیب‌زمینی"],
                 "tips": "",
             }
-        )
+        ))
         
-        # فیلتر کردن حساسیت‌ها
+        # فیلتر کردن حساسیت‌ها (AND بیتی؛ عبارت‌های ناشناخته با نام غذا مقایسه می‌شوند)
         if allergies:
-            allergies_lower = [a.lower() for a in allergies]
-            suggestions["protein_sources"] = [
-                f for f in suggestions["protein_sources"]
-                if not any(a in f.lower() for a in allergies_lower)
-            ]
-            suggestions["carb_sources"] = [
-                f for f in suggestions["carb_sources"]
-                if not any(a in f.lower() for a in allergies_lower)
-            ]
+            mask, unknown = allergen_tagger.resolve(allergies)
+            for key in ("protein_sources", "carb_sources"):
+                suggestions[key] = [
+                    f for f in suggestions[key]
+                    if not allergen_tagger.tag_name(f) & mask
+                    and not any(a in f.lower() for a in unknown)
+                ]
         
         return {
             "meal": meal_type.value,
@@ -0,0 +1,401 @@
+"""
+Diet Generator
+==============
+تولید خودکار برنامه غذایی از بانک غذاها
+
+کل بانک غذا یک بار به ماتریس NumPy تبدیل می‌شود (ماکرو به ازای یک واحد
+مقدار). برای هر وعده یک منبع پروتئین، یک منبع کربوهیدرات و یک منبع چربی
+انتخاب می‌شود:
+
+1. همه ترکیب‌های سه‌تایی ممکن به صورت برداری حل می‌شوند؛ مقدار هر غذا از
+   حداقل مربعات وزن‌دار (خطا بر حسب کالری) با ماتریس معکوس از پیش محاسبه‌شده
+2. مقادیر به بازه مجاز محدود و بهترین ترکیب با جریمه تکرار انتخاب می‌شود
+3. مقادیر به گام واحد گرد شده و با جستجوی مختصاتی روی همان گام‌ها اصلاح می‌شوند
+
+ماتریس و خروجی‌ها فقط آرایه و dict هستند تا در پردازه‌های جدا هم قابل
+استفاده باشند.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.allergens import allergen_tagger, parse_allergies
+from app.core.diet_engine import DietEngine, MealType, diet_engine
+
+
+# نقش غذا در وعده
+ROLE_NONE = 0
+ROLE_PROTEIN = 1
+ROLE_CARB = 2
+ROLE_FAT = 3
+ROLE_VEGETABLE = 4
+
+# کالری هر گرم ماکرو (وزن خطا بر حسب کالری)
+MACRO_KCAL = np.array([4.0, 4.0, 9.0])
+
+
+@dataclass
+class FoodMatrix:
+    """
+    بانک غذا به صورت ستونی
+
+    macros: ماکروی هر واحد مقدار (ستون‌ها: پروتئین، کربوهیدرات، چربی)
+    """
+    ids: np.ndarray
+    names: List[str]
+    units: List[str]
+    search_text: List[str]  # نام فارسی، انگلیسی و دسته (حروف کوچک) برای حساسیت‌های ناشناخته
+    allergens: np.ndarray  # allergen_mask هر غذا
+    calories: np.ndarray  # کالری هر واحد مقدار
+    macros: np.ndarray  # (n, 3)
+    roles: np.ndarray
+    step: np.ndarray  # گام گرد کردن مقدار
+    max_amount: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def allergy_mask(self, allergies: Iterable[str]) -> np.ndarray:
+        """
+        ماسک غذاهای مجاز (False برای غذاهای حاوی حساسیت)
+
+        حساسیت‌های شناخته‌شده یک AND بیتی روی کل ستون allergens هستند؛
+        فقط عبارت‌های ناشناخته با متن غذا مقایسه می‌شوند.
+        """
+        mask, unknown = allergen_tagger.resolve(a for a in allergies if a)
+        allowed = (self.allergens & mask) == 0
+        if unknown:
+            for i, text in enumerate(self.search_text):
+                if allowed[i] and any(a in text for a in unknown):
+                    allowed[i] = False
+        return allowed
+
+
+class DietGenerator:
+    """
+    تولیدکننده برنامه غذایی
+    =======================
+    انتخاب غذا و مقدار برای رسیدن به ماکروهای هر وعده
+    """
+
+    # دسته‌هایی که در تولید خودکار استفاده نمی‌شوند
+    EXCLUDED_CATEGORIES = {"Fast Food", "Sweeteners & Sauces", "Beverages"}
+    VEGETABLE_CATEGORY = "Vegetables"
+
+    # آستانه سهم کالری برای تعیین نقش غذا
+    PROTEIN_SHARE = 0.40
+    CARB_SHARE = 0.55
+    FAT_SHARE = 0.60
+
+    # سقف مقدار: چند برابر مقدار پایه (گرمی) یا چند واحد (عدد، قاشق و...)
+    MAX_GRAM_MULTIPLIER = 3.0
+    MAX_UNITS = 6.0
+
+    # سبزیجات ناهار و شام (گرم)
+    VEGETABLE_AMOUNT = 100
+    VEGETABLE_MEALS = {MealType.LUNCH, MealType.DINNER}
+
+    # جریمه‌ها بر حسب مربع خطای کالری
+    REPEAT_DAY_PENALTY = 2500.0  # همان غذا دوباره در همان روز
+    REPEAT_WEEK_PENALTY = 400.0  # به ازای هر بار استفاده در روزهای قبل
+    TIMING_BONUS = 300.0  # غذای پیشنهادی FOOD_TIMING_SUGGESTIONS برای این وعده
+    JITTER = 200.0  # نویز تصادفی برای تنوع بین شاگردان
+
+    # تعداد غذای کاندید از هر نقش در هر وعده (POOL_SIZE³ ترکیب)
+    POOL_SIZE = 16
+
+    # تعداد بهترین ترکیب‌ها که گرد و با جستجوی محلی اصلاح می‌شوند
+    TOP_CANDIDATES = 32
+    LOCAL_SEARCH_SWEEPS = 3
+
+    def __init__(self, engine: DietEngine = diet_engine):
+        self.engine = engine
+
+    # ===== Food Matrix =====
+
+    def build_matrix(self, foods: Sequence[dict]) -> FoodMatrix:
+        """
+        ساخت ماتریس از ردیف‌های غذا
+
+        Args:
+            foods: dict با کلیدهای id, name, name_en, category, category_en,
+                unit, base_amount, calories, protein, carbs, fat و allergen_mask
+                (در نبود ماسک از روی نام و دسته محاسبه می‌شود)
+        """
+        foods = [f for f in foods if f.get("category_en") not in self.EXCLUDED_CATEGORIES]
+        n = len(foods)
+        base = np.array([f["base_amount"] or 100 for f in foods], dtype=float).reshape(n)
+        calories = np.array([f["calories"] or 0 for f in foods], dtype=float).reshape(n) / base
+        macros = np.array(
+            [[f["protein"] or 0, f["carbs"] or 0, f["fat"] or 0] for f in foods], dtype=float
+        ).reshape(n, 3) / base[:, None]
+
+        # نقش بر اساس سهم کالری غالب
+        kcal = macros * MACRO_KCAL
+        total = kcal.sum(axis=1)
+        share = np.divide(kcal, total[:, None], out=np.zeros_like(kcal), where=total[:, None] > 0)
+        vegetable = np.array([f.get("category_en") == self.VEGETABLE_CATEGORY for f in foods], dtype=bool)
+        roles = np.full(n, ROLE_NONE, dtype=np.int8)
+        roles[share[:, 2] >= self.FAT_SHARE] = ROLE_FAT
+        roles[share[:, 1] >= self.CARB_SHARE] = ROLE_CARB
+        roles[share[:, 0] >= self.PROTEIN_SHARE] = ROLE_PROTEIN
+        roles[vegetable] = ROLE_VEGETABLE
+
+        gram = np.array([f["unit"] == "گرم" for f in foods], dtype=bool)
+        whole = np.array([f["unit"].startswith("عدد") for f in foods], dtype=bool)
+        step = np.where(gram, 5.0, np.where(whole, 1.0, 0.5))
+        max_amount = np.where(gram, base * self.MAX_GRAM_MULTIPLIER, self.MAX_UNITS)
+
+        return FoodMatrix(
+            ids=np.array([f["id"] for f in foods], dtype=np.int64),
+            names=[f["name"] for f in foods],
+            units=[f["unit"] for f in foods],
+            search_text=[
+                " ".join(filter(None, (f["name"], f.get("name_en"), f.get("category"), f.get("category_en")))).lower()
+                for f in foods
+            ],
+            allergens=np.array(
+                [
+                    f["allergen_mask"] if f.get("allergen_mask") is not None
+                    else allergen_tagger.tag(f["name"], f.get("name_en"), f.get("category"), f.get("category_en"))
+                    for f in foods
+                ],
+                dtype=np.int64,
+            ).reshape(n),
+            calories=calories,
+            macros=macros,
+            roles=roles,
+            step=step,
+            max_amount=max_amount,
+        )
+
+    # ===== Generation =====
+
+    def generate(
+        self,
+        matrix: FoodMatrix,
+        meal_targets: List[Dict],
+        days: int = 7,
+        allergies: Iterable[str] = (),
+        seed: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        تولید برنامه چند روزه
+
+        Args:
+            matrix: ماتریس بانک غذا
+            meal_targets: خروجی distribute_macros
+            days: تعداد روزها (هر روز با غذاهای متفاوت)
+            allergies: کلیدواژه‌های حساسیت غذایی
+            seed: بذر انتخاب تصادفی بین غذاهای هم‌امتیاز (برای تکرارپذیری)
+
+        Returns:
+            لیست روزها؛ هر روز شامل meals (آیتم‌ها و مجموع هر وعده) و totals
+        """
+        allowed = matrix.allergy_mask(allergies)
+        pools = {
+            role: np.flatnonzero((matrix.roles == role) & allowed)
+            for role in (ROLE_PROTEIN, ROLE_CARB, ROLE_FAT, ROLE_VEGETABLE)
+        }
+        timing = self._timing_bonus(matrix, meal_targets)
+        # تنوع بین شاگردان: نویز کوچک ثابت روی امتیاز غذاها
+        jitter = np.random.default_rng(seed).uniform(0, self.JITTER, len(matrix))
+
+        week_usage = np.zeros(len(matrix))
+        plan = []
+        for day in range(days):
+            day_usage = np.zeros(len(matrix))
+            meals = []
+            for target in meal_targets:
+                penalty = (
+                    self.REPEAT_DAY_PENALTY * day_usage
+                    + self.REPEAT_WEEK_PENALTY * week_usage
+                    - timing[target["meal"]]
+                    + jitter
+                )
+                items = self._solve_meal(matrix, pools, target, penalty)
+                for index, _ in items:
+                    day_usage[index] += 1
+                meals.append(self._meal_result(matrix, target, items))
+            week_usage += day_usage
+            plan.append({
+                "day": day + 1,
+                "meals": meals,
+                "totals": self._sum_totals(meal["totals"] for meal in meals),
+            })
+        return plan
+
+    def _triples(
+        self,
+        matrix: FoodMatrix,
+        pools: Dict[int, np.ndarray],
+        penalty: np.ndarray,
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        ترکیب‌های (پروتئین، کربوهیدرات، چربی) با ماتریس حل معادلات نرمال
+
+        از هر نقش فقط POOL_SIZE غذای کم‌جریمه‌تر وارد می‌شوند.
+        حل وزن‌دار: min ||W (A x - t)||² با W = کالری هر گرم ماکرو
+        """
+        candidates = []
+        for role in (ROLE_PROTEIN, ROLE_CARB, ROLE_FAT):
+            pool = pools[role]
+            if not len(pool):
+                return None
+            if len(pool) > self.POOL_SIZE:
+                pool = pool[np.argpartition(penalty[pool], self.POOL_SIZE - 1)[:self.POOL_SIZE]]
+            candidates.append(pool)
+
+        index = np.stack(np.meshgrid(*candidates, indexing="ij"), axis=-1).reshape(-1, 3)
+        # چیدمان ستونی (ماکرو، غذا، ترکیب) تا همه عملیات روی بردارهای طول T باشد
+        A = matrix.macros[index].transpose(2, 1, 0)
+        weighted = A * (MACRO_KCAL ** 2)[:, None, None]
+        normal = (weighted[:, :, None, :] * A[:, None, :, :]).sum(axis=0)
+        # ریج کوچک برای ترکیب‌های تقریباً هم‌راستا
+        normal += np.eye(3)[:, :, None] * 1e-6
+        return {
+            "index": index,
+            "A": A,
+            "weighted": weighted,
+            "normal": normal,
+            "upper": matrix.max_amount[index].T,
+        }
+
+    @staticmethod
+    def _solve3(normal: np.ndarray, rhs: np.ndarray) -> np.ndarray:
+        """حل دسته‌ای دستگاه‌های ۳×۳ با قاعده کرامر (سریع‌تر از linalg برای ماتریس‌های کوچک)"""
+        def cross(a, b):
+            return np.stack([
+                a[1] * b[2] - a[2] * b[1],
+                a[2] * b[0] - a[0] * b[2],
+                a[0] * b[1] - a[1] * b[0],
+            ])
+
+        c0, c1, c2 = normal[:, 0], normal[:, 1], normal[:, 2]
+        inverse = np.stack([cross(c1, c2), cross(c2, c0), cross(c0, c1)])
+        det = (c0 * inverse[0]).sum(axis=0)
+        return (inverse * rhs[None, :, :]).sum(axis=1) / det
+
+    def _timing_bonus(self, matrix: FoodMatrix, meal_targets: List[Dict]) -> Dict[str, np.ndarray]:
+        """امتیاز غذاهای پیشنهادی هر وعده از FOOD_TIMING_SUGGESTIONS"""
+        bonus = {}
+        for target in meal_targets:
+            suggestions = self.engine.FOOD_TIMING_SUGGESTIONS.get(MealType(target["meal"]), {})
+            keywords = suggestions.get("protein_sources", []) + suggestions.get("carb_sources", [])
+            bonus[target["meal"]] = np.array(
+                [self.TIMING_BONUS if any(k in name for k in keywords) else 0.0 for name in matrix.names]
+            )
+        return bonus
+
+    def _solve_meal(
+        self,
+        matrix: FoodMatrix,
+        pools: Dict[int, np.ndarray],
+        target: Dict,
+        penalty: np.ndarray,
+    ) -> List[tuple]:
+        """انتخاب غذاها و مقادیر یک وعده؛ لیست (اندیس غذا، مقدار)"""
+        goal = np.array([target["protein"], target["carbs"], target["fat"]], dtype=float)
+
+        items = []
+        vegetables = pools[ROLE_VEGETABLE]
+        if MealType(target["meal"]) in self.VEGETABLE_MEALS and len(vegetables):
+            choice = vegetables[np.argmin(penalty[vegetables])]
+            items.append((int(choice), float(self.VEGETABLE_AMOUNT)))
+            goal = np.maximum(goal - matrix.macros[choice] * self.VEGETABLE_AMOUNT, 0)
+
+        triples = self._triples(matrix, pools, penalty)
+        if triples is None:
+            return items
+
+        # حل برداری همه ترکیب‌ها و محدود کردن به بازه مجاز
+        rhs = (triples["weighted"] * goal[:, None, None]).sum(axis=0)
+        amounts = np.clip(self._solve3(triples["normal"], rhs), 0, triples["upper"])
+        error = self._error(triples["A"], amounts, goal)
+        cost = error + penalty[triples["index"]].sum(axis=1)
+
+        # گرد کردن و جستجوی محلی فقط روی بهترین ترکیب‌ها
+        top = np.argpartition(cost, min(self.TOP_CANDIDATES, len(cost)) - 1)[:self.TOP_CANDIDATES]
+        chosen = triples["index"][top]
+        amounts, error = self._local_search(matrix, chosen, triples["A"][:, :, top], amounts[:, top], goal)
+        best = int(np.argmin(error + penalty[chosen].sum(axis=1)))
+
+        items.extend((int(i), float(a)) for i, a in zip(chosen[best], amounts[:, best]) if a > 0)
+        return items
+
+    @staticmethod
+    def _error(A: np.ndarray, amounts: np.ndarray, goal: np.ndarray) -> np.ndarray:
+        """مربع خطای کالری هر ترکیب"""
+        achieved = (A * amounts[None, :, :]).sum(axis=1)
+        return (((achieved - goal[:, None]) * MACRO_KCAL[:, None]) ** 2).sum(axis=0)
+
+    def _local_search(
+        self,
+        matrix: FoodMatrix,
+        chosen: np.ndarray,
+        A: np.ndarray,
+        amounts: np.ndarray,
+        goal: np.ndarray,
+    ) -> tuple:
+        """
+        گرد کردن به گام واحد و جستجوی مختصاتی روی همان گام‌ها
+
+        خطا نسبت به مقدار هر غذا درجه دو است، پس بهترین مضرب گام برای هر غذا
+        (با ثابت بودن بقیه) مستقیم محاسبه می‌شود؛ همه ترکیب‌های کاندید با هم.
+        """
+        step = matrix.step[chosen].T
+        upper = matrix.max_amount[chosen].T
+        weight = (MACRO_KCAL ** 2)[:, None]
+        amounts = np.clip(np.round(amounts / step) * step, 0, upper)
+        residual = (A * amounts[None, :, :]).sum(axis=1) - goal[:, None]
+
+        curvature = (weight[:, None, :] * A * A).sum(axis=0)
+        curvature[curvature <= 0] = np.inf
+        for _ in range(self.LOCAL_SEARCH_SWEEPS):
+            for k in range(len(step)):
+                column = A[:, k, :]
+                gradient = (weight * column * residual).sum(axis=0)
+                best = np.round((amounts[k] - gradient / curvature[k]) / step[k]) * step[k]
+                best = np.minimum(np.maximum(best, 0), upper[k])
+                residual += column * (best - amounts[k])
+                amounts[k] = best
+
+        return amounts, (weight * residual ** 2).sum(axis=0)
+
+    # ===== Output =====
+
+    def _meal_result(self, matrix: FoodMatrix, target: Dict, items: List[tuple]) -> Dict:
+        """ساخت خروجی یک وعده"""
+        rows = []
+        for index, amount in items:
+            macros = matrix.macros[index] * amount
+            rows.append({
+                "food_id": int(matrix.ids[index]),
+                "name": matrix.names[index],
+                "amount": round(amount, 1),
+                "unit": matrix.units[index],
+                "calories": round(float(matrix.calories[index] * amount), 1),
+                "protein": round(float(macros[0]), 1),
+                "carbs": round(float(macros[1]), 1),
+                "fat": round(float(macros[2]), 1),
+            })
+        return {
+            "meal": target["meal"],
+            "targets": {key: target[key] for key in ("calories", "protein", "carbs", "fat")},
+            "items": rows,
+            "totals": self._sum_totals(rows),
+        }
+
+    @staticmethod
+    def _sum_totals(rows: Iterable[Dict]) -> Dict[str, float]:
+        totals = {"calories": 0.0, "protein": 0.0, "carbs": 0.0, "fat": 0.0}
+        for row in rows:
+            for key in totals:
+                totals[key] += row[key]
+        return {key: round(value, 1) for key, value in totals.items()}
+
+
+# نمونه سینگلتون
+diet_generator = DietGenerator()
@@ -0,0 +1,123 @@
+"""
+Injury Restrictions
+===================
+ایندکس کامپایل‌شده حرکات ممنوعه بر اساس آسیب‌دیدگی
+
+نام حرکات یک بار به مجموعه توکن‌های نرمال‌شده تبدیل و یک ایندکس معکوس
+(توکن -> شناسه حرکات) ساخته می‌شود. هر عبارت ممنوعه (مثلاً «لانج») با اشتراک
+posting list توکن‌هایش به مجموعه شناسه‌ها تبدیل می‌شود؛ پس «لانج دمبل» و
+«لانج راه رفتنی» هم بدون اسکن رشته‌ای پیدا می‌شوند.
+
+خروجی برای هر عضو بدن یک frozenset از شناسه‌هاست که مستقیم در
+NOT IN کوئری استفاده می‌شود.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional, Set, Tuple
+
+from app.core.text import normalize_text, tokenize
+
+
+def match_body_parts(injuries: Iterable[str], body_parts: Iterable[str]) -> Set[str]:
+    """
+    اعضای بدن ذکرشده در متن آسیب‌ها
+
+    مقایسه بدون فاصله انجام می‌شود تا «کمردرد» و «مچ‌دست» هم شناخته شوند.
+    """
+    texts = [normalize_text(injury).replace(" ", "") for injury in injuries]
+    texts = [text for text in texts if text]
+    matched = set()
+    for body_part in body_parts:
+        key = normalize_text(body_part).replace(" ", "")
+        if key and any(key in text for text in texts):
+            matched.add(body_part)
+    return matched
+
+
+@dataclass
+class RestrictionIndex:
+    """
+    ایندکس حرکات ممنوعه
+    ===================
+    postings: توکن -> شناسه حرکاتی که نامشان این توکن را دارد
+    by_body_part: عضو بدن -> شناسه حرکات ممنوعه
+    """
+    postings: Dict[str, FrozenSet[int]]
+    by_body_part: Dict[str, FrozenSet[int]] = field(default_factory=dict)
+
+    def match(self, phrase: str) -> FrozenSet[int]:
+        """حرکاتی که همه توکن‌های عبارت را در نام خود دارند"""
+        tokens = tokenize(phrase)
+        if not tokens:
+            return frozenset()
+        lists = sorted((self.postings.get(token, frozenset()) for token in tokens), key=len)
+        result = lists[0]
+        for ids in lists[1:]:
+            if not result:
+                break
+            result = result & ids
+        return result
+
+    def extend(
+        self,
+        rules: Mapping[str, Iterable[str]],
+        exercise_ids: Optional[Mapping[str, Iterable[int]]] = None,
+    ) -> "RestrictionIndex":
+        """
+        ایندکس جدید با قوانین اضافه (مثلاً قوانین اختصاصی یک مربی)
+
+        posting list ها مشترک می‌مانند و دوباره ساخته نمی‌شوند.
+        """
+        by_body_part = dict(self.by_body_part)
+        for body_part, phrases in rules.items():
+            ids = set(by_body_part.get(body_part, frozenset()))
+            for phrase in phrases:
+                ids |= self.match(phrase)
+            by_body_part[body_part] = frozenset(ids)
+        for body_part, ids in (exercise_ids or {}).items():
+            by_body_part[body_part] = by_body_part.get(body_part, frozenset()) | frozenset(ids)
+        return RestrictionIndex(postings=self.postings, by_body_part=by_body_part)
+
+    def body_parts(self, injuries: Iterable[str]) -> Set[str]:
+        """اعضای بدن دارای محدودیت که در متن آسیب‌ها آمده‌اند"""
+        return match_body_parts(injuries, self.by_body_part)
+
+    def excluded_ids(self, injuries: Iterable[str]) -> FrozenSet[int]:
+        """شناسه همه حرکات ممنوعه برای لیست آسیب‌ها"""
+        excluded: FrozenSet[int] = frozenset()
+        for body_part in self.body_parts(injuries):
+            excluded = excluded | self.by_body_part[body_part]
+        return excluded
+
+
+class InjuryRestrictionMatcher:
+    """
+    سازنده ایندکس حرکات ممنوعه
+    ==========================
+    """
+
+    def build(
+        self,
+        exercises: Iterable[Tuple[int, Optional[str], Optional[str]]],
+        rules: Mapping[str, Iterable[str]],
+    ) -> RestrictionIndex:
+        """
+        ساخت ایندکس از بانک تمرینات
+
+        Args:
+            exercises: (شناسه، نام، نام انگلیسی)؛ عبارت‌ها با هر دو نام تطبیق داده می‌شوند
+            rules: عضو بدن -> عبارت‌های ممنوعه (مثل INJURY_EXERCISE_RESTRICTIONS)
+        """
+        postings: Dict[str, Set[int]] = {}
+        for exercise_id, name, name_en in exercises:
+            for token in tokenize(name) | tokenize(name_en):
+                postings.setdefault(token, set()).add(exercise_id)
+
+        index = RestrictionIndex(
+            postings={token: frozenset(ids) for token, ids in postings.items()}
+        )
+        return index.extend(rules)
+
+
+# نمونه سینگلتون
+injury_matcher = InjuryRestrictionMatcher()
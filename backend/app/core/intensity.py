@@ -0,0 +1,184 @@
+"""
+Intensity Tables
+================
+جدول از پیش محاسبه‌شده تکرار/RPE -> درصد 1RM با درون‌یابی
+
+- فرمول‌ها: جدول مربیگری (REP_PERCENTAGES)، Brzycki، Epley، Lombardi و
+  جدول RPE سیستم RTS
+- RPE با «تکرار تا واماندگی» یکی می‌شود: تکرار مؤثر = تکرار + (10 - RPE)
+- جدول روی شبکه تکرار مؤثر ۱ تا MAX_EFFECTIVE_REPS با گام نیم تکرار یک بار
+  ساخته می‌شود؛ هر جست‌وجو یک درون‌یابی خطی روی همین شبکه است و برای
+  آرایه‌ای از ردیف‌ها (با فرمول‌های متفاوت) در یک عملیات numpy انجام می‌شود
+- فرمول‌هایی که فقط تا تعداد تکرار مشخصی معتبرند (Brzycki تا ۱۲، RTS تا ۱۶،
+  جدول مربیگری تا ۲۰) بعد از آن با شیب Epley و بدون پرش ادامه می‌یابند
+"""
+
+from enum import Enum
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+
+class Formula(str, Enum):
+    TABLE = "table"         # جدول مربیگری
+    BRZYCKI = "brzycki"
+    EPLEY = "epley"
+    LOMBARDI = "lombardi"
+    RTS = "rts"             # جدول RPE (Tuchscherer)
+
+
+FORMULA_LABELS = {
+    Formula.TABLE: "Coaching Table",
+    Formula.BRZYCKI: "Brzycki Formula",
+    Formula.EPLEY: "Epley Formula",
+    Formula.LOMBARDI: "Lombardi Formula",
+    Formula.RTS: "RTS RPE Chart",
+}
+
+# درصد 1RM بر اساس تکرار (جدول مربیگری)
+REP_PERCENTAGES = {
+    1: 100, 2: 95, 3: 93, 4: 90, 5: 87,
+    6: 85, 7: 83, 8: 80, 9: 77, 10: 75,
+    11: 73, 12: 70, 15: 65, 20: 60
+}
+
+# جدول RTS بر اساس تکرار مؤثر ۱ تا ۱۶ با گام نیم (RPE 10 تا RPE 6 در ۱۲ تکرار)
+RTS_PERCENTAGES = (
+    100.0, 97.8, 95.5, 93.9, 92.2, 90.7, 89.2, 87.8, 86.3, 85.0,
+    83.7, 82.4, 81.1, 79.9, 78.6, 77.4, 76.2, 75.1, 73.9, 72.3,
+    70.7, 69.4, 68.0, 66.7, 65.3, 64.0, 62.6, 61.3, 59.9, 58.6,
+    57.4,
+)
+
+MIN_RPE = 6.0
+MAX_RPE = 10.0
+MAX_EFFECTIVE_REPS = 40
+STEP = 0.5
+
+GRID = np.arange(1, MAX_EFFECTIVE_REPS + STEP / 2, STEP)
+FORMULAS = tuple(Formula)
+
+
+def _epley_tail(percent: np.ndarray, reps: np.ndarray, limit: float) -> np.ndarray:
+    """ادامه منحنی بعد از حد اعتبار با شیب Epley (پیوسته در limit)"""
+    at_limit = np.interp(limit, reps, percent)
+    tail = at_limit * (1 + limit / 30) / (1 + reps / 30)
+    return np.where(reps > limit, tail, percent)
+
+
+def _curve(formula: Formula, reps: np.ndarray) -> np.ndarray:
+    """درصد 1RM یک فرمول روی تکرارهای مؤثر"""
+    if formula == Formula.BRZYCKI:
+        return _epley_tail((37 - reps) / 36 * 100, reps, 12)
+    if formula == Formula.EPLEY:
+        return np.where(reps <= 1, 100.0, 100 / (1 + reps / 30))
+    if formula == Formula.LOMBARDI:
+        return 100 * reps ** -0.10
+    if formula == Formula.RTS:
+        chart = np.interp(reps, np.arange(1, 16 + STEP / 2, STEP), RTS_PERCENTAGES)
+        return _epley_tail(chart, reps, 16)
+    table = np.interp(reps, sorted(REP_PERCENTAGES), [REP_PERCENTAGES[r] for r in sorted(REP_PERCENTAGES)])
+    return _epley_tail(table, reps, 20)
+
+
+# (فرمول، تکرار مؤثر روی GRID) -> درصد 1RM
+PERCENT_TABLE = np.vstack([_curve(formula, GRID) for formula in FORMULAS])
+
+FormulaArg = Union[Formula, str, Sequence[Union[Formula, str]]]
+
+
+def formula_index(formula: FormulaArg) -> np.ndarray:
+    """شماره سطر جدول برای یک فرمول یا آرایه‌ای از فرمول‌ها"""
+    if isinstance(formula, str):
+        return np.array(FORMULAS.index(Formula(formula)))
+    return np.array([FORMULAS.index(Formula(f)) for f in formula], dtype=int)
+
+
+def effective_reps(reps: np.ndarray, rpe: np.ndarray) -> np.ndarray:
+    """تکرار تا واماندگی (تکرار + تکرار ذخیره)"""
+    return np.clip(np.asarray(reps, dtype=float) + (MAX_RPE - np.asarray(rpe, dtype=float)), 1, MAX_EFFECTIVE_REPS)
+
+
+def percent_1rm(
+    reps: np.ndarray,
+    rpe: Union[float, np.ndarray] = MAX_RPE,
+    formula: FormulaArg = Formula.TABLE,
+) -> np.ndarray:
+    """
+    درصد 1RM برای تکرار و RPE (قابل broadcast؛ فرمول هم می‌تواند آرایه باشد)
+
+    Returns:
+        درصد 1RM (۰ تا ۱۰۰)
+    """
+    position = (effective_reps(reps, rpe) - 1) / STEP
+    lower = np.minimum(np.floor(position).astype(int), len(GRID) - 2)
+    fraction = position - lower
+    row = formula_index(formula)
+    return PERCENT_TABLE[row, lower] * (1 - fraction) + PERCENT_TABLE[row, lower + 1] * fraction
+
+
+def reps_at_percent(
+    percent: np.ndarray,
+    rpe: Union[float, np.ndarray] = MAX_RPE,
+    formula: Union[Formula, str] = Formula.TABLE,
+) -> np.ndarray:
+    """تعداد تکرار (اعشاری) قابل انجام با درصد داده‌شده از 1RM و RPE (معکوس percent_1rm)"""
+    row = PERCENT_TABLE[formula_index(formula)]
+    effective = np.interp(percent, row[::-1], GRID[::-1])
+    return effective - (MAX_RPE - np.asarray(rpe, dtype=float))
+
+
+def estimate_1rm(
+    weight: np.ndarray,
+    reps: np.ndarray,
+    rpe: Union[float, np.ndarray] = MAX_RPE,
+    formula: FormulaArg = Formula.BRZYCKI,
+) -> np.ndarray:
+    """تخمین 1RM از وزن، تکرار و RPE ست انجام‌شده"""
+    return np.asarray(weight, dtype=float) * 100 / percent_1rm(reps, rpe, formula)
+
+
+def working_weights(
+    one_rm: np.ndarray,
+    reps: np.ndarray,
+    rpe: Union[float, np.ndarray] = MAX_RPE,
+    formula: FormulaArg = Formula.TABLE,
+    rounding: Optional[float] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    وزن کاری برای همه ردیف‌ها در یک محاسبه
+
+    Args:
+        one_rm: 1RM هر ردیف
+        reps: تکرار هدف
+        rpe: RPE هدف (۱۰ = تا واماندگی)
+        formula: فرمول مشترک یا آرایه فرمول هر ردیف
+        rounding: گام گرد کردن وزن (None = یک رقم اعشار)
+
+    Returns:
+        percent (درصد 1RM) و weight با شکل ورودی
+    """
+    percent = percent_1rm(reps, rpe, formula)
+    weight = np.asarray(one_rm, dtype=float) * percent / 100
+    if rounding:
+        weight = np.round(weight / rounding) * rounding
+    else:
+        weight = np.round(weight, 1)
+    return {"percent": np.round(percent, 1), "weight": weight}
+
+
+def rpe_chart(
+    formula: Union[Formula, str] = Formula.RTS,
+    max_reps: int = 12,
+    rpes: Sequence[float] = tuple(np.arange(MAX_RPE, MIN_RPE - STEP / 2, -STEP)),
+) -> Dict[str, object]:
+    """جدول RPE × تکرار -> درصد 1RM برای نمایش"""
+    reps = np.arange(1, max_reps + 1)
+    rpe = np.array(rpes, dtype=float)
+    percent = percent_1rm(reps[None, :], rpe[:, None], formula)
+    return {
+        "formula": Formula(formula).value,
+        "reps": reps.tolist(),
+        "rpe": rpe.tolist(),
+        "percent": np.round(percent, 1).tolist(),
+    }
@@ -0,0 +1,121 @@
+"""
+Periodization
+=============
+جدول پیشرفت کل برنامه (هفته × حرکت) با یک محاسبه آرایه‌ای
+
+- linear: افزایش ثابت شدت در هر هفته (تکرار متناسب با شدت کم می‌شود)
+- dup: موج روزانه سنگین/متوسط/سبک که با روز تمرین و هفته می‌چرخد
+- block: سه بلوک انباشت، تبدیل و اوج با شدت پایه بالاتر در هر بلوک
+
+شدت پایه هر حرکت از تکرار هدف همان حرکت (جدول مربیگری app.core.intensity،
+با درون‌یابی خطی) به دست می‌آید؛ تکرار هر هفته تکراری است که با آن
+شدت قابل انجام است و وزن = 1RM × شدت، گرد شده به نزدیک‌ترین وزنه.
+"""
+
+import re
+from enum import Enum
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from app.core.intensity import Formula, percent_1rm, reps_at_percent
+
+
+class Scheme(str, Enum):
+    LINEAR = "linear"   # خطی
+    DUP = "dup"         # موجی روزانه
+    BLOCK = "block"     # بلوکی
+
+
+DEFAULT_REPS = 8            # برای تکرارهای غیرعددی ("تا واماندگی")
+MIN_PERCENT = 60.0          # ۲۰ تکرار در جدول مربیگری
+MAX_PERCENT = 100.0
+
+# تغییر شدت روزهای سنگین/متوسط/سبک در DUP
+DUP_OFFSETS = np.array([5.0, 0.0, -7.5])
+
+# (سهم از کل هفته‌ها، تغییر شدت پایه) برای بلوک‌های انباشت/تبدیل/اوج
+BLOCK_PHASES = ((0.4, -5.0), (0.35, 5.0), (0.25, 15.0))
+
+_NUMBER = re.compile(r"\d+")
+
+
+def parse_reps(values: Sequence[Optional[str]], default: int = DEFAULT_REPS) -> np.ndarray:
+    """
+    تکرار هدف هر حرکت از متن تکرار ("8-12" -> 8، "۱۰" -> 10)
+
+    حد پایین بازه در نظر گرفته می‌شود (سنگین‌ترین وزنی که کل بازه را پوشش
+    می‌دهد)؛ متن بدون عدد مقدار پیش‌فرض می‌گیرد.
+    """
+    parsed = []
+    for value in values:
+        match = _NUMBER.search(value or "")
+        parsed.append(int(match.group()) if match else default)
+    return np.array(parsed, dtype=float)
+
+
+def percent_for_reps(reps: np.ndarray) -> np.ndarray:
+    """درصد 1RM برای تعداد تکرار (درون‌یابی جدول مربیگری)"""
+    return percent_1rm(reps, formula=Formula.TABLE)
+
+
+def reps_for_percent(percent: np.ndarray) -> np.ndarray:
+    """بیشترین تکرار کامل قابل انجام با درصد داده‌شده از 1RM"""
+    reps = reps_at_percent(percent, formula=Formula.TABLE)
+    return np.maximum(np.floor(reps + 1e-9), 1).astype(int)
+
+
+def block_phase(weeks: int) -> np.ndarray:
+    """شماره بلوک (۰ تا ۲) هر هفته"""
+    ends = np.cumsum([share for share, _ in BLOCK_PHASES])
+    phase = np.searchsorted(ends, np.arange(weeks) / weeks, side="right")
+    return phase.clip(max=len(BLOCK_PHASES) - 1)
+
+
+def periodize(
+    one_rms: np.ndarray,
+    base_reps: np.ndarray,
+    weeks: int,
+    scheme: Scheme = Scheme.LINEAR,
+    step_percent: float = 2.5,
+    day_index: Optional[np.ndarray] = None,
+    rounding: float = 2.5,
+) -> Dict[str, np.ndarray]:
+    """
+    جدول پیشرفت همه حرکات برای همه هفته‌ها
+
+    Args:
+        one_rms: 1RM هر حرکت (n)
+        base_reps: تکرار هدف هفته اول هر حرکت (n)
+        weeks: تعداد هفته
+        scheme: نوع دوره‌بندی
+        step_percent: افزایش شدت در هر هفته (درصد 1RM)
+        day_index: ترتیب روز تمرینی هر حرکت (فقط برای DUP)
+        rounding: گام گرد کردن وزن (کیلوگرم)
+
+    Returns:
+        percent / reps / load با شکل (weeks, n)
+    """
+    base = percent_for_reps(base_reps)[None, :]
+    week = np.arange(weeks)[:, None]
+
+    if scheme == Scheme.DUP:
+        days = np.zeros(len(base_reps), dtype=int) if day_index is None else day_index
+        wave = DUP_OFFSETS[(week + days[None, :]) % len(DUP_OFFSETS)]
+        # پیشرفت هفتگی کندتر، چون شدت روزها خودش بالا و پایین می‌رود
+        percent = base + wave + step_percent / 2 * week
+    elif scheme == Scheme.BLOCK:
+        phase = block_phase(weeks)
+        offsets = np.array([offset for _, offset in BLOCK_PHASES])
+        starts = np.searchsorted(phase, phase, side="left")
+        percent = base + (offsets[phase] + step_percent * (np.arange(weeks) - starts))[:, None]
+    else:
+        percent = base + step_percent * week
+
+    percent = np.clip(percent, MIN_PERCENT, MAX_PERCENT)
+    load = np.round(one_rms[None, :] * percent / 100 / rounding) * rounding
+    return {
+        "percent": np.round(percent, 1),
+        "reps": reps_for_percent(percent),
+        "load": load,
+    }
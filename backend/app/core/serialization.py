@@ -0,0 +1,48 @@
+"""
+Serialization
+=============
+تبدیل سریع پاسخ‌ها به JSON
+
+در صورت نصب بودن orjson از آن استفاده می‌شود (چند برابر سریع‌تر از json
+استاندارد و خروجی مستقیم bytes)؛ در غیر این صورت json استاندارد با همان
+قالب فشرده (بدون فاصله، UTF-8 بدون escape حروف فارسی).
+"""
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # اختیاری (روی بعضی نسخه‌های ویندوز نصب نمی‌شود)
+    orjson = None
+
+
+HAS_ORJSON = orjson is not None
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(content: Any) -> bytes:
+        """تبدیل به JSON (bytes)"""
+        return orjson.dumps(content, option=_ORJSON_OPTIONS)
+else:
+    def dumps(content: Any) -> bytes:
+        """تبدیل به JSON (bytes)"""
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    پاسخ JSON با dumps این ماژول
+    کلاس پیش‌فرض پاسخ اپلیکیشن (default_response_class)
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
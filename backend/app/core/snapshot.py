@@ -0,0 +1,140 @@
+"""
+Snapshot Encoding
+=================
+کدگذاری از پیش محاسبه‌شده اسناد فقط‌خواندنی (مثل کاتالوگ غذا و تمرین)
+
+هر سند یک بار به JSON (و در صورت نصب بودن msgpack به MessagePack) تبدیل و
+با gzip (و در صورت نصب بودن brotli با br) فشرده می‌شود. ETag قوی از هش
+محتوا ساخته می‌شود؛ هر نمایش (قالب + فشرده‌سازی) پسوند جداگانه دارد تا
+ETag با بایت‌های ارسالی یکی باشد.
+
+درخواست تکراری با If-None-Match همان هش پاسخ 304 بدون بدنه می‌گیرد.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Request, Response, status
+
+from app.core.compression import HAS_BROTLI, choose_encoding, compress
+from app.core.serialization import dumps
+
+try:
+    import msgpack
+except ImportError:  # اختیاری
+    msgpack = None
+
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "msgpack": "application/msgpack",
+}
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+@dataclass(frozen=True)
+class EncodedDocument:
+    """
+    سند کدگذاری‌شده
+    ===============
+    bodies: (قالب، فشرده‌سازی) -> بایت‌ها؛ فشرده‌سازی "identity"، "gzip" یا "br"
+    """
+    digest: str
+    bodies: Dict[Tuple[str, str], bytes] = field(default_factory=dict)
+
+    def etag(self, fmt: str, encoding: str) -> str:
+        suffix = "" if (fmt, encoding) == ("json", "identity") else f"-{fmt}-{encoding}"
+        return f'"{self.digest}{suffix}"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """مقایسه If-None-Match با هش سند (همه نمایش‌ها محتوای یکسان دارند)"""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            if tag.strip('"').split("-", 1)[0] == self.digest:
+                return True
+        return False
+
+
+def encode_document(payload: Any) -> EncodedDocument:
+    """
+    کدگذاری یک سند در همه قالب‌ها و فشرده‌سازی‌های در دسترس
+
+    Args:
+        payload: داده قابل تبدیل به JSON (خروجی model_dump با mode="json")
+    """
+    raw = {"json": dumps(payload)}
+    if msgpack is not None:
+        raw["msgpack"] = msgpack.packb(payload, use_bin_type=True)
+
+    bodies: Dict[Tuple[str, str], bytes] = {}
+    for fmt, body in raw.items():
+        bodies[(fmt, "identity")] = body
+        bodies[(fmt, "gzip")] = compress(body, "gzip", gzip_level=GZIP_LEVEL)
+        if HAS_BROTLI:
+            bodies[(fmt, "br")] = compress(body, "br", brotli_quality=BROTLI_QUALITY)
+
+    return EncodedDocument(digest=hashlib.sha256(raw["json"]).hexdigest()[:32], bodies=bodies)
+
+
+def negotiate(
+    document: EncodedDocument,
+    accept: Optional[str],
+    accept_encoding: Optional[str],
+    fmt: Optional[str] = None,
+) -> Tuple[str, str]:
+    """
+    انتخاب نمایش سند
+
+    Args:
+        fmt: قالب صریح ("json" یا "msgpack")؛ در غیر این صورت از هدر Accept
+
+    Returns:
+        (قالب، فشرده‌سازی)؛ اگر MessagePack در دسترس نباشد JSON برگردانده می‌شود
+    """
+    if fmt is None:
+        fmt = "msgpack" if any(media in (accept or "") for media in MSGPACK_MEDIA_TYPES) else "json"
+    if (fmt, "identity") not in document.bodies:
+        fmt = "json"
+
+    available = tuple(e for e in ("br", "gzip") if (fmt, e) in document.bodies)
+    return fmt, choose_encoding(accept_encoding, available) or "identity"
+
+
+def snapshot_response(
+    request: Request,
+    document: EncodedDocument,
+    cache_control: str,
+    fmt: Optional[str] = None,
+) -> Response:
+    """پاسخ سند با ETag/304، Cache-Control و نمایش مذاکره‌شده"""
+    fmt, encoding = negotiate(
+        document,
+        request.headers.get("accept"),
+        request.headers.get("accept-encoding"),
+        fmt,
+    )
+    headers = {
+        "ETag": document.etag(fmt, encoding),
+        "Cache-Control": cache_control,
+        "Vary": "Accept, Accept-Encoding",
+    }
+    if document.matches(request.headers.get("if-none-match")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(
+        content=document.bodies[(fmt, encoding)],
+        media_type=MEDIA_TYPES[fmt],
+        headers=headers,
+    )
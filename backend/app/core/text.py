@@ -0,0 +1,31 @@
+"""
+Text Normalization
+==================
+نرمال‌سازی متن فارسی/انگلیسی برای تطبیق نام‌ها (حرکات، غذاها، آسیب‌ها)
+"""
+
+import re
+from typing import FrozenSet, Optional
+
+
+# یکسان‌سازی حروف عربی/فارسی و تبدیل نیم‌فاصله به فاصله
+_CHAR_MAP = str.maketrans({
+    "ي": "ی",
+    "ى": "ی",
+    "ك": "ک",
+    "ۀ": "ه",
+    "\u200c": " ",
+    "\u200f": " ",
+})
+
+_SPLIT = re.compile(r"[\s\-_/،,;؛()%.0-9]+")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """نرمال‌سازی متن برای مقایسه (حروف کوچک، حروف فارسی یکسان)"""
+    return (text or "").translate(_CHAR_MAP).lower().strip()
+
+
+def tokenize(text: Optional[str]) -> FrozenSet[str]:
+    """مجموعه توکن‌های نرمال‌شده یک نام"""
+    return frozenset(token for token in _SPLIT.split(normalize_text(text)) if token)
@@ -0,0 +1,134 @@
+"""
+Time Series
+===========
+کاهش نمونه سری‌های زمانی برای نمودارها
+
+- bucket_aggregate: تجمیع روزانه/هفتگی/ماهانه با min/avg/max
+- lttb_indices: الگوریتم Largest-Triangle-Three-Buckets برای انتخاب نقاط
+  نماینده‌ای که شکل نمودار را حفظ می‌کنند
+"""
+
+from typing import Dict, List, Literal, Optional
+
+import numpy as np
+
+
+BucketSize = Literal["day", "week", "month"]
+
+
+def to_day_numbers(dates: List) -> np.ndarray:
+    """تبدیل لیست date به آرایه datetime64[D]"""
+    return np.array(dates, dtype="datetime64[D]")
+
+
+def to_float_array(values: List[Optional[float]]) -> np.ndarray:
+    """تبدیل مقادیر (با None) به آرایه float با NaN"""
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def to_nullable_list(values: np.ndarray, ndigits: int = 2) -> List[Optional[float]]:
+    """تبدیل آرایه به لیست JSON (NaN -> None)"""
+    return [None if np.isnan(v) else round(float(v), ndigits) for v in values]
+
+
+def bucket_keys(days: np.ndarray, size: BucketSize) -> np.ndarray:
+    """
+    کلید bucket هر تاریخ (روز شروع bucket)
+
+    هفته‌ها از دوشنبه شروع می‌شوند (1970-01-01 پنجشنبه است).
+    """
+    if size == "day":
+        return days
+    if size == "week":
+        offsets = (days.astype(np.int64) + 3) % 7
+        return days - offsets.astype("timedelta64[D]")
+    return days.astype("datetime64[M]").astype("datetime64[D]")
+
+
+def bucket_aggregate(
+    days: np.ndarray,
+    columns: Dict[str, np.ndarray],
+    size: BucketSize,
+) -> Dict[str, object]:
+    """
+    تجمیع سری‌ها در bucket های زمانی
+
+    Args:
+        days: تاریخ‌ها (datetime64[D]) به ترتیب صعودی
+        columns: نام فیلد -> مقادیر float (NaN = بدون مقدار)
+        size: اندازه bucket
+
+    Returns:
+        {"dates": شروع bucket ها, "count": تعداد رکورد,
+         "min"/"avg"/"max": نام فیلد -> آرایه (NaN برای bucket بدون مقدار)}
+    """
+    keys = bucket_keys(days, size)
+    if len(keys) == 0:
+        empty = {name: np.array([], dtype=float) for name in columns}
+        return {"dates": keys, "count": np.array([], dtype=np.int64), "min": empty, "avg": empty, "max": empty}
+
+    # داده‌ها مرتب هستند، پس هر bucket یک بازه پیوسته است
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    counts = np.diff(np.r_[starts, len(keys)])
+
+    mins, avgs, maxs = {}, {}, {}
+    for name, values in columns.items():
+        present = ~np.isnan(values)
+        n = np.add.reduceat(present.astype(np.int64), starts)
+        total = np.add.reduceat(np.where(present, values, 0.0), starts)
+        low = np.minimum.reduceat(np.where(present, values, np.inf), starts)
+        high = np.maximum.reduceat(np.where(present, values, -np.inf), starts)
+
+        empty = n == 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avgs[name] = np.where(empty, np.nan, total / n)
+        mins[name] = np.where(empty, np.nan, low)
+        maxs[name] = np.where(empty, np.nan, high)
+
+    return {"dates": keys[starts], "count": counts, "min": mins, "avg": avgs, "max": maxs}
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    انتخاب نقاط با الگوریتم LTTB
+
+    Args:
+        x: محور افقی (عددی، صعودی)
+        y: مقادیر (بدون NaN)
+        threshold: تعداد نقاط خروجی
+
+    Returns:
+        اندیس نقاط انتخاب‌شده (اولین و آخرین نقطه همیشه حفظ می‌شوند)
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = x.astype(float)
+    y = y.astype(float)
+    # مرزهای bucket های میانی (نقطه اول و آخر bucket جداگانه دارند)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+
+        # میانگین bucket بعدی (برای آخرین bucket، خود نقطه آخر)
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        if next_start >= next_end:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # نقطه‌ای که بزرگ‌ترین مثلث را با نقطه قبلی و میانگین بعدی می‌سازد
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+
+    return selected
@@ -7,6 +7,9 @@ Training Engine
 from typing import List, Dict, Optional, Set
 from enum import Enum
 
+from app.core.injury_restrictions import match_body_parts
+from app.core.intensity import Formula, REP_PERCENTAGES, MAX_RPE, estimate_1rm, percent_1rm
+
 
 class ExperienceLevel(str, Enum):
     BEGINNER = "beginner"
@@ -90,6 +93,21 @@ class TrainingEngine:
             ["پشت", "جلوبازو", "ساعد"],       # Pull
             ["چهارسر", "همسترینگ", "ساق"],    # Legs
         ],
+        SplitType.BRO_SPLIT: [
+            ["سینه"],
+            ["پشت"],
+            ["شانه"],
+            ["پا"],
+            ["جلوبازو", "پشت‌بازو", "ساعد"],
+        ],
+        SplitType.ARNOLD: [
+            ["سینه", "پشت"],                         # سینه و پشت
+            ["شانه", "جلوبازو", "پشت‌بازو"],         # شانه و بازو
+            ["چهارسر", "همسترینگ", "سرینی", "ساق"],  # پا
+            ["سینه", "پشت"],
+            ["شانه", "جلوبازو", "پشت‌بازو"],
+            ["چهارسر", "همسترینگ", "سرینی", "ساق"],
+        ],
     }
     
     # محدوده تکرار بر اساس هدف
@@ -100,6 +118,9 @@ class TrainingEngine:
         Goal.ENDURANCE: {"min": 15, "max": 25, "description": "استقامت عضلانی"},
     }
     
+    # درصد 1RM بر اساس تکرار (جدول مربیگری؛ درون‌یابی در app.core.intensity)
+    REP_PERCENTAGES = REP_PERCENTAGES
+    
     # حرکات ممنوعه برای آسیب‌های خاص
     INJURY_EXERCISE_RESTRICTIONS = {
         "کمر": ["ددلیفت", "اسکات با وزنه سنگین", "گودمورنینگ", "بارفیکس"],
@@ -160,14 +181,12 @@ class TrainingEngine:
             injuries: لیست آسیب‌ها
             
         Returns:
-            مجموعه حرکات ممنوعه
+            مجموعه عبارت‌های ممنوعه؛ برای شناسه حرکات بانک تمرینات از
+            RestrictionIndex (app.core.injury_restrictions) استفاده شود
         """
         restricted = set()
-        for injury in injuries:
-            injury_lower = injury.lower()
-            for body_part, exercises in self.INJURY_EXERCISE_RESTRICTIONS.items():
-                if body_part in injury_lower:
-                    restricted.update(exercises)
+        for body_part in match_body_parts(injuries, self.INJURY_EXERCISE_RESTRICTIONS):
+            restricted.update(self.INJURY_EXERCISE_RESTRICTIONS[body_part])
         return restricted
     
     def calculate_volume(
@@ -214,31 +233,34 @@ class TrainingEngine:
             "rest_seconds": base["rest_seconds"],
         }
     
-    def calculate_1rm(self, weight: float, reps: int) -> float:
+    def calculate_1rm(
+        self,
+        weight: float,
+        reps: int,
+        formula: Formula = Formula.BRZYCKI,
+        rpe: float = MAX_RPE
+    ) -> float:
         """
-        تخمین 1RM با فرمول Brzycki
+        تخمین 1RM (پیش‌فرض فرمول Brzycki)
         
         Args:
             weight: وزن استفاده شده
             reps: تعداد تکرار انجام شده
+            formula: فرمول تخمین
+            rpe: RPE ست انجام شده (۱۰ = تا واماندگی)
             
         Returns:
             تخمین یک تکرار بیشینه
         """
-        if reps == 1:
-            return weight
-        if reps > 12:
-            # فرمول برای تکرار بالا دقیق نیست
-            return weight * (1 + 0.025 * reps)
-        
-        # فرمول Brzycki
-        return weight * (36 / (37 - reps))
+        return float(estimate_1rm(weight, reps, rpe, formula))
     
     def calculate_working_weight(
         self,
         one_rm: float,
         target_reps: int,
-        goal: Goal
+        goal: Goal,
+        rpe: float = MAX_RPE,
+        formula: Formula = Formula.TABLE
     ) -> Dict[str, float]:
         """
         محاسبه وزن کاری بر اساس 1RM
@@ -247,18 +269,13 @@ class TrainingEngine:
             one_rm: یک تکرار بیشینه
             target_reps: تکرار هدف
             goal: هدف تمرینی
+            rpe: RPE هدف (۱۰ = تا واماندگی)
+            formula: جدول/فرمول درصد 1RM (تکرارهای بین نقاط جدول درون‌یابی می‌شوند)
             
         Returns:
             وزن پیشنهادی
         """
-        # درصد 1RM بر اساس تکرار
-        percentage_map = {
-            1: 100, 2: 95, 3: 93, 4: 90, 5: 87,
-            6: 85, 7: 83, 8: 80, 9: 77, 10: 75,
-            11: 73, 12: 70, 15: 65, 20: 60
-        }
-        
-        percentage = percentage_map.get(target_reps, 70) / 100
+        percentage = float(percent_1rm(target_reps, rpe, formula)) / 100
         working_weight = one_rm * percentage
         
         return {
@@ -0,0 +1,304 @@
+"""
+Training Generator
+==================
+تولید خودکار برنامه تمرینی از قالب‌های تقسیم‌بندی و بانک تمرینات
+
+بانک تمرینات یک بار به ایندکس «عضله هدف -> حرکات» تبدیل می‌شود. بعد از آن
+انتخاب حرکات هر روز کاملاً در حافظه انجام می‌شود و به ازای هر عضله یا هر روز
+کوئری زده نمی‌شود.
+"""
+
+import random
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.training_engine import (
+    training_engine, ExperienceLevel, Goal, SplitType
+)
+
+
+def normalize_label(text: Optional[str]) -> str:
+    """حذف فاصله و نیم‌فاصله برای مقایسه نام عضلات («جلو بازو» = «جلوبازو»)"""
+    return re.sub(r"[\s\u200c\u200f_\-]+", "", text or "").lower()
+
+
+@dataclass(frozen=True)
+class ExerciseOption:
+    """یک حرکت قابل انتخاب در ایندکس"""
+    id: int
+    name: str
+    is_compound: bool
+    difficulty: Optional[str]
+
+
+@dataclass
+class ExerciseIndex:
+    """
+    ایندکس عضله هدف -> حرکات
+
+    برای هر عضله قالب‌ها (مثلاً «چهارسر») شناسه حرکات به ترتیب
+    چندمفصلی‌ها و سپس تک‌مفصلی‌ها نگه داشته می‌شود.
+    """
+    exercises: Dict[int, ExerciseOption]
+    compound: Dict[str, Tuple[int, ...]]
+    isolation: Dict[str, Tuple[int, ...]]
+
+    def candidates(self, muscle: str) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        return self.compound.get(muscle, ()), self.isolation.get(muscle, ())
+
+
+class TrainingGenerator:
+    """
+    تولیدکننده برنامه تمرینی
+    ========================
+    تقسیم‌بندی، حجم و محدوده تکرار از TrainingEngine؛ انتخاب حرکت از ایندکس
+    """
+
+    # نام عضلات قالب‌ها -> برچسب‌های معادل در بانک تمرینات
+    # (نام گروه عضلانی یا زیرگروه ثبت‌شده در secondary_muscles، نرمال‌شده)
+    MUSCLE_ALIASES = {
+        "سینه": {"سینه"},
+        "پشت": {"پشت", "پشتوزیربغل", "زیربغل"},
+        "شانه": {"شانه", "سرشانه"},
+        "جلوبازو": {"جلوبازو"},
+        "پشت‌بازو": {"پشتبازو"},
+        "ساعد": {"ساعد"},
+        "چهارسر": {"چهارسر", "چهارسرران"},
+        "همسترینگ": {"همسترینگ"},
+        "سرینی": {"سرینی", "باسن"},
+        "ساق": {"ساق", "ساقپا"},
+        "پا": {"پا", "چهارسر", "چهارسرران", "همسترینگ", "سرینی", "باسن", "ساق", "ساقپا"},
+    }
+
+    # هدف شاگرد -> هدف تمرینی (نگهداری و بازترکیب با محدوده هایپرتروفی)
+    GOAL_MAP = {
+        "bulk": Goal.BULK,
+        "cut": Goal.CUT,
+        "strength": Goal.STRENGTH,
+        "endurance": Goal.ENDURANCE,
+    }
+
+    # حرکات با سختی بالاتر از سطح شاگرد انتخاب نمی‌شوند
+    ALLOWED_DIFFICULTY = {
+        ExperienceLevel.BEGINNER: {None, "beginner", "intermediate"},
+    }
+
+    SETS_PER_EXERCISE = 3
+    MAX_SETS_PER_EXERCISE = 5
+    MAX_EXERCISES_PER_MUSCLE = 3
+    MAX_DAY_EXERCISES = 8
+    MAX_DAYS = 7
+
+    def __init__(self):
+        self.engine = training_engine
+
+    # ===== Index =====
+
+    def build_index(self, exercises: Iterable[dict]) -> ExerciseIndex:
+        """
+        ساخت ایندکس از ردیف‌های بانک تمرینات
+
+        Args:
+            exercises: دیکشنری‌های شامل id، name، is_compound، difficulty،
+                muscle_group (نام گروه) و secondary_muscles
+        """
+        options: Dict[int, ExerciseOption] = {}
+        compound: Dict[str, List[int]] = {muscle: [] for muscle in self.MUSCLE_ALIASES}
+        isolation: Dict[str, List[int]] = {muscle: [] for muscle in self.MUSCLE_ALIASES}
+
+        for row in sorted(exercises, key=lambda r: (r["name"], r["id"])):
+            labels = {normalize_label(row.get("muscle_group"))}
+            labels.update(
+                normalize_label(part)
+                for part in (row.get("secondary_muscles") or "").split(",")
+            )
+            labels.discard("")
+
+            matched = [
+                muscle for muscle, aliases in self.MUSCLE_ALIASES.items()
+                if labels & aliases
+            ]
+            if not matched:
+                continue
+
+            options[row["id"]] = ExerciseOption(
+                id=row["id"],
+                name=row["name"],
+                is_compound=bool(row.get("is_compound")),
+                difficulty=row.get("difficulty"),
+            )
+            target = compound if row.get("is_compound") else isolation
+            for muscle in matched:
+                target[muscle].append(row["id"])
+
+        return ExerciseIndex(
+            exercises=options,
+            compound={muscle: tuple(ids) for muscle, ids in compound.items()},
+            isolation={muscle: tuple(ids) for muscle, ids in isolation.items()},
+        )
+
+    # ===== Structure =====
+
+    def resolve_goal(self, goal: Optional[str]) -> Goal:
+        """تبدیل هدف شاگرد به هدف تمرینی"""
+        return self.GOAL_MAP.get(goal or "", Goal.BULK)
+
+    def plan_structure(
+        self,
+        experience_level: ExperienceLevel,
+        available_days: Optional[int] = None,
+        split: Optional[SplitType] = None,
+    ) -> Tuple[SplitType, List[List[str]]]:
+        """
+        تقسیم‌بندی و عضلات هر روز
+
+        بدون split از suggest_split استفاده می‌شود؛ اگر تعداد روزها از طول
+        قالب بیشتر باشد قالب تکرار می‌شود.
+        """
+        if split is None:
+            suggestion = self.engine.suggest_split(
+                experience_level,
+                available_days or self.engine.SPLIT_RECOMMENDATIONS[experience_level]["days_per_week"],
+            )
+            split = suggestion["split"]
+            days_per_week = suggestion["days_per_week"]
+        else:
+            days_per_week = available_days or len(self.engine.SPLIT_TEMPLATES[split])
+
+        template = self.engine.SPLIT_TEMPLATES[split]
+        days_per_week = min(days_per_week, self.MAX_DAYS)
+        return split, [template[i % len(template)] for i in range(days_per_week)]
+
+    # ===== Generation =====
+
+    def generate(
+        self,
+        index: ExerciseIndex,
+        experience_level: ExperienceLevel,
+        goal: Goal,
+        available_days: Optional[int] = None,
+        split: Optional[SplitType] = None,
+        excluded_ids: Optional[Set[int]] = None,
+        seed: Optional[int] = None,
+    ) -> dict:
+        """
+        تولید برنامه هفتگی (بدون دسترسی به دیتابیس)
+
+        Args:
+            index: ایندکس ساخته‌شده با build_index
+            excluded_ids: شناسه حرکات ممنوعه (خروجی RestrictionIndex.excluded_ids)
+            seed: با مقدار ثابت ترتیب حرکات هم‌سطح به صورت تکرارپذیر بر زده می‌شود
+
+        Returns:
+            split_type، days_per_week، rep_range، rest_seconds، days و missing
+            (عضلاتی که حرکت مجازی برایشان پیدا نشد)
+        """
+        split, sessions = self.plan_structure(experience_level, available_days, split)
+        excluded_ids = excluded_ids or frozenset()
+        allowed_difficulty = self.ALLOWED_DIFFICULTY.get(experience_level)
+        rng = random.Random(seed) if seed is not None else None
+
+        def allowed(exercise_id: int) -> bool:
+            if exercise_id in excluded_ids:
+                return False
+            return allowed_difficulty is None or index.exercises[exercise_id].difficulty in allowed_difficulty
+
+        pools: Dict[str, Tuple[List[int], List[int]]] = {}
+        occurrences: Dict[str, int] = {}
+        missing: List[str] = []
+        days = []
+
+        for day_number, muscles in enumerate(sessions, start=1):
+            per_muscle = max(1, min(self.MAX_EXERCISES_PER_MUSCLE, self.MAX_DAY_EXERCISES // len(muscles)))
+            used: Set[int] = set()
+            items = []
+
+            for muscle in muscles:
+                if muscle not in pools:
+                    compound, isolation = (
+                        [i for i in ids if allowed(i)] for ids in index.candidates(muscle)
+                    )
+                    if rng:
+                        rng.shuffle(compound)
+                        rng.shuffle(isolation)
+                    pools[muscle] = (compound, isolation)
+
+                volume = self.engine.calculate_volume(experience_level, muscle, goal)
+                count = min(per_muscle, -(-volume["sets_per_session"] // self.SETS_PER_EXERCISE))
+                picked = self._pick(*pools[muscle], count, occurrences.get(muscle, 0), used)
+                occurrences[muscle] = occurrences.get(muscle, 0) + 1
+
+                if not picked:
+                    if muscle not in missing:
+                        missing.append(muscle)
+                    continue
+
+                for exercise_id, sets in zip(picked, self._split_sets(volume["sets_per_session"], len(picked))):
+                    used.add(exercise_id)
+                    items.append({
+                        "exercise_id": exercise_id,
+                        "name": index.exercises[exercise_id].name,
+                        "muscle": muscle,
+                        "sets": sets,
+                        "reps": volume["rep_range"],
+                        "rest_seconds": volume["rest_seconds"],
+                    })
+
+            days.append({
+                "day_number": day_number,
+                "name": "، ".join(muscles)[:100],
+                "muscles": list(muscles),
+                "exercises": items,
+            })
+
+        rep_range = self.engine.get_rep_range(goal)
+        return {
+            "split_type": split.value,
+            "days_per_week": len(days),
+            "experience_level": experience_level.value,
+            "goal": goal.value,
+            "rep_range": f"{rep_range['min']}-{rep_range['max']}",
+            "rest_seconds": self.engine.SPLIT_RECOMMENDATIONS[experience_level]["rest_seconds"],
+            "days": days,
+            "missing": missing,
+        }
+
+    # ===== Helpers =====
+
+    @staticmethod
+    def _pick(
+        compound: List[int],
+        isolation: List[int],
+        count: int,
+        occurrence: int,
+        used: Set[int],
+    ) -> List[int]:
+        """
+        انتخاب حرکات یک عضله: اول یک حرکت چندمفصلی، بعد تک‌مفصلی‌ها
+
+        در تکرارهای بعدی همان عضله در هفته، هر فهرست به اندازه حرکات
+        برداشته‌شده از آن چرخانده می‌شود تا روزها حرکات متفاوت داشته باشند.
+        """
+        def rotated(ids: List[int], step: int) -> List[int]:
+            if not ids:
+                return []
+            shift = (occurrence * step) % len(ids)
+            return [i for i in ids[shift:] + ids[:shift] if i not in used]
+
+        compound, isolation = rotated(compound, 1), rotated(isolation, max(count - 1, 1))
+        first, rest = (compound[:1], compound[1:]) if compound else (isolation[:1], [])
+        remaining = isolation + rest if compound else isolation[1:]
+        return (first + remaining)[:count]
+
+    def _split_sets(self, total: int, count: int) -> List[int]:
+        """تقسیم ست‌های جلسه بین حرکات (حرکات اول ست بیشتر)"""
+        base, extra = divmod(max(total, count), count)
+        return [
+            min(base + (1 if i < extra else 0), self.MAX_SETS_PER_EXERCISE)
+            for i in range(count)
+        ]
+
+
+# نمونه سینگلتون
+training_generator = TrainingGenerator()
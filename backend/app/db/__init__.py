@@ -5,6 +5,6 @@ Database Package
 """
 
 from app.db.base import Base
-from app.db.session import get_db, engine, SessionLocal
+from app.db.session import get_db, get_read_db, engine, read_engine, SessionLocal, ReadSessionLocal
 
-__all__ = ["Base", "get_db", "engine", "SessionLocal"]
+__all__ = ["Base", "get_db", "get_read_db", "engine", "read_engine", "SessionLocal", "ReadSessionLocal"]
@@ -4,7 +4,11 @@ Database Initialization
 راه‌اندازی و پر کردن داده‌های اولیه دیتابیس
 """
 
+from sqlalchemy import MetaData, inspect
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import Session
+from typing import Union
 
 from app.db.base import Base
 from app.db.session import engine
@@ -12,12 +16,51 @@ from app.models.user import User
 from app.models.food import FoodCategory, Food
 from app.models.exercise import MuscleGroup, Exercise, ExerciseType
 from app.models.supplement import SupplementCategory, Supplement
+from app.models.athlete import AthleteMeasurement
+from app.models.progress import ProgressRecord
+from app.models.body_composition import BodyComposition
+from app.models.ownership import backfill_coach_ids
+from app.models.plan_history import backfill_deleted_markers
 from app.core.security import get_password_hash
 
 
+def ensure_indexes(metadata: MetaData, bind: Union[Engine, Connection]) -> None:
+    """
+    ایجاد index های جدید روی جداول موجود (Idempotent)
+    create_all فقط برای جداول جدید index می‌سازد.
+    """
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+
+def ensure_columns(metadata: MetaData, bind: Union[Engine, Connection]) -> None:
+    """
+    افزودن ستون‌های جدید (nullable) به جداول موجود (Idempotent)
+    create_all جدول موجود را تغییر نمی‌دهد.
+    """
+    inspector = inspect(bind)
+    for table in metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            ddl = CreateColumn(column).compile(dialect=bind.dialect)
+            statement = f"ALTER TABLE {table.name} ADD COLUMN {ddl}"
+            if isinstance(bind, Connection):
+                bind.exec_driver_sql(statement)
+            else:
+                with bind.begin() as conn:
+                    conn.exec_driver_sql(statement)
+
+
 def create_tables() -> None:
     """ایجاد جداول دیتابیس"""
     Base.metadata.create_all(bind=engine)
+    ensure_columns(Base.metadata, engine)
+    ensure_indexes(Base.metadata, engine)
     print("✅ جداول دیتابیس ایجاد شد")
 
 
@@ -231,6 +274,50 @@ def create_supplement_categories(db: Session) -> None:
     print("✅ دسته‌بندی‌های مکمل ایجاد شد")
 
 
+def backfill_body_composition(db: Session) -> None:
+    """ساخت تایم‌لاین ترکیب بدنی برای شاگردانی که هنوز ندارند (Idempotent)"""
+    from sqlalchemy import select, union
+    from app.services.body_composition_service import BodyCompositionService
+    
+    athlete_ids = set(db.scalars(union(
+        select(AthleteMeasurement.athlete_id),
+        select(ProgressRecord.athlete_id),
+    ))) - set(db.scalars(select(BodyComposition.athlete_id).distinct()))
+    if not athlete_ids:
+        return
+    
+    service = BodyCompositionService(db)
+    for athlete_id in athlete_ids:
+        service.rebuild(athlete_id)
+    db.commit()
+    print(f"✅ ترکیب بدنی {len(athlete_ids)} شاگرد ساخته شد")
+
+
+def backfill_allergens(db: Session) -> None:
+    """برچسب‌گذاری حساسیت‌زای غذاهایی که هنوز ماسک ندارند (Idempotent)"""
+    from app.services.food_service import FoodService
+    
+    tagged = FoodService(db).tag_allergens(only_missing=True)
+    if tagged:
+        print(f"✅ حساسیت‌زای {tagged} غذا برچسب‌گذاری شد")
+
+
+def backfill_plan_owners(db: Session) -> None:
+    """پر کردن coach_id برنامه‌ها، روزها و آیتم‌های قدیمی (Idempotent)"""
+    updated = backfill_coach_ids(db)
+    db.commit()
+    if updated:
+        print(f"✅ مالک {updated} ردیف برنامه ثبت شد")
+
+
+def backfill_plan_versions(db: Session) -> None:
+    """پر کردن is_deleted نسخه‌های قدیمی تاریخچه برنامه‌ها (Idempotent)"""
+    updated = backfill_deleted_markers(db)
+    db.commit()
+    if updated:
+        print(f"✅ نشانه حذف {updated} نسخه برنامه ثبت شد")
+
+
 def init_db(db: Session) -> None:
     """
     راه‌اندازی کامل دیتابیس (Idempotent)
@@ -251,6 +338,10 @@ def init_db(db: Session) -> None:
         create_muscle_groups(db)
         create_sample_exercises(db)
         create_supplement_categories(db)
+        backfill_body_composition(db)
+        backfill_allergens(db)
+        backfill_plan_owners(db)
+        backfill_plan_versions(db)
         
         print("✅ راه‌اندازی دیتابیس با موفقیت انجام شد!")
     except Exception as e:
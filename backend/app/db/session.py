@@ -2,50 +2,181 @@
 Database Session
 ================
 مدیریت اتصال و session های دیتابیس
+
+دو engine وجود دارد:
+- engine: برای نوشتن (و خواندن وقتی مسیریابی غیرفعال است)
+- read_engine: برای خواندن؛ replica در PostgreSQL یا اتصال read-only در SQLite
 """
 
 from sqlalchemy import create_engine, event
 from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import Generator, Optional
 import contextlib
 
 from app.config import settings
 
-# ایجاد Engine با تنظیمات بهینه برای SQLite
-connect_args = {}
-if settings.DATABASE_URL.startswith("sqlite"):
-    # برای SQLite باید check_same_thread را False کنیم تا در FastAPI کار کند
-    connect_args["check_same_thread"] = False
-    # فعال‌سازی timeout برای جلوگیری از lock های طولانی
-    connect_args["timeout"] = 20  # 20 second timeout
-
-engine = create_engine(
-    settings.DATABASE_URL,
-    echo=settings.DATABASE_ECHO,
-    connect_args=connect_args,
-    pool_pre_ping=True,  # بررسی اتصال قبل از استفاده
-    # برای SQLite: poolclass=NullPool بهتر است چون SQLite فایل-based است
-    poolclass=None if not settings.DATABASE_URL.startswith("sqlite") else None,
-)
+
+def _is_sqlite(url: str) -> bool:
+    """آیا آدرس مربوط به SQLite است"""
+    return url.startswith("sqlite")
+
+
+def _sqlite_read_only_url(url: str) -> Optional[str]:
+    """
+    تبدیل آدرس SQLite به آدرس URI فقط‌خواندنی (mode=ro)
+
+    برای دیتابیس in-memory امکان اتصال جداگانه وجود ندارد و None برمی‌گردد.
+
+    Example:
+        sqlite:///./flexpro.db -> sqlite:///file:./flexpro.db?mode=ro&uri=true
+    """
+    prefix = "sqlite:///"
+    if not url.startswith(prefix):
+        return None
+
+    path = url[len(prefix):]
+    if not path or path == ":memory:" or path.startswith("file:"):
+        return None
+
+    return f"{prefix}file:{path}?mode=ro&uri=true"
+
+
+def _sqlite_connect_args() -> dict:
+    """تنظیمات اتصال SQLite"""
+    return {
+        # برای SQLite باید check_same_thread را False کنیم تا در FastAPI کار کند
+        "check_same_thread": False,
+        # فعال‌سازی timeout برای جلوگیری از lock های طولانی
+        "timeout": 20,  # 20 second timeout
+    }
 
 
-@event.listens_for(Engine, "connect")
-def set_sqlite_pragma(dbapi_conn, connection_record):
+def _set_sqlite_pragma(dbapi_conn, connection_record):
     """تنظیم pragma های SQLite برای عملکرد بهتر"""
-    if settings.DATABASE_URL.startswith("sqlite"):
-        cursor = dbapi_conn.cursor()
-        # فعال‌سازی WAL mode برای پشتیبانی از concurrent reads/writes
-        cursor.execute("PRAGMA journal_mode=WAL")
-        # افزایش timeout برای کاهش خطاهای "database is locked"
-        cursor.execute("PRAGMA busy_timeout=20000")  # 20 seconds
-        # فعال‌سازی foreign key constraints
-        cursor.execute("PRAGMA foreign_keys=ON")
-        # بهینه‌سازی برای عملکرد بهتر
-        cursor.execute("PRAGMA synchronous=NORMAL")  # توازن بین امنیت و عملکرد
-        cursor.execute("PRAGMA cache_size=-64000")  # 64MB cache
-        cursor.execute("PRAGMA temp_store=MEMORY")
-        cursor.close()
+    cursor = dbapi_conn.cursor()
+    # فعال‌سازی WAL mode برای پشتیبانی از concurrent reads/writes
+    cursor.execute("PRAGMA journal_mode=WAL")
+    # افزایش timeout برای کاهش خطاهای "database is locked"
+    cursor.execute("PRAGMA busy_timeout=20000")  # 20 seconds
+    # فعال‌سازی foreign key constraints
+    cursor.execute("PRAGMA foreign_keys=ON")
+    # بهینه‌سازی برای عملکرد بهتر
+    cursor.execute("PRAGMA synchronous=NORMAL")  # توازن بین امنیت و عملکرد
+    cursor.execute("PRAGMA cache_size=-64000")  # 64MB cache
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def _set_sqlite_read_pragma(dbapi_conn, connection_record):
+    """
+    تنظیم pragma های اتصال خواندنی SQLite
+    journal_mode روی اتصال read-only قابل تغییر نیست و از نویسنده (WAL) پیروی می‌کند
+    """
+    cursor = dbapi_conn.cursor()
+    # جلوگیری از هر نوع نوشتن حتی اگر فایل قابل نوشتن باشد
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.execute("PRAGMA busy_timeout=20000")
+    cursor.execute("PRAGMA cache_size=-64000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def _postgres_connect_args(url: str, read_only: bool = False) -> dict:
+    """
+    تنظیمات اتصال PostgreSQL
+
+    - statement_timeout: جلوگیری از کوئری‌های طولانی که اتصال pool را قفل می‌کنند
+    - default_transaction_read_only: برای engine خواندنی
+    - prepare_threshold: prepared statement سمت سرور (فقط درایور psycopg 3)
+    """
+    connect_args = {}
+    server_options = []
+    if settings.DATABASE_STATEMENT_TIMEOUT_MS:
+        server_options.append(f"-c statement_timeout={settings.DATABASE_STATEMENT_TIMEOUT_MS}")
+    if read_only:
+        server_options.append("-c default_transaction_read_only=on")
+    if server_options:
+        connect_args["options"] = " ".join(server_options)
+    if url.startswith("postgresql+psycopg://") and settings.DATABASE_PREPARE_THRESHOLD is not None:
+        connect_args["prepare_threshold"] = settings.DATABASE_PREPARE_THRESHOLD
+    return connect_args
+
+
+def get_engine_options(url: str, read_only: bool = False) -> dict:
+    """
+    پروفایل ساخت engine بر اساس نوع دیتابیس
+
+    SQLite:
+        pool پیش‌فرض SQLAlchemy (QueuePool برای فایل) + check_same_thread و timeout
+    PostgreSQL و سایر:
+        QueuePool با اندازه، overflow، recycle و timeout از Settings
+    """
+    options = {
+        "echo": settings.DATABASE_ECHO,
+        "pool_pre_ping": True,  # بررسی اتصال قبل از استفاده
+    }
+
+    if _is_sqlite(url):
+        options["connect_args"] = _sqlite_connect_args()
+        return options
+
+    options.update(
+        poolclass=QueuePool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        # برگرداندن اتصال به pool با rollback سبک‌تر از reset کامل است
+        pool_reset_on_return="rollback",
+    )
+    if url.startswith("postgresql"):
+        options["connect_args"] = _postgres_connect_args(url, read_only)
+    return options
+
+
+def create_db_engine(url: str, read_only: bool = False) -> Engine:
+    """
+    ساخت engine با پروفایل مناسب و listener های مخصوص همان engine
+
+    pragma های SQLite فقط روی engine های SQLite ثبت می‌شوند،
+    نه روی کلاس سراسری Engine.
+    """
+    db_engine = create_engine(url, **get_engine_options(url, read_only))
+
+    if _is_sqlite(url):
+        listener = _set_sqlite_read_pragma if read_only else _set_sqlite_pragma
+        event.listen(db_engine, "connect", listener)
+
+    return db_engine
+
+
+# Engine اصلی (نوشتن)
+engine = create_db_engine(settings.DATABASE_URL)
+
+
+def _create_read_engine() -> Engine:
+    """
+    ایجاد engine خواندنی
+
+    - مسیریابی غیرفعال: همان engine نوشتن برگردانده می‌شود
+    - DATABASE_READ_URL تنظیم شده: اتصال به replica
+    - SQLite فایلی: اتصال جداگانه با mode=ro و PRAGMA query_only
+    """
+    if not settings.DATABASE_READ_ROUTING:
+        return engine
+
+    read_url = settings.DATABASE_READ_URL
+    if read_url is None and _is_sqlite(settings.DATABASE_URL):
+        read_url = _sqlite_read_only_url(settings.DATABASE_URL)
+        if read_url is None:
+            return engine
+
+    return create_db_engine(read_url or settings.DATABASE_URL, read_only=True)
+
+
+read_engine = _create_read_engine()
 
 
 # ایجاد SessionLocal
@@ -56,16 +187,24 @@ SessionLocal = sessionmaker(
     expire_on_commit=False,  # برای جلوگیری از lazy loading issues
 )
 
+# Session خواندنی
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine,
+    expire_on_commit=False,
+)
+
 
 def get_db() -> Generator[Session, None, None]:
     """
     Dependency برای دریافت session دیتابیس
     استفاده در API routes
-    
+
     این تابع اطمینان می‌دهد که:
     - Session همیشه بسته می‌شود حتی در صورت خطا
     - Transaction ها به درستی commit یا rollback می‌شوند
-    
+
     Example:
         @router.get("/users")
         def get_users(db: Session = Depends(get_db)):
@@ -83,3 +222,45 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         # همیشه session را بسته می‌کنیم
         db.close()
+
+
+def get_read_db() -> Generator[Session, None, None]:
+    """
+    Dependency برای دریافت session خواندنی
+
+    روی read_engine باز می‌شود و هیچ‌وقت commit نمی‌کند؛
+    بستن session تراکنش خواندنی را خاتمه می‌دهد.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _pool_metrics(target: Engine) -> dict:
+    """آمار pool اتصال یک engine"""
+    pool = target.pool
+    metrics = {
+        "url": target.url.render_as_string(hide_password=True),
+        "pool": type(pool).__name__,
+        "status": pool.status(),
+    }
+    # QueuePool این متدها را دارد؛ NullPool/StaticPool ندارند
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            metrics[name] = method()
+    return metrics
+
+
+def get_pool_status() -> dict:
+    """
+    آمار pool های نوشتن و خواندن
+    برای مانیتورینگ در endpoint سلامت
+    """
+    return {
+        "read_routing": read_engine is not engine,
+        "write": _pool_metrics(engine),
+        "read": _pool_metrics(read_engine),
+    }
@@ -0,0 +1,220 @@
+"""
+Database Sharding
+=================
+تقسیم داده‌های مربی‌ها بین فایل‌های SQLite جداگانه
+
+همه داده‌های یک مربی از users.id -> athletes.coach_id آویزان است، پس هر مربی
+(یا یک bucket از مربی‌ها) فایل SQLite خودش را می‌گیرد و قفل نوشتن یک مربی
+پرکار بقیه را متوقف نمی‌کند.
+
+- دیتابیس اصلی (DATABASE_URL): کاربران و بانک‌های مشترک (غذا، تمرین، مکمل)
+- فایل shard: جداول شاگردان و برنامه‌ها؛ دیتابیس اصلی به صورت read-only با
+  نام shared به آن ATTACH می‌شود، پس کوئری‌های بانک‌ها بدون تغییر کار می‌کنند
+"""
+
+import os
+import threading
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import MetaData, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker, Session
+
+from app.config import settings
+from app.db.base import Base
+from app.db.init_db import ensure_columns, ensure_indexes
+from app.models.ownership import backfill_coach_ids
+from app.models.plan_history import backfill_deleted_markers
+from app.db.session import SessionLocal, create_db_engine
+
+
+# جداولی که فقط در دیتابیس اصلی هستند و در shard از طریق ATTACH خوانده می‌شوند
+SHARED_TABLES = {
+    "users",
+    "food_categories",
+    "foods",
+    "muscle_groups",
+    "exercises",
+    "supplement_categories",
+    "supplements",
+}
+
+# نام schema دیتابیس اصلی داخل اتصال shard
+SHARED_SCHEMA = "shared"
+
+# فاصله شناسه‌ها بین shard ها؛ شناسه‌های هر shard از shard_number << 32 شروع می‌شوند
+# تا شناسه شاگرد و برنامه در کل سیستم یکتا بماند
+SHARD_ID_BITS = 32
+
+# بزرگ‌ترین شماره shard که شناسه‌هایش زیر 2^53 (عدد صحیح امن JavaScript) می‌ماند؛
+# تغییر SHARD_ID_BITS بازه shard های موجود را با shard های جدید هم‌پوشان می‌کند
+MAX_SHARD_NUMBER = (1 << (53 - SHARD_ID_BITS)) - 1
+
+
+def _main_database_path() -> str:
+    """مسیر مطلق فایل دیتابیس اصلی"""
+    prefix = "sqlite:///"
+    if not settings.DATABASE_URL.startswith(prefix):
+        raise RuntimeError("Sharding فقط با DATABASE_URL از نوع SQLite فایلی پشتیبانی می‌شود")
+    return os.path.abspath(settings.DATABASE_URL[len(prefix):])
+
+
+def _build_tenant_metadata() -> MetaData:
+    """
+    کپی جداول tenant بدون کلیدهای خارجی به جداول مشترک
+
+    SQLite کلید خارجی بین دیتابیس‌های ATTACH شده را پشتیبانی نمی‌کند
+    (جدول والد باید در همان فایل باشد)، پس آن‌ها حذف می‌شوند؛
+    کلیدهای خارجی داخلی (شاگرد -> برنامه -> آیتم) با cascade باقی می‌مانند.
+    """
+    metadata = MetaData()
+    for source in Base.metadata.sorted_tables:
+        if source.name in SHARED_TABLES:
+            continue
+
+        table = source.to_metadata(metadata)
+        for constraint in list(table.foreign_key_constraints):
+            target_table = constraint.elements[0].target_fullname.split(".")[0]
+            if target_table in SHARED_TABLES:
+                table.constraints.discard(constraint)
+                for element in constraint.elements:
+                    element.parent.foreign_keys.discard(element)
+                    table.foreign_keys.discard(element)
+
+        # AUTOINCREMENT تا بتوان شروع شناسه‌ها را از sqlite_sequence تعیین کرد
+        table.dialect_options["sqlite"]["autoincrement"] = True
+
+    return metadata
+
+
+def shard_number(coach_id: int) -> int:
+    """
+    شماره shard یک مربی
+
+    SHARD_BUCKETS=0: هر مربی فایل خودش (شماره = شناسه مربی)
+    SHARD_BUCKETS=N: مربی‌ها در N فایل پخش می‌شوند (شماره 1..N)
+
+    Raises:
+        RuntimeError: اگر شماره از MAX_SHARD_NUMBER بیشتر شود
+    """
+    if settings.SHARD_BUCKETS > 0:
+        number = coach_id % settings.SHARD_BUCKETS + 1
+    else:
+        number = coach_id
+
+    if not 0 < number <= MAX_SHARD_NUMBER:
+        raise RuntimeError(
+            f"شماره shard {number} خارج از بازه 1..{MAX_SHARD_NUMBER} است "
+            "(شناسه‌ها از 2^53 عبور می‌کنند)؛ SHARD_BUCKETS را تنظیم کنید"
+        )
+    return number
+
+
+class ShardRouter:
+    """
+    مسیریاب shard ها
+    ================
+    نگهداری engine و sessionmaker هر shard (ساخت تنبل و thread-safe)
+    """
+
+    def __init__(self, shard_dir: str):
+        self.shard_dir = shard_dir
+        self._lock = threading.Lock()
+        self._engines: Dict[int, Engine] = {}
+        self._sessionmakers: Dict[int, sessionmaker] = {}
+        self._tenant_metadata: Optional[MetaData] = None
+
+    def shard_path(self, number: int) -> str:
+        """مسیر فایل shard"""
+        prefix = "bucket" if settings.SHARD_BUCKETS > 0 else "coach"
+        return os.path.abspath(os.path.join(self.shard_dir, f"{prefix}_{number}.db"))
+
+    def get_engine(self, coach_id: int) -> Engine:
+        """دریافت (یا ساخت) engine shard یک مربی"""
+        number = shard_number(coach_id)
+        shard_engine = self._engines.get(number)
+        if shard_engine is not None:
+            return shard_engine
+
+        with self._lock:
+            shard_engine = self._engines.get(number)
+            if shard_engine is None:
+                shard_engine = self._create_engine(number)
+                self._engines[number] = shard_engine
+                self._sessionmakers[number] = sessionmaker(
+                    autocommit=False,
+                    autoflush=False,
+                    bind=shard_engine,
+                    expire_on_commit=False,
+                )
+        return shard_engine
+
+    def session(self, coach_id: int) -> Session:
+        """ایجاد session روی shard یک مربی"""
+        self.get_engine(coach_id)
+        return self._sessionmakers[shard_number(coach_id)]()
+
+    def _create_engine(self, number: int) -> Engine:
+        """ساخت engine، ATTACH دیتابیس اصلی و ایجاد schema"""
+        os.makedirs(self.shard_dir, exist_ok=True)
+        main_path = _main_database_path()
+
+        # uri=true لازم است تا ATTACH آدرس file:...?mode=ro را بپذیرد
+        shard_engine = create_db_engine(f"sqlite:///file:{self.shard_path(number)}?uri=true")
+
+        def attach_shared(dbapi_conn, connection_record):
+            cursor = dbapi_conn.cursor()
+            cursor.execute(f"ATTACH DATABASE 'file:{main_path}?mode=ro' AS {SHARED_SCHEMA}")
+            cursor.close()
+
+        event.listen(shard_engine, "connect", attach_shared)
+
+        self._create_schema(shard_engine, number)
+        return shard_engine
+
+    def _create_schema(self, shard_engine: Engine, number: int) -> None:
+        """ایجاد جداول tenant و تعیین شروع شناسه‌ها (Idempotent)"""
+        if self._tenant_metadata is None:
+            self._tenant_metadata = _build_tenant_metadata()
+
+        id_base = number << SHARD_ID_BITS
+        with shard_engine.begin() as conn:
+            self._tenant_metadata.create_all(conn)
+            ensure_columns(self._tenant_metadata, conn)
+            ensure_indexes(self._tenant_metadata, conn)
+            backfill_coach_ids(conn)
+            backfill_deleted_markers(conn)
+            for table in self._tenant_metadata.sorted_tables:
+                conn.execute(
+                    text(
+                        "INSERT INTO main.sqlite_sequence (name, seq) "
+                        "SELECT :name, :seq WHERE NOT EXISTS "
+                        "(SELECT 1 FROM main.sqlite_sequence WHERE name = :name)"
+                    ),
+                    {"name": table.name, "seq": id_base},
+                )
+
+    def dispose(self) -> None:
+        """بستن همه اتصال‌ها"""
+        with self._lock:
+            for shard_engine in self._engines.values():
+                shard_engine.dispose()
+            self._engines.clear()
+            self._sessionmakers.clear()
+
+
+# نمونه سراسری
+shard_router = ShardRouter(settings.SHARD_DIR)
+
+
+def session_target(coach_id: int) -> Tuple[Hashable, Callable[[], Session]]:
+    """
+    کلید و سازنده session محل ذخیره داده‌های یک مربی
+    برای کارهای پس‌زمینه که خارج از چرخه درخواست session باز می‌کنند
+
+    Returns:
+        (کلید دیتابیس، تابع ساخت session)؛ مربی‌های هم‌کلید در یک فایل هستند
+    """
+    if settings.SHARDING_ENABLED:
+        return ("shard", shard_number(coach_id)), lambda: shard_router.session(coach_id)
+    return "main", SessionLocal
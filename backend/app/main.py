@@ -13,9 +13,13 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 
 from app.config import settings
+from app.core.compression import CompressionMiddleware
+from app.core.serialization import FastJSONResponse
 from app.api.v1.router import api_router
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, get_pool_status
 from app.db.init_db import init_db
+from app.services.ingestion_queue import ingestion_queue
+from app.services.catalog_service import CatalogService
 
 
 @asynccontextmanager
@@ -29,13 +33,17 @@ async def lifespan(app: FastAPI):
     db = SessionLocal()
     try:
         init_db(db)
+        # ساخت snapshot کاتالوگ پیش از اولین درخواست
+        CatalogService(db).get_document()
     finally:
         db.close()
+    ingestion_queue.start()
     
     yield
     
-    # Shutdown
+    # Shutdown: نوشتن داده‌های باقی‌مانده در صف
     print("👋 Shutting down FLEX PRO Backend...")
+    ingestion_queue.stop()
 
 
 # ایجاد اپلیکیشن FastAPI
@@ -44,6 +52,7 @@ app = FastAPI(
     description=settings.APP_DESCRIPTION,
     version=settings.APP_VERSION,
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,  # orjson در صورت نصب بودن
     docs_url="/docs",           # Swagger UI
     redoc_url="/redoc",         # ReDoc
     openapi_url="/openapi.json",
@@ -61,6 +70,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# فشرده‌سازی پاسخ‌های بزرگ (gzip/br)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
 
 # ===== Exception Handlers =====
 
@@ -134,6 +152,8 @@ def health_check():
     return {
         "status": "healthy",
         "database": "connected",
+        "pools": get_pool_status(),
+        "ingestion": ingestion_queue.stats(),
     }
 
 
@@ -8,11 +8,20 @@ from app.models.user import User
 from app.models.athlete import Athlete, AthleteInjury, AthleteMeasurement
 from app.models.food import FoodCategory, Food
 from app.models.exercise import MuscleGroup, Exercise
+from app.models.injury_restriction import InjuryRestriction
 from app.models.supplement import SupplementCategory, Supplement
-from app.models.training import TrainingPlan, TrainingDay, WorkoutItem
+from app.models.training import TrainingPlan, TrainingDay, WorkoutItem, TrainingProgression
 from app.models.diet import DietPlan, DietItem
 from app.models.supplement_plan import SupplementPlan, SupplementPlanItem
+from app.models.plan_template import (
+    TrainingTemplate, TrainingTemplateDay, TrainingTemplateItem,
+    DietTemplate, DietTemplateItem,
+)
+from app.models.plan_history import PlanVersion
 from app.models.progress import ProgressRecord
+from app.models.body_composition import BodyComposition
+from app.models.adaptive_tdee import AdaptiveTDEE
+from app.models import ownership  # noqa: F401  ثبت listener های coach_id
 
 __all__ = [
     # User & Athlete
@@ -26,6 +35,7 @@ __all__ = [
     "Food",
     "MuscleGroup",
     "Exercise",
+    "InjuryRestriction",
     "SupplementCategory",
     "Supplement",
     
@@ -33,11 +43,24 @@ __all__ = [
     "TrainingPlan",
     "TrainingDay",
     "WorkoutItem",
+    "TrainingProgression",
     "DietPlan",
     "DietItem",
     "SupplementPlan",
     "SupplementPlanItem",
     
+    # Templates
+    "TrainingTemplate",
+    "TrainingTemplateDay",
+    "TrainingTemplateItem",
+    "DietTemplate",
+    "DietTemplateItem",
+    
+    # History
+    "PlanVersion",
+    
     # Progress
     "ProgressRecord",
+    "BodyComposition",
+    "AdaptiveTDEE",
 ]
@@ -0,0 +1,38 @@
+"""
+Adaptive TDEE Model
+===================
+کش وضعیت تخمین TDEE تطبیقی هر شاگرد
+"""
+
+from sqlalchemy import Integer, Float, ForeignKey, Date
+from sqlalchemy.orm import Mapped, mapped_column
+from typing import Optional
+from datetime import date
+
+from app.db.base import Base, TimestampMixin
+
+
+class AdaptiveTDEE(Base, TimestampMixin):
+    """
+    TDEE تطبیقی
+    ===========
+    وضعیت تخمین‌گر آنلاین (AdaptiveTDEEEngine)؛ فقط با ثبت وزن جدید بروز می‌شود
+    """
+    __tablename__ = "adaptive_tdee"
+    
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    athlete_id: Mapped[int] = mapped_column(
+        ForeignKey("athletes.id", ondelete="CASCADE"), unique=True, index=True
+    )
+    
+    last_date: Mapped[date] = mapped_column(Date)  # تاریخ آخرین وزن اعمال‌شده
+    weight_trend: Mapped[float] = mapped_column(Float)  # وزن روند (kg)
+    weekly_change: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # kg در هفته
+    
+    tdee: Mapped[float] = mapped_column(Float)  # تخمین فعلی (kcal)
+    prior_tdee: Mapped[float] = mapped_column(Float)  # تخمین اولیه با ضریب فعالیت
+    observations: Mapped[int] = mapped_column(Integer, default=0)
+    intake_calories: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # کالری برنامه فعال در آخرین بروزرسانی
+    
+    def __repr__(self) -> str:
+        return f"<AdaptiveTDEE(athlete_id={self.athlete_id}, tdee={self.tdee:.0f})>"
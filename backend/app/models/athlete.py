@@ -4,7 +4,7 @@ Athlete Model
 مدل شاگرد (ورزشکار)
 """
 
-from sqlalchemy import String, Integer, Float, Boolean, Text, ForeignKey, Date, Enum as SQLEnum
+from sqlalchemy import String, Integer, Float, Boolean, Text, ForeignKey, Date, Index, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional, List, TYPE_CHECKING
 from datetime import date
@@ -60,6 +60,8 @@ class Athlete(Base, TimestampMixin):
     شامل تمام اطلاعات فردی، پزشکی و مالی
     """
     __tablename__ = "athletes"
+    # شناسه شاگرد حذف‌شده دوباره استفاده نمی‌شود (کلید کش دسترسی)
+    __table_args__ = {"sqlite_autoincrement": True}
     
     # شناسه
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -177,6 +179,10 @@ class AthleteMeasurement(Base):
     ثبت دوره‌ای اندازه‌گیری‌های بدن برای پیگیری پیشرفت
     """
     __tablename__ = "athlete_measurements"
+    __table_args__ = (
+        # تاریخچه و تحلیل روند اندازه‌گیری‌های یک شاگرد
+        Index("ix_athlete_measurements_athlete_recorded", "athlete_id", "recorded_at"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     athlete_id: Mapped[int] = mapped_column(ForeignKey("athletes.id", ondelete="CASCADE"), index=True)
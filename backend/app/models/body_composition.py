@@ -0,0 +1,42 @@
+"""
+Body Composition Model
+======================
+جدول از پیش محاسبه‌شده ترکیب بدنی
+"""
+
+from sqlalchemy import String, Float, ForeignKey, Date, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from typing import Optional
+from datetime import date
+
+from app.db.base import Base, TimestampMixin
+
+
+class BodyComposition(Base, TimestampMixin):
+    """
+    ترکیب بدنی روزانه
+    =================
+    یک ردیف به ازای هر شاگرد و روز، مشتق‌شده از اندازه‌گیری‌ها و رکوردهای پیشرفت.
+    با ثبت/حذف هر اندازه‌گیری یا رکورد فقط ردیف همان روز دوباره محاسبه می‌شود
+    (BodyCompositionService).
+    """
+    __tablename__ = "body_composition"
+    __table_args__ = (
+        UniqueConstraint("athlete_id", "recorded_at", name="uq_body_composition_athlete_date"),
+    )
+    
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    athlete_id: Mapped[int] = mapped_column(ForeignKey("athletes.id", ondelete="CASCADE"), index=True)
+    recorded_at: Mapped[date] = mapped_column(Date)
+    
+    weight: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # kg
+    # درصد چربی انتخاب‌شده و منبع آن (measured / progress / navy)
+    body_fat: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    body_fat_source: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    navy_body_fat: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # فرمول نیروی دریایی
+    lean_mass: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # توده بدون چربی (kg)
+    fat_mass: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # توده چربی (kg)
+    bmi: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    
+    def __repr__(self) -> str:
+        return f"<BodyComposition(athlete_id={self.athlete_id}, date={self.recorded_at})>"
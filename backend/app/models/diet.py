@@ -28,16 +28,8 @@ class MealType(str, enum.Enum):
     POST_WORKOUT = "بعد تمرین"
 
 
-class DietPlan(Base, TimestampMixin):
-    """
-    برنامه غذایی
-    ============
-    یک برنامه کامل رژیم غذایی
-    """
-    __tablename__ = "diet_plans"
-    
-    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    athlete_id: Mapped[int] = mapped_column(ForeignKey("athletes.id", ondelete="CASCADE"), index=True)
+class DietPlanFields:
+    """فیلدهای محتوای برنامه غذایی (مشترک بین برنامه و قالب برنامه)"""
     
     # اطلاعات پایه
     name: Mapped[str] = mapped_column(String(200), default="برنامه غذایی")
@@ -51,6 +43,52 @@ class DietPlan(Base, TimestampMixin):
     
     # یادداشت‌های کلی
     general_notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+
+class DietItemFields:
+    """فیلدهای محتوای آیتم غذایی (مشترک بین برنامه و قالب برنامه)"""
+    
+    food_id: Mapped[Optional[int]] = mapped_column(ForeignKey("foods.id", ondelete="SET NULL"), nullable=True)
+    
+    # ترتیب در لیست
+    order: Mapped[int] = mapped_column(Integer, default=0)
+    
+    # وعده غذایی
+    meal: Mapped[MealType] = mapped_column(SQLEnum(MealType))
+    
+    # نام غذا (برای غذاهای سفارشی)
+    custom_name: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    
+    # مقدار
+    amount: Mapped[float] = mapped_column(Float, default=100)
+    unit: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    
+    # ماکروهای محاسبه شده (کش برای سرعت بیشتر)
+    calculated_calories: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    calculated_protein: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    calculated_carbs: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    calculated_fat: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    
+    # یادداشت
+    notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+
+class DietPlan(Base, TimestampMixin, DietPlanFields):
+    """
+    برنامه غذایی
+    ============
+    یک برنامه کامل رژیم غذایی
+    """
+    __tablename__ = "diet_plans"
+    # شناسه برنامه حذف‌شده دوباره استفاده نمی‌شود (کلید تاریخچه نسخه‌ها)
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    athlete_id: Mapped[int] = mapped_column(ForeignKey("athletes.id", ondelete="CASCADE"), index=True)
+    # مربی مالک (تکرار athletes.coach_id برای بررسی دسترسی بدون join)
+    coach_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
+    # قالبی که برنامه از آن ساخته شده (فقط برای ردیابی؛ قالب ممکن است حذف شده باشد)
+    template_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     
     # وضعیت
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
@@ -79,7 +117,7 @@ class DietPlan(Base, TimestampMixin):
         return f"<DietPlan(id={self.id}, athlete_id={self.athlete_id}, name={self.name})>"
 
 
-class DietItem(Base, TimestampMixin):
+class DietItem(Base, TimestampMixin, DietItemFields):
     """
     آیتم غذایی
     ==========
@@ -89,29 +127,7 @@ class DietItem(Base, TimestampMixin):
     
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     diet_plan_id: Mapped[int] = mapped_column(ForeignKey("diet_plans.id", ondelete="CASCADE"), index=True)
-    food_id: Mapped[Optional[int]] = mapped_column(ForeignKey("foods.id", ondelete="SET NULL"), nullable=True)
-    
-    # ترتیب در لیست
-    order: Mapped[int] = mapped_column(Integer, default=0)
-    
-    # وعده غذایی
-    meal: Mapped[MealType] = mapped_column(SQLEnum(MealType))
-    
-    # نام غذا (برای غذاهای سفارشی)
-    custom_name: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
-    
-    # مقدار
-    amount: Mapped[float] = mapped_column(Float, default=100)
-    unit: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
-    
-    # ماکروهای محاسبه شده (کش برای سرعت بیشتر)
-    calculated_calories: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
-    calculated_protein: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
-    calculated_carbs: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
-    calculated_fat: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
-    
-    # یادداشت
-    notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    coach_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # مربی مالک (از برنامه)
     
     # روابط
     diet_plan: Mapped["DietPlan"] = relationship("DietPlan", back_populates="items")
@@ -4,11 +4,12 @@ Food Models
 مدل‌های بانک غذاها
 """
 
-from sqlalchemy import String, Float, Integer, Text, ForeignKey, Boolean
+from sqlalchemy import String, Float, Integer, Text, ForeignKey, Boolean, event, select, inspect
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional, List, TYPE_CHECKING
 
 from app.db.base import Base, TimestampMixin
+from app.core.allergens import allergen_tagger
 
 
 class FoodCategory(Base, TimestampMixin):
@@ -74,6 +75,9 @@ class Food(Base, TimestampMixin):
     is_custom: Mapped[bool] = mapped_column(Boolean, default=False)  # غذای سفارشی کاربر
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     
+    # ایندکس حساسیت‌زا (bitmask از app.core.allergens.Allergen)؛ در هر نوشتن محاسبه می‌شود
+    allergen_mask: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    
     # روابط
     category: Mapped["FoodCategory"] = relationship("FoodCategory", back_populates="foods")
     
@@ -96,5 +100,32 @@ class Food(Base, TimestampMixin):
             "fiber": round((self.fiber or 0) * ratio, 1),
         }
     
+    @property
+    def allergens(self) -> List[str]:
+        """کد حساسیت‌زاهای غذا (مثلاً ["dairy"])"""
+        return allergen_tagger.labels(self.allergen_mask)
+    
     def __repr__(self) -> str:
         return f"<Food(id={self.id}, name={self.name}, cal={self.calories})>"
+
+
+@event.listens_for(Food, "before_insert")
+@event.listens_for(Food, "before_update")
+def _tag_allergens(mapper, connection, target: Food) -> None:
+    """به‌روزرسانی allergen_mask هنگام تغییر نام یا دسته غذا"""
+    state = inspect(target)
+    if state.persistent and target.allergen_mask is not None and not any(
+        state.attrs[key].history.has_changes() for key in ("name", "name_en", "category_id")
+    ):
+        return
+    category_table = FoodCategory.__table__
+    category = connection.execute(
+        select(category_table.c.name, category_table.c.name_en)
+        .where(category_table.c.id == target.category_id)
+    ).first()
+    target.allergen_mask = allergen_tagger.tag(
+        target.name,
+        target.name_en,
+        category.name if category else None,
+        category.name_en if category else None,
+    )
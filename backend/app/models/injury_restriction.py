@@ -0,0 +1,33 @@
+"""
+Injury Restriction Model
+========================
+قوانین اختصاصی مربی برای حرکات ممنوعه آسیب‌دیدگی
+"""
+
+from sqlalchemy import String, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from typing import Optional
+
+from app.db.base import Base, TimestampMixin
+
+
+class InjuryRestriction(Base, TimestampMixin):
+    """
+    قانون حرکت ممنوعه
+    =================
+    علاوه بر INJURY_EXERCISE_RESTRICTIONS؛ هر قانون یا یک عبارت
+    (مثلاً «پرس پا» برای همه حرکات شامل این توکن‌ها) یا یک حرکت مشخص است
+    """
+    __tablename__ = "injury_restrictions"
+    
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    coach_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    
+    body_part: Mapped[str] = mapped_column(String(100))  # کمر، زانو، شانه
+    pattern: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    exercise_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("exercises.id", ondelete="CASCADE"), nullable=True
+    )
+    
+    def __repr__(self) -> str:
+        return f"<InjuryRestriction(coach_id={self.coach_id}, body_part={self.body_part})>"
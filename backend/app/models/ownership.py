@@ -0,0 +1,86 @@
+"""
+Plan Ownership
+==============
+نگهداری ستون تکراری coach_id روی برنامه‌ها، روزها و آیتم‌ها
+
+هر ردیف برنامه/روز/آیتم شناسه مربی مالک را خودش نگه می‌دارد تا هر تغییر
+(UPDATE/DELETE) با یک شرط روی همان ردیف مجاز شود و زنجیره
+آیتم -> روز -> برنامه -> شاگرد -> مربی پیموده نشود.
+
+مقدار هنگام insert از والد گرفته می‌شود (والد داخل session در همان flush
+قبل از فرزند insert شده است). مالک شاگرد و شاگرد برنامه عوض نمی‌شوند،
+پس به‌روزرسانی لازم نیست. insert های دسته‌ای (Core) باید coach_id را
+خودشان در ردیف‌ها بگذارند.
+"""
+
+from typing import Dict, Tuple, Type, Union
+
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.athlete import Athlete
+from app.models.training import TrainingPlan, TrainingDay, WorkoutItem, TrainingProgression
+from app.models.diet import DietPlan, DietItem
+from app.models.supplement_plan import SupplementPlan, SupplementPlanItem
+
+
+# مدل -> (مدل والد، ستون کلید خارجی، نام رابطه با والد)؛ والدها قبل از فرزندان
+OWNERSHIP_CHAIN: Dict[Type, Tuple[Type, str, str]] = {
+    TrainingPlan: (Athlete, "athlete_id", "athlete"),
+    TrainingDay: (TrainingPlan, "training_plan_id", "training_plan"),
+    WorkoutItem: (TrainingDay, "training_day_id", "training_day"),
+    TrainingProgression: (TrainingPlan, "training_plan_id", "training_plan"),
+    DietPlan: (Athlete, "athlete_id", "athlete"),
+    DietItem: (DietPlan, "diet_plan_id", "diet_plan"),
+    SupplementPlan: (Athlete, "athlete_id", "athlete"),
+    SupplementPlanItem: (SupplementPlan, "supplement_plan_id", "supplement_plan"),
+}
+
+
+def _set_coach_id(mapper, connection, target) -> None:
+    """پر کردن coach_id از والد (شیء داخل session یا یک SELECT روی کلید اصلی)"""
+    if target.coach_id is not None:
+        return
+    parent_model, fk_name, relation = OWNERSHIP_CHAIN[mapper.class_]
+
+    # رابطه بارگذاری‌نشده را lazy load نمی‌کنیم (داخل flush)
+    parent = inspect(target).attrs[relation].loaded_value
+    if parent is not None and hasattr(parent, "coach_id") and parent.coach_id is not None:
+        target.coach_id = parent.coach_id
+        return
+
+    parent_id = getattr(target, fk_name)
+    if parent_id is None and parent is not None:
+        parent_id = parent.id
+    table = parent_model.__table__
+    target.coach_id = connection.scalar(select(table.c.coach_id).where(table.c.id == parent_id))
+
+
+for _model in OWNERSHIP_CHAIN:
+    event.listen(_model, "before_insert", _set_coach_id)
+
+
+def backfill_coach_ids(bind: Union[Session, Connection]) -> int:
+    """
+    پر کردن coach_id ردیف‌های قدیمی (Idempotent)
+
+    Returns:
+        تعداد ردیف‌های به‌روزرسانی‌شده
+    """
+    total = 0
+    for model, (parent_model, fk_name, _) in OWNERSHIP_CHAIN.items():
+        table = model.__table__
+        parent = parent_model.__table__
+        owner = (
+            select(parent.c.coach_id)
+            .where(parent.c.id == table.c[fk_name])
+            .scalar_subquery()
+        )
+        result = bind.execute(
+            update(table)
+            .where(table.c.coach_id.is_(None), owner.is_not(None))
+            .values(coach_id=owner, updated_at=table.c.updated_at)
+        )
+        total += result.rowcount or 0
+    return total
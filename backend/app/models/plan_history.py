@@ -0,0 +1,69 @@
+"""
+Plan History Model
+==================
+تاریخچه نسخه‌های برنامه (تمرینی، غذایی و مکمل)
+
+جدول فقط افزودنی است: هر ذخیره یک ردیف با تفاوت ستون به ستون نسبت به نسخه
+قبل (delta) و هر چند نسخه یک بار کل سند (snapshot). کلید خارجی به جدول
+برنامه ندارد تا با حذف برنامه تاریخچه از بین نرود.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional, Union
+
+from sqlalchemy import String, Integer, Boolean, DateTime, JSON, UniqueConstraint, cast, func, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from app.db.base import Base
+
+
+class PlanVersion(Base):
+    """
+    نسخه برنامه
+    ===========
+    plan_type: training / diet / supplement
+    data: کل سند (is_snapshot) یا تفاوت با نسخه قبل
+    is_deleted: نشانه حذف برنامه (snapshot با سند خالی)
+    """
+    __tablename__ = "plan_versions"
+    __table_args__ = (
+        UniqueConstraint("plan_type", "plan_id", "version", name="uq_plan_version"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    plan_type: Mapped[str] = mapped_column(String(20))
+    plan_id: Mapped[int] = mapped_column(Integer)
+    coach_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
+    version: Mapped[int] = mapped_column(Integer)
+    is_snapshot: Mapped[bool] = mapped_column(Boolean, default=False)
+    # nullable تا ensure_columns بتواند ستون را به جدول موجود اضافه کند
+    is_deleted: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True, default=False)
+    data: Mapped[Dict[str, Any]] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<PlanVersion({self.plan_type}:{self.plan_id} v{self.version})>"
+
+
+def backfill_deleted_markers(bind: Union[Session, Connection]) -> int:
+    """
+    پر کردن is_deleted ردیف‌های قدیمی‌تر از این ستون (Idempotent)
+
+    نشانه‌های حذف قدیمی snapshot با سند خالی هستند؛ مقایسه روی متن JSON انجام
+    می‌شود چون PostgreSQL عملگر برابری برای نوع json ندارد.
+
+    Returns:
+        تعداد ردیف‌های به‌روزرسانی‌شده
+    """
+    table = PlanVersion.__table__
+    result = bind.execute(
+        update(table)
+        .where(table.c.is_deleted.is_(None))
+        .values(is_deleted=(table.c.is_snapshot == True) & (cast(table.c.data, String) == "{}"))
+    )
+    return result.rowcount or 0
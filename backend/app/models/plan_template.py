@@ -0,0 +1,102 @@
+"""
+Plan Template Models
+====================
+مدل‌های قالب برنامه تمرینی و غذایی
+
+قالب همان محتوای برنامه (روزها و آیتم‌ها) را بدون شاگرد نگه می‌دارد و
+ستون‌هایش از mixin های مشترک با برنامه می‌آید؛ پس تخصیص قالب به شاگردان
+با INSERT ... SELECT ستون به ستون انجام می‌شود.
+"""
+
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from typing import List
+
+from app.db.base import Base, TimestampMixin
+from app.models.training import TrainingPlanFields, TrainingDayFields, WorkoutItemFields
+from app.models.diet import DietPlanFields, DietItemFields
+
+
+class TrainingTemplate(Base, TimestampMixin, TrainingPlanFields):
+    """
+    قالب برنامه تمرینی
+    ==================
+    مثال: PPL شش روزه که برای چند شاگرد استفاده می‌شود
+    """
+    __tablename__ = "training_templates"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    coach_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+
+    # روابط
+    days: Mapped[List["TrainingTemplateDay"]] = relationship(
+        "TrainingTemplateDay",
+        back_populates="template",
+        cascade="all, delete-orphan",
+        order_by="TrainingTemplateDay.day_number"
+    )
+
+    def __repr__(self) -> str:
+        return f"<TrainingTemplate(id={self.id}, coach_id={self.coach_id}, name={self.name})>"
+
+
+class TrainingTemplateDay(Base, TimestampMixin, TrainingDayFields):
+    """روز قالب برنامه تمرینی"""
+    __tablename__ = "training_template_days"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    template_id: Mapped[int] = mapped_column(ForeignKey("training_templates.id", ondelete="CASCADE"), index=True)
+
+    # روابط
+    template: Mapped["TrainingTemplate"] = relationship("TrainingTemplate", back_populates="days")
+    workout_items: Mapped[List["TrainingTemplateItem"]] = relationship(
+        "TrainingTemplateItem",
+        back_populates="template_day",
+        cascade="all, delete-orphan",
+        order_by="TrainingTemplateItem.order"
+    )
+
+
+class TrainingTemplateItem(Base, TimestampMixin, WorkoutItemFields):
+    """حرکت قالب برنامه تمرینی"""
+    __tablename__ = "training_template_items"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    template_day_id: Mapped[int] = mapped_column(ForeignKey("training_template_days.id", ondelete="CASCADE"), index=True)
+
+    # روابط
+    template_day: Mapped["TrainingTemplateDay"] = relationship("TrainingTemplateDay", back_populates="workout_items")
+
+
+class DietTemplate(Base, TimestampMixin, DietPlanFields):
+    """
+    قالب برنامه غذایی
+    =================
+    مثال: رژیم کات ۲۰۰۰ کالری
+    """
+    __tablename__ = "diet_templates"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    coach_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+
+    # روابط
+    items: Mapped[List["DietTemplateItem"]] = relationship(
+        "DietTemplateItem",
+        back_populates="template",
+        cascade="all, delete-orphan",
+        order_by="DietTemplateItem.order"
+    )
+
+    def __repr__(self) -> str:
+        return f"<DietTemplate(id={self.id}, coach_id={self.coach_id}, name={self.name})>"
+
+
+class DietTemplateItem(Base, TimestampMixin, DietItemFields):
+    """آیتم قالب برنامه غذایی"""
+    __tablename__ = "diet_template_items"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    template_id: Mapped[int] = mapped_column(ForeignKey("diet_templates.id", ondelete="CASCADE"), index=True)
+
+    # روابط
+    template: Mapped["DietTemplate"] = relationship("DietTemplate", back_populates="items")
@@ -4,7 +4,7 @@ Progress Record Model
 مدل ثبت پیشرفت
 """
 
-from sqlalchemy import String, Integer, Float, Text, ForeignKey, Date
+from sqlalchemy import String, Integer, Float, Text, ForeignKey, Date, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional, TYPE_CHECKING
 from datetime import date
@@ -22,6 +22,10 @@ class ProgressRecord(Base, TimestampMixin):
     ثبت دوره‌ای پیشرفت ورزشکار
     """
     __tablename__ = "progress_records"
+    __table_args__ = (
+        # کوئری‌های بازه زمانی و نمودار یک شاگرد
+        Index("ix_progress_records_athlete_recorded", "athlete_id", "recorded_at"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     athlete_id: Mapped[int] = mapped_column(ForeignKey("athletes.id", ondelete="CASCADE"), index=True)
@@ -22,9 +22,13 @@ class SupplementPlan(Base, TimestampMixin):
     لیست مکمل‌های تجویز شده برای یک ورزشکار
     """
     __tablename__ = "supplement_plans"
+    # شناسه برنامه حذف‌شده دوباره استفاده نمی‌شود (کلید تاریخچه نسخه‌ها)
+    __table_args__ = {"sqlite_autoincrement": True}
     
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     athlete_id: Mapped[int] = mapped_column(ForeignKey("athletes.id", ondelete="CASCADE"), index=True)
+    # مربی مالک (تکرار athletes.coach_id برای بررسی دسترسی بدون join)
+    coach_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
     
     # اطلاعات پایه
     name: Mapped[str] = mapped_column(String(200), default="نسخه مکمل")
@@ -59,6 +63,7 @@ class SupplementPlanItem(Base, TimestampMixin):
     
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     supplement_plan_id: Mapped[int] = mapped_column(ForeignKey("supplement_plans.id", ondelete="CASCADE"), index=True)
+    coach_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # مربی مالک (از برنامه)
     supplement_id: Mapped[Optional[int]] = mapped_column(ForeignKey("supplements.id", ondelete="SET NULL"), nullable=True)
     
     # ترتیب در لیست
@@ -4,9 +4,9 @@ Training Plan Models
 مدل‌های برنامه تمرینی
 """
 
-from sqlalchemy import String, Integer, Float, Text, ForeignKey, Boolean, Enum as SQLEnum
+from sqlalchemy import String, Integer, Float, Text, ForeignKey, Boolean, JSON, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from typing import Optional, List, TYPE_CHECKING
+from typing import Any, Dict, Optional, List, TYPE_CHECKING
 import enum
 
 from app.db.base import Base, TimestampMixin
@@ -28,16 +28,8 @@ class SetType(str, enum.Enum):
     CLUSTER = "cluster"         # کلاستر
 
 
-class TrainingPlan(Base, TimestampMixin):
-    """
-    برنامه تمرینی
-    =============
-    یک برنامه کامل شامل چند روز تمرینی
-    """
-    __tablename__ = "training_plans"
-    
-    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    athlete_id: Mapped[int] = mapped_column(ForeignKey("athletes.id", ondelete="CASCADE"), index=True)
+class TrainingPlanFields:
+    """فیلدهای محتوای برنامه تمرینی (مشترک بین برنامه و قالب برنامه)"""
     
     # اطلاعات پایه
     name: Mapped[str] = mapped_column(String(200), default="برنامه تمرینی")
@@ -48,33 +40,10 @@ class TrainingPlan(Base, TimestampMixin):
     
     # نوع تقسیم‌بندی
     split_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # PPL, Upper/Lower, Full Body
-    
-    # وضعیت
-    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
-    
-    # روابط
-    athlete: Mapped["Athlete"] = relationship("Athlete", back_populates="training_plans")
-    days: Mapped[List["TrainingDay"]] = relationship(
-        "TrainingDay",
-        back_populates="training_plan",
-        cascade="all, delete-orphan",
-        order_by="TrainingDay.day_number"
-    )
-    
-    def __repr__(self) -> str:
-        return f"<TrainingPlan(id={self.id}, athlete_id={self.athlete_id}, name={self.name})>"
 
 
-class TrainingDay(Base, TimestampMixin):
-    """
-    روز تمرینی
-    ==========
-    یک روز از برنامه تمرینی
-    """
-    __tablename__ = "training_days"
-    
-    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    training_plan_id: Mapped[int] = mapped_column(ForeignKey("training_plans.id", ondelete="CASCADE"), index=True)
+class TrainingDayFields:
+    """فیلدهای محتوای روز تمرینی (مشترک بین برنامه و قالب برنامه)"""
     
     # شماره روز (۱ تا ۷)
     day_number: Mapped[int] = mapped_column(Integer)
@@ -87,30 +56,11 @@ class TrainingDay(Base, TimestampMixin):
     
     # آیا روز استراحت است؟
     is_rest_day: Mapped[bool] = mapped_column(Boolean, default=False)
-    
-    # روابط
-    training_plan: Mapped["TrainingPlan"] = relationship("TrainingPlan", back_populates="days")
-    workout_items: Mapped[List["WorkoutItem"]] = relationship(
-        "WorkoutItem",
-        back_populates="training_day",
-        cascade="all, delete-orphan",
-        order_by="WorkoutItem.order"
-    )
-    
-    def __repr__(self) -> str:
-        return f"<TrainingDay(id={self.id}, day={self.day_number}, name={self.name})>"
 
 
-class WorkoutItem(Base, TimestampMixin):
-    """
-    آیتم تمرینی
-    ===========
-    یک حرکت در برنامه روزانه
-    """
-    __tablename__ = "workout_items"
+class WorkoutItemFields:
+    """فیلدهای محتوای آیتم تمرینی (مشترک بین برنامه و قالب برنامه)"""
     
-    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    training_day_id: Mapped[int] = mapped_column(ForeignKey("training_days.id", ondelete="CASCADE"), index=True)
     exercise_id: Mapped[Optional[int]] = mapped_column(ForeignKey("exercises.id", ondelete="SET NULL"), nullable=True)
     
     # ترتیب در لیست
@@ -145,6 +95,78 @@ class WorkoutItem(Base, TimestampMixin):
     # حرکات اضافی برای سوپرست (نام حرکت دوم و سوم)
     secondary_exercise_name: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
     tertiary_exercise_name: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+
+
+class TrainingPlan(Base, TimestampMixin, TrainingPlanFields):
+    """
+    برنامه تمرینی
+    =============
+    یک برنامه کامل شامل چند روز تمرینی
+    """
+    __tablename__ = "training_plans"
+    # شناسه برنامه حذف‌شده دوباره استفاده نمی‌شود (کلید تاریخچه نسخه‌ها)
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    athlete_id: Mapped[int] = mapped_column(ForeignKey("athletes.id", ondelete="CASCADE"), index=True)
+    # مربی مالک (تکرار athletes.coach_id برای بررسی دسترسی بدون join)
+    coach_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
+    # قالبی که برنامه از آن ساخته شده (فقط برای ردیابی؛ قالب ممکن است حذف شده باشد)
+    template_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    
+    # وضعیت
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    
+    # روابط
+    athlete: Mapped["Athlete"] = relationship("Athlete", back_populates="training_plans")
+    days: Mapped[List["TrainingDay"]] = relationship(
+        "TrainingDay",
+        back_populates="training_plan",
+        cascade="all, delete-orphan",
+        order_by="TrainingDay.day_number"
+    )
+    
+    def __repr__(self) -> str:
+        return f"<TrainingPlan(id={self.id}, athlete_id={self.athlete_id}, name={self.name})>"
+
+
+class TrainingDay(Base, TimestampMixin, TrainingDayFields):
+    """
+    روز تمرینی
+    ==========
+    یک روز از برنامه تمرینی
+    """
+    __tablename__ = "training_days"
+    
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    training_plan_id: Mapped[int] = mapped_column(ForeignKey("training_plans.id", ondelete="CASCADE"), index=True)
+    coach_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # مربی مالک (از برنامه)
+    template_day_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # روز قالب منبع
+    
+    # روابط
+    training_plan: Mapped["TrainingPlan"] = relationship("TrainingPlan", back_populates="days")
+    workout_items: Mapped[List["WorkoutItem"]] = relationship(
+        "WorkoutItem",
+        back_populates="training_day",
+        cascade="all, delete-orphan",
+        order_by="WorkoutItem.order"
+    )
+    
+    def __repr__(self) -> str:
+        return f"<TrainingDay(id={self.id}, day={self.day_number}, name={self.name})>"
+
+
+class WorkoutItem(Base, TimestampMixin, WorkoutItemFields):
+    """
+    آیتم تمرینی
+    ===========
+    یک حرکت در برنامه روزانه
+    """
+    __tablename__ = "workout_items"
+    
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    training_day_id: Mapped[int] = mapped_column(ForeignKey("training_days.id", ondelete="CASCADE"), index=True)
+    coach_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # مربی مالک (از روز)
     
     # روابط
     training_day: Mapped["TrainingDay"] = relationship("TrainingDay", back_populates="workout_items")
@@ -159,3 +181,38 @@ class WorkoutItem(Base, TimestampMixin):
     
     def __repr__(self) -> str:
         return f"<WorkoutItem(id={self.id}, exercise={self.display_name}, sets={self.sets})>"
+
+
+class TrainingProgression(Base, TimestampMixin):
+    """
+    جدول پیشرفت برنامه
+    ==================
+    وزن/شدت/تکرار هر حرکت در هر هفته (ماتریس هفته × حرکت) که یک بار
+    تولید و برای نمایش و چاپ بدون محاسبه دوباره خوانده می‌شود.
+    
+    items: [{id, day_number, name, one_rm}] به ترتیب ستون‌های ماتریس
+    table: {"percent": [[...]], "reps": [[...]], "load": [[...]]} با سطر هر هفته
+    plan_version: نسخه برنامه (تاریخچه) هنگام تولید؛ برای تشخیص جدول قدیمی
+    """
+    __tablename__ = "training_progressions"
+    
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    training_plan_id: Mapped[int] = mapped_column(
+        ForeignKey("training_plans.id", ondelete="CASCADE"), unique=True, index=True
+    )
+    coach_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # مربی مالک (از برنامه)
+    
+    scheme: Mapped[str] = mapped_column(String(20))  # linear / dup / block
+    weeks: Mapped[int] = mapped_column(Integer)
+    step_percent: Mapped[float] = mapped_column(Float)
+    rounding: Mapped[float] = mapped_column(Float)
+    plan_version: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    
+    items: Mapped[List[Dict[str, Any]]] = mapped_column(JSON)
+    table: Mapped[Dict[str, Any]] = mapped_column(JSON)
+    
+    # روابط (بدون back_populates؛ حذف برنامه با CASCADE دیتابیس)
+    training_plan: Mapped["TrainingPlan"] = relationship("TrainingPlan")
+    
+    def __repr__(self) -> str:
+        return f"<TrainingProgression(plan_id={self.training_plan_id}, scheme={self.scheme}, weeks={self.weeks})>"
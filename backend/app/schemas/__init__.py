@@ -15,7 +15,8 @@ from app.schemas.food import (
     FoodCategoryCreate, FoodCategoryResponse, FoodCreate, FoodResponse, FoodSearch
 )
 from app.schemas.exercise import (
-    MuscleGroupCreate, MuscleGroupResponse, ExerciseCreate, ExerciseResponse, ExerciseSearch
+    MuscleGroupCreate, MuscleGroupResponse, ExerciseCreate, ExerciseResponse, ExerciseSearch,
+    InjuryRestrictionCreate, InjuryRestrictionResponse
 )
 from app.schemas.supplement import (
     SupplementCategoryCreate, SupplementCategoryResponse,
@@ -24,17 +25,35 @@ from app.schemas.supplement import (
 from app.schemas.training import (
     TrainingPlanCreate, TrainingPlanUpdate, TrainingPlanResponse,
     TrainingDayCreate, TrainingDayResponse,
-    WorkoutItemCreate, WorkoutItemResponse
+    WorkoutItemCreate, WorkoutItemResponse,
+    TrainingGenerateRequest, TrainingGenerateResponse,
+    TrainingPlanDocument, TrainingDayUpsert, WorkoutItemUpsert,
+    TrainingProgressionRequest, TrainingProgressionResponse
 )
 from app.schemas.diet import (
     DietPlanCreate, DietPlanUpdate, DietPlanResponse,
-    DietItemCreate, DietItemResponse, MacroSummary
+    DietItemCreate, DietItemResponse, MacroSummary,
+    DietGenerateRequest, DietGenerateResponse, RosterGenerateRequest,
+    DietPlanDocument, DietItemUpsert
 )
 from app.schemas.supplement_plan import (
     SupplementPlanCreate, SupplementPlanUpdate, SupplementPlanResponse,
-    SupplementPlanItemCreate, SupplementPlanItemResponse
+    SupplementPlanItemCreate, SupplementPlanItemResponse,
+    SupplementPlanBulkAssign, SupplementPlanBulkAssignResponse
 )
-from app.schemas.progress import ProgressRecordCreate, ProgressRecordResponse
+from app.schemas.plan_template import (
+    TrainingTemplateCreate, TrainingTemplateResponse,
+    DietTemplateCreate, DietTemplateResponse, PlanTemplateSummary,
+    TemplateFromPlanRequest, TemplateAssignRequest, TemplateAssignResponse
+)
+from app.schemas.plan_history import (
+    PlanType, PlanVersionSummary, PlanVersionDocument, PlanVersionDiff
+)
+from app.schemas.progress import (
+    ProgressRecordCreate, ProgressRecordResponse, ProgressSummary, ProgressSeries
+)
+from app.schemas.workspace import AthleteWorkspace
+from app.schemas.ingestion import MeasurementIngest, IngestionRequest, IngestionResponse
 from app.schemas.common import MessageResponse, PaginatedResponse
 
 __all__ = [
@@ -44,22 +63,35 @@ __all__ = [
     # Athlete
     "AthleteCreate", "AthleteUpdate", "AthleteResponse", "AthleteListResponse",
     "InjuryCreate", "InjuryResponse", "MeasurementCreate", "MeasurementResponse",
+    "AthleteWorkspace",
     
     # Data Banks
     "FoodCategoryCreate", "FoodCategoryResponse", "FoodCreate", "FoodResponse", "FoodSearch",
     "MuscleGroupCreate", "MuscleGroupResponse", "ExerciseCreate", "ExerciseResponse", "ExerciseSearch",
+    "InjuryRestrictionCreate", "InjuryRestrictionResponse",
     "SupplementCategoryCreate", "SupplementCategoryResponse", "SupplementCreate", "SupplementResponse",
     
     # Plans
     "TrainingPlanCreate", "TrainingPlanUpdate", "TrainingPlanResponse",
     "TrainingDayCreate", "TrainingDayResponse", "WorkoutItemCreate", "WorkoutItemResponse",
+    "TrainingGenerateRequest", "TrainingGenerateResponse",
+    "TrainingPlanDocument", "TrainingDayUpsert", "WorkoutItemUpsert",
+    "TrainingProgressionRequest", "TrainingProgressionResponse",
     "DietPlanCreate", "DietPlanUpdate", "DietPlanResponse",
     "DietItemCreate", "DietItemResponse", "MacroSummary",
+    "DietGenerateRequest", "DietGenerateResponse", "RosterGenerateRequest",
+    "DietPlanDocument", "DietItemUpsert",
     "SupplementPlanCreate", "SupplementPlanUpdate", "SupplementPlanResponse",
     "SupplementPlanItemCreate", "SupplementPlanItemResponse",
+    "SupplementPlanBulkAssign", "SupplementPlanBulkAssignResponse",
+    "TrainingTemplateCreate", "TrainingTemplateResponse",
+    "DietTemplateCreate", "DietTemplateResponse", "PlanTemplateSummary",
+    "TemplateFromPlanRequest", "TemplateAssignRequest", "TemplateAssignResponse",
+    "PlanType", "PlanVersionSummary", "PlanVersionDocument", "PlanVersionDiff",
     
     # Progress
-    "ProgressRecordCreate", "ProgressRecordResponse",
+    "ProgressRecordCreate", "ProgressRecordResponse", "ProgressSummary", "ProgressSeries",
+    "MeasurementIngest", "IngestionRequest", "IngestionResponse",
     
     # Common
     "MessageResponse", "PaginatedResponse",
@@ -5,7 +5,7 @@ Athlete Schemas
 """
 
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional, List
+from typing import Optional, List, Dict, Literal
 from datetime import date, datetime
 from enum import Enum
 
@@ -103,6 +103,62 @@ class MeasurementResponse(MeasurementBase):
         from_attributes = True
 
 
+# فیلدهای عددی اندازه‌گیری برای تحلیل روند
+MeasurementField = Literal[
+    "weight", "body_fat", "neck", "chest", "shoulders", "waist", "hip",
+    "thigh_right", "thigh_left", "arm_right", "arm_left",
+    "forearm_right", "forearm_left", "calf_right", "calf_left", "wrist",
+]
+
+
+class FieldTrend(BaseModel):
+    """روند یک فیلد (آرایه‌های هم‌طول با dates)"""
+    value: List[Optional[float]]
+    delta: List[Optional[float]]  # تغییر نسبت به اندازه‌گیری قبلی همین فیلد
+    rolling_avg: List[Optional[float]]  # میانگین متحرک window اندازه‌گیری اخیر
+    weekly_rate: List[Optional[float]]  # نرخ تغییر در هفته
+
+
+class MeasurementTrends(BaseModel):
+    """تحلیل روند اندازه‌گیری‌ها"""
+    athlete_id: int
+    window: int
+    dates: List[date]
+    fields: Dict[str, FieldTrend]
+    # درصد چربی فرمول نیروی دریایی از اندازه‌های همان روز و از میانگین متحرک
+    navy_body_fat: List[Optional[float]]
+    navy_body_fat_rolling: List[Optional[float]]
+
+
+class AdaptiveTDEEResponse(BaseModel):
+    """TDEE تطبیقی یک شاگرد"""
+    athlete_id: int
+    tdee: float
+    prior_tdee: float  # تخمین با ضریب فعالیت
+    reliable: bool = False  # تعداد مشاهدات کافی است
+    observations: int
+    weight_trend: float
+    weekly_change: Optional[float] = None
+    intake_calories: Optional[float] = None
+    last_date: date
+    
+    class Config:
+        from_attributes = True
+
+
+class BodyCompositionTimeline(BaseModel):
+    """تایم‌لاین ستونی ترکیب بدنی (آرایه‌های هم‌طول با dates)"""
+    athlete_id: int
+    dates: List[date]
+    weight: List[Optional[float]]
+    body_fat: List[Optional[float]]
+    body_fat_source: List[Optional[str]]  # measured / progress / navy
+    navy_body_fat: List[Optional[float]]
+    lean_mass: List[Optional[float]]
+    fat_mass: List[Optional[float]]
+    bmi: List[Optional[float]]
+
+
 # ===== Athlete Schemas =====
 
 class AthleteBase(BaseModel):
@@ -5,10 +5,12 @@ Diet Plan Schemas
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Literal
 from datetime import datetime
 from enum import Enum
 
+from app.schemas.athlete import Goal
+
 
 class MealType(str, Enum):
     BREAKFAST = "صبحانه"
@@ -110,6 +112,23 @@ class DietPlanUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
+class DietItemUpsert(DietItemCreate):
+    """آیتم غذایی در سند کامل برنامه (بدون id یعنی آیتم جدید)"""
+    id: Optional[int] = None
+
+
+class DietPlanDocument(DietPlanBase):
+    """
+    سند کامل برنامه غذایی برای ذخیره یکجا
+    
+    آیتم‌های بدون id ایجاد، با id ویرایش و آیتم‌های غایب از سند حذف
+    می‌شوند. ترتیب آیتم‌ها همان ترتیب لیست است و ماکروها از روی غذا
+    دوباره محاسبه می‌شوند؛ آیتم سفارشی موجود بدون فیلدهای custom_* ماکروی
+    ذخیره‌شده‌اش را نگه می‌دارد.
+    """
+    items: List[DietItemUpsert] = []
+
+
 class DietPlanResponse(DietPlanBase):
     """پاسخ برنامه غذایی"""
     id: int
@@ -148,3 +167,76 @@ class MealSummary(BaseModel):
     total_protein: float
     total_carbs: float
     total_fat: float
+
+
+# ===== Plan Generation =====
+
+MealPlanType = Literal["standard", "pre_post_workout", "intermittent_fasting"]
+
+
+class DietGenerateRequest(BaseModel):
+    """درخواست تولید خودکار برنامه غذایی"""
+    athlete_id: int
+    meal_plan_type: MealPlanType = "standard"
+    days: int = Field(default=7, ge=1, le=14)
+    name: Optional[str] = Field(None, max_length=200)
+    # اهداف دستی؛ در نبود آن‌ها از محاسبه تغذیه شاگرد
+    target_calories: Optional[int] = Field(None, ge=500, le=10000)
+    target_protein: Optional[int] = Field(None, ge=0, le=500)
+    target_carbs: Optional[int] = Field(None, ge=0, le=1000)
+    target_fat: Optional[int] = Field(None, ge=0, le=500)
+    seed: Optional[int] = None
+    save: bool = True  # ذخیره به عنوان برنامه فعال
+
+
+class RosterGenerateRequest(BaseModel):
+    """درخواست تولید دسته‌ای برنامه غذایی برای شاگردان مربی"""
+    goal: Optional[Goal] = None  # مثلاً cut: همه شاگردان در فاز کات
+    athlete_ids: Optional[List[int]] = Field(None, max_length=5000)
+    active_only: bool = True
+    meal_plan_type: MealPlanType = "standard"
+    days: int = Field(default=7, ge=1, le=14)
+    name: Optional[str] = Field(None, max_length=200)
+    chunk_size: Optional[int] = Field(None, ge=1, le=500)
+
+
+class MacroTargets(BaseModel):
+    """کالری و ماکرو"""
+    calories: float
+    protein: float
+    carbs: float
+    fat: float
+
+
+class GeneratedFood(MacroTargets):
+    """یک غذای تولیدشده"""
+    food_id: int
+    name: str
+    amount: float
+    unit: str
+
+
+class GeneratedMeal(BaseModel):
+    """یک وعده تولیدشده"""
+    meal: MealType
+    targets: MacroTargets
+    items: List[GeneratedFood]
+    totals: MacroTargets
+
+
+class GeneratedDay(BaseModel):
+    """یک روز برنامه تولیدشده"""
+    day: int
+    meals: List[GeneratedMeal]
+    totals: MacroTargets
+
+
+class DietGenerateResponse(BaseModel):
+    """نتیجه تولید برنامه غذایی"""
+    athlete_id: int
+    meal_plan_type: MealPlanType
+    targets: MacroTargets
+    allergies: List[str]
+    days: List[GeneratedDay]
+    plan: Optional[DietPlanResponse] = None  # برنامه فعال (روز اول)
+    day_plan_ids: List[int] = []  # برنامه هر روز به ترتیب روز
@@ -4,7 +4,7 @@ Exercise Schemas
 اسکیماهای تمرین
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
@@ -122,3 +122,28 @@ class ExerciseSearch(BaseModel):
 class MuscleGroupWithExercises(MuscleGroupResponse):
     """گروه عضلانی با لیست تمرینات"""
     exercises: List[ExerciseResponse] = []
+
+
+# ===== Injury Restriction Schemas =====
+
+class InjuryRestrictionCreate(BaseModel):
+    """قانون اختصاصی حرکت ممنوعه (عبارت یا حرکت مشخص)"""
+    body_part: str = Field(..., min_length=2, max_length=100)
+    pattern: Optional[str] = Field(None, min_length=2, max_length=200)
+    exercise_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if not self.pattern and not self.exercise_id:
+            raise ValueError("pattern یا exercise_id لازم است")
+        return self
+
+
+class InjuryRestrictionResponse(InjuryRestrictionCreate):
+    """پاسخ قانون حرکت ممنوعه"""
+    id: int
+    coach_id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -64,6 +64,7 @@ class FoodResponse(FoodBase):
     category_id: int
     is_custom: bool
     is_active: bool
+    allergens: List[str] = []  # کد حساسیت‌زاها (dairy, gluten, ...)
     created_at: datetime
     
     class Config:
@@ -81,6 +82,7 @@ class FoodSearch(BaseModel):
     category_id: Optional[int] = None
     min_protein: Optional[float] = None
     max_calories: Optional[float] = None
+    allergies: Optional[str] = None  # متن حساسیت‌ها (مثل فیلد allergies شاگرد)
     page: int = 1
     page_size: int = 20
 
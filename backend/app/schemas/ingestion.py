@@ -0,0 +1,50 @@
+"""
+Ingestion Schemas
+=================
+اسکیماهای دریافت دسته‌ای داده از ترازو و دستگاه‌های پوشیدنی
+"""
+
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal, Optional
+
+from app.schemas.athlete import MeasurementBase
+from app.schemas.progress import ProgressRecordCreate
+
+
+# حداکثر ردیف در هر درخواست
+MAX_INGEST_ROWS = 5000
+
+
+class MeasurementIngest(MeasurementBase):
+    """اندازه‌گیری دریافتی (همراه با شناسه شاگرد)"""
+    athlete_id: int
+
+
+class IngestionRequest(BaseModel):
+    """درخواست ثبت دسته‌ای"""
+    measurements: List[MeasurementIngest] = Field(default_factory=list, max_length=MAX_INGEST_ROWS)
+    progress_records: List[ProgressRecordCreate] = Field(default_factory=list, max_length=MAX_INGEST_ROWS)
+
+    @model_validator(mode="after")
+    def check_rows(self):
+        rows = len(self.measurements) + len(self.progress_records)
+        if rows == 0:
+            raise ValueError("حداقل یک ردیف لازم است")
+        if rows > MAX_INGEST_ROWS:
+            raise ValueError(f"حداکثر {MAX_INGEST_ROWS} ردیف در هر درخواست")
+        return self
+
+
+class IngestionResponse(BaseModel):
+    """
+    نتیجه ثبت دسته‌ای
+    
+    status:
+        committed: داده در دیتابیس commit شده است
+        accepted: داده در صف است و در flush بعدی نوشته می‌شود
+    """
+    status: Literal["committed", "accepted"]
+    measurements: int
+    progress_records: int
+    batch_id: Optional[int] = None  # شماره flush (فقط برای committed)
+    batch_rows: Optional[int] = None  # تعداد ردیف‌های کل flush
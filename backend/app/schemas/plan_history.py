@@ -0,0 +1,48 @@
+"""
+Plan History Schemas
+====================
+اسکیماهای تاریخچه نسخه‌های برنامه
+"""
+
+from pydantic import BaseModel
+from typing import Any, Dict, List
+from datetime import datetime
+from enum import Enum
+
+
+class PlanType(str, Enum):
+    """نوع برنامه"""
+    TRAINING = "training"
+    DIET = "diet"
+    SUPPLEMENT = "supplement"
+
+
+class PlanVersionSummary(BaseModel):
+    """خلاصه یک نسخه"""
+    version: int
+    is_snapshot: bool
+    deleted: bool = False  # نسخه ثبت حذف برنامه
+    sections: List[str]  # بخش‌های تغییرکرده (plan, days, items)
+    created_at: datetime
+
+
+class PlanVersionDocument(BaseModel):
+    """سند کامل یک نسخه: {"plan": {...}, "items": {"<id>": {...}}}"""
+    plan_type: PlanType
+    plan_id: int
+    version: int
+    document: Dict[str, Any]
+
+
+class PlanVersionDiff(BaseModel):
+    """
+    تفاوت دو نسخه
+
+    changes: {"plan": {ستون: {"old", "new"}},
+              "<بخش>": {"added": {...}, "removed": {...}, "changed": {id: {ستون: {"old", "new"}}}}}
+    """
+    plan_type: PlanType
+    plan_id: int
+    from_version: int
+    to_version: int
+    changes: Dict[str, Any]
@@ -0,0 +1,117 @@
+"""
+Plan Template Schemas
+=====================
+اسکیماهای قالب برنامه تمرینی و غذایی
+"""
+
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+
+from app.schemas.training import TrainingPlanBase, TrainingDayBase, TrainingDayCreate, WorkoutItemBase
+from app.schemas.diet import DietPlanBase, DietItemBase, DietItemCreate
+
+
+# ===== Training Templates =====
+
+class TrainingTemplateCreate(TrainingPlanBase):
+    """ایجاد قالب برنامه تمرینی"""
+    days: List[TrainingDayCreate] = []
+
+
+class TrainingTemplateItemResponse(WorkoutItemBase):
+    """پاسخ حرکت قالب"""
+    id: int
+
+    class Config:
+        from_attributes = True
+
+
+class TrainingTemplateDayResponse(TrainingDayBase):
+    """پاسخ روز قالب"""
+    id: int
+    workout_items: List[TrainingTemplateItemResponse] = []
+
+    class Config:
+        from_attributes = True
+
+
+class TrainingTemplateResponse(TrainingPlanBase):
+    """پاسخ قالب برنامه تمرینی"""
+    id: int
+    days: List[TrainingTemplateDayResponse] = []
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+# ===== Diet Templates =====
+
+class DietTemplateCreate(DietPlanBase):
+    """ایجاد قالب برنامه غذایی"""
+    items: List[DietItemCreate] = []
+
+
+class DietTemplateItemResponse(DietItemBase):
+    """پاسخ آیتم قالب غذایی"""
+    id: int
+    calculated_calories: Optional[float] = None
+    calculated_protein: Optional[float] = None
+    calculated_carbs: Optional[float] = None
+    calculated_fat: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+
+class DietTemplateResponse(DietPlanBase):
+    """پاسخ قالب برنامه غذایی"""
+    id: int
+    items: List[DietTemplateItemResponse] = []
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+# ===== Common =====
+
+class PlanTemplateSummary(BaseModel):
+    """خلاصه قالب (لیست قالب‌های مربی)"""
+    id: int
+    name: str
+    description: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class TemplateFromPlanRequest(BaseModel):
+    """ساخت قالب از روی برنامه موجود"""
+    plan_id: int
+    name: Optional[str] = Field(None, max_length=200)  # پیش‌فرض: نام برنامه
+
+
+class TemplateAssignRequest(BaseModel):
+    """تخصیص قالب به چند شاگرد"""
+    athlete_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    name: Optional[str] = Field(None, max_length=200)  # پیش‌فرض: نام قالب
+    activate: bool = True  # برنامه جدید فعال و برنامه‌های قبلی غیرفعال شوند
+
+
+class AssignedPlan(BaseModel):
+    """برنامه ساخته‌شده برای یک شاگرد"""
+    athlete_id: int
+    plan_id: int
+
+
+class TemplateAssignResponse(BaseModel):
+    """نتیجه تخصیص قالب"""
+    template_id: int
+    created: int
+    plans: List[AssignedPlan]
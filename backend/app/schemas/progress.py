@@ -5,7 +5,7 @@ Progress Record Schemas
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 from datetime import date, datetime
 
 
@@ -82,3 +82,33 @@ class ProgressSummary(BaseModel):
     avg_sleep_quality: Optional[float] = None
     avg_training_adherence: Optional[float] = None
     avg_diet_adherence: Optional[float] = None
+
+
+# فیلدهای عددی قابل رسم در نمودار
+ProgressField = Literal[
+    "weight", "body_fat_percentage", "muscle_mass",
+    "squat_1rm", "bench_1rm", "deadlift_1rm", "ohp_1rm",
+    "cardio_time", "cardio_distance", "resting_heart_rate",
+    "energy_level", "sleep_quality", "stress_level", "soreness_level",
+    "training_adherence", "diet_adherence",
+]
+
+# raw: همه رکوردها، day/week/month: تجمیع، lttb: انتخاب نقاط نماینده
+ProgressResolution = Literal["raw", "day", "week", "month", "lttb"]
+
+
+class ProgressSeries(BaseModel):
+    """
+    سری زمانی ستونی پیشرفت
+    
+    به جای لیست اشیاء، برای هر فیلد یک آرایه هم‌طول با dates برمی‌گردد.
+    برای تجمیع (day/week/month) مقادیر values میانگین bucket هستند و
+    min/max/count هم پر می‌شوند.
+    """
+    athlete_id: int
+    resolution: ProgressResolution
+    dates: List[date]
+    values: Dict[str, List[Optional[float]]]
+    min: Optional[Dict[str, List[Optional[float]]]] = None
+    max: Optional[Dict[str, List[Optional[float]]]] = None
+    count: Optional[List[int]] = None
@@ -8,6 +8,8 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 
+from app.schemas.plan_template import AssignedPlan
+
 
 # ===== Supplement Plan Item Schemas =====
 
@@ -52,6 +54,18 @@ class SupplementPlanCreate(SupplementPlanBase):
     items: List[SupplementPlanItemCreate] = []
 
 
+class SupplementPlanBulkAssign(SupplementPlanBase):
+    """ساخت یک برنامه مکمل یکسان برای چند شاگرد"""
+    athlete_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    items: List[SupplementPlanItemCreate] = []
+
+
+class SupplementPlanBulkAssignResponse(BaseModel):
+    """نتیجه تخصیص دسته‌ای (یک برنامه برای هر شاگرد)"""
+    created: int
+    plans: List[AssignedPlan]
+
+
 class SupplementPlanUpdate(BaseModel):
     """ویرایش برنامه مکمل"""
     name: Optional[str] = Field(None, max_length=200)
@@ -5,10 +5,12 @@ Training Plan Schemas
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, Optional, List, Literal
 from datetime import datetime
 from enum import Enum
 
+from app.schemas.athlete import ExperienceLevel, Goal
+
 
 class SetType(str, Enum):
     NORMAL = "normal"
@@ -127,6 +129,27 @@ class TrainingPlanResponse(TrainingPlanBase):
         from_attributes = True
 
 
+class WorkoutItemUpsert(WorkoutItemBase):
+    """آیتم تمرینی در سند کامل برنامه (بدون id یعنی حرکت جدید)"""
+    id: Optional[int] = None
+
+
+class TrainingDayUpsert(TrainingDayBase):
+    """روز تمرینی در سند کامل برنامه (بدون id یعنی روز جدید)"""
+    id: Optional[int] = None
+    workout_items: List[WorkoutItemUpsert] = []
+
+
+class TrainingPlanDocument(TrainingPlanBase):
+    """
+    سند کامل برنامه تمرینی برای ذخیره یکجا
+    
+    روزها و حرکات بدون id ایجاد، با id ویرایش و موارد غایب از سند حذف
+    می‌شوند. ترتیب حرکات همان ترتیب لیست است.
+    """
+    days: List[TrainingDayUpsert] = []
+
+
 class TrainingPlanSummary(BaseModel):
     """خلاصه برنامه تمرینی"""
     id: int
@@ -140,3 +163,105 @@ class TrainingPlanSummary(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+# ===== Generation Schemas =====
+
+TrainingSplit = Literal["full_body", "upper_lower", "push_pull_legs", "bro_split", "arnold"]
+
+
+class TrainingGenerateRequest(BaseModel):
+    """درخواست تولید خودکار برنامه تمرینی"""
+    athlete_id: int
+    experience_level: Optional[ExperienceLevel] = None  # پیش‌فرض: سطح پروفایل شاگرد
+    goal: Optional[Goal] = None  # پیش‌فرض: هدف پروفایل شاگرد
+    available_days: Optional[int] = Field(None, ge=1, le=7)
+    split_type: Optional[TrainingSplit] = None  # پیش‌فرض: پیشنهاد suggest_split
+    name: Optional[str] = Field(None, max_length=200)
+    seed: Optional[int] = None
+    save: bool = True
+
+
+class GeneratedExercise(BaseModel):
+    """حرکت تولیدشده"""
+    exercise_id: int
+    name: str
+    muscle: str
+    sets: int
+    reps: str
+    rest_seconds: int
+
+
+class GeneratedTrainingDay(BaseModel):
+    """روز تمرینی تولیدشده"""
+    day_number: int
+    name: str
+    muscles: List[str]
+    exercises: List[GeneratedExercise]
+
+
+class TrainingGenerateResponse(BaseModel):
+    """نتیجه تولید برنامه تمرینی"""
+    athlete_id: int
+    split_type: TrainingSplit
+    days_per_week: int
+    experience_level: ExperienceLevel
+    goal: str
+    rep_range: str
+    rest_seconds: int
+    injuries: List[str]
+    restricted: List[str]
+    missing: List[str]  # عضلاتی که حرکت مجازی نداشتند
+    days: List[GeneratedTrainingDay]
+    plan: Optional[TrainingPlanResponse] = None
+
+
+# ===== Progression Schemas =====
+
+ProgressionScheme = Literal["linear", "dup", "block"]
+
+
+class TrainingProgressionRequest(BaseModel):
+    """
+    درخواست تولید جدول پیشرفت برنامه
+    
+    1RM با شناسه حرکت برنامه (one_rms) یا شناسه حرکت بانک (exercise_one_rms،
+    برای همه روزهایی که آن حرکت را دارند) داده می‌شود؛ فقط حرکات دارای 1RM
+    در جدول می‌آیند.
+    """
+    scheme: ProgressionScheme = "linear"
+    weeks: Optional[int] = Field(None, ge=1, le=52)  # پیش‌فرض: duration_weeks برنامه یا ۴
+    step_percent: float = Field(2.5, ge=0, le=10)  # افزایش شدت هفتگی (درصد 1RM)
+    rounding: float = Field(2.5, gt=0, le=10)  # گام گرد کردن وزن (کیلوگرم)
+    one_rms: Dict[int, float] = {}
+    exercise_one_rms: Dict[int, float] = {}
+
+
+class ProgressionItem(BaseModel):
+    """ستون جدول پیشرفت (یک حرکت برنامه)"""
+    id: int
+    day_number: int
+    name: str
+    one_rm: float
+
+
+class TrainingProgressionResponse(BaseModel):
+    """
+    جدول پیشرفت برنامه
+    
+    percent / reps / load ماتریس‌های هفته × حرکت هستند (سطر i = هفته i+1،
+    ستون j = items[j]). stale یعنی برنامه بعد از تولید جدول تغییر کرده است.
+    """
+    training_plan_id: int
+    scheme: ProgressionScheme
+    weeks: int
+    step_percent: float
+    rounding: float
+    plan_version: Optional[int] = None
+    stale: bool = False
+    items: List[ProgressionItem]
+    percent: List[List[float]]
+    reps: List[List[int]]
+    load: List[List[float]]
+    created_at: datetime
+    updated_at: Optional[datetime] = None
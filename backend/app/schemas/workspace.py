@@ -0,0 +1,39 @@
+"""
+Workspace Schemas
+=================
+اسکیمای پنل شاگرد (پروفایل و برنامه‌های فعال در یک پاسخ)
+"""
+
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+from app.schemas.athlete import AthleteResponse, MeasurementResponse
+from app.schemas.training import TrainingPlanResponse, TrainingProgressionResponse
+from app.schemas.diet import DietPlanResponse
+from app.schemas.supplement_plan import SupplementPlanResponse
+
+
+# بخش‌های قابل درخواست با پارامتر fields
+WORKSPACE_FIELDS = (
+    "athlete",
+    "measurements",
+    "training_plan",
+    "training_progression",
+    "diet_plan",
+    "supplement_plan",
+    "nutrition",
+)
+
+
+class AthleteWorkspace(BaseModel):
+    """
+    پنل شاگرد
+    فقط بخش‌های درخواست‌شده در پاسخ می‌آیند (response_model_exclude_unset)
+    """
+    athlete: Optional[AthleteResponse] = None
+    measurements: List[MeasurementResponse] = []
+    training_plan: Optional[TrainingPlanResponse] = None  # برنامه تمرینی فعال
+    training_progression: Optional[TrainingProgressionResponse] = None  # جدول پیشرفت برنامه فعال
+    diet_plan: Optional[DietPlanResponse] = None          # برنامه غذایی فعال
+    supplement_plan: Optional[SupplementPlanResponse] = None  # برنامه مکمل فعال
+    nutrition: Optional[Dict[str, Any]] = None  # خروجی /athletes/{id}/nutrition یا {"error": ...}
@@ -10,6 +10,18 @@ from app.services.food_service import FoodService
 from app.services.exercise_service import ExerciseService
 from app.services.training_service import TrainingService
 from app.services.diet_service import DietService
+from app.services.diet_generation_service import DietGenerationService
+from app.services.training_generation_service import TrainingGenerationService
+from app.services.restriction_service import InjuryRestrictionService
+from app.services.progress_service import ProgressService
+from app.services.body_composition_service import BodyCompositionService
+from app.services.tdee_service import TDEEService
+from app.services.catalog_service import CatalogService
+from app.services.workspace_service import WorkspaceService
+from app.services.access_service import AccessService
+from app.services.plan_template_service import PlanTemplateService
+from app.services.plan_history_service import PlanHistoryService
+from app.services.progression_service import ProgressionService
 
 __all__ = [
     "UserService",
@@ -18,4 +30,16 @@ __all__ = [
     "ExerciseService",
     "TrainingService",
     "DietService",
+    "DietGenerationService",
+    "TrainingGenerationService",
+    "InjuryRestrictionService",
+    "ProgressService",
+    "BodyCompositionService",
+    "TDEEService",
+    "CatalogService",
+    "WorkspaceService",
+    "AccessService",
+    "PlanTemplateService",
+    "PlanHistoryService",
+    "ProgressionService",
 ]
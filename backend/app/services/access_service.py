@@ -0,0 +1,188 @@
+"""
+Access Service
+==============
+بررسی سبک مالکیت (مربی -> شاگرد -> برنامه)
+
+برای بررسی دسترسی فقط ستون coach_id شاگرد خوانده می‌شود (نه کل شاگرد با
+آسیب‌ها و اندازه‌گیری‌ها). با ACCESS_CACHE_SIZE > 0 نگاشت athlete_id -> coach_id
+در یک کش LRU محدود بین درخواست‌ها نگه داشته می‌شود؛ مالک شاگرد هیچ‌وقت عوض
+نمی‌شود و با حذف یا ایجاد شاگرد ورودی کش حذف می‌شود:
+
+- شاگردهای ایجاد/حذف‌شده در flush جمع و بعد از commit از کش حذف می‌شوند
+  (با rollback دور ریخته می‌شوند)
+- DELETE دسته‌ای روی شاگردان یا کاربران از طریق Session (ORM یا Core) و
+  حذف مربی (حذف cascade شاگردانش در پایگاه داده) بعد از commit کل کش را
+  خالی می‌کند
+- تا وقتی Session تغییر commit‌نشده‌ای روی شاگردان دارد، کش از آن پر نمی‌شود
+
+کش مخصوص هر پردازه است: تغییراتی که در پردازه (worker) دیگر یا مستقیم با
+Connection (بیرون از Session) انجام شوند دیده نمی‌شوند. اگر شناسه شاگرد
+حذف‌شده دوباره استفاده شود، ورودی کهنه پردازه دیگر شاگرد جدید را به مربی
+قبلی نسبت می‌دهد؛ برای همین کش به طور پیش‌فرض خاموش است و جدول athletes
+با AUTOINCREMENT ساخته می‌شود (دیتابیس‌های قدیمی‌تر بدون آن نباید کش را در
+استقرار چند پردازه‌ای روشن کنند).
+
+برنامه‌ها، روزها و آیتم‌ها coach_id خودشان را دارند (app.models.ownership)؛
+تغییر آن‌ها با scope_to_coach در همان دستور UPDATE/DELETE مجاز می‌شود.
+"""
+
+import threading
+from collections import OrderedDict
+from itertools import chain
+from typing import List, Optional, Sequence, Type, TypeVar
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.sql import Executable
+
+from app.config import settings
+from app.models.athlete import Athlete
+from app.models.user import User
+
+
+StatementT = TypeVar("StatementT", bound=Executable)
+
+_owner_lock = threading.Lock()
+_owner_cache: "OrderedDict[int, int]" = OrderedDict()
+
+
+# کلید Session.info برای شناسه‌هایی که بعد از commit باید از کش حذف شوند
+# (_ALL یعنی خالی کردن کل کش)
+_PENDING_KEY = "access_cache_evict"
+_ALL = "*"
+_OWNER_TABLES = {Athlete.__tablename__, User.__tablename__}
+
+
+def _evict(athlete_ids) -> None:
+    with _owner_lock:
+        for athlete_id in athlete_ids:
+            _owner_cache.pop(athlete_id, None)
+
+
+def _remember(session: Session, owners) -> None:
+    """پر کردن کش (نه از Session ای که تغییر commit‌نشده روی شاگردان دارد)"""
+    if session.info.get(_PENDING_KEY) or settings.ACCESS_CACHE_SIZE <= 0:
+        return
+    with _owner_lock:
+        _owner_cache.update(owners)
+        while len(_owner_cache) > settings.ACCESS_CACHE_SIZE:
+            _owner_cache.popitem(last=False)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_athletes(session: Session, flush_context) -> None:
+    changed = {
+        obj.id for obj in chain(session.new, session.deleted)
+        if isinstance(obj, Athlete) and obj.id is not None
+    }
+    # شاگردان مربی حذف‌شده با cascade پایگاه داده حذف می‌شوند
+    if any(isinstance(obj, User) for obj in session.deleted):
+        changed.add(_ALL)
+    if changed:
+        session.info.setdefault(_PENDING_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_changes(orm_execute_state: ORMExecuteState) -> None:
+    if not orm_execute_state.is_delete:
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if getattr(table, "name", None) in _OWNER_TABLES:
+        orm_execute_state.session.info.setdefault(_PENDING_KEY, set()).add(_ALL)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    if _ALL in pending:
+        with _owner_lock:
+            _owner_cache.clear()
+    else:
+        _evict(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def scope_to_coach(stmt: StatementT, model: Type, coach_id: Optional[int]) -> StatementT:
+    """
+    محدود کردن SELECT/UPDATE/DELETE به ردیف‌های یک مربی
+
+    برنامه‌ها، روزها و آیتم‌ها ستون coach_id دارند، پس شرط دسترسی در همان
+    دستور و روی همان ردیف بررسی می‌شود (بدون join تا شاگرد).
+
+    Args:
+        coach_id: None یعنی بدون محدودیت (استفاده داخلی)
+    """
+    if coach_id is None:
+        return stmt
+    return stmt.where(model.coach_id == coach_id)
+
+
+class AccessService:
+    """سرویس بررسی دسترسی"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def athlete_owner(self, athlete_id: int) -> Optional[int]:
+        """شناسه مربی شاگرد (None اگر شاگرد وجود نداشته باشد)"""
+        with _owner_lock:
+            coach_id = _owner_cache.get(athlete_id)
+            if coach_id is not None:
+                _owner_cache.move_to_end(athlete_id)
+                return coach_id
+
+        coach_id = self.db.scalar(select(Athlete.coach_id).where(Athlete.id == athlete_id))
+        if coach_id is None:
+            return None
+
+        _remember(self.db, {athlete_id: coach_id})
+        return coach_id
+
+    def owns_athlete(self, athlete_id: int, coach_id: int) -> bool:
+        """آیا شاگرد متعلق به این مربی است"""
+        return self.athlete_owner(athlete_id) == coach_id
+
+    def require_athletes(self, athlete_ids: Sequence[int], coach_id: int) -> List[int]:
+        """
+        بررسی مالکیت چند شاگرد با یک کوئری (برای عملیات دسته‌ای)
+
+        Returns:
+            شناسه‌های درخواستی بدون تکرار و به همان ترتیب
+
+        Raises:
+            ValueError: اگر شاگردی یافت نشود یا متعلق به این مربی نباشد
+        """
+        requested = list(dict.fromkeys(athlete_ids))
+        owners = dict(self.db.execute(
+            select(Athlete.id, Athlete.coach_id).where(Athlete.id.in_(requested))
+        ).all())
+        missing = [athlete_id for athlete_id in requested if owners.get(athlete_id) != coach_id]
+        if missing:
+            raise ValueError(f"شاگرد یافت نشد: {', '.join(map(str, missing))}")
+
+        _remember(self.db, owners)
+        return requested
+
+    def owns_plan(self, plan_model: Type, plan_id: int, coach_id: int) -> Optional[bool]:
+        """
+        آیا برنامه (تمرینی، غذایی یا مکمل) متعلق به این مربی است
+
+        ردیف‌های قدیمی بدون coach_id از طریق مالک شاگرد بررسی می‌شوند.
+
+        Returns:
+            None اگر برنامه وجود نداشته باشد
+        """
+        row = self.db.execute(
+            select(plan_model.athlete_id, plan_model.coach_id).where(plan_model.id == plan_id)
+        ).first()
+        if row is None:
+            return None
+        if row.coach_id is not None:
+            return row.coach_id == coach_id
+        return self.owns_athlete(row.athlete_id, coach_id)
@@ -4,16 +4,20 @@ Athlete Service
 سرویس مدیریت شاگردان (ورزشکاران)
 """
 
+from datetime import date
 from typing import Optional, List
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, func, extract
 
 from app.models.athlete import Athlete, AthleteInjury, AthleteMeasurement
 from app.schemas.athlete import (
     AthleteCreate, AthleteUpdate, 
     InjuryCreate, MeasurementCreate
 )
-from app.core.calculator import NutritionCalculator
+from app.core.calculator import NutritionCalculator, Gender, Goal, ActivityLevel
+from app.services.body_composition_service import BodyCompositionService, navy_body_fat
+from app.services.tdee_service import TDEEService
+from app.services.plan_history_service import PlanHistoryService
 
 
 class AthleteService:
@@ -84,9 +88,18 @@ class AthleteService:
         
         update_data = athlete_data.model_dump(exclude_unset=True)
         
+        # قد و جنسیت در BMI و فرمول نیروی دریایی استفاده می‌شوند
+        rebuild_composition = any(
+            field in update_data and update_data[field] != getattr(athlete, field)
+            for field in ("height", "gender")
+        )
+        
         for field, value in update_data.items():
             setattr(athlete, field, value)
         
+        if rebuild_composition:
+            BodyCompositionService(self.db).rebuild(athlete_id)
+        
         self.db.commit()
         self.db.refresh(athlete)
         return athlete
@@ -97,6 +110,16 @@ class AthleteService:
         if not athlete:
             return False
         
+        # برنامه‌ها با cascade حذف می‌شوند؛ پایان تاریخچه هر کدام ثبت می‌شود
+        history = PlanHistoryService(self.db)
+        for plan_type, plans in (
+            ("training", athlete.training_plans),
+            ("diet", athlete.diet_plans),
+            ("supplement", athlete.supplement_plans),
+        ):
+            for plan in plans:
+                history.record_deleted(plan_type, plan.id)
+        
         self.db.delete(athlete)
         self.db.commit()
         return True
@@ -130,9 +153,12 @@ class AthleteService:
         self.db.refresh(injury)
         return injury
     
-    def remove_injury(self, injury_id: int) -> bool:
-        """حذف آسیب"""
-        injury = self.db.get(AthleteInjury, injury_id)
+    def remove_injury(self, injury_id: int, coach_id: Optional[int] = None) -> bool:
+        """حذف آسیب (فقط آسیب شاگردان مربی)"""
+        stmt = select(AthleteInjury).where(AthleteInjury.id == injury_id)
+        if coach_id is not None:
+            stmt = stmt.join(Athlete, Athlete.id == AthleteInjury.athlete_id).where(Athlete.coach_id == coach_id)
+        injury = self.db.scalar(stmt)
         if not injury:
             return False
         
@@ -173,6 +199,9 @@ class AthleteService:
             athlete.weight = measurement_data.weight
         
         self.db.add(measurement)
+        BodyCompositionService(self.db).refresh({athlete_id: [measurement.recorded_at]})
+        if measurement_data.weight:
+            TDEEService(self.db).observe({athlete_id: [(measurement.recorded_at, measurement_data.weight)]})
         self.db.commit()
         self.db.refresh(measurement)
         return measurement
@@ -191,30 +220,111 @@ class AthleteService:
         )
         return list(self.db.execute(stmt).scalars().all())
     
+    def get_measurement_trends(
+        self,
+        athlete_id: int,
+        fields: List[str],
+        window: int = 4,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        limit: int = 200
+    ) -> Optional[dict]:
+        """
+        تحلیل روند اندازه‌گیری‌ها با window function های SQL
+        
+        تغییر نسبت به قبل (LAG)، میانگین متحرک و نرخ تغییر هفتگی روی کل
+        تاریخچه در دیتابیس محاسبه می‌شوند و فقط ردیف‌های بازه درخواستی
+        (حداکثر limit ردیف آخر) به Python می‌آیند.
+        
+        Args:
+            fields: فیلدهای اندازه‌گیری
+            window: تعداد اندازه‌گیری‌های میانگین متحرک
+            start, end: بازه نمایش (محاسبات روی کل تاریخچه است)
+        """
+        athlete = self.db.get(Athlete, athlete_id)
+        if not athlete:
+            return None
+        
+        m = AthleteMeasurement
+        day = self._day_number(m.recorded_at)
+        navy_fields = ["neck", "waist", "hip"]
+        
+        columns = [m.id.label("id"), m.recorded_at.label("recorded_at")]
+        for name in dict.fromkeys([*fields, *navy_fields]):
+            column = getattr(m, name)
+            # پارتیشن جداگانه برای مقادیر خالی: LAG و میانگین فقط روی
+            # اندازه‌گیری‌هایی که این فیلد را دارند (معادل IGNORE NULLS)
+            over = {"partition_by": column.is_(None), "order_by": (m.recorded_at, m.id)}
+            previous = func.lag(column).over(**over)
+            previous_day = func.lag(day).over(**over)
+            columns += [
+                column.label(name),
+                (column - previous).label(f"{name}__delta"),
+                func.avg(column).over(rows=(-(window - 1), 0), **over).label(f"{name}__avg"),
+                ((column - previous) * 7 / func.nullif(day - previous_day, 0)).label(f"{name}__rate"),
+            ]
+        
+        history = select(*columns).where(m.athlete_id == athlete_id).subquery()
+        stmt = select(history)
+        if start:
+            stmt = stmt.where(history.c.recorded_at >= start)
+        if end:
+            stmt = stmt.where(history.c.recorded_at <= end)
+        stmt = stmt.order_by(history.c.recorded_at.desc(), history.c.id.desc()).limit(limit)
+        rows = list(reversed(self.db.execute(stmt).mappings().all()))
+        
+        def column_values(key: str) -> List[Optional[float]]:
+            return [round(row[key], 2) if row[key] is not None else None for row in rows]
+        
+        return {
+            "athlete_id": athlete_id,
+            "window": window,
+            "dates": [row["recorded_at"] for row in rows],
+            "fields": {
+                name: {
+                    "value": column_values(name),
+                    "delta": column_values(f"{name}__delta"),
+                    "rolling_avg": column_values(f"{name}__avg"),
+                    "weekly_rate": column_values(f"{name}__rate"),
+                }
+                for name in dict.fromkeys(fields)
+            },
+            "navy_body_fat": [self._navy_body_fat(athlete, row, "") for row in rows],
+            "navy_body_fat_rolling": [self._navy_body_fat(athlete, row, "__avg") for row in rows],
+        }
+    
+    def _day_number(self, column):
+        """شماره روز تاریخ برای محاسبه فاصله (وابسته به دیتابیس)"""
+        if self.db.get_bind().dialect.name == "sqlite":
+            return func.julianday(column)
+        return extract("epoch", column) / 86400
+    
+    def _navy_body_fat(self, athlete: Athlete, row, suffix: str) -> Optional[float]:
+        """درصد چربی فرمول نیروی دریایی از دور گردن/کمر/باسن یک ردیف"""
+        return navy_body_fat(athlete, row[f"neck{suffix}"], row[f"waist{suffix}"], row[f"hip{suffix}"])
+    
     # ===== Calculations =====
     
     def calculate_nutrition(self, athlete_id: int) -> Optional[dict]:
         """محاسبه نیازهای تغذیه‌ای شاگرد"""
-        athlete = self.get_by_id(athlete_id)
+        athlete = self.db.get(Athlete, athlete_id)
         if not athlete:
             return None
         
         if not all([athlete.weight, athlete.height, athlete.age, athlete.gender]):
             return {"error": "اطلاعات ناقص - وزن، قد، سن و جنسیت الزامی است"}
         
-        # دریافت آخرین درصد چربی
-        body_fat = None
-        if athlete.measurements:
-            latest = athlete.measurements[0]
-            body_fat = latest.body_fat
+        # آخرین درصد چربی از جدول ترکیب بدنی (اندازه‌گیری، رکورد پیشرفت یا فرمول نیروی دریایی)
+        composition = BodyCompositionService(self.db).get_latest(athlete_id, with_body_fat=True)
+        body_fat = composition.body_fat if composition else None
         
         result = self.calculator.get_full_calculation(
             weight=athlete.weight,
             height=athlete.height,
             age=athlete.age,
-            gender=athlete.gender.value if athlete.gender else "male",
-            activity_level=athlete.activity_level.value if athlete.activity_level else "moderate",
-            goal=athlete.goal.value if athlete.goal else "maintain",
+            gender=Gender(athlete.gender.value if athlete.gender else "male"),
+            activity_level=ActivityLevel(athlete.activity_level.value if athlete.activity_level else "moderate"),
+            goal=Goal(athlete.goal.value if athlete.goal else "maintain"),
             body_fat=body_fat
         )
         
@@ -225,6 +335,26 @@ class AthleteService:
             athlete.gender.value if athlete.gender else "male"
         )
         
+        # TDEE تطبیقی از روند وزن (در صورت وجود مشاهدات کافی)
+        tdee_service = TDEEService(self.db)
+        adaptive = tdee_service.get(athlete_id)
+        if adaptive:
+            result["adaptive_tdee"] = {
+                "tdee": round(adaptive.tdee),
+                "reliable": tdee_service.is_reliable(adaptive),
+                "observations": adaptive.observations,
+                "weight_trend": adaptive.weight_trend,
+                "weekly_change": adaptive.weekly_change,
+            }
+        if composition:
+            result["body_composition"] = {
+                "recorded_at": composition.recorded_at,
+                "body_fat": composition.body_fat,
+                "body_fat_source": composition.body_fat_source,
+                "lean_mass": composition.lean_mass,
+                "fat_mass": composition.fat_mass,
+            }
+        
         return result
     
     def count_by_coach(self, coach_id: int, active_only: bool = False) -> int:
@@ -0,0 +1,226 @@
+"""
+Body Composition Service
+========================
+نگهداری جدول از پیش محاسبه‌شده ترکیب بدنی
+
+جدول body_composition به صورت افزایشی بروز می‌شود: با هر ثبت یا حذف
+اندازه‌گیری/رکورد پیشرفت فقط ردیف همان شاگرد و همان روز دوباره ساخته
+می‌شود، پس پروفایل، ماشین حساب و نمودارها نیازی به join و محاسبه
+دوباره کل تاریخچه ندارند.
+"""
+
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+from sqlalchemy import select, union
+
+from app.models.athlete import Athlete, AthleteMeasurement
+from app.models.progress import ProgressRecord
+from app.models.body_composition import BodyComposition
+from app.core.calculator import NutritionCalculator
+
+
+# فیلدهای اندازه‌گیری که در ترکیب بدنی استفاده می‌شوند
+MEASUREMENT_FIELDS = ("weight", "body_fat", "neck", "waist", "hip")
+PROGRESS_FIELDS = ("weight", "body_fat_percentage")
+
+# ستون‌های خروجی تایم‌لاین
+TIMELINE_FIELDS = ("weight", "body_fat", "navy_body_fat", "lean_mass", "fat_mass", "bmi")
+
+
+def navy_body_fat(
+    athlete: Athlete,
+    neck: Optional[float],
+    waist: Optional[float],
+    hip: Optional[float]
+) -> Optional[float]:
+    """درصد چربی فرمول نیروی دریایی؛ None اگر داده کافی نباشد"""
+    if not (neck and waist and athlete.height and athlete.gender):
+        return None
+    try:
+        return NutritionCalculator.estimate_body_fat(
+            weight=athlete.weight,
+            waist=waist,
+            neck=neck,
+            height=athlete.height,
+            gender=athlete.gender.value,
+            hip=hip,
+        )
+    except ValueError:
+        # باسن ثبت نشده (زنان) یا دور کمر کمتر از گردن
+        return None
+
+
+class BodyCompositionService:
+    """سرویس ترکیب بدنی"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.calculator = NutritionCalculator()
+
+    # ===== Incremental Refresh =====
+
+    def refresh(self, athlete_dates: Dict[int, Iterable[date]]) -> None:
+        """
+        بازمحاسبه ردیف‌های روزهای تغییر کرده
+
+        commit نمی‌کند تا در همان تراکنش ثبت اندازه‌گیری انجام شود.
+
+        Args:
+            athlete_dates: شناسه شاگرد -> روزهایی که داده‌شان تغییر کرده
+        """
+        pairs: Set[Tuple[int, date]] = {
+            (athlete_id, day) for athlete_id, days in athlete_dates.items() for day in days
+        }
+        if not pairs:
+            return
+
+        self.db.flush()
+        athlete_ids = {athlete_id for athlete_id, _ in pairs}
+        days = {day for _, day in pairs}
+
+        athletes = {
+            athlete.id: athlete
+            for athlete in self.db.scalars(select(Athlete).where(Athlete.id.in_(athlete_ids)))
+        }
+        measurements = self._merge_by_day(AthleteMeasurement, MEASUREMENT_FIELDS, athlete_ids, days)
+        progress = self._merge_by_day(ProgressRecord, PROGRESS_FIELDS, athlete_ids, days)
+        existing = {
+            (row.athlete_id, row.recorded_at): row
+            for row in self.db.scalars(
+                select(BodyComposition).where(
+                    BodyComposition.athlete_id.in_(athlete_ids),
+                    BodyComposition.recorded_at.in_(days)
+                )
+            )
+        }
+
+        for athlete_id, day in pairs:
+            athlete = athletes.get(athlete_id)
+            values = None
+            if athlete:
+                values = self._derive(athlete, measurements.get((athlete_id, day)), progress.get((athlete_id, day)))
+
+            row = existing.get((athlete_id, day))
+            if values is None:
+                if row:
+                    self.db.delete(row)
+                continue
+
+            if row is None:
+                row = BodyComposition(athlete_id=athlete_id, recorded_at=day)
+                self.db.add(row)
+            for field, value in values.items():
+                setattr(row, field, value)
+
+    def rebuild(self, athlete_id: int) -> None:
+        """بازسازی کامل تایم‌لاین یک شاگرد (مثلاً بعد از تغییر قد یا جنسیت)"""
+        days = self.db.scalars(union(
+            select(AthleteMeasurement.recorded_at).where(AthleteMeasurement.athlete_id == athlete_id),
+            select(ProgressRecord.recorded_at).where(ProgressRecord.athlete_id == athlete_id),
+            select(BodyComposition.recorded_at).where(BodyComposition.athlete_id == athlete_id),
+        )).all()
+        self.refresh({athlete_id: days})
+
+    def _merge_by_day(
+        self,
+        model,
+        fields: Tuple[str, ...],
+        athlete_ids: Set[int],
+        days: Set[date]
+    ) -> Dict[Tuple[int, date], dict]:
+        """ادغام رکوردهای یک روز؛ برای هر فیلد آخرین مقدار غیرخالی"""
+        columns = [getattr(model, field) for field in fields]
+        rows = self.db.execute(
+            select(model.athlete_id, model.recorded_at, *columns)
+            .where(model.athlete_id.in_(athlete_ids), model.recorded_at.in_(days))
+            .order_by(model.id)
+        ).all()
+
+        merged: Dict[Tuple[int, date], dict] = {}
+        for athlete_id, day, *values in rows:
+            current = merged.setdefault((athlete_id, day), {})
+            for field, value in zip(fields, values):
+                if value is not None:
+                    current[field] = value
+        return merged
+
+    def _derive(
+        self,
+        athlete: Athlete,
+        measurement: Optional[dict],
+        progress: Optional[dict]
+    ) -> Optional[dict]:
+        """محاسبه ستون‌های ترکیب بدنی یک روز؛ None اگر داده‌ای نباشد"""
+        measurement = measurement or {}
+        progress = progress or {}
+
+        weight = measurement.get("weight") or progress.get("weight")
+        navy = navy_body_fat(athlete, measurement.get("neck"), measurement.get("waist"), measurement.get("hip"))
+
+        # اولویت: درصد چربی اندازه‌گیری‌شده، رکورد پیشرفت، فرمول نیروی دریایی
+        body_fat, source = None, None
+        for value, name in (
+            (measurement.get("body_fat"), "measured"),
+            (progress.get("body_fat_percentage"), "progress"),
+            (navy, "navy"),
+        ):
+            if value is not None:
+                body_fat, source = value, name
+                break
+
+        if weight is None and body_fat is None:
+            return None
+
+        lean_mass = fat_mass = bmi = None
+        if weight is not None and body_fat is not None:
+            fat_mass = round(weight * body_fat / 100, 2)
+            lean_mass = round(weight - fat_mass, 2)
+        if weight is not None and athlete.height:
+            bmi = self.calculator.calculate_bmi(weight, athlete.height)["bmi"]
+
+        return {
+            "weight": weight,
+            "body_fat": body_fat,
+            "body_fat_source": source,
+            "navy_body_fat": navy,
+            "lean_mass": lean_mass,
+            "fat_mass": fat_mass,
+            "bmi": bmi,
+        }
+
+    # ===== Queries =====
+
+    def get_latest(self, athlete_id: int, with_body_fat: bool = False) -> Optional[BodyComposition]:
+        """آخرین ردیف ترکیب بدنی (اختیاری: آخرین ردیف دارای درصد چربی)"""
+        stmt = select(BodyComposition).where(BodyComposition.athlete_id == athlete_id)
+        if with_body_fat:
+            stmt = stmt.where(BodyComposition.body_fat.isnot(None))
+        stmt = stmt.order_by(BodyComposition.recorded_at.desc()).limit(1)
+        return self.db.scalar(stmt)
+
+    def get_timeline(
+        self,
+        athlete_id: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> dict:
+        """تایم‌لاین ستونی ترکیب بدنی برای نمودار"""
+        stmt = select(BodyComposition).where(BodyComposition.athlete_id == athlete_id)
+        if start:
+            stmt = stmt.where(BodyComposition.recorded_at >= start)
+        if end:
+            stmt = stmt.where(BodyComposition.recorded_at <= end)
+        rows: List[BodyComposition] = list(
+            self.db.scalars(stmt.order_by(BodyComposition.recorded_at))
+        )
+
+        timeline = {
+            "athlete_id": athlete_id,
+            "dates": [row.recorded_at for row in rows],
+            "body_fat_source": [row.body_fat_source for row in rows],
+        }
+        for field in TIMELINE_FIELDS:
+            timeline[field] = [getattr(row, field) for row in rows]
+        return timeline
@@ -0,0 +1,124 @@
+"""
+Catalog Service
+===============
+سرویس snapshot کاتالوگ (بانک غذا و بانک تمرینات)
+
+کاتالوگ فقط وقتی دوباره ساخته می‌شود که تراکنشی روی غذا، دسته غذا، گروه
+عضلانی یا تمرین commit شده باشد (رویدادهای Session در همین ماژول). بین دو
+تغییر، هر درخواست فقط بایت‌های از پیش کدگذاری‌شده را می‌گیرد و session
+دیتابیس هیچ اتصالی باز نمی‌کند.
+
+نسخه فقط در همین پردازه نگه داشته می‌شود؛ تغییرات پردازه‌های دیگر (مثلاً
+اسکریپت migrate_data) بعد از ری‌استارت دیده می‌شوند.
+"""
+
+import threading
+from itertools import chain
+from typing import Dict, List
+
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.food import Food, FoodCategory
+from app.models.exercise import Exercise, MuscleGroup
+from app.core.snapshot import EncodedDocument, encode_document
+from app.schemas.food import FoodCategoryWithFoods
+from app.schemas.exercise import MuscleGroupWithExercises
+from app.services.food_service import FoodService
+from app.services.exercise_service import ExerciseService
+
+
+CATALOG_MODELS = (Food, FoodCategory, Exercise, MuscleGroup)
+
+_food_categories_adapter = TypeAdapter(List[FoodCategoryWithFoods])
+_muscle_groups_adapter = TypeAdapter(List[MuscleGroupWithExercises])
+
+_snapshot_lock = threading.Lock()
+_snapshot: Dict[str, object] = {"generation": 0, "built": None, "documents": None}
+
+
+def invalidate_catalog() -> None:
+    """علامت‌گذاری snapshot به عنوان کهنه (ساخت دوباره در درخواست بعدی)"""
+    with _snapshot_lock:
+        _snapshot["generation"] += 1
+
+
+# ===== Change Tracking =====
+
+@event.listens_for(Session, "after_flush")
+def _track_catalog_flush(session: Session, flush_context) -> None:
+    if any(
+        isinstance(obj, CATALOG_MODELS)
+        for obj in chain(session.new, session.dirty, session.deleted)
+    ):
+        session.info["catalog_changed"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_catalog_bulk(orm_execute_state) -> None:
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in CATALOG_MODELS:
+        orm_execute_state.session.info["catalog_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_catalog_changes(session: Session) -> None:
+    if session.info.pop("catalog_changed", False):
+        invalidate_catalog()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_catalog_changes(session: Session) -> None:
+    session.info.pop("catalog_changed", None)
+
+
+class CatalogService:
+    """سرویس snapshot کاتالوگ"""
+
+    # سندهای snapshot
+    DOCUMENTS = ("catalog", "food_categories", "muscle_groups")
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_document(self, name: str = "catalog") -> EncodedDocument:
+        """سند کدگذاری‌شده (بدون کوئری تا تغییر بعدی کاتالوگ)"""
+        with _snapshot_lock:
+            generation = _snapshot["generation"]
+            if _snapshot["built"] == generation:
+                return _snapshot["documents"][name]
+
+        documents = self.build()
+
+        with _snapshot_lock:
+            # اگر در حین ساخت تغییری commit شده باشد، درخواست بعدی دوباره می‌سازد
+            if _snapshot["generation"] == generation:
+                _snapshot["documents"] = documents
+                _snapshot["built"] = generation
+        return documents[name]
+
+    def build(self) -> Dict[str, EncodedDocument]:
+        """ساخت و کدگذاری همه سندهای کاتالوگ"""
+        food_categories = _food_categories_adapter.dump_python(
+            _food_categories_adapter.validate_python(FoodService(self.db).get_categories_with_foods()),
+            mode="json",
+        )
+        muscle_groups = _muscle_groups_adapter.dump_python(
+            _muscle_groups_adapter.validate_python(ExerciseService(self.db).get_groups_with_exercises()),
+            mode="json",
+        )
+
+        documents = {
+            "food_categories": encode_document(food_categories),
+            "muscle_groups": encode_document(muscle_groups),
+        }
+        version = documents["food_categories"].digest[:16] + documents["muscle_groups"].digest[:16]
+        documents["catalog"] = encode_document({
+            "version": version,
+            "food_categories": food_categories,
+            "muscle_groups": muscle_groups,
+        })
+        return documents
@@ -0,0 +1,415 @@
+"""
+Diet Generation Service
+=======================
+سرویس تولید خودکار برنامه غذایی
+
+ماتریس بانک غذا یک بار ساخته و در حافظه نگه داشته می‌شود؛ فقط وقتی تعداد،
+بیشترین شناسه یا آخرین زمان ویرایش غذاها تغییر کند دوباره ساخته می‌شود.
+
+تولید دسته‌ای (کل شاگردان یک مربی): اهداف هر شاگرد در پردازه اصلی محاسبه،
+حل بهینه‌سازی در ProcessPoolExecutor به صورت دسته‌ای انجام و نتیجه هر دسته
+در یک تراکنش نوشته می‌شود. پیشرفت کار به صورت رویداد برگردانده می‌شود.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, update, func, and_
+
+from app.config import settings
+from app.models.athlete import Athlete, Goal as AthleteGoal
+from app.models.diet import DietPlan, DietItem, MealType
+from app.models.food import Food, FoodCategory
+from app.core.diet_engine import diet_engine
+from app.core.diet_generator import diet_generator, FoodMatrix, parse_allergies
+from app.core.calculator import Goal
+from app.services.athlete_service import AthleteService
+from app.services.tdee_service import TDEEService
+from app.services.plan_history_service import PlanHistoryService
+
+
+_matrix_lock = threading.Lock()
+_matrix_cache: Dict[str, object] = {"version": None, "matrix": None}
+
+
+# ===== Process Pool Workers =====
+
+# ماتریس غذا در هر پردازه فقط یک بار (هنگام شروع) دریافت می‌شود
+_worker_matrix: Optional[FoodMatrix] = None
+
+
+def _init_worker(matrix: FoodMatrix) -> None:
+    global _worker_matrix
+    _worker_matrix = matrix
+
+
+def _generate_chunk(tasks: List[dict]) -> List[List[Dict]]:
+    """تولید برنامه یک دسته از شاگردان در پردازه کارگر"""
+    return [
+        diet_generator.generate(
+            _worker_matrix,
+            task["meal_targets"],
+            days=task["days"],
+            allergies=task["allergies"],
+            seed=task["seed"],
+        )
+        for task in tasks
+    ]
+
+
+class DietGenerationService:
+    """سرویس تولید خودکار برنامه غذایی"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.generator = diet_generator
+
+    # ===== Food Matrix =====
+
+    def get_food_matrix(self) -> FoodMatrix:
+        """ماتریس غذاهای فعال (کش‌شده تا تغییر بانک غذا)"""
+        version = tuple(self.db.execute(
+            select(func.count(Food.id), func.max(Food.id), func.max(Food.updated_at))
+            .where(Food.is_active == True)
+        ).one())
+
+        with _matrix_lock:
+            if _matrix_cache["version"] != version:
+                _matrix_cache["matrix"] = self.generator.build_matrix(self._load_foods())
+                _matrix_cache["version"] = version
+            return _matrix_cache["matrix"]
+
+    def _load_foods(self) -> List[dict]:
+        """ردیف‌های غذا با نام دسته برای ساخت ماتریس"""
+        rows = self.db.execute(
+            select(
+                Food.id, Food.name, Food.name_en, Food.unit, Food.base_amount,
+                Food.calories, Food.protein, Food.carbs, Food.fat, Food.allergen_mask,
+                FoodCategory.name.label("category"),
+                FoodCategory.name_en.label("category_en"),
+            )
+            .join(FoodCategory, FoodCategory.id == Food.category_id)
+            .where(and_(Food.is_active == True, FoodCategory.is_active == True))
+            .order_by(Food.id)
+        ).mappings().all()
+        return [dict(row) for row in rows]
+
+    # ===== Targets =====
+
+    def resolve_targets(self, athlete: Athlete, overrides: Optional[dict] = None) -> dict:
+        """
+        کالری و ماکروی روزانه هدف
+
+        اولویت: مقادیر ارسالی، ماکروهای TDEE تطبیقی (در صورت قابل اعتماد بودن)،
+        ماکروهای فرمول
+
+        Raises:
+            ValueError: اگر اطلاعات پایه شاگرد ناقص باشد و هدفی ارسال نشده باشد
+        """
+        overrides = {k: v for k, v in (overrides or {}).items() if v is not None}
+        keys = ("calories", "protein", "carbs", "fat")
+        if all(key in overrides for key in keys):
+            return {key: overrides[key] for key in keys}
+
+        athlete_service = AthleteService(self.db)
+        nutrition = athlete_service.calculate_nutrition(athlete.id)
+        if not nutrition or "error" in nutrition:
+            raise ValueError(nutrition["error"] if nutrition else "شاگرد یافت نشد")
+        macros = nutrition["macros"]
+
+        tdee_service = TDEEService(self.db)
+        adaptive = tdee_service.get(athlete.id)
+        if adaptive and tdee_service.is_reliable(adaptive):
+            macros = athlete_service.calculator.calculate_macros(
+                athlete.weight, round(adaptive.tdee), Goal(nutrition["goal"])
+            )
+
+        targets = {key: macros[key] for key in keys}
+        targets.update(overrides)
+        return targets
+
+    # ===== Generation =====
+
+    def generate(
+        self,
+        athlete: Athlete,
+        meal_plan_type: str = "standard",
+        days: int = 7,
+        targets: Optional[dict] = None,
+        seed: Optional[int] = None,
+    ) -> dict:
+        """
+        تولید برنامه چند روزه برای یک شاگرد (بدون ذخیره)
+
+        Returns:
+            targets، meal_targets (خروجی distribute_macros)، allergies و days
+        """
+        daily = self.resolve_targets(athlete, targets)
+        meal_targets = diet_engine.distribute_macros(
+            daily["calories"], daily["protein"], daily["carbs"], daily["fat"],
+            meal_plan_type=meal_plan_type,
+        )
+        allergies = parse_allergies(athlete.allergies)
+        plan_days = self.generator.generate(
+            self.get_food_matrix(), meal_targets, days=days, allergies=allergies, seed=seed
+        )
+        return {
+            "targets": daily,
+            "meal_plan_type": meal_plan_type,
+            "meal_targets": meal_targets,
+            "allergies": allergies,
+            "days": plan_days,
+        }
+
+    def build_plans(self, athlete_id: int, generated: dict, name: Optional[str] = None) -> List[DietPlan]:
+        """
+        تبدیل خروجی تولید به DietPlan ها (ذخیره نمی‌کند)
+
+        هر روز یک DietPlan جدا می‌شود تا جمع ماکروها و خلاصه وعده‌ها (که همه
+        آیتم‌های یک برنامه را جمع می‌زنند) مصرف یک روز بماند؛ روز اول برنامه فعال
+        است و بقیه روزها برنامه‌های غیرفعال چرخشی با پسوند «روز N» هستند.
+        """
+        plans = self._plan_rows(athlete_id, generated, name)
+        for plan, day in zip(plans, generated["days"]):
+            plan.items = [DietItem(**row) for row in self._item_rows(day)]
+        return plans
+
+    @staticmethod
+    def _plan_rows(
+        athlete_id: int,
+        generated: dict,
+        name: Optional[str],
+        coach_id: Optional[int] = None,
+    ) -> List[DietPlan]:
+        """ردیف‌های diet_plans یک برنامه تولیدشده (یکی برای هر روز)"""
+        targets = generated["targets"]
+        days = generated["days"]
+        name = name or "برنامه غذایی خودکار"
+        return [
+            DietPlan(
+                athlete_id=athlete_id,
+                coach_id=coach_id,
+                name=f"{name} - روز {day['day']}" if len(days) > 1 else name,
+                target_calories=round(targets["calories"]),
+                target_protein=round(targets["protein"]),
+                target_carbs=round(targets["carbs"]),
+                target_fat=round(targets["fat"]),
+                is_active=index == 0,
+            )
+            for index, day in enumerate(days)
+        ]
+
+    @staticmethod
+    def _item_rows(day: dict) -> List[dict]:
+        """ردیف‌های diet_items یک روز تولیدشده"""
+        rows = []
+        for meal in day["meals"]:
+            for item in meal["items"]:
+                rows.append({
+                    "order": len(rows),
+                    "meal": MealType(meal["meal"]),
+                    "food_id": item["food_id"],
+                    "amount": item["amount"],
+                    "unit": item["unit"],
+                    "calculated_calories": item["calories"],
+                    "calculated_protein": item["protein"],
+                    "calculated_carbs": item["carbs"],
+                    "calculated_fat": item["fat"],
+                })
+        return rows
+
+    def create_plan(self, athlete_id: int, generated: dict, name: Optional[str] = None) -> List[DietPlan]:
+        """
+        ذخیره برنامه تولیدشده؛ روز اول برنامه فعال شاگرد می‌شود
+
+        Returns:
+            برنامه‌های روزها به ترتیب روز
+        """
+        for plan in self.db.scalars(
+            select(DietPlan).where(DietPlan.athlete_id == athlete_id, DietPlan.is_active == True)
+        ):
+            plan.is_active = False
+
+        plans = self.build_plans(athlete_id, generated, name)
+        self.db.add_all(plans)
+        self.db.flush()
+        PlanHistoryService(self.db).record_created("diet", [plan.id for plan in plans])
+        self.db.commit()
+        for plan in plans:
+            self.db.refresh(plan)
+        return plans
+
+    # ===== Roster =====
+
+    def select_roster(
+        self,
+        coach_id: int,
+        goal: Optional[AthleteGoal] = None,
+        athlete_ids: Optional[List[int]] = None,
+        active_only: bool = True,
+    ) -> List[Athlete]:
+        """شاگردان مربی با فیلتر هدف (مثلاً همه شاگردان کات) یا لیست شناسه"""
+        stmt = select(Athlete).where(Athlete.coach_id == coach_id)
+        if goal:
+            stmt = stmt.where(Athlete.goal == goal)
+        if athlete_ids:
+            stmt = stmt.where(Athlete.id.in_(athlete_ids))
+        if active_only:
+            stmt = stmt.where(Athlete.is_active == True)
+        return list(self.db.scalars(stmt.order_by(Athlete.id)))
+
+    def generate_roster(
+        self,
+        athletes: List[Athlete],
+        meal_plan_type: str = "standard",
+        days: int = 7,
+        name: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        workers: Optional[int] = None,
+    ) -> Iterator[dict]:
+        """
+        تولید و ذخیره برنامه برای چند شاگرد
+
+        Yields:
+            رویدادهای started، progress (بعد از commit هر دسته)، error و completed
+        """
+        chunk_size = chunk_size or settings.DIET_GENERATION_CHUNK_SIZE
+        workers = workers or settings.DIET_GENERATION_WORKERS or os.cpu_count() or 1
+
+        tasks, skipped = [], []
+        for athlete in athletes:
+            try:
+                targets = self.resolve_targets(athlete)
+            except ValueError as e:
+                skipped.append({"athlete_id": athlete.id, "reason": str(e)})
+                continue
+            tasks.append({
+                "athlete_id": athlete.id,
+                "coach_id": athlete.coach_id,
+                "targets": targets,
+                "meal_targets": diet_engine.distribute_macros(
+                    targets["calories"], targets["protein"], targets["carbs"], targets["fat"],
+                    meal_plan_type=meal_plan_type,
+                ),
+                "allergies": parse_allergies(athlete.allergies),
+                "days": days,
+                "seed": athlete.id,
+            })
+        # پایان تراکنش خواندن قبل از کار طولانی
+        self.db.rollback()
+
+        total = len(athletes)
+        yield {"event": "started", "total": total, "queued": len(tasks), "skipped": skipped}
+
+        chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+        done, created, failed = len(skipped), 0, []
+        for chunk, results, error in self._run_chunks(chunks, workers):
+            athlete_ids = [task["athlete_id"] for task in chunk]
+            if error is None:
+                try:
+                    plans = self._save_chunk(chunk, results, name)
+                except Exception as e:
+                    self.db.rollback()
+                    error = e
+            done += len(chunk)
+            if error is not None:
+                failed.extend(athlete_ids)
+                yield {"event": "error", "athlete_ids": athlete_ids, "detail": str(error), "done": done, "total": total}
+                continue
+
+            created += len(plans)
+            yield {
+                "event": "progress",
+                "done": done,
+                "total": total,
+                "plans": [
+                    {
+                        "athlete_id": day_plans[0].athlete_id,
+                        "plan_id": day_plans[0].id,
+                        "day_plan_ids": [plan.id for plan in day_plans],
+                    }
+                    for day_plans in plans
+                ],
+            }
+
+        yield {"event": "completed", "total": total, "created": created, "skipped": len(skipped), "failed": failed}
+
+    def _run_chunks(
+        self,
+        chunks: List[List[dict]],
+        workers: int,
+    ) -> Iterator[Tuple[List[dict], Optional[List], Optional[Exception]]]:
+        """
+        اجرای دسته‌ها؛ با بیش از یک دسته در ProcessPoolExecutor
+
+        خروجی به ترتیب اتمام دسته‌هاست (نه ترتیب ارسال).
+        """
+        if not chunks:
+            return
+        matrix = self.get_food_matrix()
+
+        if workers <= 1 or len(chunks) == 1:
+            _init_worker(matrix)
+            for chunk in chunks:
+                yield chunk, _generate_chunk(chunk), None
+            return
+
+        # spawn: fork کردن پردازه سرور چندنخی امن نیست
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(matrix,),
+        ) as pool:
+            futures = {pool.submit(_generate_chunk, chunk): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result(), None
+                except Exception as e:
+                    yield futures[future], None, e
+
+    def _save_chunk(
+        self,
+        chunk: List[dict],
+        results: List[List[Dict]],
+        name: Optional[str],
+    ) -> List[List[DietPlan]]:
+        """
+        ذخیره برنامه‌های یک دسته در یک تراکنش
+
+        برنامه‌ها با یک flush و آیتم‌های همه برنامه‌ها با یک insert دسته‌ای نوشته می‌شوند.
+
+        Returns:
+            برنامه‌های روزهای هر شاگرد (روز اول فعال)
+        """
+        athlete_ids = [task["athlete_id"] for task in chunk]
+        self.db.execute(
+            update(DietPlan)
+            .where(DietPlan.athlete_id.in_(athlete_ids), DietPlan.is_active == True)
+            .values(is_active=False)
+        )
+
+        plans = [
+            self._plan_rows(task["athlete_id"], {"targets": task["targets"], "days": days}, name, task["coach_id"])
+            for task, days in zip(chunk, results)
+        ]
+        self.db.add_all([plan for day_plans in plans for plan in day_plans])
+        self.db.flush()
+
+        items = [
+            {**row, "diet_plan_id": plan.id, "coach_id": plan.coach_id}
+            for day_plans, days in zip(plans, results)
+            for plan, day in zip(day_plans, days)
+            for row in self._item_rows(day)
+        ]
+        if items:
+            self.db.execute(insert(DietItem), items)
+        PlanHistoryService(self.db).record_created(
+            "diet", [plan.id for day_plans in plans for plan in day_plans]
+        )
+        self.db.commit()
+        return plans
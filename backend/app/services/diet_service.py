@@ -5,22 +5,32 @@ Diet Service
 """
 
 from typing import Optional, List
+import numpy as np
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, case, delete, func, insert, update
 
 from app.models.diet import DietPlan, DietItem, MealType
 from app.models.food import Food
+from app.services.access_service import scope_to_coach
+from app.services.plan_history_service import PlanHistoryService
+from app.services.plan_diff import diff_rows
 from app.schemas.diet import (
-    DietPlanCreate, DietPlanUpdate,
-    DietItemCreate, MacroSummary
+    DietPlanBase, DietPlanCreate, DietPlanUpdate, DietPlanDocument,
+    DietItemCreate, DietItemUpsert, MacroSummary
 )
 
 
+MACRO_FIELDS = ("calculated_calories", "calculated_protein", "calculated_carbs", "calculated_fat")
+ITEM_FIELDS = ("order", "meal", "food_id", "custom_name", "amount", "unit", "notes", *MACRO_FIELDS)
+CUSTOM_MACRO_FIELDS = {"custom_calories", "custom_protein", "custom_carbs", "custom_fat"}
+
+
 class DietService:
     """سرویس مدیریت برنامه‌های غذایی"""
     
     def __init__(self, db: Session):
         self.db = db
+        self.history = PlanHistoryService(db)
     
     # ===== Diet Plans =====
     
@@ -84,6 +94,8 @@ class DietService:
             plan.items.append(item)
         
         self.db.add(plan)
+        self.db.flush()
+        self.history.record("diet", plan.id)
         self.db.commit()
         self.db.refresh(plan)
         return plan
@@ -98,10 +110,11 @@ class DietService:
         if not plan:
             return None
         
-        update_data = plan_data.model_dump(exclude_unset=True)
-        
-        for field, value in update_data.items():
-            setattr(plan, field, value)
+        with self.history.versioned("diet", plan_id):
+            update_data = plan_data.model_dump(exclude_unset=True)
+            
+            for field, value in update_data.items():
+                setattr(plan, field, value)
         
         self.db.commit()
         self.db.refresh(plan)
@@ -113,6 +126,7 @@ class DietService:
         if not plan:
             return False
         
+        self.history.record_deleted("diet", plan_id)
         self.db.delete(plan)
         self.db.commit()
         return True
@@ -130,6 +144,115 @@ class DietService:
         self.db.refresh(plan)
         return plan
     
+    def save_plan_document(
+        self,
+        plan_id: int,
+        document: DietPlanDocument,
+        coach_id: Optional[int] = None
+    ) -> Optional[DietPlan]:
+        """
+        ذخیره کامل برنامه غذایی در یک تراکنش
+        
+        غذاهای سند با یک کوئری IN خوانده و ماکروها برداری محاسبه می‌شوند؛
+        سپس فقط تفاوت با آیتم‌های فعلی نوشته می‌شود (update با کلید اصلی،
+        حذف با IN و insert دسته‌ای).
+        
+        Args:
+            coach_id: فقط اگر برنامه متعلق به این مربی باشد
+        
+        Raises:
+            ValueError: اگر غذا وجود نداشته باشد یا id آیتم متعلق به این برنامه نباشد
+        """
+        stmt = select(DietPlan).where(DietPlan.id == plan_id)
+        plan = self.db.scalars(scope_to_coach(stmt, DietPlan, coach_id)).first()
+        if not plan:
+            return None
+        
+        with self.history.versioned("diet", plan_id):
+            existing = {
+                row.id: row._asdict()
+                for row in self.db.execute(
+                    select(DietItem.id, *(getattr(DietItem, name) for name in ITEM_FIELDS))
+                    .where(DietItem.diet_plan_id == plan_id)
+                )
+            }
+            
+            macros = self._document_macros(document.items)
+            docs = []
+            for order, (item, values) in enumerate(zip(document.items, macros)):
+                row = item.model_dump(include={"id", "meal", "food_id", "custom_name", "amount", "unit", "notes"})
+                row["order"] = order
+                row.update(
+                    (name, None if np.isnan(value) else float(value))
+                    for name, value in zip(MACRO_FIELDS, values)
+                )
+                stored = existing.get(item.id)
+                if (
+                    stored and not item.food_id and not stored["food_id"]
+                    and not CUSTOM_MACRO_FIELDS & item.model_fields_set
+                ):
+                    # سند GET فیلدهای custom_* ندارد؛ ماکروی آیتم سفارشی موجود حفظ می‌شود
+                    row.update((name, stored[name]) for name in MACRO_FIELDS)
+                docs.append(row)
+            diff = diff_rows(existing, docs, ITEM_FIELDS, "آیتم")
+            
+            if diff.updates:
+                self.db.execute(update(DietItem), diff.updates)
+            if diff.deletes:
+                self.db.execute(delete(DietItem).where(DietItem.id.in_(diff.deletes)))
+            if diff.inserts:
+                self.db.execute(
+                    insert(DietItem),
+                    [{**row, "diet_plan_id": plan_id, "coach_id": plan.coach_id} for row in diff.inserts],
+                )
+            
+            for name, value in document.model_dump(include=set(DietPlanBase.model_fields)).items():
+                setattr(plan, name, value)
+            if diff:
+                plan.updated_at = func.now()
+        
+        self.db.commit()
+        return self.get_plan(plan_id)
+    
+    def _document_macros(self, items: List[DietItemUpsert]) -> np.ndarray:
+        """
+        ماکروهای آیتم‌های سند (یک کوئری برای همه غذاها)
+        
+        Returns:
+            آرایه (n, 4) کالری، پروتئین، کربوهیدرات و چربی؛ NaN برای آیتم
+            سفارشی بدون ماکرو دستی
+        """
+        macros = np.full((len(items), len(MACRO_FIELDS)), np.nan)
+        
+        food_ids = sorted({item.food_id for item in items if item.food_id})
+        if food_ids:
+            rows = self.db.execute(
+                select(Food.id, Food.base_amount, Food.calories, Food.protein, Food.carbs, Food.fat)
+                .where(Food.id.in_(food_ids))
+            ).all()
+            missing = set(food_ids) - {row.id for row in rows}
+            if missing:
+                raise ValueError(f"غذا یافت نشد: {', '.join(map(str, sorted(missing)))}")
+            
+            index = {row.id: i for i, row in enumerate(rows)}
+            table = np.array([row[1:] for row in rows], dtype=float)  # base_amount + ماکروها
+            positions = np.array([i for i, item in enumerate(items) if item.food_id])
+            foods = table[[index[items[i].food_id] for i in positions]]
+            amounts = np.array([items[i].amount for i in positions], dtype=float)
+            macros[positions] = np.round(foods[:, 1:] * (amounts / foods[:, 0])[:, None], 1)
+        
+        # ماکروهای دستی برای غذای سفارشی
+        for i, item in enumerate(items):
+            if not item.food_id and item.custom_calories:
+                macros[i] = (
+                    item.custom_calories,
+                    item.custom_protein or 0,
+                    item.custom_carbs or 0,
+                    item.custom_fat or 0,
+                )
+        
+        return macros
+    
     def _deactivate_athlete_plans(self, athlete_id: int) -> None:
         """غیرفعال کردن همه برنامه‌های شاگرد"""
         stmt = (
@@ -153,14 +276,17 @@ class DietService:
         if not plan:
             return None
         
-        # تعیین ترتیب جدید
-        max_order = max([i.order for i in plan.items], default=0)
-        
-        item = self._create_item(item_data)
-        item.diet_plan_id = plan_id
-        item.order = max_order + 1
+        with self.history.versioned("diet", plan_id):
+            # تعیین ترتیب جدید
+            max_order = max([i.order for i in plan.items], default=0)
+            
+            item = self._create_item(item_data)
+            item.diet_plan_id = plan_id
+            item.coach_id = plan.coach_id
+            item.order = max_order + 1
+            
+            self.db.add(item)
         
-        self.db.add(item)
         self.db.commit()
         self.db.refresh(item)
         return item
@@ -171,25 +297,34 @@ class DietService:
         if not item:
             return None
         
-        for field, value in item_data.items():
-            if hasattr(item, field):
-                setattr(item, field, value)
-        
-        # بروزرسانی ماکروها
-        if "amount" in item_data or "food_id" in item_data:
-            item.calculate_macros()
+        with self.history.versioned("diet", item.diet_plan_id):
+            for field, value in item_data.items():
+                if hasattr(item, field):
+                    setattr(item, field, value)
+            
+            # بروزرسانی ماکروها
+            if "amount" in item_data or "food_id" in item_data:
+                item.calculate_macros()
         
         self.db.commit()
         self.db.refresh(item)
         return item
     
-    def delete_item(self, item_id: int) -> bool:
-        """حذف آیتم غذایی"""
-        item = self.db.get(DietItem, item_id)
-        if not item:
+    def delete_item(self, item_id: int, coach_id: Optional[int] = None) -> bool:
+        """
+        حذف آیتم غذایی
+        
+        Args:
+            coach_id: فقط اگر آیتم متعلق به این مربی باشد
+        """
+        stmt = select(DietItem.diet_plan_id).where(DietItem.id == item_id)
+        plan_id = self.db.scalar(scope_to_coach(stmt, DietItem, coach_id))
+        if plan_id is None:
             return False
         
-        self.db.delete(item)
+        with self.history.versioned("diet", plan_id):
+            self.db.execute(delete(DietItem).where(DietItem.id == item_id))
+        
         self.db.commit()
         return True
     
@@ -223,16 +358,26 @@ class DietService:
         
         return item
     
-    def reorder_items(self, plan_id: int, item_ids: List[int]) -> bool:
-        """مرتب‌سازی مجدد آیتم‌ها"""
-        plan = self.db.get(DietPlan, plan_id)
-        if not plan:
+    def reorder_items(self, plan_id: int, item_ids: List[int], coach_id: Optional[int] = None) -> bool:
+        """
+        مرتب‌سازی مجدد آیتم‌ها (یک UPDATE با CASE)
+        
+        Args:
+            coach_id: فقط اگر برنامه متعلق به این مربی باشد
+        """
+        stmt = select(DietPlan.id).where(DietPlan.id == plan_id)
+        if self.db.execute(scope_to_coach(stmt, DietPlan, coach_id)).first() is None:
             return False
         
-        for order, item_id in enumerate(item_ids):
-            item = self.db.get(DietItem, item_id)
-            if item and item.diet_plan_id == plan_id:
-                item.order = order
+        with self.history.versioned("diet", plan_id):
+            if item_ids:
+                orders = {item_id: order for order, item_id in enumerate(item_ids)}
+                stmt = (
+                    update(DietItem)
+                    .where(DietItem.diet_plan_id == plan_id, DietItem.id.in_(orders))
+                    .values(order=case(orders, value=DietItem.id))
+                )
+                self.db.execute(scope_to_coach(stmt, DietItem, coach_id))
         
         self.db.commit()
         return True
@@ -4,7 +4,7 @@ Exercise Service
 سرویس مدیریت بانک تمرینات
 """
 
-from typing import Optional, List, Set
+from typing import Optional, List, Set, Collection
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import select, and_, or_
 
@@ -153,9 +153,16 @@ class ExerciseService:
     def get_safe_exercises(
         self,
         muscle_group_id: Optional[int] = None,
-        excluded_exercises: Optional[Set[str]] = None
+        excluded_exercises: Optional[Set[str]] = None,
+        excluded_ids: Optional[Collection[int]] = None,
+        exercise_type: Optional[ExerciseType] = None
     ) -> List[Exercise]:
-        """دریافت تمرینات امن (غیر پرخطر)"""
+        """
+        دریافت تمرینات امن (غیر پرخطر)
+        
+        حرکات ممنوعه در خود کوئری (NOT IN) حذف می‌شوند؛ excluded_ids معمولاً
+        از InjuryRestrictionService.excluded_ids می‌آید.
+        """
         stmt = (
             select(Exercise)
             .where(
@@ -169,16 +176,18 @@ class ExerciseService:
         if muscle_group_id:
             stmt = stmt.where(Exercise.muscle_group_id == muscle_group_id)
         
-        exercises = list(self.db.execute(stmt).scalars().all())
+        if exercise_type:
+            stmt = stmt.where(Exercise.type == exercise_type)
         
         # فیلتر کردن تمرینات ممنوعه
         if excluded_exercises:
-            exercises = [
-                e for e in exercises 
-                if e.name not in excluded_exercises
-            ]
+            stmt = stmt.where(Exercise.name.not_in(excluded_exercises))
         
-        return exercises
+        if excluded_ids:
+            stmt = stmt.where(Exercise.id.not_in(excluded_ids))
+        
+        stmt = stmt.order_by(Exercise.name)
+        return list(self.db.execute(stmt).scalars().all())
     
     def count(
         self, 
@@ -6,9 +6,10 @@ Food Service
 
 from typing import Optional, List
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, update, and_, or_
 
 from app.models.food import Food, FoodCategory
+from app.core.allergens import allergen_tagger, parse_allergies
 from app.schemas.food import FoodCreate, FoodCategoryCreate, FoodSearch
 
 
@@ -99,11 +100,65 @@ class FoodService:
         if search_params.max_calories:
             stmt = stmt.where(Food.calories <= search_params.max_calories)
         
+        if search_params.allergies:
+            stmt = stmt.where(*self.allergy_filters(parse_allergies(search_params.allergies)))
+        
         offset = (search_params.page - 1) * search_params.page_size
         stmt = stmt.order_by(Food.name).offset(offset).limit(search_params.page_size)
         
         return list(self.db.execute(stmt).scalars().all())
     
+    # ===== Allergens =====
+    
+    @staticmethod
+    def allergy_filters(allergies: List[str]) -> list:
+        """
+        شرط‌های حذف غذاهای حساسیت‌زا
+        
+        حساسیت‌های شناخته‌شده یک AND بیتی روی allergen_mask هستند؛ فقط
+        عبارت‌های ناشناخته با نام غذا مقایسه می‌شوند.
+        """
+        mask, unknown = allergen_tagger.resolve(allergies)
+        filters = []
+        if mask:
+            filters.append(Food.allergen_mask.op("&")(mask) == 0)
+        for term in unknown:
+            filters.append(~Food.name.ilike(f"%{term}%"))
+            filters.append(or_(Food.name_en.is_(None), ~Food.name_en.ilike(f"%{term}%")))
+        return filters
+    
+    def tag_allergens(self, only_missing: bool = False) -> int:
+        """
+        برچسب‌گذاری حساسیت‌زای غذاها (پاس کامل روی جدول foods)
+        
+        Args:
+            only_missing: فقط غذاهایی که هنوز ماسک ندارند
+            
+        Returns:
+            تعداد غذاهایی که ماسکشان تغییر کرد
+        """
+        stmt = (
+            select(
+                Food.id, Food.name, Food.name_en, Food.allergen_mask,
+                FoodCategory.name.label("category"),
+                FoodCategory.name_en.label("category_en"),
+            )
+            .join(FoodCategory, FoodCategory.id == Food.category_id)
+        )
+        if only_missing:
+            stmt = stmt.where(Food.allergen_mask.is_(None))
+        
+        changes = []
+        for row in self.db.execute(stmt).all():
+            mask = allergen_tagger.tag(row.name, row.name_en, row.category, row.category_en)
+            if mask != row.allergen_mask:
+                changes.append({"id": row.id, "allergen_mask": mask})
+        
+        if changes:
+            self.db.execute(update(Food), changes)
+            self.db.commit()
+        return len(changes)
+    
     def calculate_macros(self, food_id: int, amount: float) -> Optional[dict]:
         """محاسبه ماکروها برای مقدار مشخص"""
         food = self.get_food(food_id)
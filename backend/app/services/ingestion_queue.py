@@ -0,0 +1,317 @@
+"""
+Ingestion Queue
+===============
+صف نوشتن دسته‌ای (write-behind) برای اندازه‌گیری‌ها و رکوردهای پیشرفت
+
+ترازوها و دستگاه‌های پوشیدنی داده را نمونه به نمونه می‌فرستند؛ ثبت هر نمونه
+در یک تراکنش جداگانه یعنی یک fsync به ازای هر نمونه. این صف درخواست‌های
+همزمان را جمع می‌کند و هر چند صد میلی‌ثانیه همه را در یک تراکنش
+(به ازای هر دیتابیس/shard) می‌نویسد.
+
+- backpressure: با پر شدن صف، درخواست جدید تا INGEST_ENQUEUE_TIMEOUT منتظر
+  می‌ماند و سپس IngestionQueueFull می‌گیرد
+- flush محدود: هیچ داده‌ای بیشتر از INGEST_FLUSH_INTERVAL_MS در صف نمی‌ماند
+- تأیید ماندگاری: هر ارسال یک Future دارد که بعد از commit تکمیل می‌شود
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.athlete import Athlete, AthleteMeasurement
+from app.models.progress import ProgressRecord
+from app.services.body_composition_service import BodyCompositionService
+from app.services.tdee_service import TDEEService
+
+
+class IngestionQueueFull(Exception):
+    """صف پر است و داده در زمان مجاز پذیرفته نشد"""
+    pass
+
+
+@dataclass
+class IngestionAck:
+    """تأیید ثبت یک ارسال"""
+    batch_id: int  # شماره flush ای که داده در آن commit شد
+    batch_rows: int  # تعداد کل ردیف‌های آن flush (از همه درخواست‌ها)
+    measurements: int
+    progress_records: int
+
+
+@dataclass
+class _PendingWrite:
+    """یک ارسال در صف"""
+    key: Hashable
+    session_factory: Callable[[], Session]
+    measurements: List[dict]
+    progress_records: List[dict]
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def rows(self) -> int:
+        return len(self.measurements) + len(self.progress_records)
+
+
+class WriteBehindQueue:
+    """
+    صف نوشتن دسته‌ای
+    ================
+    یک thread پس‌زمینه ارسال‌ها را جمع کرده و به صورت دسته‌ای commit می‌کند
+    """
+
+    def __init__(
+        self,
+        flush_interval: float,
+        max_batch_rows: int,
+        max_pending_rows: int,
+        enqueue_timeout: float,
+    ):
+        self.flush_interval = flush_interval
+        self.max_batch_rows = max_batch_rows
+        self.max_pending_rows = max_pending_rows
+        self.enqueue_timeout = enqueue_timeout
+
+        self._cond = threading.Condition()
+        self._pending: List[_PendingWrite] = []
+        self._pending_rows = 0
+        self._inflight_rows = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._batch_counter = 0
+        self._stats = {"batches": 0, "rows": 0, "errors": 0, "rejected": 0}
+
+    # ===== Lifecycle =====
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """شروع thread پس‌زمینه"""
+        with self._cond:
+            if self.running:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="ingestion-queue", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """توقف صف؛ داده‌های باقی‌مانده قبل از توقف commit می‌شوند"""
+        with self._cond:
+            if not self.running:
+                return
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self._thread = None
+
+    # ===== Producer =====
+
+    def submit(
+        self,
+        key: Hashable,
+        session_factory: Callable[[], Session],
+        measurements: List[dict],
+        progress_records: List[dict],
+    ) -> Future:
+        """
+        افزودن داده به صف
+
+        Args:
+            key: کلید دیتابیس مقصد (ارسال‌های هم‌کلید در یک تراکنش نوشته می‌شوند)
+            session_factory: سازنده session دیتابیس مقصد
+            measurements: ردیف‌های athlete_measurements (شامل athlete_id)
+            progress_records: ردیف‌های progress_records (شامل athlete_id)
+
+        Returns:
+            Future ای که بعد از commit با IngestionAck تکمیل می‌شود
+
+        Raises:
+            IngestionQueueFull: اگر در enqueue_timeout جا باز نشود
+        """
+        item = _PendingWrite(key, session_factory, measurements, progress_records)
+        if item.rows > self.max_pending_rows:
+            raise ValueError("تعداد ردیف‌ها از ظرفیت صف بیشتر است")
+
+        with self._cond:
+            if not self.running:
+                # بدون thread (اسکریپت‌ها، اجرای خارج از lifespan): نوشتن مستقیم
+                self._batch_counter += 1
+                batch_id = self._batch_counter
+            else:
+                deadline = time.monotonic() + self.enqueue_timeout
+                while self._pending_rows + self._inflight_rows + item.rows > self.max_pending_rows:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["rejected"] += 1
+                        raise IngestionQueueFull()
+                    self._cond.wait(remaining)
+
+                self._pending.append(item)
+                self._pending_rows += item.rows
+                self._cond.notify_all()
+                return item.future
+
+        self._write_group(batch_id, item.session_factory, [item])
+        return item.future
+
+    # ===== Consumer =====
+
+    def _run(self) -> None:
+        """حلقه thread پس‌زمینه"""
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+
+                # جمع کردن ارسال‌ها تا پر شدن دسته یا رسیدن قدیمی‌ترین به سقف زمان
+                deadline = self._pending[0].enqueued_at + self.flush_interval
+                while self._pending_rows < self.max_batch_rows and not self._stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch = self._pending
+                self._pending = []
+                self._inflight_rows = self._pending_rows
+                self._pending_rows = 0
+                self._batch_counter += 1
+                batch_id = self._batch_counter
+
+            self._flush(batch_id, batch)
+
+            with self._cond:
+                self._inflight_rows = 0
+                # بیدار کردن درخواست‌هایی که منتظر جا در صف هستند
+                self._cond.notify_all()
+
+    def _flush(self, batch_id: int, batch: List[_PendingWrite]) -> None:
+        """نوشتن یک دسته؛ یک تراکنش به ازای هر دیتابیس مقصد"""
+        groups: Dict[Hashable, Tuple[Callable[[], Session], List[_PendingWrite]]] = {}
+        for item in batch:
+            groups.setdefault(item.key, (item.session_factory, []))[1].append(item)
+
+        for session_factory, items in groups.values():
+            self._write_group(batch_id, session_factory, items)
+
+    def _write_group(
+        self,
+        batch_id: int,
+        session_factory: Callable[[], Session],
+        items: List[_PendingWrite],
+    ) -> None:
+        """
+        نوشتن ارسال‌های یک دیتابیس در یک تراکنش و تکمیل Future ها
+
+        اگر تراکنش مشترک شکست بخورد (مثلاً یک ردیف نامعتبر از یک کلاینت)،
+        هر ارسال جداگانه دوباره نوشته می‌شود تا خطای یک درخواست بقیه را
+        از بین نبرد.
+        """
+        try:
+            self._write(session_factory, items)
+        except Exception as exc:
+            with self._cond:
+                self._stats["errors"] += 1
+            if len(items) == 1:
+                items[0].future.set_exception(exc)
+                return
+            for item in items:
+                self._write_group(batch_id, session_factory, [item])
+            return
+
+        batch_rows = sum(item.rows for item in items)
+        with self._cond:
+            self._stats["batches"] += 1
+            self._stats["rows"] += batch_rows
+        for item in items:
+            item.future.set_result(IngestionAck(
+                batch_id=batch_id,
+                batch_rows=batch_rows,
+                measurements=len(item.measurements),
+                progress_records=len(item.progress_records),
+            ))
+
+    @staticmethod
+    def _write(session_factory: Callable[[], Session], items: List[_PendingWrite]) -> None:
+        """نوشتن ردیف‌های چند ارسال در یک تراکنش (rollback و raise در صورت خطا)"""
+        measurements = [row for item in items for row in item.measurements]
+        progress_records = [row for item in items for row in item.progress_records]
+
+        db = session_factory()
+        try:
+            if measurements:
+                db.execute(insert(AthleteMeasurement), measurements)
+            if progress_records:
+                db.execute(insert(ProgressRecord), progress_records)
+
+            # وزن پروفایل = وزن جدیدترین اندازه‌گیری ذخیره‌شده (نه فقط داخل همین دسته)،
+            # تا داده دیررسیده با تاریخ قدیمی‌تر وزن جدیدتر را بازنویسی نکند
+            weighed = {row["athlete_id"] for row in measurements if row.get("weight")}
+            if weighed:
+                latest_weight = (
+                    select(AthleteMeasurement.weight)
+                    .where(
+                        AthleteMeasurement.athlete_id == Athlete.id,
+                        AthleteMeasurement.weight.is_not(None),
+                    )
+                    .order_by(AthleteMeasurement.recorded_at.desc(), AthleteMeasurement.id.desc())
+                    .limit(1)
+                    .scalar_subquery()
+                )
+                db.execute(
+                    update(Athlete)
+                    .where(Athlete.id.in_(weighed))
+                    .values(weight=latest_weight)
+                    .execution_options(synchronize_session=False)
+                )
+
+            # بروزرسانی افزایشی ترکیب بدنی روزهای دریافت‌شده
+            athlete_dates: Dict[int, set] = {}
+            for row in measurements + progress_records:
+                athlete_dates.setdefault(row["athlete_id"], set()).add(row["recorded_at"])
+            BodyCompositionService(db).refresh(athlete_dates)
+
+            # بروزرسانی آنلاین TDEE تطبیقی با وزن‌های جدید
+            weights: Dict[int, list] = {}
+            for row in measurements:
+                if row.get("weight"):
+                    weights.setdefault(row["athlete_id"], []).append((row["recorded_at"], row["weight"]))
+            TDEEService(db).observe(weights)
+
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    # ===== Monitoring =====
+
+    def stats(self) -> dict:
+        """آمار صف برای endpoint سلامت"""
+        with self._cond:
+            return {
+                "running": self.running,
+                "pending_rows": self._pending_rows,
+                "inflight_rows": self._inflight_rows,
+                **self._stats,
+            }
+
+
+# نمونه سراسری
+ingestion_queue = WriteBehindQueue(
+    flush_interval=settings.INGEST_FLUSH_INTERVAL_MS / 1000,
+    max_batch_rows=settings.INGEST_MAX_BATCH_ROWS,
+    max_pending_rows=settings.INGEST_MAX_PENDING_ROWS,
+    enqueue_timeout=settings.INGEST_ENQUEUE_TIMEOUT,
+)
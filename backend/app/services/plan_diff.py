@@ -0,0 +1,170 @@
+"""
+Plan Diff
+=========
+مقایسه سند کامل برنامه با ردیف‌های ذخیره‌شده
+
+ویرایشگر برنامه کل سند را می‌فرستد؛ این ماژول در حافظه مشخص می‌کند کدام
+ردیف‌ها جدید، کدام تغییرکرده و کدام حذف‌شده‌اند تا ذخیره با چند دستور
+دسته‌ای (insert/update/delete) در یک تراکنش انجام شود.
+
+همین مقایسه برای تاریخچه نسخه‌ها روی سند کامل برنامه هم انجام می‌شود
+(document_delta / apply_delta).
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Sequence
+
+
+@dataclass
+class RowDiff:
+    """
+    تفاوت یک جدول
+    =============
+    inserts: ردیف‌های بدون id
+    updates: ردیف‌های تغییرکرده (id و همه فیلدها، برای یک executemany یکدست)
+    deletes: شناسه ردیف‌هایی که در سند نیامده‌اند
+    """
+    inserts: List[Dict[str, Any]] = field(default_factory=list)
+    updates: List[Dict[str, Any]] = field(default_factory=list)
+    deletes: List[int] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.inserts or self.updates or self.deletes)
+
+
+def diff_rows(
+    existing: Dict[int, Dict[str, Any]],
+    incoming: Iterable[Dict[str, Any]],
+    fields: Sequence[str],
+    label: str,
+) -> RowDiff:
+    """
+    مقایسه ردیف‌های سند با ردیف‌های موجود
+
+    Args:
+        existing: id -> مقادیر فعلی فیلدها
+        incoming: ردیف‌های سند (id اختیاری)
+        fields: فیلدهای قابل مقایسه
+        label: نام فارسی ردیف برای پیام خطا (مثلاً "روز")
+
+    Raises:
+        ValueError: اگر id متعلق به این برنامه نباشد یا تکراری باشد
+    """
+    diff = RowDiff()
+    seen = set()
+    for row in incoming:
+        row_id = row.get("id")
+        if row_id is None:
+            diff.inserts.append({name: row[name] for name in fields})
+            continue
+        if row_id in seen:
+            raise ValueError(f"{label} {row_id} بیش از یک بار در سند آمده است")
+        current = existing.get(row_id)
+        if current is None:
+            raise ValueError(f"{label} {row_id} متعلق به این برنامه نیست")
+        seen.add(row_id)
+        if any(row[name] != current[name] for name in fields):
+            diff.updates.append({"id": row_id, **{name: row[name] for name in fields}})
+
+    diff.deletes = [row_id for row_id in existing if row_id not in seen]
+    return diff
+
+
+# ===== Plan Documents (تاریخچه نسخه‌ها) =====
+#
+# سند برنامه: {"plan": {ستون: مقدار}, "<جدول فرزند>": {"<id>": {ستون: مقدار}}}
+# تفاوت دو سند: {"plan": {ستون تغییرکرده: مقدار جدید},
+#                "<جدول فرزند>": {"set": {"<id>": {ستون‌های تغییرکرده}}, "del": ["<id>"]}}
+# ردیف جدید در set با همه ستون‌ها می‌آید؛ بخش‌های بدون تغییر حذف می‌شوند.
+
+_MISSING = object()
+
+
+def document_delta(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """تفاوت ستون به ستون دو سند برنامه (خالی یعنی بدون تغییر)"""
+    delta: Dict[str, Any] = {}
+
+    plan = {
+        name: value for name, value in new.get("plan", {}).items()
+        if old.get("plan", {}).get(name, _MISSING) != value
+    }
+    if plan:
+        delta["plan"] = plan
+
+    for key in sorted((old.keys() | new.keys()) - {"plan"}):
+        before, after = old.get(key, {}), new.get(key, {})
+        changed = {}
+        for row_id, row in after.items():
+            current = before.get(row_id)
+            if current is None:
+                changed[row_id] = row
+                continue
+            columns = {name: value for name, value in row.items() if current.get(name, _MISSING) != value}
+            if columns:
+                changed[row_id] = columns
+        removed = [row_id for row_id in before if row_id not in after]
+
+        part: Dict[str, Any] = {}
+        if changed:
+            part["set"] = changed
+        if removed:
+            part["del"] = removed
+        if part:
+            delta[key] = part
+
+    return delta
+
+
+def apply_delta(document: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """اعمال تفاوت روی سند (سند ورودی تغییر نمی‌کند)"""
+    result = {key: dict(rows) for key, rows in document.items()}
+    result.setdefault("plan", {}).update(delta.get("plan", {}))
+
+    for key, part in delta.items():
+        if key == "plan":
+            continue
+        rows = result.setdefault(key, {})
+        for row_id, columns in part.get("set", {}).items():
+            rows[row_id] = {**rows.get(row_id, {}), **columns}
+        for row_id in part.get("del", []):
+            rows.pop(row_id, None)
+
+    return result
+
+
+def describe_changes(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    تفاوت خوانا برای نمایش
+
+    Returns:
+        {"plan": {ستون: {"old", "new"}},
+         "<جدول فرزند>": {"added": {id: ردیف}, "removed": {id: ردیف},
+                          "changed": {id: {ستون: {"old", "new"}}}}}
+    """
+    delta = document_delta(old, new)
+    changes: Dict[str, Any] = {}
+
+    if "plan" in delta:
+        before = old.get("plan", {})
+        changes["plan"] = {
+            name: {"old": before.get(name), "new": value} for name, value in delta["plan"].items()
+        }
+
+    for key, part in delta.items():
+        if key == "plan":
+            continue
+        before = old.get(key, {})
+        section: Dict[str, Any] = {"added": {}, "removed": {}, "changed": {}}
+        for row_id, columns in part.get("set", {}).items():
+            if row_id not in before:
+                section["added"][row_id] = columns
+            else:
+                section["changed"][row_id] = {
+                    name: {"old": before[row_id].get(name), "new": value}
+                    for name, value in columns.items()
+                }
+        for row_id in part.get("del", []):
+            section["removed"][row_id] = before[row_id]
+        changes[key] = section
+
+    return changes
@@ -0,0 +1,430 @@
+"""
+Plan History Service
+====================
+تاریخچه نسخه‌های برنامه تمرینی، غذایی و مکمل
+
+هر ذخیره سند فعلی برنامه را با آخرین نسخه ثبت‌شده مقایسه می‌کند و فقط
+تفاوت ستون به ستون را در plan_versions می‌نویسد؛ هر PLAN_SNAPSHOT_INTERVAL
+نسخه یک بار کل سند ذخیره می‌شود. بازسازی نسخه v = آخرین snapshot تا v به
+اضافه deltaهای بعد از آن (حداکثر PLAN_SNAPSHOT_INTERVAL ردیف در یک کوئری).
+
+ثبت نسخه commit نمی‌کند؛ در همان تراکنش ذخیره برنامه نوشته می‌شود. سرویس‌ها
+تغییر برنامه را داخل versioned(plan_type, plan_id) انجام می‌دهند.
+
+شناسه برنامه حذف‌شده ممکن است دوباره استفاده شود (دیتابیس‌های قدیمی بدون
+AUTOINCREMENT)، پس تاریخچه هر برنامه یک «زنجیره» است: نسخه‌های همان مربی
+بعد از آخرین نشانه حذف (is_deleted). همه خواندن‌ها به مربی درخواست‌کننده
+و زنجیره او محدودند.
+"""
+
+import enum
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import insert, select, func
+from sqlalchemy.orm import Session, MappedColumn
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.config import settings
+from app.models.training import (
+    TrainingPlan, TrainingDay, WorkoutItem,
+    TrainingPlanFields, TrainingDayFields, WorkoutItemFields
+)
+from app.models.diet import DietPlan, DietItem, DietPlanFields, DietItemFields
+from app.models.supplement_plan import SupplementPlan, SupplementPlanItem
+from app.models.plan_history import PlanVersion
+from app.services.plan_diff import apply_delta, describe_changes, document_delta
+from app.schemas.supplement_plan import SupplementPlanBase, SupplementPlanItemBase
+
+
+def content_fields(fields: type) -> Tuple[str, ...]:
+    """نام ستون‌های یک mixin محتوا (به ترتیب تعریف)"""
+    return tuple(name for name, value in vars(fields).items() if isinstance(value, MappedColumn))
+
+
+TRAINING_PLAN_FIELDS = content_fields(TrainingPlanFields)
+TRAINING_DAY_FIELDS = content_fields(TrainingDayFields)
+WORKOUT_ITEM_FIELDS = content_fields(WorkoutItemFields)
+DIET_PLAN_FIELDS = content_fields(DietPlanFields)
+DIET_ITEM_FIELDS = content_fields(DietItemFields)
+SUPPLEMENT_PLAN_FIELDS = tuple(SupplementPlanBase.model_fields)
+SUPPLEMENT_ITEM_FIELDS = tuple(SupplementPlanItemBase.model_fields)
+
+
+@dataclass(frozen=True)
+class _Rows:
+    """جدول فرزند در سند برنامه"""
+    key: str
+    model: Type
+    fields: Tuple[str, ...]
+    plan_column: ColumnElement  # ستون شناسه برنامه (روی خود جدول یا جدول join)
+    join: Optional[Type] = None
+
+
+@dataclass(frozen=True)
+class _Source:
+    """برنامه و جدول‌های فرزندش"""
+    model: Type
+    fields: Tuple[str, ...]
+    rows: Tuple[_Rows, ...]
+
+
+SOURCES: Dict[str, _Source] = {
+    "training": _Source(TrainingPlan, TRAINING_PLAN_FIELDS, (
+        _Rows("days", TrainingDay, TRAINING_DAY_FIELDS, TrainingDay.training_plan_id),
+        _Rows("items", WorkoutItem, ("training_day_id", *WORKOUT_ITEM_FIELDS), TrainingDay.training_plan_id, TrainingDay),
+    )),
+    "diet": _Source(DietPlan, DIET_PLAN_FIELDS, (
+        _Rows("items", DietItem, DIET_ITEM_FIELDS, DietItem.diet_plan_id),
+    )),
+    "supplement": _Source(SupplementPlan, SUPPLEMENT_PLAN_FIELDS, (
+        _Rows("items", SupplementPlanItem, SUPPLEMENT_ITEM_FIELDS, SupplementPlanItem.supplement_plan_id),
+    )),
+}
+
+
+@dataclass(frozen=True)
+class _Chain:
+    """وضعیت زنجیره برنامه فعلی"""
+    coach_id: Optional[int]
+    start: int  # آخرین نشانه حذف (۰ اگر برنامه حذف نشده باشد)
+    last: Optional[int]  # آخرین نسخه مربی در زنجیره
+    max_version: int  # بزرگ‌ترین شماره نسخه این شناسه در همه زنجیره‌ها
+
+
+def _jsonable(value: Any) -> Any:
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+def _scope(plan_type: str, plan_id: int) -> Tuple[ColumnElement, ...]:
+    return PlanVersion.plan_type == plan_type, PlanVersion.plan_id == plan_id
+
+
+# نشانه حذف برنامه (snapshot با سند خالی)
+_DELETED = (PlanVersion.is_deleted == True,)
+
+
+class PlanHistoryService:
+    """سرویس تاریخچه نسخه‌های برنامه"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    # ===== Recording =====
+    
+    @contextmanager
+    def versioned(self, plan_type: str, plan_id: int) -> Iterator[None]:
+        """
+        ثبت نسخه برای تغییرات برنامه داخل بلوک (بدون commit)
+        
+        وضعیت زنجیره قبل از بلوک با یک کوئری خوانده و بعد از بلوک برای ثبت
+        نسخه دوباره استفاده می‌شود. برنامه‌ای که هنوز تاریخچه ندارد (قدیمی یا
+        ساخته‌شده با insert دسته‌ای) اول وضعیت پیش از تغییر را به عنوان نسخه
+        پایه ثبت می‌کند. با خطا در بلوک نسخه‌ای ثبت نمی‌شود.
+        """
+        chain = self._chain_state(plan_type, plan_id)
+        if chain.last is None:
+            self._record(plan_type, plan_id, chain)
+            chain = None
+        yield
+        self._record(plan_type, plan_id, chain)
+    
+    def record(self, plan_type: str, plan_id: int) -> Optional[PlanVersion]:
+        """
+        ثبت نسخه جدید از وضعیت فعلی برنامه (بدون commit)
+        
+        Returns:
+            نسخه ثبت‌شده، یا None اگر برنامه وجود نداشته باشد یا تغییری نکرده باشد
+        """
+        return self._record(plan_type, plan_id, None)
+    
+    def record_created(self, plan_type: str, plan_ids: Sequence[int]) -> None:
+        """
+        ثبت نسخه اول (snapshot) برنامه‌های ساخته‌شده با insert دسته‌ای (بدون commit)
+        
+        سندها با یک کوئری برای هر جدول خوانده و نسخه‌ها با یک executemany
+        نوشته می‌شوند.
+        """
+        if not plan_ids:
+            return
+        self.db.flush()
+        documents = self._load_documents(plan_type, plan_ids)
+        # شناسه دوباره استفاده‌شده: شماره نسخه بعد از زنجیره‌های قبلی
+        versions = dict(self.db.execute(
+            select(PlanVersion.plan_id, func.max(PlanVersion.version))
+            .where(PlanVersion.plan_type == plan_type, PlanVersion.plan_id.in_(list(documents)))
+            .group_by(PlanVersion.plan_id)
+        ).all())
+        if documents:
+            self.db.execute(insert(PlanVersion), [
+                {
+                    "plan_type": plan_type,
+                    "plan_id": plan_id,
+                    "coach_id": coach_id,
+                    "version": versions.get(plan_id, 0) + 1,
+                    "is_snapshot": True,
+                    "data": document,
+                }
+                for plan_id, (coach_id, document) in documents.items()
+            ])
+    
+    def record_deleted(self, plan_type: str, plan_id: int) -> None:
+        """
+        ثبت حذف برنامه (snapshot خالی) تا تاریخچه بعد از حذف باقی بماند و
+        برنامه جدیدی با همان شناسه تاریخچه را ادامه ندهد
+        
+        قبل از حذف برنامه صدا زده می‌شود؛ وضعیت فعلی (تغییرات ثبت‌نشده)
+        اول به عنوان نسخه آخر ثبت می‌شود.
+        """
+        self.record(plan_type, plan_id)
+        chain = self._chain_state(plan_type, plan_id)
+        if chain.last is None:
+            return
+        self._add(plan_type, plan_id, chain.coach_id, chain.max_version + 1, True, {}, is_deleted=True)
+    
+    # ===== Reading =====
+    
+    def latest_version(self, plan_type: str, plan_id: int, coach_id: Optional[int]) -> Optional[int]:
+        """شماره آخرین نسخه برنامه فعلی (None برای برنامه بدون تاریخچه)"""
+        return self._chain_last(plan_type, plan_id, coach_id, self._last_deleted(plan_type, plan_id))
+    
+    def reconstruct(
+        self,
+        plan_type: str,
+        plan_id: int,
+        version: int,
+        coach_id: Optional[int],
+        after: int = 0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        بازسازی سند یک نسخه: آخرین snapshot تا آن نسخه + deltaهای بعدی
+        
+        Args:
+            coach_id: فقط نسخه‌های این مربی
+            after: فقط نسخه‌های بعد از این شماره (ابتدای زنجیره)
+        
+        Returns:
+            سند ({} برای نسخه حذف) یا None اگر نسخه وجود نداشته باشد
+        """
+        scope = (*_scope(plan_type, plan_id), PlanVersion.coach_id == coach_id, PlanVersion.version > after)
+        base = (
+            select(func.max(PlanVersion.version))
+            .where(*scope, PlanVersion.is_snapshot == True, PlanVersion.version <= version)
+            .scalar_subquery()
+        )
+        rows = self.db.execute(
+            select(PlanVersion.version, PlanVersion.is_snapshot, PlanVersion.data)
+            .where(*scope, PlanVersion.version >= base, PlanVersion.version <= version)
+            .order_by(PlanVersion.version)
+        ).all()
+        if not rows or rows[-1].version != version:
+            return None
+        
+        document = rows[0].data
+        for row in rows[1:]:
+            document = apply_delta(document, row.data)
+        return document
+    
+    def list_versions(self, plan_type: str, plan_id: int, coach_id: int) -> List[Dict[str, Any]]:
+        """لیست نسخه‌های یک برنامه (جدیدترین اول)"""
+        chain = self._chain_for(plan_type, plan_id, coach_id)
+        if chain is None:
+            return []
+        rows = self.db.execute(
+            select(
+                PlanVersion.version,
+                PlanVersion.is_snapshot,
+                PlanVersion.is_deleted,
+                PlanVersion.data,
+                PlanVersion.created_at,
+            )
+            .where(
+                *_scope(plan_type, plan_id),
+                PlanVersion.coach_id == coach_id,
+                PlanVersion.version > chain[0],
+                PlanVersion.version <= chain[1],
+            )
+            .order_by(PlanVersion.version.desc())
+        ).all()
+        return [
+            {
+                "version": row.version,
+                "is_snapshot": row.is_snapshot,
+                "deleted": bool(row.is_deleted),
+                "sections": sorted(row.data),
+                "created_at": row.created_at,
+            }
+            for row in rows
+        ]
+    
+    def get_version(
+        self,
+        plan_type: str,
+        plan_id: int,
+        version: int,
+        coach_id: int
+    ) -> Optional[Dict[str, Any]]:
+        """سند کامل یک نسخه (فقط برای مربی مالک)"""
+        chain = self._chain_for(plan_type, plan_id, coach_id)
+        if chain is None or version > chain[1]:
+            return None
+        return self.reconstruct(plan_type, plan_id, version, coach_id, chain[0])
+    
+    def diff(
+        self,
+        plan_type: str,
+        plan_id: int,
+        from_version: int,
+        to_version: int,
+        coach_id: int
+    ) -> Optional[Dict[str, Any]]:
+        """تفاوت دو نسخه (None اگر یکی از نسخه‌ها وجود نداشته باشد)"""
+        chain = self._chain_for(plan_type, plan_id, coach_id)
+        if chain is None or max(from_version, to_version) > chain[1]:
+            return None
+        old = self.reconstruct(plan_type, plan_id, from_version, coach_id, chain[0])
+        new = self.reconstruct(plan_type, plan_id, to_version, coach_id, chain[0])
+        if old is None or new is None:
+            return None
+        return describe_changes(old, new)
+    
+    # ===== Internal =====
+    
+    def _record(self, plan_type: str, plan_id: int, chain: Optional[_Chain]) -> Optional[PlanVersion]:
+        """
+        ثبت نسخه با وضعیت زنجیره خوانده‌شده قبل از تغییر
+        
+        اگر وضعیت داده نشده یا کهنه شده باشد (نسخه‌ای در این فاصله ثبت شده)
+        دوباره خوانده می‌شود.
+        """
+        self.db.flush()  # autoflush خاموش است؛ تغییرات ORM همین تراکنش باید دیده شوند
+        loaded = self._load_document(plan_type, plan_id)
+        if loaded is None:
+            return None
+        coach_id, document = loaded
+        
+        if (
+            chain is None
+            or chain.coach_id != coach_id
+            or self._max_version(plan_type, plan_id) != chain.max_version
+        ):
+            chain = self._chain_state(plan_type, plan_id)
+        
+        previous = None
+        if chain.last is not None:
+            previous = self.reconstruct(plan_type, plan_id, chain.last, coach_id, chain.start)
+        version = chain.max_version + 1
+        
+        # اولین نسخه زنجیره یا در فاصله‌های ثابت، کل سند ذخیره می‌شود
+        if not previous or (version - 1) % settings.PLAN_SNAPSHOT_INTERVAL == 0:
+            if previous == document:
+                return None
+            return self._add(plan_type, plan_id, coach_id, version, True, document)
+        
+        delta = document_delta(previous, document)
+        if not delta:
+            return None
+        return self._add(plan_type, plan_id, coach_id, version, False, delta)
+    
+    def _chain_state(self, plan_type: str, plan_id: int) -> _Chain:
+        """مالک برنامه فعلی و وضعیت زنجیره او با یک کوئری"""
+        model = SOURCES[plan_type].model
+        scope = _scope(plan_type, plan_id)
+        coach = select(model.coach_id).where(model.id == plan_id).correlate(None).scalar_subquery()
+        start = func.coalesce(
+            select(func.max(PlanVersion.version)).where(*scope, *_DELETED).correlate(None).scalar_subquery(),
+            0,
+        )
+        last = (
+            select(func.max(PlanVersion.version))
+            .where(*scope, PlanVersion.coach_id.is_not_distinct_from(coach), PlanVersion.version > start)
+            .correlate(None)
+            .scalar_subquery()
+        )
+        latest = select(func.max(PlanVersion.version)).where(*scope).correlate(None).scalar_subquery()
+        row = self.db.execute(select(coach, start, last, latest)).one()
+        return _Chain(coach_id=row[0], start=row[1], last=row[2], max_version=row[3] or 0)
+    
+    def _load_document(self, plan_type: str, plan_id: int) -> Optional[Tuple[Optional[int], Dict[str, Any]]]:
+        """(coach_id, سند فعلی برنامه) با یک کوئری ستونی برای هر جدول"""
+        return self._load_documents(plan_type, [plan_id]).get(plan_id)
+    
+    def _load_documents(
+        self,
+        plan_type: str,
+        plan_ids: Sequence[int]
+    ) -> Dict[int, Tuple[Optional[int], Dict[str, Any]]]:
+        """plan_id -> (coach_id، سند فعلی) برای چند برنامه با یک کوئری برای هر جدول"""
+        source = SOURCES[plan_type]
+        loaded: Dict[int, Tuple[Optional[int], Dict[str, Any]]] = {}
+        for plan in self.db.execute(
+            select(source.model.id, source.model.coach_id, *(getattr(source.model, name) for name in source.fields))
+            .where(source.model.id.in_(plan_ids))
+        ):
+            document = {"plan": {name: _jsonable(value) for name, value in zip(source.fields, plan[2:])}}
+            document.update((rows.key, {}) for rows in source.rows)
+            loaded[plan.id] = (plan.coach_id, document)
+        if not loaded:
+            return loaded
+        
+        for rows in source.rows:
+            stmt = select(rows.plan_column, rows.model.id, *(getattr(rows.model, name) for name in rows.fields))
+            if rows.join is not None:
+                stmt = stmt.join(rows.join)
+            for row in self.db.execute(stmt.where(rows.plan_column.in_(list(loaded)))):
+                loaded[row[0]][1][rows.key][str(row[1])] = {
+                    name: _jsonable(value) for name, value in zip(rows.fields, row[2:])
+                }
+        return loaded
+    
+    def _max_version(self, plan_type: str, plan_id: int) -> int:
+        """بزرگ‌ترین شماره نسخه این شناسه در همه زنجیره‌ها (برای شماره نسخه جدید)"""
+        return self.db.scalar(select(func.max(PlanVersion.version)).where(*_scope(plan_type, plan_id))) or 0
+    
+    def _last_deleted(self, plan_type: str, plan_id: int, before: Optional[int] = None) -> int:
+        """شماره آخرین نشانه حذف (قبل از before)؛ ۰ اگر برنامه حذف نشده باشد"""
+        stmt = select(func.max(PlanVersion.version)).where(*_scope(plan_type, plan_id), *_DELETED)
+        if before is not None:
+            stmt = stmt.where(PlanVersion.version < before)
+        return self.db.scalar(stmt) or 0
+    
+    def _chain_last(self, plan_type: str, plan_id: int, coach_id: Optional[int], after: int) -> Optional[int]:
+        """آخرین نسخه مربی بعد از شماره after"""
+        return self.db.scalar(
+            select(func.max(PlanVersion.version))
+            .where(*_scope(plan_type, plan_id), PlanVersion.coach_id == coach_id, PlanVersion.version > after)
+        )
+    
+    def _chain_for(self, plan_type: str, plan_id: int, coach_id: int) -> Optional[Tuple[int, int]]:
+        """
+        (ابتدا، انتها)ی آخرین زنجیره مربی: برنامه فعلی یا آخرین برنامه حذف‌شده
+        او با این شناسه (None اگر مربی تاریخچه‌ای با این شناسه نداشته باشد)
+        """
+        last = self._chain_last(plan_type, plan_id, coach_id, 0)
+        if last is None:
+            return None
+        return self._last_deleted(plan_type, plan_id, before=last), last
+    
+    def _add(
+        self,
+        plan_type: str,
+        plan_id: int,
+        coach_id: Optional[int],
+        version: int,
+        is_snapshot: bool,
+        data: Dict[str, Any],
+        is_deleted: bool = False
+    ) -> PlanVersion:
+        entry = PlanVersion(
+            plan_type=plan_type,
+            plan_id=plan_id,
+            coach_id=coach_id,
+            version=version,
+            is_snapshot=is_snapshot,
+            is_deleted=is_deleted,
+            data=data,
+        )
+        self.db.add(entry)
+        self.db.flush()
+        return entry
@@ -0,0 +1,343 @@
+"""
+Plan Template Service
+=====================
+سرویس قالب‌های برنامه تمرینی و غذایی
+
+تخصیص قالب به شاگردان با INSERT ... SELECT انجام می‌شود: یک دستور برای
+برنامه‌ها، یک دستور برای روزها و یک دستور برای آیتم‌ها، مستقل از تعداد
+شاگردان. برنامه ساخته‌شده کپی مستقل است و ویرایش بعدی قالب روی آن اثری ندارد.
+"""
+
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import select, delete, insert, update, literal
+
+from app.models.athlete import Athlete
+from app.models.training import TrainingPlan, TrainingDay, WorkoutItem
+from app.models.diet import DietPlan, DietItem
+from app.models.plan_template import (
+    TrainingTemplate, TrainingTemplateDay, TrainingTemplateItem,
+    DietTemplate, DietTemplateItem
+)
+from app.services.access_service import AccessService, scope_to_coach
+from app.services.diet_service import DietService, MACRO_FIELDS
+from app.services.plan_history_service import (
+    PlanHistoryService, TRAINING_PLAN_FIELDS, TRAINING_DAY_FIELDS, WORKOUT_ITEM_FIELDS,
+    DIET_PLAN_FIELDS, DIET_ITEM_FIELDS
+)
+from app.schemas.plan_template import TrainingTemplateCreate, DietTemplateCreate
+
+
+class PlanTemplateService:
+    """سرویس مدیریت قالب‌های برنامه"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.history = PlanHistoryService(db)
+    
+    # ===== Training Templates =====
+    
+    def get_training(self, template_id: int, coach_id: int) -> Optional[TrainingTemplate]:
+        """دریافت قالب تمرینی با روزها و حرکات"""
+        stmt = (
+            select(TrainingTemplate)
+            .options(selectinload(TrainingTemplate.days).selectinload(TrainingTemplateDay.workout_items))
+            .where(TrainingTemplate.id == template_id, TrainingTemplate.coach_id == coach_id)
+        )
+        return self.db.scalars(stmt).first()
+    
+    def list_training(self, coach_id: int) -> List[TrainingTemplate]:
+        """لیست قالب‌های تمرینی مربی"""
+        stmt = (
+            select(TrainingTemplate)
+            .where(TrainingTemplate.coach_id == coach_id)
+            .order_by(TrainingTemplate.name)
+        )
+        return list(self.db.scalars(stmt).all())
+    
+    def create_training(self, coach_id: int, data: TrainingTemplateCreate) -> TrainingTemplate:
+        """ایجاد قالب تمرینی"""
+        template = TrainingTemplate(coach_id=coach_id, **data.model_dump(exclude={"days"}))
+        for day_data in data.days:
+            day = TrainingTemplateDay(**day_data.model_dump(exclude={"workout_items"}))
+            day.workout_items = [
+                TrainingTemplateItem(**item_data.model_dump()) for item_data in day_data.workout_items
+            ]
+            template.days.append(day)
+        
+        self.db.add(template)
+        self.db.commit()
+        return self.get_training(template.id, coach_id)
+    
+    def training_from_plan(
+        self,
+        plan_id: int,
+        coach_id: int,
+        name: Optional[str] = None
+    ) -> Optional[TrainingTemplate]:
+        """ذخیره یک برنامه تمرینی موجود به‌عنوان قالب"""
+        stmt = (
+            select(TrainingPlan)
+            .options(selectinload(TrainingPlan.days).selectinload(TrainingDay.workout_items))
+            .where(TrainingPlan.id == plan_id)
+        )
+        plan = self.db.scalars(scope_to_coach(stmt, TrainingPlan, coach_id)).first()
+        if not plan:
+            return None
+        
+        template = TrainingTemplate(coach_id=coach_id, **_copy(plan, TRAINING_PLAN_FIELDS))
+        if name:
+            template.name = name
+        for day in plan.days:
+            template_day = TrainingTemplateDay(**_copy(day, TRAINING_DAY_FIELDS))
+            template_day.workout_items = [
+                TrainingTemplateItem(**_copy(item, WORKOUT_ITEM_FIELDS)) for item in day.workout_items
+            ]
+            template.days.append(template_day)
+        
+        self.db.add(template)
+        self.db.commit()
+        return self.get_training(template.id, coach_id)
+    
+    def delete_training(self, template_id: int, coach_id: int) -> bool:
+        """حذف قالب تمرینی (برنامه‌های ساخته‌شده از آن باقی می‌مانند)"""
+        stmt = delete(TrainingTemplate).where(
+            TrainingTemplate.id == template_id, TrainingTemplate.coach_id == coach_id
+        )
+        deleted = self.db.execute(stmt).rowcount
+        self.db.commit()
+        return deleted > 0
+    
+    def assign_training(
+        self,
+        template_id: int,
+        coach_id: int,
+        athlete_ids: Sequence[int],
+        name: Optional[str] = None,
+        activate: bool = True
+    ) -> Optional[List[Dict[str, int]]]:
+        """
+        ساخت برنامه تمرینی از روی قالب برای چند شاگرد
+        
+        سه INSERT ... SELECT: برنامه‌ها (شاگرد × قالب)، روزها (برنامه جدید ×
+        روزهای قالب از طریق template_id) و حرکات (روز جدید × حرکات روز قالب
+        از طریق template_day_id).
+        
+        Returns:
+            لیست {athlete_id, plan_id} یا None اگر قالب یافت نشود
+        
+        Raises:
+            ValueError: اگر شاگردی متعلق به این مربی نباشد
+        """
+        exists = self.db.scalar(
+            select(TrainingTemplate.id)
+            .where(TrainingTemplate.id == template_id, TrainingTemplate.coach_id == coach_id)
+        )
+        if exists is None:
+            return None
+        
+        athlete_ids = AccessService(self.db).require_athletes(athlete_ids, coach_id)
+        if activate:
+            self.db.execute(
+                update(TrainingPlan)
+                .where(TrainingPlan.athlete_id.in_(athlete_ids), TrainingPlan.is_active == True)
+                .values(is_active=False)
+            )
+        
+        plan_fields = [field for field in TRAINING_PLAN_FIELDS if field != "name"]
+        plans = self.db.execute(
+            insert(TrainingPlan)
+            .from_select(
+                ["athlete_id", "coach_id", "template_id", "is_active", "name", *plan_fields],
+                select(
+                    Athlete.id,
+                    literal(coach_id),
+                    TrainingTemplate.id,
+                    literal(activate),
+                    literal(name) if name else TrainingTemplate.name,
+                    *(getattr(TrainingTemplate, field) for field in plan_fields),
+                )
+                .join_from(Athlete, TrainingTemplate, TrainingTemplate.id == template_id)
+                .where(Athlete.id.in_(athlete_ids))
+            )
+            .returning(TrainingPlan.id, TrainingPlan.athlete_id)
+        ).all()
+        plan_ids = [plan.id for plan in plans]
+        
+        self.db.execute(
+            insert(TrainingDay).from_select(
+                ["training_plan_id", "coach_id", "template_day_id", *TRAINING_DAY_FIELDS],
+                select(
+                    TrainingPlan.id,
+                    TrainingPlan.coach_id,
+                    TrainingTemplateDay.id,
+                    *(getattr(TrainingTemplateDay, field) for field in TRAINING_DAY_FIELDS),
+                )
+                .join_from(TrainingPlan, TrainingTemplateDay, TrainingTemplateDay.template_id == TrainingPlan.template_id)
+                .where(TrainingPlan.id.in_(plan_ids))
+            )
+        )
+        self.db.execute(
+            insert(WorkoutItem).from_select(
+                ["training_day_id", "coach_id", *WORKOUT_ITEM_FIELDS],
+                select(
+                    TrainingDay.id,
+                    TrainingDay.coach_id,
+                    *(getattr(TrainingTemplateItem, field) for field in WORKOUT_ITEM_FIELDS),
+                )
+                .join_from(TrainingDay, TrainingTemplateItem, TrainingTemplateItem.template_day_id == TrainingDay.template_day_id)
+                .where(TrainingDay.training_plan_id.in_(plan_ids))
+            )
+        )
+        
+        self.history.record_created("training", plan_ids)
+        self.db.commit()
+        return [{"athlete_id": plan.athlete_id, "plan_id": plan.id} for plan in plans]
+    
+    # ===== Diet Templates =====
+    
+    def get_diet(self, template_id: int, coach_id: int) -> Optional[DietTemplate]:
+        """دریافت قالب غذایی با آیتم‌ها"""
+        stmt = (
+            select(DietTemplate)
+            .options(selectinload(DietTemplate.items))
+            .where(DietTemplate.id == template_id, DietTemplate.coach_id == coach_id)
+        )
+        return self.db.scalars(stmt).first()
+    
+    def list_diet(self, coach_id: int) -> List[DietTemplate]:
+        """لیست قالب‌های غذایی مربی"""
+        stmt = (
+            select(DietTemplate)
+            .where(DietTemplate.coach_id == coach_id)
+            .order_by(DietTemplate.name)
+        )
+        return list(self.db.scalars(stmt).all())
+    
+    def create_diet(self, coach_id: int, data: DietTemplateCreate) -> DietTemplate:
+        """
+        ایجاد قالب غذایی (ماکروها همین‌جا محاسبه و همراه آیتم‌ها کپی می‌شوند)
+        
+        Raises:
+            ValueError: اگر غذای آیتمی وجود نداشته باشد
+        """
+        macros = DietService(self.db)._document_macros(data.items)
+        
+        template = DietTemplate(coach_id=coach_id, **data.model_dump(exclude={"items"}))
+        for item_data, row in zip(data.items, macros.tolist()):
+            item = DietTemplateItem(**item_data.model_dump(include=set(DIET_ITEM_FIELDS)))
+            for field, value in zip(MACRO_FIELDS, row):
+                setattr(item, field, None if value != value else value)  # NaN -> None
+            template.items.append(item)
+        
+        self.db.add(template)
+        self.db.commit()
+        return self.get_diet(template.id, coach_id)
+    
+    def diet_from_plan(
+        self,
+        plan_id: int,
+        coach_id: int,
+        name: Optional[str] = None
+    ) -> Optional[DietTemplate]:
+        """ذخیره یک برنامه غذایی موجود به‌عنوان قالب"""
+        stmt = (
+            select(DietPlan)
+            .options(selectinload(DietPlan.items))
+            .where(DietPlan.id == plan_id)
+        )
+        plan = self.db.scalars(scope_to_coach(stmt, DietPlan, coach_id)).first()
+        if not plan:
+            return None
+        
+        template = DietTemplate(coach_id=coach_id, **_copy(plan, DIET_PLAN_FIELDS))
+        if name:
+            template.name = name
+        template.items = [DietTemplateItem(**_copy(item, DIET_ITEM_FIELDS)) for item in plan.items]
+        
+        self.db.add(template)
+        self.db.commit()
+        return self.get_diet(template.id, coach_id)
+    
+    def delete_diet(self, template_id: int, coach_id: int) -> bool:
+        """حذف قالب غذایی (برنامه‌های ساخته‌شده از آن باقی می‌مانند)"""
+        stmt = delete(DietTemplate).where(DietTemplate.id == template_id, DietTemplate.coach_id == coach_id)
+        deleted = self.db.execute(stmt).rowcount
+        self.db.commit()
+        return deleted > 0
+    
+    def assign_diet(
+        self,
+        template_id: int,
+        coach_id: int,
+        athlete_ids: Sequence[int],
+        name: Optional[str] = None,
+        activate: bool = True
+    ) -> Optional[List[Dict[str, int]]]:
+        """
+        ساخت برنامه غذایی از روی قالب برای چند شاگرد
+        
+        دو INSERT ... SELECT: برنامه‌ها (شاگرد × قالب) و آیتم‌ها (برنامه جدید ×
+        آیتم‌های قالب از طریق template_id، با ماکروهای از پیش محاسبه‌شده).
+        
+        Returns:
+            لیست {athlete_id, plan_id} یا None اگر قالب یافت نشود
+        
+        Raises:
+            ValueError: اگر شاگردی متعلق به این مربی نباشد
+        """
+        exists = self.db.scalar(
+            select(DietTemplate.id)
+            .where(DietTemplate.id == template_id, DietTemplate.coach_id == coach_id)
+        )
+        if exists is None:
+            return None
+        
+        athlete_ids = AccessService(self.db).require_athletes(athlete_ids, coach_id)
+        if activate:
+            self.db.execute(
+                update(DietPlan)
+                .where(DietPlan.athlete_id.in_(athlete_ids), DietPlan.is_active == True)
+                .values(is_active=False)
+            )
+        
+        plan_fields = [field for field in DIET_PLAN_FIELDS if field != "name"]
+        plans = self.db.execute(
+            insert(DietPlan)
+            .from_select(
+                ["athlete_id", "coach_id", "template_id", "is_active", "name", *plan_fields],
+                select(
+                    Athlete.id,
+                    literal(coach_id),
+                    DietTemplate.id,
+                    literal(activate),
+                    literal(name) if name else DietTemplate.name,
+                    *(getattr(DietTemplate, field) for field in plan_fields),
+                )
+                .join_from(Athlete, DietTemplate, DietTemplate.id == template_id)
+                .where(Athlete.id.in_(athlete_ids))
+            )
+            .returning(DietPlan.id, DietPlan.athlete_id)
+        ).all()
+        
+        self.db.execute(
+            insert(DietItem).from_select(
+                ["diet_plan_id", "coach_id", *DIET_ITEM_FIELDS],
+                select(
+                    DietPlan.id,
+                    DietPlan.coach_id,
+                    *(getattr(DietTemplateItem, field) for field in DIET_ITEM_FIELDS),
+                )
+                .join_from(DietPlan, DietTemplateItem, DietTemplateItem.template_id == DietPlan.template_id)
+                .where(DietPlan.id.in_([plan.id for plan in plans]))
+            )
+        )
+        
+        self.history.record_created("diet", [plan.id for plan in plans])
+        self.db.commit()
+        return [{"athlete_id": plan.athlete_id, "plan_id": plan.id} for plan in plans]
+
+
+def _copy(row: object, fields: Sequence[str]) -> Dict[str, object]:
+    """مقادیر ستون‌های محتوای یک ردیف"""
+    return {field: getattr(row, field) for field in fields}
@@ -0,0 +1,197 @@
+"""
+Progress Service
+================
+سرویس ثبت و تحلیل رکوردهای پیشرفت
+"""
+
+from datetime import date
+from typing import Optional, List
+
+import numpy as np
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+
+from app.models.progress import ProgressRecord
+from app.schemas.progress import (
+    ProgressRecordCreate, ProgressSummary, ProgressSeries,
+    ProgressField, ProgressResolution
+)
+from app.services.body_composition_service import BodyCompositionService
+from app.core.timeseries import (
+    bucket_aggregate, lttb_indices,
+    to_day_numbers, to_float_array, to_nullable_list
+)
+
+
+class ProgressService:
+    """سرویس رکوردهای پیشرفت"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_record(self, record_id: int) -> Optional[ProgressRecord]:
+        """دریافت رکورد با شناسه"""
+        return self.db.get(ProgressRecord, record_id)
+
+    def get_records(
+        self,
+        athlete_id: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        limit: int = 100
+    ) -> List[ProgressRecord]:
+        """دریافت رکوردهای یک بازه زمانی (جدیدترین اول)"""
+        stmt = select(ProgressRecord).where(ProgressRecord.athlete_id == athlete_id)
+        stmt = self._apply_range(stmt, start, end)
+        stmt = stmt.order_by(ProgressRecord.recorded_at.desc(), ProgressRecord.id.desc()).limit(limit)
+        return list(self.db.execute(stmt).scalars().all())
+
+    def create_record(self, record_data: ProgressRecordCreate) -> ProgressRecord:
+        """ثبت رکورد پیشرفت"""
+        record = ProgressRecord(**record_data.model_dump())
+        self.db.add(record)
+        BodyCompositionService(self.db).refresh({record.athlete_id: [record.recorded_at]})
+        self.db.commit()
+        self.db.refresh(record)
+        return record
+
+    def delete_record(self, record_id: int) -> bool:
+        """حذف رکورد"""
+        record = self.get_record(record_id)
+        if not record:
+            return False
+
+        self.db.delete(record)
+        BodyCompositionService(self.db).refresh({record.athlete_id: [record.recorded_at]})
+        self.db.commit()
+        return True
+
+    # ===== Analytics =====
+
+    def get_summary(self, athlete_id: int) -> ProgressSummary:
+        """خلاصه پیشرفت با یک کوئری تجمیعی"""
+        r = ProgressRecord
+        stats = self.db.execute(
+            select(
+                func.count(r.id),
+                func.max(r.squat_1rm),
+                func.max(r.bench_1rm),
+                func.max(r.deadlift_1rm),
+                func.avg(r.energy_level),
+                func.avg(r.sleep_quality),
+                func.avg(r.training_adherence),
+                func.avg(r.diet_adherence),
+            ).where(r.athlete_id == athlete_id)
+        ).one()
+
+        weight_first, weight_last = self._first_last(athlete_id, r.weight)
+        fat_first, fat_last = self._first_last(athlete_id, r.body_fat_percentage)
+
+        return ProgressSummary(
+            athlete_id=athlete_id,
+            records_count=stats[0],
+            latest_weight=weight_last,
+            latest_body_fat=fat_last,
+            weight_change=round(weight_last - weight_first, 2) if weight_last is not None else None,
+            body_fat_change=round(fat_last - fat_first, 2) if fat_last is not None else None,
+            best_squat=stats[1],
+            best_bench=stats[2],
+            best_deadlift=stats[3],
+            avg_energy=self._round(stats[4]),
+            avg_sleep_quality=self._round(stats[5]),
+            avg_training_adherence=self._round(stats[6]),
+            avg_diet_adherence=self._round(stats[7]),
+        )
+
+    def get_series(
+        self,
+        athlete_id: int,
+        fields: List[ProgressField],
+        resolution: ProgressResolution = "lttb",
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        points: int = 500
+    ) -> ProgressSeries:
+        """
+        سری زمانی ستونی برای نمودار
+
+        فقط ستون‌های درخواستی از دیتابیس خوانده می‌شوند.
+
+        Args:
+            fields: فیلدهای درخواستی (برای lttb، اولین فیلد مبنای انتخاب نقاط است)
+            resolution: lttb، raw یا تجمیع day/week/month
+            points: حداکثر تعداد نقاط در حالت lttb و raw؛ raw بیشتر از این سقف
+                با lttb کاهش می‌یابد و resolution پاسخ lttb می‌شود
+        """
+        columns = [getattr(ProgressRecord, name) for name in fields]
+        stmt = select(ProgressRecord.recorded_at, *columns).where(
+            ProgressRecord.athlete_id == athlete_id
+        )
+        stmt = self._apply_range(stmt, start, end)
+        stmt = stmt.order_by(ProgressRecord.recorded_at, ProgressRecord.id)
+        rows = self.db.execute(stmt).all()
+
+        # تبدیل ردیف‌ها به ستون‌ها
+        dates = [row[0] for row in rows]
+        days = to_day_numbers(dates)
+        data = {
+            name: to_float_array([row[i + 1] for row in rows])
+            for i, name in enumerate(fields)
+        }
+
+        if resolution in ("day", "week", "month"):
+            result = bucket_aggregate(days, data, resolution)
+            return ProgressSeries(
+                athlete_id=athlete_id,
+                resolution=resolution,
+                dates=result["dates"].tolist(),
+                values={name: to_nullable_list(v) for name, v in result["avg"].items()},
+                min={name: to_nullable_list(v) for name, v in result["min"].items()},
+                max={name: to_nullable_list(v) for name, v in result["max"].items()},
+                count=result["count"].tolist(),
+            )
+
+        if resolution == "raw" and len(rows) > points:
+            resolution = "lttb"
+
+        if resolution == "lttb" and fields:
+            # انتخاب نقاط بر اساس فیلد اول؛ سایر فیلدها در همان تاریخ‌ها
+            primary = data[fields[0]]
+            present = np.flatnonzero(~np.isnan(primary))
+            selected = present[
+                lttb_indices(days[present].astype(np.int64), primary[present], points)
+            ]
+            days = days[selected]
+            data = {name: values[selected] for name, values in data.items()}
+
+        return ProgressSeries(
+            athlete_id=athlete_id,
+            resolution=resolution,
+            dates=days.tolist(),
+            values={name: to_nullable_list(v) for name, v in data.items()},
+        )
+
+    # ===== Helpers =====
+
+    @staticmethod
+    def _apply_range(stmt, start: Optional[date], end: Optional[date]):
+        """اعمال بازه زمانی روی recorded_at"""
+        if start:
+            stmt = stmt.where(ProgressRecord.recorded_at >= start)
+        if end:
+            stmt = stmt.where(ProgressRecord.recorded_at <= end)
+        return stmt
+
+    def _first_last(self, athlete_id: int, column) -> tuple:
+        """اولین و آخرین مقدار غیرخالی یک ستون"""
+        base = select(column).where(
+            ProgressRecord.athlete_id == athlete_id,
+            column.isnot(None)
+        )
+        first = self.db.scalar(base.order_by(ProgressRecord.recorded_at, ProgressRecord.id).limit(1))
+        last = self.db.scalar(base.order_by(ProgressRecord.recorded_at.desc(), ProgressRecord.id.desc()).limit(1))
+        return first, last
+
+    @staticmethod
+    def _round(value) -> Optional[float]:
+        return round(float(value), 1) if value is not None else None
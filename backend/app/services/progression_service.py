@@ -0,0 +1,173 @@
+"""
+Progression Service
+===================
+سرویس جدول پیشرفت برنامه تمرینی
+
+جدول همه حرکات برنامه برای همه هفته‌ها با یک فراخوانی periodize (numpy)
+ساخته و به شکل ماتریس هفته × حرکت ذخیره می‌شود؛ پنل شاگرد و چاپ برنامه
+همان ماتریس ذخیره‌شده را می‌خوانند. نسخه برنامه (تاریخچه) هنگام تولید
+نگه داشته می‌شود تا جدولِ برنامه‌ای که بعداً ویرایش شده stale علامت بخورد؛
+همه مسیرهای ویرایش برنامه (سند کامل، روز، حرکت و ترتیب) نسخه ثبت می‌کنند،
+پس مقایسه شماره نسخه هر تغییر محتوا را می‌بیند.
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+from sqlalchemy import select, delete, func
+from sqlalchemy.orm import Session
+
+from app.core.periodization import Scheme, parse_reps, periodize
+from app.models.training import TrainingPlan, TrainingDay, WorkoutItem, TrainingProgression
+from app.models.exercise import Exercise
+from app.services.plan_history_service import PlanHistoryService
+from app.schemas.training import TrainingProgressionRequest
+
+
+DEFAULT_WEEKS = 4
+
+
+class ProgressionService:
+    """سرویس جدول پیشرفت برنامه تمرینی"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.history = PlanHistoryService(db)
+    
+    def generate(self, plan_id: int, data: TrainingProgressionRequest) -> Optional[Dict[str, Any]]:
+        """
+        تولید (یا جایگزینی) جدول پیشرفت برنامه
+        
+        Returns:
+            جدول ذخیره‌شده، یا None اگر برنامه وجود نداشته باشد
+        
+        Raises:
+            ValueError: حرکت ناشناخته، 1RM نامعتبر یا نبود هیچ حرکتی با 1RM
+        """
+        plan = self.db.execute(
+            select(TrainingPlan.coach_id, TrainingPlan.duration_weeks)
+            .where(TrainingPlan.id == plan_id)
+        ).first()
+        if plan is None:
+            return None
+        
+        rows = self.db.execute(
+            select(
+                WorkoutItem.id,
+                WorkoutItem.exercise_id,
+                WorkoutItem.reps,
+                TrainingDay.day_number,
+                func.coalesce(Exercise.name, WorkoutItem.custom_name, "بدون نام").label("name"),
+            )
+            .join(TrainingDay, WorkoutItem.training_day_id == TrainingDay.id)
+            .outerjoin(Exercise, WorkoutItem.exercise_id == Exercise.id)
+            .where(TrainingDay.training_plan_id == plan_id)
+            .order_by(TrainingDay.day_number, WorkoutItem.order, WorkoutItem.id)
+        ).all()
+        
+        unknown = set(data.one_rms) - {row.id for row in rows}
+        if unknown:
+            raise ValueError(f"حرکت در برنامه یافت نشد: {', '.join(map(str, sorted(unknown)))}")
+        
+        selected = []
+        for row in rows:
+            one_rm = data.one_rms.get(row.id, data.exercise_one_rms.get(row.exercise_id))
+            if one_rm is None:
+                continue
+            if one_rm <= 0:
+                raise ValueError("1RM باید بزرگ‌تر از صفر باشد")
+            selected.append((row, one_rm))
+        if not selected:
+            raise ValueError("برای هیچ حرکتی از برنامه 1RM مشخص نشده است")
+        
+        weeks = data.weeks or plan.duration_weeks or DEFAULT_WEEKS
+        _, day_index = np.unique([row.day_number for row, _ in selected], return_inverse=True)
+        table = periodize(
+            np.array([one_rm for _, one_rm in selected], dtype=float),
+            parse_reps([row.reps for row, _ in selected]),
+            weeks,
+            Scheme(data.scheme),
+            data.step_percent,
+            day_index,
+            data.rounding,
+        )
+        
+        # وضعیت فعلی برنامه به عنوان نسخه ثبت می‌شود (اگر با آخرین نسخه فرق
+        # داشته باشد، مثلاً برنامه‌های قدیمی بدون تاریخچه)، تا plan_version دقیقاً
+        # همان محتوایی باشد که جدول از آن ساخته شده
+        self.history.record("training", plan_id)
+        progression = self._get(plan_id)
+        if progression is None:
+            progression = TrainingProgression(training_plan_id=plan_id, coach_id=plan.coach_id)
+            self.db.add(progression)
+        
+        progression.scheme = data.scheme
+        progression.weeks = weeks
+        progression.step_percent = data.step_percent
+        progression.rounding = data.rounding
+        progression.plan_version = self.history.latest_version("training", plan_id, plan.coach_id)
+        progression.items = [
+            {"id": row.id, "day_number": row.day_number, "name": row.name, "one_rm": one_rm}
+            for row, one_rm in selected
+        ]
+        progression.table = {name: values.tolist() for name, values in table.items()}
+        
+        self.db.commit()
+        self.db.refresh(progression)
+        return self._response(progression, progression.plan_version)
+    
+    def get(self, plan_id: int) -> Optional[Dict[str, Any]]:
+        """جدول ذخیره‌شده برنامه (بدون محاسبه دوباره)"""
+        progression = self._get(plan_id)
+        if progression is None:
+            return None
+        return self._response(
+            progression, self.history.latest_version("training", plan_id, progression.coach_id)
+        )
+    
+    def get_active(self, athlete_id: int) -> Optional[Dict[str, Any]]:
+        """جدول پیشرفت برنامه تمرینی فعال شاگرد"""
+        progression = self.db.execute(
+            select(TrainingProgression)
+            .join(TrainingPlan, TrainingProgression.training_plan_id == TrainingPlan.id)
+            .where(TrainingPlan.athlete_id == athlete_id, TrainingPlan.is_active == True)
+            .order_by(TrainingPlan.id.desc())
+            .limit(1)
+        ).scalar_one_or_none()
+        if progression is None:
+            return None
+        return self._response(
+            progression,
+            self.history.latest_version("training", progression.training_plan_id, progression.coach_id),
+        )
+    
+    def delete(self, plan_id: int) -> bool:
+        """حذف جدول پیشرفت برنامه"""
+        result = self.db.execute(
+            delete(TrainingProgression).where(TrainingProgression.training_plan_id == plan_id)
+        )
+        self.db.commit()
+        return result.rowcount > 0
+    
+    # ===== Internal =====
+    
+    def _get(self, plan_id: int) -> Optional[TrainingProgression]:
+        return self.db.execute(
+            select(TrainingProgression).where(TrainingProgression.training_plan_id == plan_id)
+        ).scalar_one_or_none()
+    
+    @staticmethod
+    def _response(progression: TrainingProgression, current_version: Optional[int]) -> Dict[str, Any]:
+        return {
+            "training_plan_id": progression.training_plan_id,
+            "scheme": progression.scheme,
+            "weeks": progression.weeks,
+            "step_percent": progression.step_percent,
+            "rounding": progression.rounding,
+            "plan_version": progression.plan_version,
+            "stale": progression.plan_version != current_version,
+            "items": progression.items,
+            **progression.table,
+            "created_at": progression.created_at,
+            "updated_at": progression.updated_at,
+        }
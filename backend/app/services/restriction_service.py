@@ -0,0 +1,141 @@
+"""
+Injury Restriction Service
+==========================
+سرویس حرکات ممنوعه آسیب‌دیدگی
+
+ایندکس پایه (INJURY_EXERCISE_RESTRICTIONS روی کل بانک تمرینات) یک بار ساخته
+و تا تغییر بانک تمرینات در حافظه نگه داشته می‌شود. قوانین اختصاصی هر مربی
+روی همان posting list ها اعمال و جداگانه کش می‌شوند.
+"""
+
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+
+from app.models.athlete import Athlete
+from app.models.exercise import Exercise
+from app.models.injury_restriction import InjuryRestriction
+from app.core.training_engine import training_engine
+from app.core.injury_restrictions import injury_matcher, RestrictionIndex
+from app.schemas.exercise import InjuryRestrictionCreate
+
+
+_index_lock = threading.Lock()
+_base_cache: Dict[str, object] = {"version": None, "index": None}
+_coach_cache: Dict[int, Tuple[tuple, RestrictionIndex]] = {}
+
+
+class InjuryRestrictionService:
+    """سرویس حرکات ممنوعه آسیب‌دیدگی"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.matcher = injury_matcher
+
+    # ===== Index =====
+
+    def get_index(self, coach_id: Optional[int] = None) -> RestrictionIndex:
+        """ایندکس حرکات ممنوعه (پایه + قوانین مربی)"""
+        base_version = tuple(self.db.execute(
+            select(func.count(Exercise.id), func.max(Exercise.id), func.max(Exercise.updated_at))
+        ).one())
+
+        with _index_lock:
+            if _base_cache["version"] != base_version:
+                _base_cache["index"] = self.matcher.build(
+                    self.db.execute(select(Exercise.id, Exercise.name, Exercise.name_en)).all(),
+                    training_engine.INJURY_EXERCISE_RESTRICTIONS,
+                )
+                _base_cache["version"] = base_version
+                _coach_cache.clear()
+            base: RestrictionIndex = _base_cache["index"]
+
+        if coach_id is None:
+            return base
+
+        coach_version = tuple(self.db.execute(
+            select(
+                func.count(InjuryRestriction.id),
+                func.max(InjuryRestriction.id),
+                func.max(InjuryRestriction.updated_at),
+            ).where(InjuryRestriction.coach_id == coach_id)
+        ).one())
+        if not coach_version[0]:
+            return base
+
+        with _index_lock:
+            cached = _coach_cache.get(coach_id)
+            if cached and cached[0] == coach_version:
+                return cached[1]
+
+        patterns: Dict[str, List[str]] = {}
+        exercise_ids: Dict[str, List[int]] = {}
+        for rule in self.list_rules(coach_id):
+            if rule.pattern:
+                patterns.setdefault(rule.body_part, []).append(rule.pattern)
+            if rule.exercise_id:
+                exercise_ids.setdefault(rule.body_part, []).append(rule.exercise_id)
+        index = base.extend(patterns, exercise_ids)
+
+        with _index_lock:
+            _coach_cache[coach_id] = (coach_version, index)
+        return index
+
+    def excluded_ids(self, injuries: Iterable[str], coach_id: Optional[int] = None) -> FrozenSet[int]:
+        """شناسه حرکات ممنوعه برای متن آسیب‌ها"""
+        injuries = list(injuries)
+        if not injuries:
+            return frozenset()
+        return self.get_index(coach_id).excluded_ids(injuries)
+
+    def athlete_excluded_ids(self, athlete: Athlete) -> FrozenSet[int]:
+        """شناسه حرکات ممنوعه بر اساس آسیب‌های درمان‌نشده شاگرد"""
+        return self.excluded_ids(self.athlete_injuries(athlete), athlete.coach_id)
+
+    @staticmethod
+    def athlete_injuries(athlete: Athlete) -> List[str]:
+        """متن آسیب‌های درمان‌نشده (عضو بدن + توضیحات)"""
+        return [
+            " ".join(filter(None, [injury.body_part, injury.description]))
+            for injury in athlete.injuries
+            if not injury.is_healed
+        ]
+
+    # ===== Coach Rules =====
+
+    def list_rules(self, coach_id: int) -> List[InjuryRestriction]:
+        """قوانین اختصاصی مربی"""
+        stmt = (
+            select(InjuryRestriction)
+            .where(InjuryRestriction.coach_id == coach_id)
+            .order_by(InjuryRestriction.body_part, InjuryRestriction.id)
+        )
+        return list(self.db.execute(stmt).scalars().all())
+
+    def add_rule(self, coach_id: int, rule_data: InjuryRestrictionCreate) -> InjuryRestriction:
+        """
+        افزودن قانون اختصاصی
+
+        Raises:
+            ValueError: اگر حرکت مشخص‌شده وجود نداشته باشد
+        """
+        if rule_data.exercise_id and not self.db.get(Exercise, rule_data.exercise_id):
+            raise ValueError("تمرین یافت نشد")
+
+        rule = InjuryRestriction(coach_id=coach_id, **rule_data.model_dump())
+        self.db.add(rule)
+        self.db.commit()
+        self.db.refresh(rule)
+        return rule
+
+    def delete_rule(self, coach_id: int, rule_id: int) -> bool:
+        """حذف قانون اختصاصی"""
+        rule = self.db.get(InjuryRestriction, rule_id)
+        if not rule or rule.coach_id != coach_id:
+            return False
+
+        self.db.delete(rule)
+        self.db.commit()
+        return True
@@ -4,14 +4,16 @@ Supplement Plan Service
 سرویس مدیریت برنامه‌های مکمل
 """
 
-from typing import Optional, List
+from typing import Dict, Optional, List
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, delete, insert, update
 
 from app.models.supplement_plan import SupplementPlan, SupplementPlanItem
+from app.services.access_service import AccessService, scope_to_coach
+from app.services.plan_history_service import PlanHistoryService
 from app.schemas.supplement_plan import (
-    SupplementPlanCreate, SupplementPlanUpdate,
-    SupplementPlanItemCreate
+    SupplementPlanBase, SupplementPlanCreate, SupplementPlanUpdate,
+    SupplementPlanItemCreate, SupplementPlanBulkAssign
 )
 
 
@@ -20,6 +22,7 @@ class SupplementPlanService:
     
     def __init__(self, db: Session):
         self.db = db
+        self.history = PlanHistoryService(db)
     
     def get_plan(self, plan_id: int) -> Optional[SupplementPlan]:
         """دریافت برنامه مکمل با جزئیات"""
@@ -83,10 +86,61 @@ class SupplementPlanService:
             plan.items.append(item)
         
         self.db.add(plan)
+        self.db.flush()
+        self.history.record("supplement", plan.id)
         self.db.commit()
         self.db.refresh(plan)
         return plan
     
+    def bulk_assign(self, coach_id: int, data: SupplementPlanBulkAssign) -> List[Dict[str, int]]:
+        """
+        ساخت یک برنامه مکمل یکسان برای چند شاگرد در یک تراکنش
+        
+        مالکیت همه شاگردان با یک کوئری بررسی می‌شود، برنامه‌های فعال قبلی با
+        یک UPDATE غیرفعال می‌شوند و برنامه‌ها و آیتم‌ها با executemany درج
+        می‌شوند (برنامه‌ها با RETURNING).
+        
+        Returns:
+            لیست {athlete_id, plan_id}
+        
+        Raises:
+            ValueError: اگر شاگردی متعلق به این مربی نباشد
+        """
+        athlete_ids = AccessService(self.db).require_athletes(data.athlete_ids, coach_id)
+        self._deactivate_athlete_plans(*athlete_ids)
+        
+        plan_fields = data.model_dump(include=set(SupplementPlanBase.model_fields))
+        # RETURNING بدون ترتیب تضمین‌شده در یک دسته می‌آید؛ نگاشت با athlete_id
+        plans = self.db.execute(
+            insert(SupplementPlan)
+            .execution_options(render_nulls=True)
+            .returning(SupplementPlan.id, SupplementPlan.athlete_id),
+            [
+                {**plan_fields, "athlete_id": athlete_id, "coach_id": coach_id, "is_active": True}
+                for athlete_id in athlete_ids
+            ],
+        ).all()
+        plan_ids = {plan.athlete_id: plan.id for plan in plans}
+        
+        items = [item.model_dump() for item in data.items]
+        if items:
+            # render_nulls: همه ردیف‌ها یک شکل دارند و در یک دسته درج می‌شوند
+            self.db.execute(
+                insert(SupplementPlanItem).execution_options(render_nulls=True),
+                [
+                    {**item, "supplement_plan_id": plan_id, "coach_id": coach_id}
+                    for plan_id in plan_ids.values()
+                    for item in items
+                ],
+            )
+        
+        self.history.record_created("supplement", list(plan_ids.values()))
+        self.db.commit()
+        return [
+            {"athlete_id": athlete_id, "plan_id": plan_ids[athlete_id]}
+            for athlete_id in athlete_ids
+        ]
+    
     def update_plan(
         self, 
         plan_id: int, 
@@ -97,14 +151,15 @@ class SupplementPlanService:
         if not plan:
             return None
         
-        if plan_data.name is not None:
-            plan.name = plan_data.name
-        if plan_data.description is not None:
-            plan.description = plan_data.description
-        if plan_data.general_notes is not None:
-            plan.general_notes = plan_data.general_notes
-        if plan_data.is_active is not None:
-            plan.is_active = plan_data.is_active
+        with self.history.versioned("supplement", plan_id):
+            if plan_data.name is not None:
+                plan.name = plan_data.name
+            if plan_data.description is not None:
+                plan.description = plan_data.description
+            if plan_data.general_notes is not None:
+                plan.general_notes = plan_data.general_notes
+            if plan_data.is_active is not None:
+                plan.is_active = plan_data.is_active
         
         self.db.commit()
         self.db.refresh(plan)
@@ -116,6 +171,7 @@ class SupplementPlanService:
         if not plan:
             return False
         
+        self.history.record_deleted("supplement", plan_id)
         self.db.delete(plan)
         self.db.commit()
         return True
@@ -130,36 +186,54 @@ class SupplementPlanService:
         if not plan:
             return None
         
-        item = SupplementPlanItem(
-            supplement_plan_id=plan_id,
-            order=item_data.order,
-            supplement_id=item_data.supplement_id,
-            custom_name=item_data.custom_name,
-            dose=item_data.dose,
-            timing=item_data.timing,
-            instructions=item_data.instructions,
-            notes=item_data.notes,
-        )
+        with self.history.versioned("supplement", plan_id):
+            item = SupplementPlanItem(
+                supplement_plan_id=plan_id,
+                order=item_data.order,
+                supplement_id=item_data.supplement_id,
+                custom_name=item_data.custom_name,
+                dose=item_data.dose,
+                timing=item_data.timing,
+                instructions=item_data.instructions,
+                notes=item_data.notes,
+            )
+            
+            plan.items.append(item)
         
-        plan.items.append(item)
         self.db.commit()
         self.db.refresh(item)
         return item
     
-    def delete_item(self, item_id: int) -> bool:
-        """حذف آیتم"""
-        item = self.db.get(SupplementPlanItem, item_id)
-        if not item:
+    def delete_item(self, item_id: int, coach_id: Optional[int] = None) -> bool:
+        """
+        حذف آیتم
+        
+        Args:
+            coach_id: فقط اگر آیتم متعلق به این مربی باشد
+        """
+        stmt = select(SupplementPlanItem.supplement_plan_id).where(SupplementPlanItem.id == item_id)
+        plan_id = self.db.scalar(scope_to_coach(stmt, SupplementPlanItem, coach_id))
+        if plan_id is None:
             return False
         
-        self.db.delete(item)
+        with self.history.versioned("supplement", plan_id):
+            self.db.execute(delete(SupplementPlanItem).where(SupplementPlanItem.id == item_id))
+        
         self.db.commit()
         return True
     
-    def _deactivate_athlete_plans(self, athlete_id: int):
-        """غیرفعال کردن برنامه‌های قبلی"""
-        plans = self.get_plans_by_athlete(athlete_id, active_only=True)
-        for plan in plans:
-            plan.is_active = False
-        self.db.commit()
+    def _deactivate_athlete_plans(self, *athlete_ids: int) -> None:
+        """
+        غیرفعال کردن برنامه‌های قبلی (یک UPDATE، بدون commit)
+        
+        commit با همان تراکنشی انجام می‌شود که برنامه جدید را می‌سازد.
+        """
+        self.db.execute(
+            update(SupplementPlan)
+            .where(
+                SupplementPlan.athlete_id.in_(athlete_ids),
+                SupplementPlan.is_active == True
+            )
+            .values(is_active=False)
+        )
 
@@ -0,0 +1,158 @@
+"""
+TDEE Service
+============
+سرویس TDEE تطبیقی
+
+وضعیت تخمین‌گر هر شاگرد در جدول adaptive_tdee کش می‌شود و فقط هنگام
+ثبت وزن جدید بروز می‌شود؛ خواندن TDEE کل شاگردان یک مربی یک کوئری است.
+"""
+
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, func
+
+from app.models.athlete import Athlete, AthleteMeasurement
+from app.models.diet import DietPlan, DietItem
+from app.models.adaptive_tdee import AdaptiveTDEE
+from app.core.adaptive_tdee import adaptive_tdee_engine, EnergyState
+from app.core.calculator import NutritionCalculator, Gender, ActivityLevel
+
+
+class TDEEService:
+    """سرویس TDEE تطبیقی"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.engine = adaptive_tdee_engine
+        self.calculator = NutritionCalculator()
+
+    # ===== Online Update =====
+
+    def observe(self, readings: Dict[int, Iterable[Tuple[date, float]]]) -> None:
+        """
+        اعمال وزن‌های جدید روی وضعیت شاگردان
+
+        commit نمی‌کند تا در همان تراکنش ثبت اندازه‌گیری انجام شود.
+
+        Args:
+            readings: شناسه شاگرد -> لیست (تاریخ، وزن)
+        """
+        readings = {
+            athlete_id: sorted(values)
+            for athlete_id, values in readings.items()
+            if values
+        }
+        if not readings:
+            return
+
+        athlete_ids = list(readings)
+        states = {
+            row.athlete_id: row
+            for row in self.db.scalars(
+                select(AdaptiveTDEE).where(AdaptiveTDEE.athlete_id.in_(athlete_ids))
+            )
+        }
+        intakes = self._active_intakes(athlete_ids)
+        missing = [athlete_id for athlete_id in athlete_ids if athlete_id not in states]
+        athletes = {
+            athlete.id: athlete
+            for athlete in self.db.scalars(select(Athlete).where(Athlete.id.in_(missing)))
+        } if missing else {}
+
+        for athlete_id, values in readings.items():
+            intake = intakes.get(athlete_id)
+            row = states.get(athlete_id)
+
+            if row is None:
+                first_day, first_weight = values[0]
+                prior = self._prior_tdee(athletes.get(athlete_id), first_weight) or intake
+                if prior is None:
+                    continue
+                state = self.engine.start(first_day, first_weight, prior)
+                row = AdaptiveTDEE(athlete_id=athlete_id, prior_tdee=prior)
+                self.db.add(row)
+                values = values[1:]
+            else:
+                state = EnergyState(
+                    last_date=row.last_date,
+                    weight_trend=row.weight_trend,
+                    tdee=row.tdee,
+                    observations=row.observations,
+                    weekly_change=row.weekly_change,
+                )
+
+            for day, weight in values:
+                state = self.engine.update(state, day, weight, intake)
+
+            row.last_date = state.last_date
+            row.weight_trend = round(state.weight_trend, 3)
+            row.weekly_change = state.weekly_change
+            row.tdee = round(state.tdee, 1)
+            row.observations = state.observations
+            row.intake_calories = intake
+
+    def rebuild(self, athlete_id: int) -> Optional[AdaptiveTDEE]:
+        """
+        بازسازی وضعیت از کل تاریخچه وزن
+        برای وقتی که وزن‌های قدیمی‌تر از last_date ثبت شده‌اند
+        """
+        self.db.execute(delete(AdaptiveTDEE).where(AdaptiveTDEE.athlete_id == athlete_id))
+        readings = self.db.execute(
+            select(AthleteMeasurement.recorded_at, AthleteMeasurement.weight)
+            .where(
+                AthleteMeasurement.athlete_id == athlete_id,
+                AthleteMeasurement.weight.isnot(None)
+            )
+            .order_by(AthleteMeasurement.recorded_at, AthleteMeasurement.id)
+        ).all()
+        self.observe({athlete_id: [tuple(row) for row in readings]})
+        self.db.commit()
+        return self.get(athlete_id)
+
+    # ===== Queries =====
+
+    def get(self, athlete_id: int) -> Optional[AdaptiveTDEE]:
+        """وضعیت کش‌شده یک شاگرد"""
+        return self.db.scalar(select(AdaptiveTDEE).where(AdaptiveTDEE.athlete_id == athlete_id))
+
+    def get_by_coach(self, coach_id: int) -> List[AdaptiveTDEE]:
+        """TDEE همه شاگردان یک مربی با یک کوئری"""
+        stmt = (
+            select(AdaptiveTDEE)
+            .join(Athlete, Athlete.id == AdaptiveTDEE.athlete_id)
+            .where(Athlete.coach_id == coach_id)
+            .order_by(AdaptiveTDEE.athlete_id)
+        )
+        return list(self.db.scalars(stmt))
+
+    def is_reliable(self, row: AdaptiveTDEE) -> bool:
+        """آیا تخمین به اندازه کافی مشاهده دارد"""
+        return row.observations >= self.engine.MIN_OBSERVATIONS
+
+    # ===== Helpers =====
+
+    def _active_intakes(self, athlete_ids: List[int]) -> Dict[int, float]:
+        """
+        کالری روزانه برنامه غذایی فعال
+        target_calories و در نبود آن مجموع کالری آیتم‌ها
+        """
+        rows = self.db.execute(
+            select(
+                DietPlan.athlete_id,
+                func.coalesce(DietPlan.target_calories, func.sum(DietItem.calculated_calories))
+            )
+            .outerjoin(DietItem, DietItem.diet_plan_id == DietPlan.id)
+            .where(DietPlan.athlete_id.in_(athlete_ids), DietPlan.is_active == True)
+            .group_by(DietPlan.id, DietPlan.athlete_id, DietPlan.target_calories)
+        ).all()
+        return {athlete_id: float(calories) for athlete_id, calories in rows if calories}
+
+    def _prior_tdee(self, athlete: Optional[Athlete], weight: float) -> Optional[float]:
+        """تخمین اولیه با فرمول Mifflin-St Jeor و ضریب فعالیت"""
+        if not athlete or not all([athlete.height, athlete.age, athlete.gender]):
+            return None
+        bmr = self.calculator.calculate_bmr(weight, athlete.height, athlete.age, Gender(athlete.gender.value))
+        activity = ActivityLevel(athlete.activity_level.value if athlete.activity_level else "moderate")
+        return float(self.calculator.calculate_tdee(bmr, activity))
@@ -0,0 +1,158 @@
+"""
+Training Generation Service
+===========================
+سرویس تولید خودکار برنامه تمرینی
+
+ایندکس «عضله -> حرکات» از تمرینات امن یک بار ساخته و در حافظه نگه داشته
+می‌شود؛ فقط وقتی تعداد، بیشترین شناسه یا آخرین زمان ویرایش تمرینات تغییر کند
+دوباره ساخته می‌شود.
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+
+from app.models.athlete import Athlete
+from app.models.exercise import Exercise, ExerciseType
+from app.models.training import TrainingPlan
+from app.core.training_engine import ExperienceLevel, SplitType
+from app.core.training_generator import training_generator, ExerciseIndex
+from app.schemas.training import TrainingPlanCreate, TrainingDayCreate, WorkoutItemCreate
+from app.services.exercise_service import ExerciseService
+from app.services.restriction_service import InjuryRestrictionService
+from app.services.training_service import TrainingService
+
+
+_index_lock = threading.Lock()
+_index_cache: Dict[str, object] = {"version": None, "index": None}
+
+
+class TrainingGenerationService:
+    """سرویس تولید خودکار برنامه تمرینی"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.generator = training_generator
+
+    # ===== Exercise Index =====
+
+    def get_exercise_index(self) -> ExerciseIndex:
+        """ایندکس تمرینات امن (کش‌شده تا تغییر بانک تمرینات)"""
+        version = tuple(self.db.execute(
+            select(func.count(Exercise.id), func.max(Exercise.id), func.max(Exercise.updated_at))
+            .where(Exercise.is_active == True)
+        ).one())
+
+        with _index_lock:
+            if _index_cache["version"] != version:
+                _index_cache["index"] = self.generator.build_index(self._load_exercises())
+                _index_cache["version"] = version
+            return _index_cache["index"]
+
+    def _load_exercises(self) -> List[dict]:
+        """حرکات مقاومتی امن با نام گروه عضلانی برای ساخت ایندکس"""
+        exercise_service = ExerciseService(self.db)
+        groups = {group.id: group.name for group in exercise_service.get_all_muscle_groups()}
+        return [
+            {
+                "id": exercise.id,
+                "name": exercise.name,
+                "is_compound": exercise.is_compound,
+                "difficulty": exercise.difficulty.value if exercise.difficulty else None,
+                "muscle_group": groups.get(exercise.muscle_group_id),
+                "secondary_muscles": exercise.secondary_muscles,
+            }
+            for exercise in exercise_service.get_safe_exercises(exercise_type=ExerciseType.RESISTANCE)
+        ]
+
+    # ===== Generation =====
+
+    def generate(
+        self,
+        athlete: Athlete,
+        experience_level: Optional[str] = None,
+        goal: Optional[str] = None,
+        available_days: Optional[int] = None,
+        split_type: Optional[str] = None,
+        seed: Optional[int] = None,
+    ) -> dict:
+        """
+        تولید برنامه هفتگی یک شاگرد (بدون ذخیره)
+
+        سطح و هدف در صورت ارسال نشدن از پروفایل شاگرد خوانده می‌شوند؛
+        حرکات ممنوعه آسیب‌های درمان‌نشده (با قوانین اختصاصی مربی) حذف می‌شوند.
+
+        Returns:
+            خروجی TrainingGenerator.generate به همراه injuries و restricted
+            (نام حرکات حذف‌شده از ایندکس)
+        """
+        level = ExperienceLevel(
+            experience_level
+            or (athlete.experience_level.value if athlete.experience_level else "beginner")
+        )
+        training_goal = self.generator.resolve_goal(
+            goal or (athlete.goal.value if athlete.goal else None)
+        )
+        restriction_service = InjuryRestrictionService(self.db)
+        injuries = restriction_service.athlete_injuries(athlete)
+        excluded = restriction_service.excluded_ids(injuries, athlete.coach_id)
+
+        index = self.get_exercise_index()
+        generated = self.generator.generate(
+            index,
+            level,
+            training_goal,
+            available_days=available_days,
+            split=SplitType(split_type) if split_type else None,
+            excluded_ids=excluded,
+            seed=seed,
+        )
+        generated["injuries"] = injuries
+        generated["restricted"] = sorted(
+            index.exercises[exercise_id].name
+            for exercise_id in excluded
+            if exercise_id in index.exercises
+        )
+        return generated
+
+    def build_plan_data(
+        self,
+        athlete_id: int,
+        generated: dict,
+        name: Optional[str] = None,
+    ) -> TrainingPlanCreate:
+        """تبدیل خروجی تولید به TrainingPlanCreate"""
+        return TrainingPlanCreate(
+            athlete_id=athlete_id,
+            name=name or "برنامه تمرینی خودکار",
+            split_type=generated["split_type"],
+            days=[
+                TrainingDayCreate(
+                    day_number=day["day_number"],
+                    name=day["name"],
+                    workout_items=[
+                        WorkoutItemCreate(
+                            order=order,
+                            exercise_id=item["exercise_id"],
+                            sets=item["sets"],
+                            reps=item["reps"],
+                            rest_seconds=item["rest_seconds"],
+                        )
+                        for order, item in enumerate(day["exercises"])
+                    ],
+                )
+                for day in generated["days"]
+            ],
+        )
+
+    def create_plan(
+        self,
+        athlete_id: int,
+        generated: dict,
+        name: Optional[str] = None,
+    ) -> TrainingPlan:
+        """ذخیره برنامه تولیدشده به عنوان برنامه فعال شاگرد"""
+        plan_data = self.build_plan_data(athlete_id, generated, name)
+        return TrainingService(self.db).create_plan(plan_data)
@@ -6,20 +6,28 @@ Training Service
 
 from typing import Optional, List
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, case, delete, func, insert, update
 
 from app.models.training import TrainingPlan, TrainingDay, WorkoutItem
+from app.services.access_service import scope_to_coach
+from app.services.plan_history_service import PlanHistoryService
+from app.services.plan_diff import diff_rows
 from app.schemas.training import (
-    TrainingPlanCreate, TrainingPlanUpdate,
-    TrainingDayCreate, WorkoutItemCreate
+    TrainingPlanBase, TrainingPlanCreate, TrainingPlanUpdate, TrainingPlanDocument,
+    TrainingDayCreate, WorkoutItemBase, WorkoutItemCreate
 )
 
 
+DAY_FIELDS = ("day_number", "name", "notes", "is_rest_day")
+ITEM_FIELDS = ("training_day_id", *WorkoutItemBase.model_fields)
+
+
 class TrainingService:
     """سرویس مدیریت برنامه‌های تمرینی"""
     
     def __init__(self, db: Session):
         self.db = db
+        self.history = PlanHistoryService(db)
     
     # ===== Training Plans =====
     
@@ -86,6 +94,8 @@ class TrainingService:
             plan.days.append(day)
         
         self.db.add(plan)
+        self.db.flush()
+        self.history.record("training", plan.id)
         self.db.commit()
         self.db.refresh(plan)
         return plan
@@ -100,10 +110,11 @@ class TrainingService:
         if not plan:
             return None
         
-        update_data = plan_data.model_dump(exclude_unset=True)
-        
-        for field, value in update_data.items():
-            setattr(plan, field, value)
+        with self.history.versioned("training", plan_id):
+            update_data = plan_data.model_dump(exclude_unset=True)
+            
+            for field, value in update_data.items():
+                setattr(plan, field, value)
         
         self.db.commit()
         self.db.refresh(plan)
@@ -115,6 +126,7 @@ class TrainingService:
         if not plan:
             return False
         
+        self.history.record_deleted("training", plan_id)
         self.db.delete(plan)
         self.db.commit()
         return True
@@ -133,6 +145,93 @@ class TrainingService:
         self.db.refresh(plan)
         return plan
     
+    def save_plan_document(
+        self,
+        plan_id: int,
+        document: TrainingPlanDocument,
+        coach_id: Optional[int] = None
+    ) -> Optional[TrainingPlan]:
+        """
+        ذخیره کامل برنامه (روزها و حرکات) در یک تراکنش
+        
+        سند با ردیف‌های فعلی در حافظه مقایسه می‌شود و فقط تفاوت‌ها با دستورهای
+        دسته‌ای نوشته می‌شوند: روزهای جدید (insert با RETURNING)، روزها و
+        حرکات تغییرکرده (update با کلید اصلی)، حذف‌ها و حرکات جدید.
+        حرکت می‌تواند بین روزهای همین برنامه جابه‌جا شود.
+        
+        Args:
+            coach_id: فقط اگر برنامه متعلق به این مربی باشد
+        
+        Raises:
+            ValueError: اگر id روز یا حرکت متعلق به این برنامه نباشد
+        """
+        stmt = select(TrainingPlan).where(TrainingPlan.id == plan_id)
+        plan = self.db.scalars(scope_to_coach(stmt, TrainingPlan, coach_id)).first()
+        if not plan:
+            return None
+        
+        with self.history.versioned("training", plan_id):
+            days = {
+                row.id: row._asdict()
+                for row in self.db.execute(
+                    select(TrainingDay.id, *(getattr(TrainingDay, name) for name in DAY_FIELDS))
+                    .where(TrainingDay.training_plan_id == plan_id)
+                )
+            }
+            items = {
+                row.id: row._asdict()
+                for row in self.db.execute(
+                    select(WorkoutItem.id, *(getattr(WorkoutItem, name) for name in ITEM_FIELDS))
+                    .join(TrainingDay)
+                    .where(TrainingDay.training_plan_id == plan_id)
+                )
+            }
+            
+            day_docs = [day.model_dump(include={"id", *DAY_FIELDS}) for day in document.days]
+            day_diff = diff_rows(days, day_docs, DAY_FIELDS, "روز")
+            
+            # روزهای جدید اول ساخته می‌شوند تا حرکاتشان شناسه روز داشته باشند
+            new_day_ids = iter([])
+            if day_diff.inserts:
+                new_day_ids = iter(self.db.scalars(
+                    insert(TrainingDay).returning(TrainingDay.id, sort_by_parameter_order=True),
+                    [{**row, "training_plan_id": plan_id, "coach_id": plan.coach_id} for row in day_diff.inserts],
+                ).all())
+            
+            item_docs = []
+            for day in document.days:
+                day_id = day.id if day.id is not None else next(new_day_ids)
+                for order, item in enumerate(day.workout_items):
+                    item_docs.append({
+                        **item.model_dump(exclude={"order"}),
+                        "order": order,
+                        "training_day_id": day_id,
+                    })
+            item_diff = diff_rows(items, item_docs, ITEM_FIELDS, "حرکت")
+            
+            # ترتیب مهم است: حرکات منتقل‌شده قبل از حذف روز قبلی‌شان به‌روزرسانی می‌شوند
+            if day_diff.updates:
+                self.db.execute(update(TrainingDay), day_diff.updates)
+            if item_diff.updates:
+                self.db.execute(update(WorkoutItem), item_diff.updates)
+            if item_diff.deletes:
+                self.db.execute(delete(WorkoutItem).where(WorkoutItem.id.in_(item_diff.deletes)))
+            if day_diff.deletes:
+                self.db.execute(delete(TrainingDay).where(TrainingDay.id.in_(day_diff.deletes)))
+            if item_diff.inserts:
+                self.db.execute(
+                    insert(WorkoutItem),
+                    [{**row, "coach_id": plan.coach_id} for row in item_diff.inserts],
+                )
+            
+            for name, value in document.model_dump(include=set(TrainingPlanBase.model_fields)).items():
+                setattr(plan, name, value)
+            if day_diff or item_diff:
+                plan.updated_at = func.now()
+        
+        self.db.commit()
+        return self.get_plan(plan_id)
+    
     def _deactivate_athlete_plans(self, athlete_id: int) -> None:
         """غیرفعال کردن همه برنامه‌های شاگرد"""
         stmt = (
@@ -165,10 +264,13 @@ class TrainingService:
         if not plan:
             return None
         
-        day = self._create_day(day_data)
-        day.training_plan_id = plan_id
+        with self.history.versioned("training", plan_id):
+            day = self._create_day(day_data)
+            day.training_plan_id = plan_id
+            day.coach_id = plan.coach_id
+            
+            self.db.add(day)
         
-        self.db.add(day)
         self.db.commit()
         self.db.refresh(day)
         return day
@@ -179,21 +281,30 @@ class TrainingService:
         if not day:
             return None
         
-        for field, value in day_data.items():
-            if hasattr(day, field):
-                setattr(day, field, value)
+        with self.history.versioned("training", day.training_plan_id):
+            for field, value in day_data.items():
+                if hasattr(day, field):
+                    setattr(day, field, value)
         
         self.db.commit()
         self.db.refresh(day)
         return day
     
-    def delete_day(self, day_id: int) -> bool:
-        """حذف روز تمرینی"""
-        day = self.db.get(TrainingDay, day_id)
-        if not day:
+    def delete_day(self, day_id: int, coach_id: Optional[int] = None) -> bool:
+        """
+        حذف روز تمرینی (حرکات با ON DELETE CASCADE حذف می‌شوند)
+        
+        Args:
+            coach_id: فقط اگر روز متعلق به این مربی باشد
+        """
+        stmt = select(TrainingDay.training_plan_id).where(TrainingDay.id == day_id)
+        plan_id = self.db.scalar(scope_to_coach(stmt, TrainingDay, coach_id))
+        if plan_id is None:
             return False
         
-        self.db.delete(day)
+        with self.history.versioned("training", plan_id):
+            self.db.execute(delete(TrainingDay).where(TrainingDay.id == day_id))
+        
         self.db.commit()
         return True
     
@@ -217,23 +328,35 @@ class TrainingService:
     def add_workout_item(
         self, 
         day_id: int, 
-        item_data: WorkoutItemCreate
+        item_data: WorkoutItemCreate,
+        coach_id: Optional[int] = None
     ) -> Optional[WorkoutItem]:
-        """افزودن حرکت به روز تمرینی"""
-        day = self.db.get(TrainingDay, day_id)
+        """
+        افزودن حرکت به روز تمرینی
+        
+        Args:
+            coach_id: فقط اگر روز متعلق به این مربی باشد
+        """
+        stmt = select(TrainingDay.coach_id, TrainingDay.training_plan_id).where(TrainingDay.id == day_id)
+        day = self.db.execute(scope_to_coach(stmt, TrainingDay, coach_id)).first()
         if not day:
             return None
         
-        # تعیین ترتیب جدید
-        max_order = max([i.order for i in day.workout_items], default=0)
-        
-        item = WorkoutItem(
-            training_day_id=day_id,
-            order=max_order + 1,
-            **item_data.model_dump(exclude={"order"})
-        )
+        with self.history.versioned("training", day.training_plan_id):
+            # تعیین ترتیب جدید
+            max_order = self.db.scalar(
+                select(func.max(WorkoutItem.order)).where(WorkoutItem.training_day_id == day_id)
+            ) or 0
+            
+            item = WorkoutItem(
+                training_day_id=day_id,
+                coach_id=day.coach_id,
+                order=max_order + 1,
+                **item_data.model_dump(exclude={"order"})
+            )
+            
+            self.db.add(item)
         
-        self.db.add(item)
         self.db.commit()
         self.db.refresh(item)
         return item
@@ -248,34 +371,61 @@ class TrainingService:
         if not item:
             return None
         
-        for field, value in item_data.items():
-            if hasattr(item, field):
-                setattr(item, field, value)
+        plan_id = self.db.scalar(
+            select(TrainingDay.training_plan_id).where(TrainingDay.id == item.training_day_id)
+        )
+        with self.history.versioned("training", plan_id):
+            for field, value in item_data.items():
+                if hasattr(item, field):
+                    setattr(item, field, value)
         
         self.db.commit()
         self.db.refresh(item)
         return item
     
-    def delete_workout_item(self, item_id: int) -> bool:
-        """حذف حرکت"""
-        item = self.db.get(WorkoutItem, item_id)
-        if not item:
+    def delete_workout_item(self, item_id: int, coach_id: Optional[int] = None) -> bool:
+        """
+        حذف حرکت
+        
+        Args:
+            coach_id: فقط اگر حرکت متعلق به این مربی باشد
+        """
+        stmt = (
+            select(TrainingDay.training_plan_id)
+            .join(WorkoutItem, WorkoutItem.training_day_id == TrainingDay.id)
+            .where(WorkoutItem.id == item_id)
+        )
+        plan_id = self.db.scalar(scope_to_coach(stmt, WorkoutItem, coach_id))
+        if plan_id is None:
             return False
         
-        self.db.delete(item)
+        with self.history.versioned("training", plan_id):
+            self.db.execute(delete(WorkoutItem).where(WorkoutItem.id == item_id))
+        
         self.db.commit()
         return True
     
-    def reorder_items(self, day_id: int, item_ids: List[int]) -> bool:
-        """مرتب‌سازی مجدد حرکات"""
-        day = self.db.get(TrainingDay, day_id)
-        if not day:
+    def reorder_items(self, day_id: int, item_ids: List[int], coach_id: Optional[int] = None) -> bool:
+        """
+        مرتب‌سازی مجدد حرکات (یک UPDATE با CASE)
+        
+        Args:
+            coach_id: فقط اگر روز متعلق به این مربی باشد
+        """
+        stmt = select(TrainingDay.training_plan_id).where(TrainingDay.id == day_id)
+        plan_id = self.db.scalar(scope_to_coach(stmt, TrainingDay, coach_id))
+        if plan_id is None:
             return False
         
-        for order, item_id in enumerate(item_ids):
-            item = self.db.get(WorkoutItem, item_id)
-            if item and item.training_day_id == day_id:
-                item.order = order
+        with self.history.versioned("training", plan_id):
+            if item_ids:
+                orders = {item_id: order for order, item_id in enumerate(item_ids)}
+                stmt = (
+                    update(WorkoutItem)
+                    .where(WorkoutItem.training_day_id == day_id, WorkoutItem.id.in_(orders))
+                    .values(order=case(orders, value=WorkoutItem.id))
+                )
+                self.db.execute(scope_to_coach(stmt, WorkoutItem, coach_id))
         
         self.db.commit()
         return True
@@ -0,0 +1,87 @@
+"""
+Workspace Service
+=================
+سرویس پنل شاگرد
+
+همه بخش‌های پنل با یک مجموعه ثابت کوئری بارگذاری می‌شوند (بدون N+1):
+شاگرد + آسیب‌ها، آخرین اندازه‌گیری‌ها، برنامه تمرینی/غذایی/مکمل فعال (هر کدام
+یک کوئری با joinedload)، جدول پیشرفت ذخیره‌شده برنامه تمرینی و محاسبه تغذیه.
+بخش‌هایی که درخواست نشده‌اند کوئری نمی‌زنند.
+"""
+
+from typing import Iterable, Optional
+
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import select
+
+from app.models.athlete import Athlete
+from app.schemas.workspace import AthleteWorkspace, WORKSPACE_FIELDS
+from app.services.athlete_service import AthleteService
+from app.services.training_service import TrainingService
+from app.services.progression_service import ProgressionService
+from app.services.diet_service import DietService
+from app.services.supplement_plan_service import SupplementPlanService
+
+
+class WorkspaceService:
+    """سرویس پنل شاگرد"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def parse_fields(fields: Optional[str]) -> tuple:
+        """
+        تبدیل پارامتر fields (جداشده با کاما) به لیست بخش‌ها
+
+        Raises:
+            ValueError: برای بخش ناشناخته
+        """
+        if not fields:
+            return WORKSPACE_FIELDS
+        requested = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+        unknown = [f for f in requested if f not in WORKSPACE_FIELDS]
+        if unknown:
+            raise ValueError(
+                f"بخش نامعتبر: {', '.join(unknown)} (مجاز: {', '.join(WORKSPACE_FIELDS)})"
+            )
+        return requested or WORKSPACE_FIELDS
+
+    def get_athlete(self, athlete_id: int, coach_id: int) -> Optional[Athlete]:
+        """شاگرد با آسیب‌ها (بدون بارگذاری کل اندازه‌گیری‌ها)"""
+        stmt = (
+            select(Athlete)
+            .options(selectinload(Athlete.injuries))
+            .where(Athlete.id == athlete_id, Athlete.coach_id == coach_id)
+        )
+        return self.db.execute(stmt).scalar_one_or_none()
+
+    def load(
+        self,
+        athlete: Athlete,
+        fields: Iterable[str] = WORKSPACE_FIELDS,
+        measurements_limit: int = 10,
+    ) -> AthleteWorkspace:
+        """
+        بارگذاری بخش‌های پنل برای شاگردی که دسترسی به آن بررسی شده است
+
+        خطای محاسبه تغذیه (اطلاعات ناقص) به جای شکست کل پاسخ در
+        nutrition.error برگردانده می‌شود.
+        """
+        fields = set(fields)
+        data = {}
+        if "athlete" in fields:
+            data["athlete"] = athlete
+        if "measurements" in fields:
+            data["measurements"] = AthleteService(self.db).get_measurements(athlete.id, measurements_limit)
+        if "training_plan" in fields:
+            data["training_plan"] = TrainingService(self.db).get_active_plan(athlete.id)
+        if "training_progression" in fields:
+            data["training_progression"] = ProgressionService(self.db).get_active(athlete.id)
+        if "diet_plan" in fields:
+            data["diet_plan"] = DietService(self.db).get_active_plan(athlete.id)
+        if "supplement_plan" in fields:
+            data["supplement_plan"] = SupplementPlanService(self.db).get_active_plan(athlete.id)
+        if "nutrition" in fields:
+            data["nutrition"] = AthleteService(self.db).calculate_nutrition(athlete.id)
+        return AthleteWorkspace.model_validate(data)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Response Encoding Benchmark
+===========================
+مقایسه حجم و هزینه CPU کدگذاری سنگین‌ترین پاسخ‌های API
+
+برای هر پاسخ (برنامه تمرینی کامل، برنامه غذایی، کاتالوگ غذا و تمرین):
+- سریال‌سازی Pydantic (model_dump با mode="json") به عنوان هزینه پایه هر درخواست
+- json استاندارد در مقابل orjson (در صورت نصب بودن)
+- gzip و brotli (در صورت نصب بودن) با سطح پاسخ‌های پویا (middleware) و
+  سطح بیشینه (snapshot کاتالوگ که یک بار ساخته می‌شود)
+
+اجرا (از پوشه backend):
+    python -m benchmarks.response_encoding
+    python -m benchmarks.response_encoding --iterations 200
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.db.base import Base
+from app.db.session import create_db_engine
+from app.core.compression import HAS_BROTLI, compress
+from app.core.serialization import HAS_ORJSON, dumps
+from app.core.snapshot import BROTLI_QUALITY, GZIP_LEVEL
+from app.schemas.food import FoodCategoryWithFoods
+from app.schemas.exercise import MuscleGroupWithExercises
+from app.schemas.training import TrainingPlanResponse
+from app.schemas.diet import DietPlanResponse
+from app.services.food_service import FoodService
+from app.services.exercise_service import ExerciseService
+from app.services.training_service import TrainingService
+from app.services.diet_service import DietService
+from benchmarks.hot_queries import seed
+
+
+def timed(fn: Callable[[], Any], iterations: int) -> float:
+    """میانه زمان اجرا (میلی‌ثانیه)"""
+    timings: List[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def load_responses(db, ids: Dict[str, int]) -> Dict[str, Callable[[], Any]]:
+    """سازنده پاسخ‌های سنگین (همان اسکیماهای response_model)"""
+    athlete_id = ids["athlete_id"]
+    training_plan = TrainingService(db).get_active_plan(athlete_id)
+    diet_plan = DietService(db).get_active_plan(athlete_id)
+    food_categories = FoodService(db).get_categories_with_foods()
+    muscle_groups = ExerciseService(db).get_groups_with_exercises()
+
+    food_adapter = TypeAdapter(List[FoodCategoryWithFoods])
+    muscle_adapter = TypeAdapter(List[MuscleGroupWithExercises])
+    return {
+        "training/{id} (full days)": lambda: TrainingPlanResponse.model_validate(training_plan).model_dump(mode="json"),
+        "diet/{id}": lambda: DietPlanResponse.model_validate(diet_plan).model_dump(mode="json"),
+        "foods/categories/with-foods": lambda: food_adapter.dump_python(food_adapter.validate_python(food_categories), mode="json"),
+        "exercises/muscle-groups/with-exercises": lambda: muscle_adapter.dump_python(muscle_adapter.validate_python(muscle_groups), mode="json"),
+    }
+
+
+def measure(name: str, build: Callable[[], Any], iterations: int) -> List[Dict[str, Any]]:
+    """حجم و زمان هر روش کدگذاری برای یک پاسخ"""
+    content = build()
+    # همان تنظیمات JSONResponse پیش‌فرض Starlette
+    stdlib_dumps = lambda: json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    stdlib = stdlib_dumps()
+    body = dumps(content)
+
+    rows = [
+        {"encoding": "pydantic model_dump", "bytes": None, "ms": timed(build, iterations)},
+        {"encoding": "json (stdlib)", "bytes": len(stdlib), "ms": timed(stdlib_dumps, iterations)},
+    ]
+    if HAS_ORJSON:
+        rows.append({"encoding": "orjson", "bytes": len(body), "ms": timed(lambda: dumps(content), iterations)})
+
+    levels = [
+        (f"gzip-{settings.COMPRESSION_GZIP_LEVEL} (middleware)", "gzip", {"gzip_level": settings.COMPRESSION_GZIP_LEVEL}),
+        (f"gzip-{GZIP_LEVEL} (snapshot)", "gzip", {"gzip_level": GZIP_LEVEL}),
+    ]
+    if HAS_BROTLI:
+        levels += [
+            (f"br-{settings.COMPRESSION_BROTLI_QUALITY} (middleware)", "br", {"brotli_quality": settings.COMPRESSION_BROTLI_QUALITY}),
+            (f"br-{BROTLI_QUALITY} (snapshot)", "br", {"brotli_quality": BROTLI_QUALITY}),
+        ]
+    for label, encoding, options in levels:
+        rows.append({
+            "encoding": label,
+            "bytes": len(compress(body, encoding, **options)),
+            "ms": timed(lambda: compress(body, encoding, **options), iterations),
+        })
+
+    for row in rows:
+        row["response"] = name
+        row["ratio"] = row["bytes"] / len(stdlib) if row["bytes"] else None
+    return rows
+
+
+def print_report(rows: List[Dict[str, Any]]) -> None:
+    """چاپ جدول: حجم، نسبت به json استاندارد و زمان CPU (میلی‌ثانیه)"""
+    header = f"{'response':<40}{'encoding':<26}{'bytes':>10}{'ratio':>8}{'ms p50':>10}"
+    print("\n" + header)
+    print("-" * len(header))
+    current = None
+    for row in rows:
+        name = row["response"] if row["response"] != current else ""
+        current = row["response"]
+        size = f"{row['bytes']:,}" if row["bytes"] else "-"
+        ratio = f"{row['ratio']:.2f}" if row["ratio"] else "-"
+        print(f"{name:<40}{row['encoding']:<26}{size:>10}{ratio:>8}{row['ms']:>10.3f}")
+
+    print(f"\norjson: {'✅' if HAS_ORJSON else '❌ (json استاندارد)'}   brotli: {'✅' if HAS_BROTLI else '❌ (فقط gzip)'}")
+    print("پاسخ‌های کاتالوگ بعد از اولین ساخت snapshot هیچ هزینه سریال‌سازی/فشرده‌سازی ندارند (304 یا بایت‌های آماده).")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="FLEX PRO response encoding benchmark")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        SessionFactory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+        db = SessionFactory()
+        try:
+            print("\n🔨 ساخت داده نمونه...")
+            ids = seed(db, athletes=1)
+            rows: List[Dict[str, Any]] = []
+            for name, build in load_responses(db, ids).items():
+                rows.extend(measure(name, build, args.iterations))
+        finally:
+            db.close()
+            engine.dispose()
+
+    print_report(rows)
+
+
+if __name__ == "__main__":
+    main()
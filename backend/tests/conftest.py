@@ -0,0 +1,10 @@
+"""
+Test Configuration
+==================
+افزودن پوشه backend به مسیر import (اجرا با pytest از پوشه backend یا ریشه)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
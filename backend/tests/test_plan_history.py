@@ -0,0 +1,111 @@
+"""
+Plan History Tests
+==================
+زنجیره نسخه‌ها و نشانه حذف (is_deleted) روی SQLite در حافظه
+"""
+
+import pytest
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+import app.models  # noqa: F401  ثبت همه جداول روی Base.metadata
+from app.models.athlete import Athlete
+from app.models.plan_history import PlanVersion, backfill_deleted_markers
+from app.models.training import TrainingPlan
+from app.models.user import User
+from app.services.plan_history_service import PlanHistoryService
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    coach = User(email="coach@example.com", hashed_password="x", full_name="Coach")
+    session.add(coach)
+    session.flush()
+    session.add(Athlete(name="Athlete", coach_id=coach.id))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _plan(db, name="A"):
+    athlete = db.scalar(select(Athlete))
+    plan = TrainingPlan(athlete_id=athlete.id, coach_id=athlete.coach_id, name=name)
+    db.add(plan)
+    db.flush()
+    return plan
+
+
+def test_deleted_marker_ends_chain(db):
+    history = PlanHistoryService(db)
+    plan = _plan(db)
+    history.record("training", plan.id)
+    plan.name = "B"
+    history.record("training", plan.id)
+    assert history.latest_version("training", plan.id, plan.coach_id) == 2
+
+    history.record_deleted("training", plan.id)
+
+    marker = db.scalar(select(PlanVersion).where(PlanVersion.version == 3))
+    assert marker.is_deleted and marker.is_snapshot and marker.data == {}
+    assert history.latest_version("training", plan.id, plan.coach_id) is None
+    versions = history.list_versions("training", plan.id, plan.coach_id)
+    assert [(v["version"], v["deleted"]) for v in versions] == [(3, True), (2, False), (1, False)]
+
+
+def test_backfill_marks_legacy_markers(db):
+    history = PlanHistoryService(db)
+    plan = _plan(db)
+    history.record("training", plan.id)
+    history.record_deleted("training", plan.id)
+    db.execute(update(PlanVersion).values(is_deleted=None))
+
+    assert backfill_deleted_markers(db) == 2
+    assert db.scalars(select(PlanVersion.is_deleted).order_by(PlanVersion.version)).all() == [False, True]
+    assert backfill_deleted_markers(db) == 0
+
+
+def test_versioned_records_baseline_and_change(db):
+    history = PlanHistoryService(db)
+    plan = _plan(db)
+
+    with history.versioned("training", plan.id):
+        plan.name = "B"
+
+    documents = [
+        history.get_version("training", plan.id, version, plan.coach_id)["plan"]["name"]
+        for version in (1, 2)
+    ]
+    assert documents == ["A", "B"]
+
+
+def test_versioned_skips_failed_block(db):
+    history = PlanHistoryService(db)
+    plan = _plan(db)
+    history.record("training", plan.id)
+
+    with pytest.raises(ValueError):
+        with history.versioned("training", plan.id):
+            plan.name = "B"
+            raise ValueError("invalid")
+
+    assert history.latest_version("training", plan.id, plan.coach_id) == 1
+
+
+def test_versioned_rereads_stale_chain(db):
+    history = PlanHistoryService(db)
+    plan = _plan(db)
+    history.record("training", plan.id)
+
+    with history.versioned("training", plan.id):
+        plan.name = "B"
+        history.record("training", plan.id)
+        plan.name = "C"
+
+    assert history.latest_version("training", plan.id, plan.coach_id) == 3
+    assert history.get_version("training", plan.id, 3, plan.coach_id)["plan"]["name"] == "C"
@@ -0,0 +1,27 @@
+"""
+Sharding Tests
+==============
+بازه شناسه‌های shard باید زیر 2^53 بماند
+"""
+
+import pytest
+
+from app.config import settings
+from app.db.sharding import MAX_SHARD_NUMBER, SHARD_ID_BITS, shard_number
+
+
+def test_per_coach_shard_ids_stay_javascript_safe(monkeypatch):
+    monkeypatch.setattr(settings, "SHARD_BUCKETS", 0)
+
+    assert shard_number(MAX_SHARD_NUMBER) == MAX_SHARD_NUMBER
+    assert (MAX_SHARD_NUMBER + 1) << SHARD_ID_BITS <= 2 ** 53
+
+    with pytest.raises(RuntimeError):
+        shard_number(MAX_SHARD_NUMBER + 1)
+
+
+def test_buckets_map_any_coach_into_range(monkeypatch):
+    monkeypatch.setattr(settings, "SHARD_BUCKETS", 16)
+
+    assert shard_number(2 ** 40) == 2 ** 40 % 16 + 1
+    assert {shard_number(coach_id) for coach_id in range(1, 100)} == set(range(1, 17))
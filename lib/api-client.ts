@@ -7,12 +7,33 @@ import type {
   Athlete,
   AthleteCreate,
   AthleteUpdate,
+  AthleteWorkspace,
+  AthleteWorkspaceField,
   Food,
   FoodCategory,
   Exercise,
   MuscleGroup,
   TrainingPlan,
+  TrainingPlanDocument,
+  TrainingProgression,
+  TrainingProgressionRequest,
+  WorkingWeightBatchRequest,
+  WorkingWeightBatchResponse,
+  RPETable,
+  OneRMFormula,
   DietPlan,
+  DietPlanDocument,
+  TrainingTemplate,
+  DietTemplate,
+  PlanTemplateSummary,
+  TemplateAssignRequest,
+  TemplateAssignResponse,
+  SupplementPlanBulkAssign,
+  SupplementPlanBulkAssignResponse,
+  PlanType,
+  PlanVersionSummary,
+  PlanVersionDocument,
+  PlanVersionDiff,
   BMRRequest,
   BMRResponse,
   TDEERequest,
@@ -216,6 +237,17 @@ class ApiClient {
     return response.data;
   }
 
+  async getAthleteWorkspace(
+    id: number,
+    fields?: AthleteWorkspaceField[],
+    measurementsLimit: number = 10
+  ): Promise<AthleteWorkspace> {
+    const response = await this.client.get<AthleteWorkspace>(`/athletes/${id}/workspace`, {
+      params: { fields: fields?.join(','), measurements_limit: measurementsLimit },
+    });
+    return response.data;
+  }
+
   async createAthlete(data: AthleteCreate): Promise<Athlete> {
     const response = await this.client.post<Athlete>('/athletes', data);
     return response.data;
@@ -319,6 +351,25 @@ class ApiClient {
     return response.data;
   }
 
+  async saveTrainingPlanFull(id: number, document: TrainingPlanDocument): Promise<TrainingPlan> {
+    const response = await this.client.put<TrainingPlan>(`/training/${id}/full`, document);
+    return response.data;
+  }
+
+  async generateTrainingProgression(planId: number, data: TrainingProgressionRequest): Promise<TrainingProgression> {
+    const response = await this.client.post<TrainingProgression>(`/training/${planId}/progression`, data);
+    return response.data;
+  }
+
+  async getTrainingProgression(planId: number): Promise<TrainingProgression> {
+    const response = await this.client.get<TrainingProgression>(`/training/${planId}/progression`);
+    return response.data;
+  }
+
+  async deleteTrainingProgression(planId: number): Promise<void> {
+    await this.client.delete(`/training/${planId}/progression`);
+  }
+
   async addTrainingDay(planId: number, dayData: any): Promise<any> {
     const response = await this.client.post(`/training/${planId}/days`, dayData);
     return response.data;
@@ -360,6 +411,88 @@ class ApiClient {
     return response.data;
   }
 
+  async saveDietPlanFull(id: number, document: DietPlanDocument): Promise<DietPlan> {
+    const response = await this.client.put<DietPlan>(`/diet/${id}/full`, document);
+    return response.data;
+  }
+
+  // Plan Templates API
+  async getTrainingTemplates(): Promise<PlanTemplateSummary[]> {
+    const response = await this.client.get<PlanTemplateSummary[]>('/templates/training');
+    return response.data;
+  }
+
+  async getTrainingTemplate(id: number): Promise<TrainingTemplate> {
+    const response = await this.client.get<TrainingTemplate>(`/templates/training/${id}`);
+    return response.data;
+  }
+
+  async createTrainingTemplate(data: any): Promise<TrainingTemplate> {
+    const response = await this.client.post<TrainingTemplate>('/templates/training', data);
+    return response.data;
+  }
+
+  async createTrainingTemplateFromPlan(planId: number, name?: string): Promise<TrainingTemplate> {
+    const response = await this.client.post<TrainingTemplate>('/templates/training/from-plan', { plan_id: planId, name });
+    return response.data;
+  }
+
+  async deleteTrainingTemplate(id: number): Promise<void> {
+    await this.client.delete(`/templates/training/${id}`);
+  }
+
+  async assignTrainingTemplate(id: number, data: TemplateAssignRequest): Promise<TemplateAssignResponse> {
+    const response = await this.client.post<TemplateAssignResponse>(`/templates/training/${id}/assign`, data);
+    return response.data;
+  }
+
+  async getDietTemplates(): Promise<PlanTemplateSummary[]> {
+    const response = await this.client.get<PlanTemplateSummary[]>('/templates/diet');
+    return response.data;
+  }
+
+  async getDietTemplate(id: number): Promise<DietTemplate> {
+    const response = await this.client.get<DietTemplate>(`/templates/diet/${id}`);
+    return response.data;
+  }
+
+  async createDietTemplate(data: any): Promise<DietTemplate> {
+    const response = await this.client.post<DietTemplate>('/templates/diet', data);
+    return response.data;
+  }
+
+  async createDietTemplateFromPlan(planId: number, name?: string): Promise<DietTemplate> {
+    const response = await this.client.post<DietTemplate>('/templates/diet/from-plan', { plan_id: planId, name });
+    return response.data;
+  }
+
+  async deleteDietTemplate(id: number): Promise<void> {
+    await this.client.delete(`/templates/diet/${id}`);
+  }
+
+  async assignDietTemplate(id: number, data: TemplateAssignRequest): Promise<TemplateAssignResponse> {
+    const response = await this.client.post<TemplateAssignResponse>(`/templates/diet/${id}/assign`, data);
+    return response.data;
+  }
+
+  // Plan History API
+  async getPlanVersions(planType: PlanType, planId: number): Promise<PlanVersionSummary[]> {
+    const response = await this.client.get<PlanVersionSummary[]>(`/plan-history/${planType}/${planId}`);
+    return response.data;
+  }
+
+  async getPlanVersion(planType: PlanType, planId: number, version: number): Promise<PlanVersionDocument> {
+    const response = await this.client.get<PlanVersionDocument>(`/plan-history/${planType}/${planId}/${version}`);
+    return response.data;
+  }
+
+  async diffPlanVersions(planType: PlanType, planId: number, fromVersion: number, toVersion: number): Promise<PlanVersionDiff> {
+    const response = await this.client.get<PlanVersionDiff>(`/plan-history/${planType}/${planId}/diff`, {
+      params: { from_version: fromVersion, to_version: toVersion },
+    });
+    return response.data;
+  }
+
   // Calculator API
   async calculateBMR(data: BMRRequest): Promise<BMRResponse> {
     const response = await this.client.post<BMRResponse>('/calculator/bmr', data);
@@ -384,6 +517,18 @@ class ApiClient {
     return response.data;
   }
 
+  async calculateWorkingWeights(data: WorkingWeightBatchRequest): Promise<WorkingWeightBatchResponse> {
+    const response = await this.client.post<WorkingWeightBatchResponse>('/calculator/working-weights', data);
+    return response.data;
+  }
+
+  async getRPETable(formula: OneRMFormula = 'rts', maxReps: number = 12): Promise<RPETable> {
+    const response = await this.client.get<RPETable>('/calculator/rpe-table', {
+      params: { formula, max_reps: maxReps },
+    });
+    return response.data;
+  }
+
   async calculateAthleteNutrition(athleteId: number): Promise<MacrosResponse> {
     const response = await this.client.get<MacrosResponse>(`/athletes/${athleteId}/nutrition`);
     return response.data;
@@ -407,6 +552,11 @@ class ApiClient {
     return response.data;
   }
 
+  async bulkAssignSupplementPlan(data: SupplementPlanBulkAssign): Promise<SupplementPlanBulkAssignResponse> {
+    const response = await this.client.post<SupplementPlanBulkAssignResponse>('/supplement-plans/bulk-assign', data);
+    return response.data;
+  }
+
   async addSupplementItem(planId: number, itemData: any): Promise<any> {
     const response = await this.client.post(`/supplement-plans/${planId}/items`, itemData);
     return response.data;
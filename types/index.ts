@@ -286,6 +286,63 @@ export interface WorkoutItem {
   created_at?: string;
 }
 
+// ذخیره کامل برنامه (PUT /training/{id}/full): بدون id یعنی ردیف جدید، غایب از سند یعنی حذف
+export type WorkoutItemDocument = Omit<WorkoutItem, 'id' | 'training_day_id' | 'exercise' | 'order' | 'created_at'> & {
+  id?: number; // ترتیب همان ترتیب لیست است
+};
+
+export interface TrainingDayDocument {
+  id?: number;
+  day_number: number;
+  name?: string;
+  notes?: string;
+  is_rest_day?: boolean;
+  workout_items: WorkoutItemDocument[];
+}
+
+export interface TrainingPlanDocument {
+  name: string;
+  description?: string;
+  duration_weeks?: number;
+  split_type?: string;
+  days: TrainingDayDocument[];
+}
+
+// جدول پیشرفت برنامه (ماتریس هفته × حرکت، ذخیره‌شده در سرور)
+export type ProgressionScheme = 'linear' | 'dup' | 'block';
+
+export interface TrainingProgressionRequest {
+  scheme?: ProgressionScheme;
+  weeks?: number;
+  step_percent?: number;
+  rounding?: number;
+  one_rms?: Record<number, number>;           // شناسه حرکت برنامه -> 1RM
+  exercise_one_rms?: Record<number, number>;  // شناسه حرکت بانک -> 1RM
+}
+
+export interface ProgressionItem {
+  id: number;
+  day_number: number;
+  name: string;
+  one_rm: number;
+}
+
+export interface TrainingProgression {
+  training_plan_id: number;
+  scheme: ProgressionScheme;
+  weeks: number;
+  step_percent: number;
+  rounding: number;
+  plan_version?: number | null;
+  stale: boolean;  // برنامه بعد از تولید جدول تغییر کرده است
+  items: ProgressionItem[];
+  percent: number[][];  // [هفته][حرکت]
+  reps: number[][];
+  load: number[][];
+  created_at: string;
+  updated_at?: string;
+}
+
 export interface TrainingSession {
   id: number;
   plan_id: number;
@@ -346,6 +403,77 @@ export interface DietItem {
   created_at?: string;
 }
 
+// ذخیره کامل برنامه غذایی (PUT /diet/{id}/full): ماکروها در سرور از روی غذا محاسبه می‌شوند
+export type DietItemDocument = Omit<
+  DietItem,
+  'id' | 'diet_plan_id' | 'food' | 'order' | 'created_at' |
+  'calculated_calories' | 'calculated_protein' | 'calculated_carbs' | 'calculated_fat'
+> & {
+  id?: number; // ترتیب همان ترتیب لیست است
+};
+
+export interface DietPlanDocument {
+  name: string;
+  description?: string;
+  target_calories?: number;
+  target_protein?: number;
+  target_carbs?: number;
+  target_fat?: number;
+  general_notes?: string;
+  items: DietItemDocument[];
+}
+
+// Plan Template Types
+export type TrainingTemplateDay = Omit<TrainingDay, 'training_plan_id'>;
+
+export interface TrainingTemplate {
+  id: number;
+  name: string;
+  description?: string;
+  duration_weeks?: number;
+  split_type?: string;
+  days: TrainingTemplateDay[];
+  created_at: string;
+  updated_at?: string;
+}
+
+export type DietTemplateItem = Omit<DietItem, 'diet_plan_id'>;
+
+export interface DietTemplate {
+  id: number;
+  name: string;
+  description?: string;
+  target_calories?: number;
+  target_protein?: number;
+  target_carbs?: number;
+  target_fat?: number;
+  general_notes?: string;
+  items: DietTemplateItem[];
+  created_at: string;
+  updated_at?: string;
+}
+
+export interface PlanTemplateSummary {
+  id: number;
+  name: string;
+  description?: string;
+  created_at: string;
+  updated_at?: string;
+}
+
+// تخصیص قالب: برای هر شاگرد یک کپی مستقل از قالب ساخته می‌شود
+export interface TemplateAssignRequest {
+  athlete_ids: number[];
+  name?: string; // پیش‌فرض: نام قالب
+  activate?: boolean;
+}
+
+export interface TemplateAssignResponse {
+  template_id: number;
+  created: number;
+  plans: { athlete_id: number; plan_id: number }[];
+}
+
 export interface Meal {
   id: number;
   plan_id: number;
@@ -393,6 +521,20 @@ export interface SupplementPlanItem {
   created_at?: string;
 }
 
+// یک برنامه مکمل یکسان برای چند شاگرد (POST /supplement-plans/bulk-assign)
+export interface SupplementPlanBulkAssign {
+  athlete_ids: number[];
+  name?: string;
+  description?: string;
+  general_notes?: string;
+  items?: Omit<SupplementPlanItem, 'id' | 'supplement_plan_id' | 'supplement' | 'created_at'>[];
+}
+
+export interface SupplementPlanBulkAssignResponse {
+  created: number;
+  plans: { athlete_id: number; plan_id: number }[];
+}
+
 export interface Supplement {
   id: number;
   name: string;
@@ -401,7 +543,63 @@ export interface Supplement {
   description?: string;
 }
 
+// Plan History Types
+export type PlanType = 'training' | 'diet' | 'supplement';
+
+export interface PlanVersionSummary {
+  version: number;
+  is_snapshot: boolean;
+  deleted: boolean; // نسخه ثبت حذف برنامه
+  sections: string[]; // بخش‌های تغییرکرده: plan, days, items
+  created_at: string;
+}
+
+// سند نسخه: {"plan": {...}, "items": {"<id>": {...}}}
+export interface PlanVersionDocument {
+  plan_type: PlanType;
+  plan_id: number;
+  version: number;
+  document: Record<string, any>;
+}
+
+export interface PlanVersionDiff {
+  plan_type: PlanType;
+  plan_id: number;
+  from_version: number;
+  to_version: number;
+  changes: Record<string, any>;
+}
+
 // Calculator Types
+export type OneRMFormula = 'table' | 'brzycki' | 'epley' | 'lombardi' | 'rts';
+
+export interface WorkingWeightRow {
+  one_rm: number;
+  reps: number;
+  rpe?: number;              // ۶ تا ۱۰ (۱۰ = تا واماندگی)
+  formula?: OneRMFormula;    // پیش‌فرض: فرمول درخواست
+}
+
+export interface WorkingWeightBatchRequest {
+  formula?: OneRMFormula;
+  rounding?: number;
+  items: WorkingWeightRow[];
+}
+
+export interface WorkingWeightBatchResponse {
+  formula: OneRMFormula;
+  rounding?: number | null;
+  results: { percent_1rm: number; weight: number }[];  // به ترتیب items
+}
+
+// جدول RPE × تکرار -> درصد 1RM
+export interface RPETable {
+  formula: OneRMFormula;
+  reps: number[];
+  rpe: number[];
+  percent: number[][];  // [RPE][تکرار]
+}
+
 export interface BMRRequest {
   weight: number;
   height: number;
@@ -446,6 +644,26 @@ export interface MacrosResponse {
   };
 }
 
+export type AthleteWorkspaceField =
+  | 'athlete'
+  | 'measurements'
+  | 'training_plan'
+  | 'training_progression'
+  | 'diet_plan'
+  | 'supplement_plan'
+  | 'nutrition';
+
+// پنل شاگرد در یک درخواست (فقط بخش‌های درخواست‌شده حضور دارند)
+export interface AthleteWorkspace {
+  athlete?: Athlete;
+  measurements?: Measurement[];
+  training_plan?: TrainingPlan | null;
+  training_progression?: TrainingProgression | null;
+  diet_plan?: DietPlan | null;
+  supplement_plan?: SupplementPlan | null;
+  nutrition?: (MacrosResponse & Record<string, any>) | { error: string } | null;
+}
+
 // UI State Types
 export type TabType = 'users' | 'training' | 'nutrition' | 'supplements' | 'progress';
 